@@ -0,0 +1,61 @@
+"""
+Dépendances des routes de l'API.
+
+    - rate_limit_dependencies : limitation de débit déclarée sur EndpointConfig
+    - get_relation_loader : chargeur des relations expansées, un par requête
+"""
+from typing import Any, List, Optional
+
+from fastapi import Depends, Request
+
+from app.config.endpoint_config import EndpointConfig
+from app.core.deps import get_current_user, get_engine
+from app.core.exceptions import TooManyRequestsError
+from app.core.rate_limit import RateLimit, get_rate_limiter, retry_after_header
+from app.services.relations import RelationLoader
+
+
+def caller_key(request: Request, user: Optional[Any]) -> str:
+    """Identifiant de l'appelant : utilisateur, sinon adresse du client."""
+    if user is not None:
+        return f"u:{user.internal_id}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+def rate_limit_dependencies(endpoint: EndpointConfig, scope: str) -> List[Any]:
+    """
+    Dépendances appliquant la limite de débit d'un endpoint.
+
+    Args:
+        endpoint: Configuration de l'endpoint (rate_limit)
+        scope: Nom unique de l'endpoint (ex: "User.get_all")
+
+    Returns:
+        List[Any]: [] sans limite, sinon la dépendance à passer à
+        dependencies= du décorateur de route
+    """
+    if endpoint.rate_limit is None:
+        return []
+    limit = RateLimit.parse(endpoint.rate_limit)
+    prefix = f"{scope}|"
+
+    async def enforce_rate_limit(
+            request: Request,
+            user: Optional[Any] = Depends(get_current_user)) -> None:
+        decision = await get_rate_limiter().acquire(prefix + caller_key(request, user), limit)
+        if not decision.allowed:
+            raise TooManyRequestsError(headers=retry_after_header(decision))
+
+    return [Depends(enforce_rate_limit)]
+
+
+async def get_relation_loader(
+        user: Optional[Any] = Depends(get_current_user),
+        engine: Any = Depends(get_engine)) -> RelationLoader:
+    """
+    Chargeur des relations de la requête.
+
+    FastAPI met en cache le résultat d'une dépendance pour la durée de la
+    requête : toutes les expansions d'une requête partagent le même chargeur.
+    """
+    return RelationLoader(engine, user)
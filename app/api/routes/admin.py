@@ -0,0 +1,308 @@
+"""
+Dashboard administrateur (API).
+
+create_admin_router génère les endpoints d'administration des modèles :
+
+    - GET /admin/export/{model} : export en flux NDJSON ou CSV (voir
+      app.services.export), reprise possible via ?cursor=
+    - POST /admin/import/{model} : import en flux NDJSON ou CSV du corps de
+      la requête, par lots (voir app.services.importer) ; ?import_id=
+      permet de suivre l'import pendant l'envoi :
+      GET /admin/imports/{import_id} : statut et compteurs, mis à jour à
+      chaque lot ; GET /admin/imports/{import_id}/errors : toutes les
+      erreurs par ligne, pagination par curseur
+    - GET /admin/stats : compteurs globaux de chaque modèle ;
+      GET /admin/stats/{model} : détail par propriétaire et par jour (voir
+      app.services.stats), ?refresh=true pour recompter
+    - GET /admin/logs : journal d'audit, du plus récent au plus ancien (voir
+      app.services.audit), pagination par curseur chiffré sur (ts, _id) via
+      ?cursor= (voir app.services.pagination)
+    - GET /admin/cache/stats : métriques du cache des réponses publiques
+      (voir app.services.response_cache)
+    - GET /admin/db/pool : métriques du pool de connexions MongoDB (voir
+      app.db.session)
+"""
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional, Type
+
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from bson import ObjectId
+from bson.errors import InvalidId
+from odmantic import AIOEngine
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+from app.api.deps import rate_limit_dependencies
+from app.api.routes.dynamic import parse_fields
+from app.config.endpoint_config import EndpointConfig
+from app.config.user_roles import UserRole
+from app.core.deps import get_current_user, get_engine
+from app.core.exceptions import ConflictError, NotFoundError, ValidationFailedError
+from app.core.permissions import endpoint_access, passes_custom_auth
+from app.db.session import get_session_manager, reading
+from app.models.model_data import ModelData
+from app.models.user import User
+from app.services import audit as audit_service
+from app.services import export as export_service
+from app.services import importer, stats
+from app.services.ownership import access_query
+from app.services.pagination import Keyset
+from app.services.permissions import plan_read
+from app.services.response_cache import response_cache
+
+# Entrées d'audit par page de /admin/logs
+MAX_LOGS = 500
+
+# Erreurs par page de /admin/imports/{import_id}/errors
+MAX_IMPORT_ERRORS = 1000
+
+IMPORT_ID_PATTERN = "^[0-9a-f]{32}$"
+
+
+def export_filter(endpoint: EndpointConfig, user: Optional[User],
+                  model: Type[ModelData]) -> Optional[Callable[[dict], bool]]:
+    """Filtre des documents exportés (fonction d'accès personnalisée), None sans fonction."""
+    if endpoint.custom_auth_function is None:
+        return None
+
+    def accept(document: dict) -> bool:
+        return passes_custom_auth(endpoint, user, document, model)
+    return accept
+
+
+def create_admin_router(
+        models: Iterable[Type[ModelData]],
+        endpoints: Optional[Dict[str, EndpointConfig]] = None) -> APIRouter:
+    """
+    Génère le routeur d'administration.
+
+    Args:
+        models: Modèles administrables, désignés par leur nom de collection
+        endpoints: Configuration par endpoint ; les endpoints absents sont
+            réservés aux administrateurs
+
+    Returns:
+        APIRouter: Routeur monté sous /admin
+    """
+    registry = {model.__collection__: model for model in models}
+    configs = {name: EndpointConfig(user_role=UserRole.ADMIN)
+               for name in ("export", "import", "stats", "logs", "cache_stats", "db_pool")}
+    configs.update(endpoints or {})
+    router = APIRouter(prefix="/admin", tags=["admin"])
+
+    def get_model(name: str) -> Type[ModelData]:
+        try:
+            return registry[name]
+        except KeyError:
+            raise NotFoundError(f"Modèle inconnu : {name}.")
+
+    if configs["export"].enable:
+        endpoint_export = configs["export"]
+
+        @router.get("/export/{model_name}", name="admin.export",
+                    dependencies=rate_limit_dependencies(endpoint_export, "admin.export"))
+        async def export(
+                model_name: str,
+                export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+                cursor: Optional[str] = None,
+                batch_size: int = Query(export_service.DEFAULT_BATCH_SIZE, ge=1,
+                                        le=export_service.MAX_BATCH_SIZE),
+                fields: Optional[str] = None,
+                include_inactive: bool = False,
+                user: Optional[User] = Depends(get_current_user),
+                engine: AIOEngine = Depends(get_engine)) -> StreamingResponse:
+            model = get_model(model_name)
+            role = endpoint_access(endpoint_export).authorize(user)
+            await audit_service.audit(engine, "export", model.__collection__, user)
+            requested = parse_fields(fields)
+
+            plan = plan_read(model, endpoint_export, user, role, requested, extra_fields=("internal_id",))
+            query = access_query(endpoint_export, user, role, include_inactive=include_inactive)
+            # Jeton vérifié avant d'ouvrir le flux : une erreur reste une 400
+            query = export_service.resume_filter(model, query, cursor)
+            batches = export_service.iter_batches(
+                engine.get_collection(model), query, plan.projection, batch_size)
+
+            accept = export_filter(endpoint_export, user, model)
+
+            if export_format == "csv":
+                columns = export_service.export_columns(model, role, requested)
+                body = export_service.stream_csv(model, batches, plan.serialize, columns, accept)
+            else:
+                body = export_service.stream_ndjson(model, batches, plan.serialize, accept)
+            return StreamingResponse(
+                body,
+                media_type=export_service.EXPORT_FORMATS[export_format],
+                headers={"Content-Disposition": f'attachment; filename="{model_name}.{export_format}"'})
+
+    if configs["import"].enable:
+        endpoint_import = configs["import"]
+
+        @router.post("/import/{model_name}", name="admin.import",
+                     dependencies=rate_limit_dependencies(endpoint_import, "admin.import"))
+        async def import_records(
+                model_name: str,
+                request: Request,
+                import_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+                batch_size: int = Query(importer.DEFAULT_BATCH_SIZE, ge=1, le=importer.MAX_BATCH_SIZE),
+                import_id: Optional[str] = Query(None, pattern=IMPORT_ID_PATTERN),
+                user: Optional[User] = Depends(get_current_user),
+                engine: AIOEngine = Depends(get_engine)) -> JSONResponse:
+            model = get_model(model_name)
+            role = endpoint_access(endpoint_import).authorize(user)
+            jobs = engine.database[importer.IMPORT_JOBS_COLLECTION]
+            report = importer.ImportReport(import_id)
+            try:
+                await importer.start_job(jobs, report, model.__collection__, user)
+            except DuplicateKeyError:
+                raise ConflictError(f"Import déjà existant : {report.import_id}.")
+
+            try:
+                await importer.import_records(
+                    engine.get_collection(model), model, endpoint_import, request.stream(),
+                    user, role, import_format, batch_size,
+                    on_progress=lambda current: importer.save_job(jobs, current),
+                    report=report, errors_collection=engine.database[importer.IMPORT_ERRORS_COLLECTION])
+            except importer.ImportFailed:
+                # Rapport partiel : lignes déjà écrites, erreurs déjà rapportées
+                pass
+            finally:
+                response_cache.invalidate(model)
+            await audit_service.audit(engine, "import", model.__collection__, user, count=report.inserted,
+                                      import_id=report.import_id, status=report.status)
+            try:
+                await importer.save_job(jobs, report)
+            except PyMongoError:
+                # La réponse porte le rapport ; le job expire avec son statut running
+                pass
+            code = status.HTTP_500_INTERNAL_SERVER_ERROR if report.status == importer.FAILED else status.HTTP_200_OK
+            return JSONResponse(report.to_dict(), status_code=code)
+
+        async def get_import_job(engine: AIOEngine, import_id: str) -> dict:
+            job = await engine.database[importer.IMPORT_JOBS_COLLECTION].find_one({"_id": import_id})
+            if job is None:
+                raise NotFoundError(f"Import introuvable : {import_id}.")
+            return job
+
+        @router.get("/imports/{import_id}", name="admin.import_status",
+                    dependencies=rate_limit_dependencies(endpoint_import, "admin.import_status"))
+        async def import_status(
+                import_id: str,
+                user: Optional[User] = Depends(get_current_user),
+                engine: AIOEngine = Depends(get_engine)) -> dict:
+            endpoint_access(endpoint_import).authorize(user)
+            job = await get_import_job(engine, import_id)
+            return {
+                **{name: value for name, value in job.items() if name not in ("_id", "expires_at")},
+                "actor": str(job["actor"]) if job.get("actor") is not None else None,
+            }
+
+        @router.get("/imports/{import_id}/errors", name="admin.import_errors",
+                    dependencies=rate_limit_dependencies(endpoint_import, "admin.import_errors"))
+        async def import_errors(
+                import_id: str,
+                limit: int = Query(MAX_IMPORT_ERRORS, ge=1, le=MAX_IMPORT_ERRORS),
+                cursor: Optional[str] = None,
+                user: Optional[User] = Depends(get_current_user),
+                engine: AIOEngine = Depends(get_engine)) -> dict:
+            endpoint_access(endpoint_import).authorize(user)
+            await get_import_job(engine, import_id)
+            page = Keyset(importer.IMPORT_ERRORS_COLLECTION, "row", ASCENDING, limit)
+            errors, next_cursor = await page.fetch(
+                engine.database[importer.IMPORT_ERRORS_COLLECTION], {"import_id": import_id},
+                {"row": 1, "error": 1}, cursor)
+            return {
+                "items": [{"row": error["row"], "error": error["error"]} for error in errors],
+                "next_cursor": next_cursor,
+                "limit": limit,
+            }
+
+    if configs["stats"].enable:
+        endpoint_stats = configs["stats"]
+
+        @router.get("/stats", name="admin.stats",
+                    dependencies=rate_limit_dependencies(endpoint_stats, "admin.stats"))
+        async def all_stats(user: Optional[User] = Depends(get_current_user)) -> dict:
+            endpoint_access(endpoint_stats).authorize(user)
+            counters = await stats.get_stats_store().all()
+            return {name: counters.get(name, stats.summary(stats.empty_counters())) for name in registry}
+
+        @router.get("/stats/{model_name}", name="admin.model_stats",
+                    dependencies=rate_limit_dependencies(endpoint_stats, "admin.model_stats"))
+        async def model_stats(
+                model_name: str,
+                refresh: bool = False,
+                user: Optional[User] = Depends(get_current_user),
+                engine: AIOEngine = Depends(get_engine)) -> dict:
+            model = get_model(model_name)
+            endpoint_access(endpoint_stats).authorize(user)
+            store = stats.get_stats_store()
+            if refresh:
+                reader = reading(engine, endpoint_stats.read_preference, endpoint_stats.read_concern)
+                await stats.reconcile(store, reader, [model])
+            return await store.get(model.__collection__)
+
+    if configs["logs"].enable:
+        endpoint_logs = configs["logs"]
+
+        @router.get("/logs", name="admin.logs",
+                    dependencies=rate_limit_dependencies(endpoint_logs, "admin.logs"))
+        async def logs(
+                model: Optional[str] = None,
+                action: Optional[str] = None,
+                actor: Optional[str] = None,
+                target: Optional[str] = None,
+                before: Optional[datetime] = None,
+                cursor: Optional[str] = None,
+                limit: int = Query(100, ge=1, le=MAX_LOGS),
+                user: Optional[User] = Depends(get_current_user),
+                engine: AIOEngine = Depends(get_engine)) -> dict:
+            endpoint_access(endpoint_logs).authorize(user)
+            # Égalités dans l'ordre des index de audit_logs, puis ts
+            query: dict = {}
+            if actor is not None:
+                try:
+                    query["actor"] = ObjectId(actor)
+                except InvalidId:
+                    raise ValidationFailedError(f"Auteur invalide : {actor}.")
+            if model is not None:
+                query["model"] = model
+            if action is not None:
+                query["action"] = action
+            if target is not None:
+                query["targets"] = target
+            if before is not None:
+                query["ts"] = {"$lt": before}
+
+            # Keyset sur (ts, _id) : les entrées écrites par un même lot
+            # partagent leur ts
+            page = Keyset(audit_service.AUDIT_COLLECTION, "ts", DESCENDING, limit)
+            entries, next_cursor = await page.fetch(
+                engine.database[audit_service.AUDIT_COLLECTION], query, None, cursor)
+            items = [
+                {**{name: value for name, value in entry.items() if name != "_id"},
+                 "actor": str(entry["actor"]) if entry.get("actor") is not None else None}
+                for entry in entries
+            ]
+            return {"items": items, "next_cursor": next_cursor, "limit": limit}
+
+    if configs["cache_stats"].enable:
+        endpoint_cache_stats = configs["cache_stats"]
+
+        @router.get("/cache/stats", name="admin.cache_stats",
+                    dependencies=rate_limit_dependencies(endpoint_cache_stats, "admin.cache_stats"))
+        async def cache_stats(user: Optional[User] = Depends(get_current_user)) -> dict:
+            endpoint_access(endpoint_cache_stats).authorize(user)
+            return response_cache.stats()
+
+    if configs["db_pool"].enable:
+        endpoint_db_pool = configs["db_pool"]
+
+        @router.get("/db/pool", name="admin.db_pool",
+                    dependencies=rate_limit_dependencies(endpoint_db_pool, "admin.db_pool"))
+        async def db_pool(user: Optional[User] = Depends(get_current_user)) -> dict:
+            endpoint_access(endpoint_db_pool).authorize(user)
+            return get_session_manager().metrics.snapshot()
+
+    return router
@@ -0,0 +1,493 @@
+"""
+CRUD dynamique configuré.
+
+create_crud_router génère les endpoints REST d'un modèle ModelData selon sa
+configuration d'endpoints :
+
+    - GET /api/{model} : liste des entités (get_all)
+    - GET /api/{model}/{public_id} : détail d'une entité (get_one)
+    - ?expand=owner_id,created_by sur les lectures : relations remplacées
+      par le résumé de l'enregistrement lié, une requête $in par modèle lié
+      et par page (voir app.services.relations)
+    - POST /api/{model} : création (create)
+    - PUT /api/{model}/{public_id} : modification (update)
+    - DELETE /api/{model}/{public_id} : soft delete (delete)
+    - POST /api/{model}/{public_id}/restore : restauration (restore), y
+      compris des enregistrements archivés (voir app.services.archive)
+    - POST /api/{model}/{public_id}/transfer : transfert de propriété
+      (transfer_ownership)
+    - POST|PUT|DELETE /api/{model}/_bulk : variantes par lot (voir
+      app.services.crud), un seul aller-retour MongoDB par lot
+
+Les lectures passent par motor avec une projection construite à partir du
+rôle de l'appelant : les champs invisibles ne quittent jamais la base et les
+documents ne sont pas hydratés en modèles ODMantic. Les listes sont paginées
+par curseur chiffré (voir app.services.pagination), jamais par skip(). Les
+règles de propriété et d'accès sont compilées dans le filtre MongoDB (voir
+app.services.ownership) : seuls les documents accessibles sont lus. Une
+fonction d'accès personnalisée reçoit le document brut, ou sa vue en
+lecture seule / son instance sans revalidation selon EndpointConfig.hydration
+(voir app.db.hydration). Les lectures de get_all et get_one suivent la
+préférence et le niveau de lecture de leur endpoint (secondaires possibles,
+voir app.db.session.reading).
+
+Les corps de création et de modification sont validés par les schémas
+générés une fois par modèle (voir app.schemas.base) ; les schémas de réponse
+par rôle documentent l'OpenAPI sans revalider les réponses.
+
+Les créations, suppressions, restaurations et transferts mettent à jour les
+statistiques du modèle (voir app.services.stats). Lectures et écritures
+sont journalisées dans audit_logs (voir app.services.audit). Les écritures
+dans la collection des utilisateurs invalident, une fois faites, le
+principal en cache des utilisateurs modifiés (voir app.core.principal).
+"""
+from typing import Any, Dict, List, Optional, Type
+
+from fastapi import APIRouter, Body, Depends, Query, Request, Response, status
+from odmantic import AIOEngine
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.api.deps import get_relation_loader, rate_limit_dependencies
+from app.config.endpoint_config import EndpointConfig
+from app.config.model_config import default_endpoints
+from app.config.ownership_config import OwnershipConfig
+from app.config.user_roles import UserRole
+from app.core.deps import get_current_user, get_engine
+from app.core.exceptions import ConflictError, NotFoundError, PermissionDeniedError, ValidationFailedError
+from app.core.permissions import endpoint_access, is_owner, passes_custom_auth
+from app.core.principal import invalidate_principal
+from app.db.session import reading
+from app.models.model_data import ModelData
+from app.models.user import User
+from app.schemas.base import SchemaFactory
+from app.services import archive, crud, relations, stats
+from app.services.audit import audit
+from app.services.ownership import access_query
+from app.services.pagination import KeysetPage, parse_sort
+from app.services.permissions import plan_read
+from app.services.response_cache import ETAG_FIELDS, compute_etag, etag_matches, response_cache
+from app.utils.formatters import SerializerFactory
+
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def parse_fields(fields: Optional[str]) -> Optional[list[str]]:
+    """Découpe le paramètre ?fields=a,b,c ; None pour tous les champs."""
+    if not fields:
+        return None
+    return [name.strip() for name in fields.split(",") if name.strip()]
+
+
+def create_crud_router(
+        model: Type[ModelData],
+        endpoints: Optional[Dict[str, EndpointConfig]] = None,
+        prefix: Optional[str] = None,
+        tag: Optional[str] = None,
+        ownership: Optional[OwnershipConfig] = None,
+        dependency_overrides_provider: Optional[Any] = None) -> APIRouter:
+    """
+    Génère le routeur CRUD d'un modèle.
+
+    Args:
+        model: Classe du modèle (sous-classe de ModelData)
+        endpoints: Configuration par endpoint ; les endpoints absents
+            utilisent la configuration par défaut (voir
+            app.config.model_config.default_endpoints)
+        prefix: Segment d'URL du modèle (défaut : nom de la collection)
+        tag: Tag OpenAPI des routes (défaut : nom du modèle)
+        ownership: Règles de transfert de propriété (défaut :
+            OwnershipConfig())
+        dependency_overrides_provider: Application dont les
+            dependency_overrides s'appliquent, pour des routes montées sans
+            include_router (voir app.models.registry)
+
+    Returns:
+        APIRouter: Routeur monté sous /api/{prefix}
+    """
+    configs = default_endpoints()
+    configs.update(endpoints or {})
+    ownership = ownership or OwnershipConfig()
+    router = APIRouter(prefix=f"/api/{prefix or model.__collection__}", tags=[tag or model.__name__],
+                       dependency_overrides_provider=dependency_overrides_provider)
+    # Corps de requête validés par le schéma du rôle le plus large, le rôle
+    # de l'appelant étant appliqué ensuite (crud.check_fields)
+    request_schemas = SchemaFactory.get(model, UserRole.SUPERADMIN)
+
+    def documented(endpoint: EndpointConfig, kind: str = "response", code: int = 200) -> dict:
+        # Schéma de réponse documenté pour le rôle minimal de l'endpoint ;
+        # les réponses ne sont pas revalidées
+        return {code: {"model": getattr(SchemaFactory, kind)(model, endpoint.user_role)}}
+
+    async def record_stats(delta: stats.Delta) -> None:
+        await stats.record(stats.get_stats_store(), model, delta)
+
+    async def record_created(documents: List[dict]) -> None:
+        await record_stats(stats.created_delta(documents))
+
+    async def record_deleted(documents: List[dict]) -> None:
+        await record_stats(stats.soft_deleted_delta(documents))
+
+    def invalidate_principals(documents: List[dict]) -> None:
+        # Appelé après l'écriture : un chargement commencé avant est écarté
+        # par le cache, un chargement ultérieur lit la nouvelle valeur
+        if model.__collection__ == User.__collection__:
+            for document in documents:
+                invalidate_principal(document["_id"])
+
+    async def on_updated(documents: List[dict]) -> None:
+        invalidate_principals(documents)
+
+    async def on_deleted(documents: List[dict]) -> None:
+        invalidate_principals(documents)
+        await record_deleted(documents)
+
+    async def audit_written(engine: AIOEngine, action: str, user: Optional[User],
+                            result: dict, success: str) -> None:
+        targets = [item["public_id"] for item in result["results"] if item["status"] == success]
+        if targets:
+            await audit(engine, action, model.__collection__, user, targets)
+
+    # Routes par lot déclarées en premier : /_bulk ne doit pas être capturé
+    # par /{public_id}
+    if configs["create"].enable:
+        endpoint_create = configs["create"]
+
+        @router.post("/_bulk", name=f"{model.__name__}.bulk_create",
+                     dependencies=rate_limit_dependencies(endpoint_create, f"{model.__name__}.bulk_create"))
+        async def bulk_create(
+                items: List[Any] = Body(..., max_length=crud.MAX_BULK_ITEMS),
+                ordered: bool = True,
+                user: Optional[User] = Depends(get_current_user),
+                engine: AIOEngine = Depends(get_engine)) -> dict:
+            role = endpoint_access(endpoint_create).authorize(user)
+            try:
+                result = await crud.bulk_create(
+                    engine.get_collection(model), model, endpoint_create, items, user, role, ordered,
+                    on_written=record_created)
+            finally:
+                response_cache.invalidate(model)
+            await audit_written(engine, "bulk_create", user, result, crud.CREATED)
+            return result
+
+    if configs["update"].enable:
+        endpoint_update = configs["update"]
+
+        @router.put("/_bulk", name=f"{model.__name__}.bulk_update",
+                    dependencies=rate_limit_dependencies(endpoint_update, f"{model.__name__}.bulk_update"))
+        async def bulk_update(
+                items: List[Any] = Body(..., max_length=crud.MAX_BULK_ITEMS),
+                ordered: bool = True,
+                user: Optional[User] = Depends(get_current_user),
+                engine: AIOEngine = Depends(get_engine)) -> dict:
+            role = endpoint_access(endpoint_update).authorize(user)
+            try:
+                result = await crud.bulk_update(
+                    engine.get_collection(model), model, endpoint_update, items, user, role, ordered,
+                    on_written=on_updated)
+            finally:
+                response_cache.invalidate(model, _public_ids(item.get("public_id") for item in items
+                                                             if isinstance(item, dict)))
+            await audit_written(engine, "bulk_update", user, result, crud.UPDATED)
+            return result
+
+    if configs["delete"].enable:
+        endpoint_delete = configs["delete"]
+
+        @router.delete("/_bulk", name=f"{model.__name__}.bulk_delete",
+                       dependencies=rate_limit_dependencies(endpoint_delete, f"{model.__name__}.bulk_delete"))
+        async def bulk_delete(
+                public_ids: List[Any] = Body(..., max_length=crud.MAX_BULK_ITEMS),
+                ordered: bool = True,
+                user: Optional[User] = Depends(get_current_user),
+                engine: AIOEngine = Depends(get_engine)) -> dict:
+            role = endpoint_access(endpoint_delete).authorize(user)
+            try:
+                result = await crud.bulk_soft_delete(
+                    engine.get_collection(model), endpoint_delete, public_ids, user, role, ordered,
+                    on_written=on_deleted, model=model)
+            finally:
+                response_cache.invalidate(model, _public_ids(public_ids))
+            await audit_written(engine, "bulk_delete", user, result, crud.DELETED)
+            return result
+
+    if configs["get_all"].enable:
+        endpoint_get_all = configs["get_all"]
+
+        @router.get("", name=f"{model.__name__}.get_all",
+                    responses=documented(endpoint_get_all, "list"),
+                    dependencies=rate_limit_dependencies(endpoint_get_all, f"{model.__name__}.get_all"))
+        async def get_all(
+                request: Request,
+                cursor: Optional[str] = None,
+                limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                sort: Optional[str] = None,
+                fields: Optional[str] = None,
+                expand: Optional[str] = None,
+                count: bool = False,
+                user: Optional[User] = Depends(get_current_user),
+                engine: AIOEngine = Depends(get_engine),
+                loader: relations.RelationLoader = Depends(get_relation_loader)) -> Any:
+            role = endpoint_access(endpoint_get_all).authorize(user)
+            await audit(engine, "list", model.__collection__, user)
+            requested = parse_fields(fields)
+            expanded = relations.parse_expand(model, role, user is not None, expand, requested)
+            # Résumés liés : non invalidés par les écritures de leur modèle
+            cache_key = None if expanded else response_cache.cache_key(
+                model, endpoint_get_all, user, role, requested, "list", cursor, limit, sort, count)
+            if cache_key is not None:
+                cached = response_cache.get(cache_key)
+                if cached is not None:
+                    return response_cache.respond(cached, request.headers.get("if-none-match"))
+                # Avant la lecture : une écriture concurrente empêche la mise en cache
+                generation = response_cache.generation(model)
+
+            page = KeysetPage(model, *parse_sort(model, sort, role), limit)
+            extra_fields = page.required_fields + (ETAG_FIELDS if cache_key is not None else ())
+            plan = plan_read(model, endpoint_get_all, user, role, requested, extra_fields)
+            collection = reading(engine, endpoint_get_all.read_preference, endpoint_get_all.read_concern).get_collection(model)
+            query = access_query(endpoint_get_all, user, role)
+
+            documents, next_cursor = await page.fetch(
+                collection, query, plan.projection, cursor)
+            total = await collection.count_documents(query) if count else None
+            if cache_key is not None:
+                etag = compute_etag(cache_key, documents, next_cursor, total)
+                if etag_matches(request.headers.get("if-none-match"), etag):
+                    return response_cache.not_modified_response(etag)
+
+            documents = [
+                document for document in documents
+                if passes_custom_auth(endpoint_get_all, user, document, model)
+            ]
+            items = [plan.serialize(document) for document in documents]
+            if expanded:
+                await relations.expand(loader, model, documents, items, expanded)
+            result = {"items": items, "next_cursor": next_cursor, "limit": limit}
+            if count:
+                result["total"] = total
+            if cache_key is not None:
+                entry = response_cache.put(cache_key, etag, result, generation=generation)
+                return response_cache.respond(entry, None)
+            return result
+
+    if configs["get_one"].enable:
+        endpoint_get_one = configs["get_one"]
+
+        @router.get("/{public_id}", name=f"{model.__name__}.get_one",
+                    responses=documented(endpoint_get_one),
+                    dependencies=rate_limit_dependencies(endpoint_get_one, f"{model.__name__}.get_one"))
+        async def get_one(
+                request: Request,
+                public_id: str,
+                fields: Optional[str] = None,
+                expand: Optional[str] = None,
+                user: Optional[User] = Depends(get_current_user),
+                engine: AIOEngine = Depends(get_engine),
+                loader: relations.RelationLoader = Depends(get_relation_loader)) -> Any:
+            role = endpoint_access(endpoint_get_one).authorize(user)
+            await audit(engine, "read", model.__collection__, user, (public_id,))
+            requested = parse_fields(fields)
+            expanded = relations.parse_expand(model, role, user is not None, expand, requested)
+            cache_key = None if expanded else response_cache.cache_key(
+                model, endpoint_get_one, user, role, requested, "one", public_id)
+            if cache_key is not None:
+                cached = response_cache.get(cache_key)
+                if cached is not None:
+                    return response_cache.respond(cached, request.headers.get("if-none-match"))
+                # Avant la lecture : une écriture concurrente empêche la mise en cache
+                generation = response_cache.generation(model)
+
+            extra_fields = ETAG_FIELDS if cache_key is not None else ()
+            plan = plan_read(model, endpoint_get_one, user, role, requested, extra_fields)
+            collection = reading(engine, endpoint_get_one.read_preference, endpoint_get_one.read_concern).get_collection(model)
+
+            document = await collection.find_one(
+                access_query(endpoint_get_one, user, role, {"public_id": public_id}),
+                plan.projection)
+            if document is None or not passes_custom_auth(endpoint_get_one, user, document, model):
+                raise NotFoundError()
+            if cache_key is None:
+                item = plan.serialize(document)
+                await relations.expand(loader, model, (document,), [item], expanded)
+                return item
+
+            etag = compute_etag(cache_key, (document,))
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return response_cache.not_modified_response(etag)
+            entry = response_cache.put(cache_key, etag, plan.serialize(document), public_id, generation)
+            return response_cache.respond(entry, None)
+
+    if configs["create"].enable:
+
+        @router.post("", status_code=status.HTTP_201_CREATED, name=f"{model.__name__}.create",
+                     responses=documented(endpoint_create, code=status.HTTP_201_CREATED),
+                     dependencies=rate_limit_dependencies(endpoint_create, f"{model.__name__}.create"))
+        async def create(
+                payload: request_schemas.create = Body(...),
+                user: Optional[User] = Depends(get_current_user),
+                engine: AIOEngine = Depends(get_engine)) -> dict:
+            role = endpoint_access(endpoint_create).authorize(user)
+            try:
+                document = crud.prepare_create(
+                    model, endpoint_create, payload.model_dump(exclude_unset=True), user, role)
+                await engine.get_collection(model).insert_one(document)
+            except crud.ItemError as error:
+                raise ValidationFailedError(str(error))
+            except DuplicateKeyError:
+                raise ConflictError()
+            response_cache.invalidate(model)
+            await record_created([document])
+            await audit(engine, "create", model.__collection__, user, (document["public_id"],))
+            return SerializerFactory.get_document(model, role, owner=user is not None)(document)
+
+    if configs["update"].enable:
+
+        @router.put("/{public_id}", name=f"{model.__name__}.update",
+                    responses=documented(endpoint_update),
+                    dependencies=rate_limit_dependencies(endpoint_update, f"{model.__name__}.update"))
+        async def update(
+                public_id: str,
+                payload: request_schemas.update = Body(...),
+                user: Optional[User] = Depends(get_current_user),
+                engine: AIOEngine = Depends(get_engine)) -> dict:
+            role = endpoint_access(endpoint_update).authorize(user)
+            collection = engine.get_collection(model)
+            query = access_query(endpoint_update, user, role, {"public_id": public_id})
+
+            current = await collection.find_one(query, _access_projection(endpoint_update))
+            if current is None or not passes_custom_auth(endpoint_update, user, current, model):
+                raise NotFoundError()
+            try:
+                changes = crud.prepare_update(
+                    model, payload.model_dump(exclude_unset=True), role, is_owner(user, current))
+            except crud.ItemError as error:
+                raise ValidationFailedError(str(error))
+
+            plan = plan_read(model, endpoint_update, user, role)
+            try:
+                document = await collection.find_one_and_update(
+                    query, changes, projection=plan.projection,
+                    return_document=ReturnDocument.AFTER)
+            except DuplicateKeyError:
+                raise ConflictError()
+            finally:
+                response_cache.invalidate(model, (public_id,))
+                invalidate_principals([current])
+            if document is None:
+                raise NotFoundError()
+            await audit(engine, "update", model.__collection__, user, (public_id,))
+            return plan.serialize(document)
+
+    if configs["delete"].enable:
+
+        @router.delete("/{public_id}", status_code=status.HTTP_204_NO_CONTENT,
+                       name=f"{model.__name__}.delete",
+                       dependencies=rate_limit_dependencies(endpoint_delete, f"{model.__name__}.delete"))
+        async def delete(
+                public_id: str,
+                user: Optional[User] = Depends(get_current_user),
+                engine: AIOEngine = Depends(get_engine)) -> Response:
+            role = endpoint_access(endpoint_delete).authorize(user)
+            collection = engine.get_collection(model)
+            query = access_query(endpoint_delete, user, role, {"public_id": public_id})
+
+            current = await collection.find_one(query, _access_projection(endpoint_delete))
+            if current is None or not passes_custom_auth(endpoint_delete, user, current, model):
+                raise NotFoundError()
+            result = await collection.update_one(query, crud.soft_delete_update())
+            response_cache.invalidate(model, (public_id,))
+            invalidate_principals([current])
+            if result.modified_count:
+                await record_deleted([current])
+            await audit(engine, "delete", model.__collection__, user, (public_id,))
+            return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+    if configs["restore"].enable:
+        endpoint_restore = configs["restore"]
+
+        @router.post("/{public_id}/restore", name=f"{model.__name__}.restore",
+                     dependencies=rate_limit_dependencies(endpoint_restore, f"{model.__name__}.restore"))
+        async def restore(
+                public_id: str,
+                user: Optional[User] = Depends(get_current_user),
+                engine: AIOEngine = Depends(get_engine)) -> dict:
+            role = endpoint_access(endpoint_restore).authorize(user)
+            collection = engine.get_collection(model)
+            query = access_query(endpoint_restore, user, role,
+                                 {"public_id": public_id, "is_active": False}, include_inactive=True)
+
+            current = await collection.find_one(query, _access_projection(endpoint_restore))
+            if current is None and await archive.unarchive(
+                    collection, archive.get_archive_collection(engine, model), query):
+                current = await collection.find_one(query, _access_projection(endpoint_restore))
+            if current is None or not passes_custom_auth(endpoint_restore, user, current, model):
+                raise NotFoundError()
+            plan = plan_read(model, endpoint_restore, user, role)
+            document = await collection.find_one_and_update(
+                query, crud.restore_update(), projection=plan.projection,
+                return_document=ReturnDocument.AFTER)
+            if document is None:
+                raise NotFoundError()
+            response_cache.invalidate(model, (public_id,))
+            invalidate_principals([current])
+            await record_stats(stats.restored_delta([current]))
+            await audit(engine, "restore", model.__collection__, user, (public_id,))
+            return plan.serialize(document)
+
+    if configs["transfer_ownership"].enable:
+        endpoint_transfer = configs["transfer_ownership"]
+
+        @router.post("/{public_id}/transfer", name=f"{model.__name__}.transfer_ownership",
+                     dependencies=rate_limit_dependencies(
+                         endpoint_transfer, f"{model.__name__}.transfer_ownership"))
+        async def transfer_ownership(
+                public_id: str,
+                owner: str = Body(..., embed=True),
+                user: Optional[User] = Depends(get_current_user),
+                engine: AIOEngine = Depends(get_engine)) -> dict:
+            role = endpoint_access(endpoint_transfer).authorize(user)
+            collection = engine.get_collection(model)
+            query = access_query(endpoint_transfer, user, role, {"public_id": public_id})
+
+            current = await collection.find_one(query, _access_projection(endpoint_transfer))
+            if current is None or not passes_custom_auth(endpoint_transfer, user, current, model):
+                raise NotFoundError()
+            # Hors administrateurs : le propriétaire, s'il y est autorisé
+            if not ownership.can_transfer(role, user, current):
+                raise PermissionDeniedError()
+
+            new_owner = await engine.get_collection(User).find_one(
+                {"public_id": owner, "is_active": True}, {"_id": 1})
+            if new_owner is None:
+                raise ValidationFailedError(f"Utilisateur inconnu : {owner}.")
+            plan = plan_read(model, endpoint_transfer, user, role)
+            document = await collection.find_one_and_update(
+                query, crud.transfer_update(new_owner["_id"]), projection=plan.projection,
+                return_document=ReturnDocument.AFTER)
+            if document is None:
+                raise NotFoundError()
+            response_cache.invalidate(model, (public_id,))
+            invalidate_principals([current])
+            await record_stats(stats.transferred_delta(current.get("owner_id"), new_owner["_id"]))
+            await audit(engine, "transfer_ownership", model.__collection__, user, (public_id,), owner=owner)
+            return plan.serialize(document)
+
+    return router
+
+
+def _public_ids(values: Any) -> List[str]:
+    """public_id textuels d'un lot (les autres valeurs sont rejetées par crud)."""
+    return [value for value in values if isinstance(value, str)]
+
+
+def _access_projection(endpoint: EndpointConfig) -> Optional[dict]:
+    """
+    Projection du contrôle d'accès avant écriture (complète si fonction
+    personnalisée) ; _id sert à invalider le principal d'un utilisateur.
+    """
+    if endpoint.custom_auth_function is not None:
+        return None
+    return {"owner_id": 1}
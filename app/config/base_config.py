@@ -0,0 +1,38 @@
+from typing import Any, Tuple
+
+
+class FrozenConfig:
+    """
+    Base of the immutable configuration objects.
+
+    Subclasses declare their attributes in __slots__ (no per-instance
+    __dict__) and their constructor arguments in _fields. Attributes are set
+    once in __init__ through _set; any later assignment raises. Use replace()
+    to derive a modified copy, which goes through __init__ and is validated
+    again.
+    """
+
+    __slots__ = ()
+
+    # Constructor arguments, in order: used by replace() and __repr__
+    _fields: Tuple[str, ...] = ()
+
+    def _set(self, **values: Any) -> None:
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable, use replace().")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable, use replace().")
+
+    def replace(self, **changes: Any) -> "FrozenConfig":
+        """Return a copy with some constructor arguments changed."""
+        values = {name: getattr(self, name) for name in self._fields}
+        values.update(changes)
+        return type(self)(**values)
+
+    def __repr__(self) -> str:
+        arguments = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({arguments})"
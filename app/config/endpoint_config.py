@@ -1,17 +1,53 @@
+from .base_config import FrozenConfig
+from .endpoint_options import HYDRATION_MODES, READ_CONCERNS, READ_PREFERENCES, RateLimit
 from .user_roles import UserRole
 
 
-class EndpointConfig:
+class EndpointConfig(FrozenConfig):
+    __slots__ = ("enable", "user_role", "custom_auth_function", "access_filter", "rate_limit", "hydration",
+                 "read_preference", "read_concern", "_access")
+
+    _fields = ("enable", "user_role", "custom_auth_function", "access_filter", "rate_limit", "hydration",
+               "read_preference", "read_concern")
+
     def __init__(
         self,
         enable: bool = True,
         user_role: UserRole = UserRole.USERS,
-        custom_auth_function: callable = None
+        custom_auth_function: callable = None,
+        access_filter: callable = None,
+        rate_limit: str = None,
+        hydration: str = None,
+        read_preference: str = None,
+        read_concern: str = None
     ):
-
-        self.enable: bool = enable
-        self.user_role: UserRole = user_role
-        self.custom_auth_function = custom_auth_function
+        self._set(
+            enable=enable,
+            user_role=user_role,
+            custom_auth_function=custom_auth_function,
+            # access_filter(user) -> dict: MongoDB filter restricting the
+            # records the caller may reach (team, hierarchy...), applied in
+            # the query.
+            access_filter=access_filter,
+            # rate_limit: "100/minute", "10/second"... enforced per caller
+            # (user, or client address when anonymous). None disables it.
+            rate_limit=rate_limit,
+            # hydration: what custom_auth_function receives as its record.
+            # None passes the raw MongoDB document (dict); "view", "trusted"
+            # or "validate" build a read-only view or a model instance with
+            # the model's attribute API (see app.db.hydration).
+            hydration=hydration,
+            # read_preference / read_concern: where and how the endpoint's
+            # reads are served, e.g. "secondaryPreferred" to offload list
+            # and stats reads to secondaries (see app.db.session.reading).
+            # None keeps the client's settings (primary).
+            read_preference=read_preference,
+            read_concern=read_concern,
+        )
+        # Validated once: the request path never inspects the configuration.
+        # The access checks are compiled by app.core.permissions
+        # (endpoint_access) and cached in _access.
+        self.validate_config()
 
     def validate_config(self):
         if not isinstance(self.enable, bool):
@@ -21,4 +57,17 @@ class EndpointConfig:
         if self.custom_auth_function is not None and not callable(
                 self.custom_auth_function):
             raise ValueError("Custom auth function must be callable or None.")
+        if self.access_filter is not None and not callable(self.access_filter):
+            raise ValueError("Access filter must be callable or None.")
+        if self.rate_limit is not None:
+            RateLimit.parse(self.rate_limit)
+        if self.hydration is not None and self.hydration not in HYDRATION_MODES:
+            raise ValueError(
+                f"Hydration must be None or one of {', '.join(HYDRATION_MODES)}.")
+        if self.read_preference is not None and self.read_preference not in READ_PREFERENCES:
+            raise ValueError(
+                f"Read preference must be None or one of {', '.join(READ_PREFERENCES)}.")
+        if self.read_concern is not None and self.read_concern not in READ_CONCERNS:
+            raise ValueError(
+                f"Read concern must be None or one of {', '.join(READ_CONCERNS)}.")
         return True
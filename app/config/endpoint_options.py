@@ -0,0 +1,65 @@
+"""
+Values accepted by EndpointConfig.
+
+The configuration is validated against these tables without importing the
+core or db packages; app.core.rate_limit, app.db.hydration and
+app.db.session import them from here.
+"""
+import re
+from typing import NamedTuple
+
+# hydration: what custom_auth_function receives (see app.db.hydration)
+VALIDATE = "validate"
+TRUSTED = "trusted"
+VIEW = "view"
+HYDRATION_MODES = (VALIDATE, TRUSTED, VIEW)
+
+# read_preference: MongoDB read preference names (see app.db.session.reading)
+READ_PREFERENCES = ("primary", "primaryPreferred", "secondary", "secondaryPreferred", "nearest")
+
+# read_concern: MongoDB read concern levels
+READ_CONCERNS = ("local", "available", "majority", "linearizable", "snapshot")
+
+# rate_limit: period units, in seconds
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+_LIMIT_PATTERN = re.compile(r"^\s*(\d+)\s*(?:/|per)\s*(\d*)\s*(second|minute|hour|day)s?\s*$")
+
+
+class RateLimit(NamedTuple):
+    """
+    Rate limit: count requests per period seconds (bursts of count).
+
+    Attributes:
+        count: Requests allowed per period
+        period: Period length (seconds)
+    """
+
+    count: int
+    period: float
+
+    @classmethod
+    def parse(cls, value: "str | RateLimit") -> "RateLimit":
+        """
+        Parse a limit such as "100/minute", "10 per second", "1000/2hours".
+
+        Raises:
+            ValueError: If the limit is malformed
+        """
+        if isinstance(value, RateLimit):
+            return value
+        match = _LIMIT_PATTERN.match(str(value).lower())
+        if match is None or int(match.group(1)) <= 0:
+            raise ValueError(f"Invalid rate limit: {value!r} (e.g. \"100/minute\").")
+        count, multiplier, unit = match.groups()
+        return cls(int(count), PERIODS[unit] * int(multiplier or 1))
+
+    @property
+    def interval(self) -> float:
+        """Emission interval: average delay between two requests."""
+        return self.period / self.count
+
+    @property
+    def tolerance(self) -> float:
+        """Maximum lead of the TAT over the current time (burst size)."""
+        return self.period - self.interval
@@ -1,49 +1,92 @@
-from endpoint_config import EndpointConfig
-from ownership_config import OwnershipConfig
-from permissions_config import PermissionsRegister
-
-
-class ModelConfig:
-    def __init__(self):
-        self.table_name: str
-        self.description: str
-        self.schema_name: str
-        self.endpoints: dict[str, EndpointConfig] = {
-            "get_one": EndpointConfig(),
-            "get_all": EndpointConfig(),
-            "create": EndpointConfig(),
-            "update": EndpointConfig(),
-            "delete": EndpointConfig()
-        }
-        self.ownership: OwnershipConfig = OwnershipConfig()
-        self.permissions: PermissionsRegister = PermissionsRegister()
-
-        def validate_model_config(self):
-            if not isinstance(self.table_name, str) or not self.table_name:
-                raise ValueError("Table name must be a non-empty string.")
-            if not isinstance(self.description, str):
-                raise ValueError("Description must be a string.")
-            if not isinstance(self.schema_name, str) or not self.schema_name:
-                raise ValueError("Schema name must be a non-empty string.")
-            if not isinstance(self.endpoints, dict):
-                raise ValueError("Endpoints must be a dictionary.")
-            for key, config in self.endpoints.items():
-                if key not in [
-                    "get_one",
-                    "get_all",
-                    "create",
-                    "update",
-                        "delete"]:
-                    raise ValueError(
-                        f"Invalid endpoint key: {key}. Must be one of 'get_one', 'get_all', 'create', 'update', 'delete'.")
-                if not isinstance(config, EndpointConfig):
-                    raise ValueError(
-                        f"Endpoint config for {key} must be an instance of EndpointConfig.")
-            if not isinstance(self.ownership, OwnershipConfig):
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from .base_config import FrozenConfig
+from .endpoint_config import EndpointConfig
+from .ownership_config import OwnershipConfig
+from .permissions_config import PermissionsRegister
+from .user_roles import UserRole
+from app.utils.public_ids import PUBLIC_ID_STRATEGIES
+
+# Endpoints generated for every model by the dynamic router
+ENDPOINT_NAMES = ("get_one", "get_all", "create", "update", "delete", "restore", "transfer_ownership")
+
+# Endpoints restricted to administrators by default
+ADMIN_ENDPOINT_NAMES = ("restore", "transfer_ownership")
+
+
+# Endpoint configurations are immutable: the defaults are built once and shared
+DEFAULT_ENDPOINTS = MappingProxyType({
+    name: EndpointConfig(user_role=UserRole.ADMIN) if name in ADMIN_ENDPOINT_NAMES else EndpointConfig()
+    for name in ENDPOINT_NAMES
+})
+
+
+def default_endpoints() -> dict[str, EndpointConfig]:
+    """Endpoint configuration used for the endpoints a model does not configure."""
+    return dict(DEFAULT_ENDPOINTS)
+
+
+class ModelConfig(FrozenConfig):
+    __slots__ = ("table_name", "description", "schema_name", "endpoints", "ownership", "permissions",
+                 "public_id_strategy")
+
+    _fields = __slots__
+
+    def __init__(
+        self,
+        table_name: str = None,
+        description: str = "",
+        schema_name: str = None,
+        endpoints: dict[str, EndpointConfig] = None,
+        ownership: OwnershipConfig = None,
+        permissions: PermissionsRegister = None,
+        public_id_strategy: str = None
+    ):
+        if isinstance(endpoints, Mapping) or endpoints is None:
+            # Only the configured endpoints need to be given, the others keep
+            # their defaults (see default_endpoints). Read-only mapping.
+            endpoints = MappingProxyType({**DEFAULT_ENDPOINTS, **(endpoints or {})})
+        self._set(
+            # table_name: MongoDB collection and URL segment
+            # (/api/{table_name}). None uses the model's collection.
+            table_name=table_name,
+            description=description,
+            # schema_name: OpenAPI tag and schema prefix. None uses the class
+            # name.
+            schema_name=schema_name,
+            endpoints=endpoints,
+            ownership=ownership or OwnershipConfig(),
+            permissions=permissions or PermissionsRegister(),
+            # public_id_strategy: "uuid4" (random) or "uuid7" (time-ordered,
+            # see app.utils.public_ids). None uses PUBLIC_ID_STRATEGY.
+            public_id_strategy=public_id_strategy,
+        )
+
+    def validate_model_config(self):
+        if not isinstance(self.table_name, str) or not self.table_name:
+            raise ValueError("Table name must be a non-empty string.")
+        if not isinstance(self.description, str):
+            raise ValueError("Description must be a string.")
+        if not isinstance(self.schema_name, str) or not self.schema_name:
+            raise ValueError("Schema name must be a non-empty string.")
+        if not isinstance(self.endpoints, Mapping):
+            raise ValueError("Endpoints must be a dictionary.")
+        for key, config in self.endpoints.items():
+            if key not in ENDPOINT_NAMES:
                 raise ValueError(
-                    "Ownership must be an instance of OwnershipConfig.")
-            if not isinstance(self.permissions, PermissionsRegister):
+                    f"Invalid endpoint key: {key}. Must be one of {', '.join(repr(name) for name in ENDPOINT_NAMES)}.")
+            if not isinstance(config, EndpointConfig):
                 raise ValueError(
-                    "Permissions must be an instance of PermissionsConfig.")
+                    f"Endpoint config for {key} must be an instance of EndpointConfig.")
+        if not isinstance(self.ownership, OwnershipConfig):
+            raise ValueError(
+                "Ownership must be an instance of OwnershipConfig.")
+        if not isinstance(self.permissions, PermissionsRegister):
+            raise ValueError(
+                "Permissions must be an instance of PermissionsConfig.")
+        if self.public_id_strategy is not None and self.public_id_strategy not in PUBLIC_ID_STRATEGIES:
+            raise ValueError(
+                f"Invalid public id strategy: {self.public_id_strategy}. Must be one of {', '.join(PUBLIC_ID_STRATEGIES)}.")
 
-            return True
+        return True
@@ -1,11 +1,38 @@
+from .base_config import FrozenConfig
+from .user_roles import UserRole
 
+# Roles allowed to transfer any record they can reach
+TRANSFER_ROLES = frozenset({UserRole.ADMIN, UserRole.SUPERADMIN})
+
+
+def _never(role, user, document) -> bool:
+    return False
+
+
+def _admin_or_owner(role, user, document) -> bool:
+    if role in TRANSFER_ROLES:
+        return True
+    if user is None or not user.allow_ownership_transfer:
+        return False
+    owner_id = document.get("owner_id")
+    return owner_id is not None and owner_id == user.internal_id
+
+
+class OwnershipConfig(FrozenConfig):
+    __slots__ = ("allow_ownership_transfer", "can_transfer")
+
+    _fields = ("allow_ownership_transfer",)
 
-class OwnershipConfig:
     def __init__(
         self,
         allow_ownership_transfer: bool = True
     ):
-        self.allow_ownership_transfer: bool = allow_ownership_transfer
-
-    def ownership_check(self):
-        pass
+        if not isinstance(allow_ownership_transfer, bool):
+            raise ValueError("Allow ownership transfer must be a boolean value.")
+        self._set(
+            allow_ownership_transfer=allow_ownership_transfer,
+            # can_transfer(role, user, document) -> bool: administrators, or
+            # the record owner when their account allows it. Always False
+            # when transfers are disabled.
+            can_transfer=_admin_or_owner if allow_ownership_transfer else _never,
+        )
@@ -1,14 +1,73 @@
-from typing import List, Type, Dict, Any
+from typing import List, Type, Dict, Any, FrozenSet, Iterable, Tuple
+
 from .user_roles import UserRole
 
 
 class PermissionsRegister:
     """Central registry managing model attribute permissions per user role."""
 
-    # _registry maps: { model_name: { role: {"attributes": set(), "overwrite":
+    # _registry maps: { model_name: { role: {"mask": int, "overwrite":
     # bool } } }
     _registry: Dict[str, Dict[UserRole, Dict[str, Any]]] = {}
 
+    # _matrix caches the compiled permission masks: { (model, role): int }
+    # It is filled lazily by get_mask (or eagerly by freeze) and cleared
+    # whenever the registry changes.
+    _matrix: Dict[Tuple[Type, UserRole], int] = {}
+
+    # _field_bits gives every attribute name a fixed bit position. The table
+    # is shared by all models so masks coming from different classes of an
+    # inheritance chain can be combined with a single OR. Positions are never
+    # reassigned, even by reset(), since compiled masks may outlive it.
+    _field_bits: Dict[str, int] = {}
+
+    # Memoized decoding of masks: { mask: (attribute, ...) } in bit order
+    _mask_fields: Dict[int, Tuple[str, ...]] = {}
+    _mask_sets: Dict[int, FrozenSet[str]] = {}
+
+    # -----------------------------------------------------------------------
+    # Field indexing
+    # -----------------------------------------------------------------------
+
+    @classmethod
+    def field_bit(cls, attribute: str) -> int:
+        """Return the bit position of an attribute, assigning one if needed."""
+        bit = cls._field_bits.get(attribute)
+        if bit is None:
+            bit = len(cls._field_bits)
+            cls._field_bits[attribute] = bit
+        return bit
+
+    @classmethod
+    def field_index(cls, model: Type) -> Dict[str, int]:
+        """Map every declared field of a model to its bit position."""
+        return {name: cls.field_bit(name) for name in getattr(model, "model_fields", {})}
+
+    @classmethod
+    def mask_of(cls, attributes: Iterable[str]) -> int:
+        """Build the mask of a list of attributes. Unknown attributes get no bit."""
+        mask = 0
+        for attribute in attributes:
+            bit = cls._field_bits.get(attribute)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    @classmethod
+    def fields_of(cls, mask: int) -> Tuple[str, ...]:
+        """Decode a mask into its attribute names, ordered by bit position."""
+        try:
+            return cls._mask_fields[mask]
+        except KeyError:
+            fields = tuple(
+                name for name, bit in cls._field_bits.items() if mask >> bit & 1)
+            cls._mask_fields[mask] = fields
+            return fields
+
+    # -----------------------------------------------------------------------
+    # Registration
+    # -----------------------------------------------------------------------
+
     @classmethod
     def register(
             cls,
@@ -22,29 +81,42 @@ class PermissionsRegister:
         if model_name not in cls._registry:
             cls._registry[model_name] = {}
 
+        # Declared fields are indexed first so bits follow declaration order
+        cls.field_index(model)
+        mask = 0
+        for attribute in attributes:
+            mask |= 1 << cls.field_bit(attribute)
+
         if role not in cls._registry[model_name] or overwrite:
             # Overwrite existing attributes if overwrite is True
             cls._registry[model_name][role] = {
-                "attributes": set(attributes), "overwrite": overwrite}
+                "mask": mask, "overwrite": overwrite}
         else:
             # Merge attributes if overwrite is False
-            cls._registry[model_name][role]["attributes"].update(attributes)
+            cls._registry[model_name][role]["mask"] |= mask
             # Ensure overwrite flag remains consistent
             cls._registry[model_name][role]["overwrite"] = cls._registry[model_name][role]["overwrite"] or overwrite
 
+        # Compiled entries may depend on this model through the MRO
+        cls._matrix.clear()
+
+    # -----------------------------------------------------------------------
+    # Lookups
+    # -----------------------------------------------------------------------
+
     @classmethod
-    def get_permissions(cls, model: Type, role: UserRole) -> set:
-        """Return attributes for the given model and role, considering overwrite flags."""
+    def _compile(cls, model: Type, role: UserRole) -> int:
+        """Resolve the mask of a model and role by walking its MRO."""
         model_name = model.__name__.split('.')[0]
 
         # If the model has an overwrite=True for this role, only return its
         # attributes
         if model_name in cls._registry and role in cls._registry[model_name]:
             if cls._registry[model_name][role].get("overwrite"):
-                return cls._registry[model_name][role]["attributes"]
+                return cls._registry[model_name][role]["mask"]
 
         # Otherwise, merge attributes from inheritance chain
-        merged_attributes: set = set()
+        merged_mask = 0
         for base in reversed(model.__mro__):
             base_name = base.__name__.split('.')[0]
             if base_name not in cls._registry:
@@ -52,15 +124,77 @@ class PermissionsRegister:
 
             role_data = cls._registry[base_name].get(role)
             if role_data:
-                merged_attributes.update(role_data["attributes"])
+                merged_mask |= role_data["mask"]
 
-        return merged_attributes
+        return merged_mask
+
+    @classmethod
+    def get_mask(cls, model: Type, role: UserRole) -> int:
+        """Return the permission mask for the given model and role."""
+        try:
+            return cls._matrix[(model, role)]
+        except KeyError:
+            mask = cls._compile(model, role)
+            cls._matrix[(model, role)] = mask
+            return mask
+
+    @classmethod
+    def get_permissions(cls, model: Type, role: UserRole) -> FrozenSet[str]:
+        """Return attributes for the given model and role, considering overwrite flags."""
+        mask = cls.get_mask(model, role)
+        try:
+            return cls._mask_sets[mask]
+        except KeyError:
+            attributes = frozenset(cls.fields_of(mask))
+            cls._mask_sets[mask] = attributes
+            return attributes
 
     @classmethod
     def has_access(cls, model: Type, role: UserRole, attribute: str) -> bool:
         """Check if a user role can access a specific attribute."""
-        allowed_attrs = cls.get_permissions(model, role)
-        return attribute in allowed_attrs
+        bit = cls._field_bits.get(attribute)
+        return bit is not None and cls.get_mask(model, role) >> bit & 1 == 1
+
+    @classmethod
+    def filter_mask(
+            cls,
+            model: Type,
+            role: UserRole,
+            requested: Iterable[str]) -> int:
+        """Intersect the role mask with a list of requested attributes (e.g. ?fields=)."""
+        return cls.get_mask(model, role) & cls.mask_of(requested)
+
+    @classmethod
+    def freeze(cls, models: Iterable[Type]) -> None:
+        """
+        Compile the permission matrix of the given models for every role.
+        Meant to be called once at startup with the application's models
+        (see app.main.create_app) so the first requests do not pay the
+        compilation cost.
+        """
+        for model in models:
+            for role in UserRole:
+                cls.get_permissions(model, role)
+
+    @classmethod
+    def reset(cls) -> None:
+        """Remove every registered permission and compiled entry."""
+        cls._registry.clear()
+        cls._matrix.clear()
+
+
+class WritePermissionsRegister(PermissionsRegister):
+    """
+    Registry of the attributes each role may write (create, update, import).
+
+    Same rules as PermissionsRegister (inheritance along the MRO, overwrite
+    flag, compiled masks) with its own registrations: nothing is writable
+    unless declared here. Bit positions are shared with PermissionsRegister
+    so read and write masks can be intersected.
+    """
+
+    _registry: Dict[str, Dict[UserRole, Dict[str, Any]]] = {}
+    _matrix: Dict[Tuple[Type, UserRole], int] = {}
 
 
 def Permissions(
@@ -87,3 +221,15 @@ def AllUserRolePermissions(
                     cls, role, attributes, overwrite=overwrite_attrs)
         return cls
     return decorator
+
+
+def WritePermissions(
+        role: UserRole,
+        attributes: List[str],
+        overwrite_attrs: bool = False):
+    """Decorator to register the model attributes a given user role may write."""
+    def decorator(cls):
+        WritePermissionsRegister.register(
+            cls, role, attributes, overwrite=overwrite_attrs)
+        return cls
+    return decorator
@@ -0,0 +1,70 @@
+"""
+Dépendances FastAPI communes.
+
+    - get_engine : moteur ODMantic partagé
+    - get_current_user : utilisateur authentifié de la requête
+    - resolve_principal : principal (mis en cache) d'un sujet authentifié
+"""
+from typing import Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import Depends, Header
+from odmantic import AIOEngine
+
+from app.core.exceptions import NotAuthenticatedError
+from app.core.principal import Principal, load_principal
+from app.core.security import ACCESS, get_token_verifier, split_bearer
+from app.db.session import get_engine
+from app.models.user import User
+
+__all__ = ["get_engine", "get_current_user", "resolve_principal"]
+
+
+async def resolve_principal(subject: str, engine: AIOEngine) -> Optional[Principal]:
+    """
+    Résout le sujet d'un jeton (internal_id) en principal.
+
+    Le principal est lu dans le cache du processus (voir app.core.principal),
+    la base n'est interrogée qu'en cas d'absence ou d'expiration.
+
+    Args:
+        subject: Identifiant interne de l'utilisateur, sous forme de chaîne
+        engine: Moteur ODMantic
+
+    Returns:
+        Optional[Principal]: Principal, None si l'utilisateur est inconnu
+        ou désactivé
+    """
+    try:
+        internal_id = ObjectId(subject)
+    except (InvalidId, TypeError):
+        return None
+    principal = await load_principal(engine.get_collection(User), internal_id)
+    if principal is None or not principal.is_active:
+        return None
+    return principal
+
+
+async def get_current_user(
+        authorization: Optional[str] = Header(default=None),
+        engine: AIOEngine = Depends(get_engine)) -> Optional[Principal]:
+    """
+    Retourne l'utilisateur authentifié de la requête, None si anonyme.
+
+    Le jeton Bearer est vérifié par app.core.security (claims en cache,
+    révocation en mémoire) puis son sujet est résolu en principal (cache
+    par processus) : le cas courant ne fait aucun accès à la base.
+
+    Raises:
+        NotAuthenticatedError: Jeton invalide, expiré, révoqué, ou
+            utilisateur inconnu ou désactivé
+    """
+    token = split_bearer(authorization)
+    if token is None:
+        return None
+    claims = get_token_verifier().verify(token, ACCESS)
+    principal = await resolve_principal(claims["sub"], engine)
+    if principal is None:
+        raise NotAuthenticatedError()
+    return principal
@@ -0,0 +1,74 @@
+"""
+Exceptions HTTP standardisées de l'API.
+
+Chaque exception porte un code de retour et un message par défaut, afin que
+les routes et services remontent des erreurs homogènes.
+"""
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+
+class APIError(HTTPException):
+    """Exception de base de l'API."""
+
+    status_code: int = status.HTTP_400_BAD_REQUEST
+    detail: str = "Requête invalide."
+
+    def __init__(self, detail: Optional[str] = None, headers: Optional[dict] = None):
+        super().__init__(
+            status_code=self.status_code,
+            detail=detail or self.detail,
+            headers=headers)
+
+
+class BadRequestError(APIError):
+    """Paramètres de requête invalides (400)."""
+
+    status_code = status.HTTP_400_BAD_REQUEST
+    detail = "Paramètres invalides."
+
+
+class NotAuthenticatedError(APIError):
+    """Authentification requise (401)."""
+
+    status_code = status.HTTP_401_UNAUTHORIZED
+    detail = "Authentification requise."
+
+    def __init__(self, detail: Optional[str] = None):
+        super().__init__(detail, headers={"WWW-Authenticate": "Bearer"})
+
+
+class PermissionDeniedError(APIError):
+    """Accès refusé (403)."""
+
+    status_code = status.HTTP_403_FORBIDDEN
+    detail = "Accès refusé."
+
+
+class NotFoundError(APIError):
+    """Ressource introuvable (404)."""
+
+    status_code = status.HTTP_404_NOT_FOUND
+    detail = "Ressource introuvable."
+
+
+class ConflictError(APIError):
+    """Conflit avec l'état existant, ex: clé unique (409)."""
+
+    status_code = status.HTTP_409_CONFLICT
+    detail = "Conflit avec une ressource existante."
+
+
+class ValidationFailedError(APIError):
+    """Données invalides (422)."""
+
+    status_code = status.HTTP_422_UNPROCESSABLE_CONTENT
+    detail = "Données invalides."
+
+
+class TooManyRequestsError(APIError):
+    """Limite de débit atteinte (429)."""
+
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    detail = "Trop de requêtes, réessayez plus tard."
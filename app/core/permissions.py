@@ -0,0 +1,235 @@
+"""
+Contrôle d'accès aux endpoints dynamiques.
+
+Ce module résout le rôle effectif de l'appelant et applique les niveaux
+d'authentification définis par EndpointConfig :
+
+    - PUBLIC : accès libre
+    - USERS : utilisateur connecté
+    - USER : utilisateur connecté, limité aux enregistrements dont il est
+      propriétaire (les administrateurs ne sont pas restreints)
+    - ADMIN / SUPERADMIN : rôle administrateur requis
+    - custom_auth_function : utilisateur connecté + fonction personnalisée
+"""
+from typing import Any, Callable, NamedTuple, Optional, Type
+
+from bson import ObjectId
+
+from app.config.endpoint_config import EndpointConfig
+from app.config.user_roles import UserRole
+from app.core.exceptions import NotAuthenticatedError, PermissionDeniedError
+from app.db.hydration import hydrate
+
+# Rôles qui ne sont jamais restreints à leurs propres enregistrements
+ADMIN_ROLES = frozenset({UserRole.ADMIN, UserRole.SUPERADMIN})
+
+
+def resolve_role(user: Optional[Any]) -> UserRole:
+    """
+    Retourne le rôle de l'appelant utilisé pour les permissions de champs.
+
+    Args:
+        user: Utilisateur authentifié, None pour un appel anonyme
+
+    Returns:
+        UserRole: PUBLIC si anonyme, SUPERADMIN ou ADMIN selon ses rôles,
+        USERS sinon (UserRole.USER est réservé au propriétaire d'un
+        enregistrement)
+    """
+    if user is None:
+        return UserRole.PUBLIC
+    if UserRole.SUPERADMIN in user.roles:
+        return UserRole.SUPERADMIN
+    if UserRole.ADMIN in user.roles:
+        return UserRole.ADMIN
+    return UserRole.USERS
+
+
+def check_endpoint_access(endpoint: EndpointConfig, user: Optional[Any]) -> UserRole:
+    """
+    Vérifie le niveau d'authentification d'un endpoint.
+
+    Le contrôle de propriété (UserRole.USER) et la fonction personnalisée
+    portent sur les enregistrements et sont appliqués ensuite.
+
+    Args:
+        endpoint: Configuration de l'endpoint
+        user: Utilisateur authentifié ou None
+
+    Returns:
+        UserRole: Rôle effectif de l'appelant
+
+    Raises:
+        NotAuthenticatedError: Si une authentification est requise
+        PermissionDeniedError: Si le rôle de l'appelant est insuffisant
+    """
+    role = resolve_role(user)
+    required = endpoint.user_role
+
+    if required == UserRole.PUBLIC and endpoint.custom_auth_function is None:
+        return role
+    if user is None:
+        raise NotAuthenticatedError()
+    if required == UserRole.ADMIN and role not in ADMIN_ROLES:
+        raise PermissionDeniedError()
+    if required == UserRole.SUPERADMIN and role != UserRole.SUPERADMIN:
+        raise PermissionDeniedError()
+    return role
+
+
+def compile_access(endpoint: EndpointConfig) -> Callable[[Optional[Any]], UserRole]:
+    """
+    Compile le contrôle d'authentification d'un endpoint.
+
+    Équivalent de check_endpoint_access, avec le niveau requis résolu une
+    fois par configuration (voir endpoint_access) : la fonction retournée ne fait plus que les vérifications propres à ce
+    niveau.
+
+    Args:
+        endpoint: Configuration de l'endpoint
+
+    Returns:
+        Callable: Fonction user -> rôle effectif (mêmes exceptions que
+        check_endpoint_access)
+    """
+    required = endpoint.user_role
+
+    if required == UserRole.PUBLIC and endpoint.custom_auth_function is None:
+        return resolve_role
+
+    def authenticated(user: Optional[Any]) -> UserRole:
+        if user is None:
+            raise NotAuthenticatedError()
+        return resolve_role(user)
+
+    # Vérifications en ligne : un seul appel par requête
+    if required == UserRole.ADMIN:
+        def admin(user: Optional[Any]) -> UserRole:
+            if user is None:
+                raise NotAuthenticatedError()
+            role = resolve_role(user)
+            if role not in ADMIN_ROLES:
+                raise PermissionDeniedError()
+            return role
+        return admin
+
+    if required == UserRole.SUPERADMIN:
+        def superadmin(user: Optional[Any]) -> UserRole:
+            if user is None:
+                raise NotAuthenticatedError()
+            role = resolve_role(user)
+            if role != UserRole.SUPERADMIN:
+                raise PermissionDeniedError()
+            return role
+        return superadmin
+
+    return authenticated
+
+
+def requires_ownership(endpoint: EndpointConfig, role: UserRole) -> bool:
+    """True si l'appelant est limité aux enregistrements qu'il possède."""
+    return endpoint.user_role == UserRole.USER and role not in ADMIN_ROLES
+
+
+def can_access_record(
+        endpoint: EndpointConfig,
+        user: Optional[Any],
+        role: UserRole,
+        document: dict,
+        model: Optional[Type] = None) -> bool:
+    """
+    Vérifie l'accès à un enregistrement déjà chargé.
+
+    Args:
+        endpoint: Configuration de l'endpoint
+        user: Utilisateur authentifié ou None
+        role: Rôle effectif retourné par check_endpoint_access
+        document: Document MongoDB (doit contenir owner_id si nécessaire)
+        model: Classe du modèle, pour hydrater le document remis à la
+            fonction personnalisée (EndpointConfig.hydration)
+
+    Returns:
+        bool: True si l'appelant peut accéder à l'enregistrement
+    """
+    if requires_ownership(endpoint, role) and not is_owner(user, document):
+        return False
+    return passes_custom_auth(endpoint, user, document, model)
+
+
+def passes_custom_auth(endpoint: EndpointConfig, user: Optional[Any], document: dict,
+                       model: Optional[Type] = None) -> bool:
+    """
+    Applique la fonction d'accès personnalisée de l'endpoint, s'il y en a une.
+
+    La fonction reçoit le document brut, ou sa vue / son instance selon
+    endpoint.hydration (voir app.db.hydration) quand le modèle est fourni.
+    Le contrôle est compilé une fois par configuration (voir endpoint_access).
+    """
+    return endpoint_access(endpoint).check_record(user, document, model)
+
+
+def _no_record_check(user: Optional[Any], document: dict, model: Optional[Type] = None) -> bool:
+    return True
+
+
+def compile_record_check(endpoint: EndpointConfig) -> Callable[..., bool]:
+    """
+    Compile le contrôle d'accès personnalisé d'un endpoint.
+
+    Returns:
+        Callable: Fonction (user, document, model=None) -> bool ; toujours
+        True sans custom_auth_function
+    """
+    function = endpoint.custom_auth_function
+    if function is None:
+        return _no_record_check
+
+    mode = endpoint.hydration
+    if mode is None:
+        def check(user: Optional[Any], document: dict, model: Optional[Type] = None) -> bool:
+            return bool(function(user, document))
+        return check
+
+    def check_hydrated(user: Optional[Any], document: dict, model: Optional[Type] = None) -> bool:
+        if model is not None:
+            document = hydrate(model, document, mode)
+        return bool(function(user, document))
+    return check_hydrated
+
+
+def is_owner(user: Optional[Any], document: dict) -> bool:
+    """True si l'utilisateur est propriétaire du document."""
+    if user is None:
+        return False
+    owner_id: Optional[ObjectId] = document.get("owner_id")
+    return owner_id is not None and owner_id == user.internal_id
+
+
+class EndpointAccess(NamedTuple):
+    """
+    Contrôles compilés d'un endpoint.
+
+    Attributs:
+        authorize: Fonction user -> rôle effectif (lève 401/403, voir
+            compile_access)
+        check_record: Fonction (user, document, model=None) -> bool (voir
+            compile_record_check)
+    """
+
+    authorize: Callable[[Optional[Any]], UserRole]
+    check_record: Callable[..., bool]
+
+
+def endpoint_access(endpoint: EndpointConfig) -> EndpointAccess:
+    """
+    Retourne les contrôles compilés d'un endpoint.
+
+    Compilés au premier appel puis conservés sur la configuration (immuable :
+    une copie par replace() est recompilée).
+    """
+    try:
+        return endpoint._access
+    except AttributeError:
+        access = EndpointAccess(compile_access(endpoint), compile_record_check(endpoint))
+        endpoint._set(_access=access)
+        return access
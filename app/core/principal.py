@@ -0,0 +1,268 @@
+"""
+Principal de l'utilisateur authentifié et cache par processus.
+
+Les contrôles de rôle et de propriété n'ont besoin que de quelques champs de
+l'utilisateur : Principal en est une copie réduite et immuable. Le
+PrincipalCache (TTL + LRU) évite de relire l'utilisateur en base à chaque
+requête authentifiée.
+
+Invalidation :
+    - locale : là où les utilisateurs sont écrits, une fois l'écriture
+      faite : save_user pour une instance User modifiée, le routeur CRUD
+      pour les utilisateurs qu'il modifie (voir app.api.routes.dynamic) ;
+    - entre processus : watch_principal_changes écoute le change stream de
+      la collection des utilisateurs (replica set requis) ;
+    - dans tous les cas, une entrée expire après PRINCIPAL_CACHE_TTL
+      secondes (défaut 30), ce qui borne la durée d'une entrée périmée.
+
+Configuration : PRINCIPAL_CACHE_TTL, PRINCIPAL_CACHE_SIZE (défaut 10000).
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+
+from bson import ObjectId
+
+from app.config.user_roles import UserRole
+
+# Champs lus pour construire un principal
+PRINCIPAL_FIELDS = ("roles", "groupes", "is_active", "allow_ownership_transfer")
+
+# Champs dont la modification invalide le principal (change stream)
+INVALIDATING_FIELDS = frozenset(PRINCIPAL_FIELDS) | {"hashed_password"}
+
+
+class Principal(NamedTuple):
+    """
+    Utilisateur authentifié réduit aux champs des contrôles d'accès.
+
+    Compatible avec les contrôles de app.core.permissions (roles,
+    internal_id) et les règles d'accès personnalisées (groupes).
+    """
+
+    internal_id: ObjectId
+    roles: Tuple[UserRole, ...]
+    groupes: Tuple[str, ...]
+    is_active: bool
+    allow_ownership_transfer: bool
+
+    @classmethod
+    def from_document(cls, document: dict) -> "Principal":
+        """Construit un principal depuis un document MongoDB brut."""
+        return cls(
+            internal_id=document["_id"],
+            roles=tuple(UserRole(role) for role in document.get("roles", ())),
+            groupes=tuple(document.get("groupes", ())),
+            is_active=document.get("is_active", True),
+            allow_ownership_transfer=document.get("allow_ownership_transfer", False),
+        )
+
+    @classmethod
+    def from_user(cls, user: Any) -> "Principal":
+        """Construit un principal depuis une instance User."""
+        return cls(
+            internal_id=user.internal_id,
+            roles=tuple(user.roles),
+            groupes=tuple(user.groupes),
+            is_active=user.is_active,
+            allow_ownership_transfer=user.allow_ownership_transfer,
+        )
+
+    def has_role(self, role: str) -> bool:
+        """Retourne True si l'utilisateur a le rôle."""
+        return role in self.roles
+
+
+class PrincipalCache:
+    """
+    Cache TTL + LRU des principaux, indexé par internal_id.
+
+    Un chargement commencé avant une invalidation n'est pas mis en cache :
+    une lecture concurrente d'une modification ne peut pas réinsérer
+    l'ancienne valeur.
+
+    Attributs:
+        ttl: Durée de vie d'une entrée (secondes)
+        max_size: Nombre maximal d'entrées (les moins récemment lues sont
+            évincées)
+        hits: Lectures servies par le cache
+        misses: Lectures ayant nécessité la base
+    """
+
+    def __init__(self, ttl: float = 30.0, max_size: int = 10_000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        # _entries maps: { internal_id: (expiration, principal) }
+        self._entries: "OrderedDict[ObjectId, Tuple[float, Principal]]" = OrderedDict()
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, internal_id: ObjectId) -> Optional[Principal]:
+        """Retourne le principal en cache, None s'il est absent ou expiré."""
+        entry = self._entries.get(internal_id)
+        if entry is None:
+            return None
+        expires, principal = entry
+        if expires <= self._clock():
+            del self._entries[internal_id]
+            return None
+        self._entries.move_to_end(internal_id)
+        return principal
+
+    def put(self, principal: Principal) -> None:
+        """Met un principal en cache (éviction LRU au-delà de max_size)."""
+        self._entries[principal.internal_id] = (self._clock() + self.ttl, principal)
+        self._entries.move_to_end(principal.internal_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get_or_load(
+            self,
+            internal_id: ObjectId,
+            loader: Callable[[ObjectId], Awaitable[Optional[Principal]]]) -> Optional[Principal]:
+        """
+        Retourne le principal, chargé par loader en cas d'absence.
+
+        Args:
+            internal_id: Identifiant interne de l'utilisateur
+            loader: Lecture en base (None si l'utilisateur n'existe pas)
+
+        Returns:
+            Optional[Principal]: Principal, None si l'utilisateur n'existe pas
+        """
+        principal = self.get(internal_id)
+        if principal is not None:
+            self.hits += 1
+            return principal
+        self.misses += 1
+        generation = self._generation
+        principal = await loader(internal_id)
+        if principal is not None and generation == self._generation:
+            self.put(principal)
+        return principal
+
+    def invalidate(self, internal_id: ObjectId) -> None:
+        """Retire l'entrée d'un utilisateur modifié."""
+        self._generation += 1
+        self._entries.pop(internal_id, None)
+
+    def clear(self) -> None:
+        """Vide le cache (ex: change stream interrompu)."""
+        self._generation += 1
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Taille et taux de succès du cache."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+principal_cache = PrincipalCache(
+    ttl=float(os.getenv("PRINCIPAL_CACHE_TTL", "30")),
+    max_size=int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000")),
+)
+
+
+def invalidate_principal(internal_id: ObjectId) -> None:
+    """Invalide le principal d'un utilisateur dans le cache du processus."""
+    principal_cache.invalidate(internal_id)
+
+
+async def save_user(engine: Any, user: Any) -> Any:
+    """
+    Sauvegarde un utilisateur puis invalide son principal en cache.
+
+    L'invalidation suit l'écriture : un chargement commencé avant elle n'est
+    pas mis en cache (voir PrincipalCache), un chargement ultérieur lit la
+    nouvelle valeur.
+
+    Args:
+        engine: Moteur ODMantic
+        user: Utilisateur modifié
+
+    Returns:
+        Any: Utilisateur sauvegardé
+    """
+    try:
+        return await engine.save(user)
+    finally:
+        invalidate_principal(user.internal_id)
+
+
+async def load_principal(collection: Any, internal_id: ObjectId,
+                         cache: Optional[PrincipalCache] = None) -> Optional[Principal]:
+    """
+    Retourne le principal d'un utilisateur, depuis le cache ou la base.
+
+    Args:
+        collection: Collection motor des utilisateurs
+        internal_id: Identifiant interne (sujet du jeton)
+        cache: Cache à utiliser (défaut : cache du processus)
+
+    Returns:
+        Optional[Principal]: Principal, None si l'utilisateur n'existe pas
+    """
+    async def loader(key: ObjectId) -> Optional[Principal]:
+        document = await collection.find_one({"_id": key}, {name: 1 for name in PRINCIPAL_FIELDS})
+        return Principal.from_document(document) if document is not None else None
+
+    cache = cache if cache is not None else principal_cache
+    return await cache.get_or_load(internal_id, loader)
+
+
+# ---------------------------------------------------------------------------
+# Invalidation entre processus
+# ---------------------------------------------------------------------------
+
+def handle_change(cache: PrincipalCache, change: dict) -> None:
+    """
+    Applique un événement du change stream des utilisateurs au cache.
+
+    Une mise à jour n'invalide l'entrée que si elle touche un champ du
+    principal ou le mot de passe.
+    """
+    key = change.get("documentKey", {}).get("_id")
+    if key is None:
+        return
+    if change.get("operationType") == "update":
+        description = change.get("updateDescription", {})
+        touched = set(description.get("updatedFields", {})) | set(description.get("removedFields", ()))
+        if not any(name.split(".")[0] in INVALIDATING_FIELDS for name in touched):
+            return
+    cache.invalidate(key)
+
+
+async def watch_principal_changes(collection: Any, cache: Optional[PrincipalCache] = None,
+                                  retry_delay: float = 5.0) -> None:
+    """
+    Invalide le cache à partir du change stream de la collection des
+    utilisateurs (à lancer en tâche de fond ; replica set requis).
+
+    Si le flux est interrompu, des événements ont pu être manqués : le
+    cache est vidé avant de reprendre l'écoute.
+    """
+    cache = cache if cache is not None else principal_cache
+    pipeline = [{"$match": {"operationType": {"$in": ["update", "replace", "delete"]}}}]
+    while True:
+        try:
+            async with collection.watch(pipeline) as stream:
+                async for change in stream:
+                    handle_change(cache, change)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            cache.clear()
+            await asyncio.sleep(retry_delay)
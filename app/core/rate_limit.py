@@ -0,0 +1,210 @@
+"""
+Limitation de débit par endpoint et par appelant (GCRA).
+
+Chaque limite est déclarée sur EndpointConfig (rate_limit="100/minute") et
+appliquée par clé (endpoint, appelant). L'algorithme GCRA équivaut à un
+seau à jetons de capacité count rechargé de count jetons par période, mais
+ne stocke qu'un nombre par clé : l'heure d'arrivée théorique (TAT) de la
+prochaine requête.
+
+Mode local (défaut) : état en mémoire, réparti en shards protégés chacun
+par son verrou (les endpoints synchrones s'exécutent dans des threads). Une
+clé dont le TAT est passé est équivalente à une clé absente : elle est
+supprimée sans perte d'information, ce qui borne la mémoire aux appelants
+actifs. Au-delà de max_keys par shard, les clés les plus anciennes sont
+évincées.
+
+Mode partagé (RATE_LIMIT_BACKEND=mongodb) : le TAT est stocké dans la
+collection rate_limits et mis à jour atomiquement par find_one_and_update,
+pour une limite commune à tous les workers (un aller-retour MongoDB par
+requête limitée). Les entrées expirent via un index TTL.
+"""
+import os
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from pymongo import ASCENDING, IndexModel, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.config.endpoint_options import RateLimit
+
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMITS_COLLECTION = "rate_limits"
+
+
+class RateDecision(NamedTuple):
+    """Résultat d'une demande : autorisée, et délai avant nouvel essai."""
+
+    allowed: bool
+    retry_after: float = 0.0
+
+
+ALLOWED = RateDecision(True)
+
+
+def gcra(tat: Optional[float], now: float, limit: RateLimit) -> "tuple[RateDecision, Optional[float]]":
+    """
+    Applique GCRA à une clé.
+
+    Args:
+        tat: TAT courant de la clé (None si inconnue)
+        now: Heure courante (secondes)
+        limit: Limite appliquée
+
+    Returns:
+        tuple: (décision, nouveau TAT ; None si refusé et inchangé)
+    """
+    tat = now if tat is None or tat < now else tat
+    if tat - now > limit.tolerance:
+        return RateDecision(False, tat - now - limit.tolerance), None
+    return ALLOWED, tat + limit.interval
+
+
+class _Shard:
+    __slots__ = ("lock", "keys", "operations")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # keys maps: { clé: TAT }, dans l'ordre de dernière mise à jour
+        self.keys: Dict[str, float] = {}
+        self.operations = 0
+
+
+class RateLimiter:
+    """
+    Limiteur GCRA en mémoire, réparti en shards.
+
+    Attributs:
+        shards: Nombre de shards (puissance de 2)
+        max_keys: Nombre maximal de clés par shard
+        sweep_every: Nombre d'opérations d'un shard entre deux purges des
+            clés inactives
+    """
+
+    def __init__(self, shards: int = 16, max_keys: int = 65_536, sweep_every: int = 1024,
+                 clock=time.monotonic):
+        if shards <= 0 or shards & (shards - 1):
+            raise ValueError("Le nombre de shards doit être une puissance de 2.")
+        self.max_keys = max_keys
+        self.sweep_every = sweep_every
+        self._clock = clock
+        self._mask = shards - 1
+        self._shards: List[_Shard] = [_Shard() for _ in range(shards)]
+
+    def __len__(self) -> int:
+        return sum(len(shard.keys) for shard in self._shards)
+
+    def hit(self, key: str, limit: RateLimit) -> RateDecision:
+        """
+        Consomme une requête pour une clé.
+
+        Args:
+            key: Clé (endpoint, appelant)
+            limit: Limite appliquée
+
+        Returns:
+            RateDecision: Autorisation et délai avant nouvel essai
+        """
+        shard = self._shards[hash(key) & self._mask]
+        now = self._clock()
+        with shard.lock:
+            decision, tat = gcra(shard.keys.get(key), now, limit)
+            if tat is not None:
+                # Réinsertion : la clé passe en fin d'ordre d'éviction
+                shard.keys.pop(key, None)
+                shard.keys[key] = tat
+                if len(shard.keys) > self.max_keys:
+                    del shard.keys[next(iter(shard.keys))]
+            shard.operations += 1
+            if shard.operations >= self.sweep_every:
+                shard.operations = 0
+                self._sweep(shard, now)
+        return decision
+
+    async def acquire(self, key: str, limit: RateLimit) -> RateDecision:
+        """Variante asynchrone de hit (interface commune avec MongoRateLimiter)."""
+        return self.hit(key, limit)
+
+    @staticmethod
+    def _sweep(shard: _Shard, now: float) -> None:
+        """Supprime les clés dont le TAT est passé (seau plein)."""
+        idle = [key for key, tat in shard.keys.items() if tat <= now]
+        for key in idle:
+            del shard.keys[key]
+
+    def sweep(self) -> None:
+        """Purge les clés inactives de tous les shards."""
+        now = self._clock()
+        for shard in self._shards:
+            with shard.lock:
+                self._sweep(shard, now)
+
+    def reset(self) -> None:
+        """Oublie toutes les clés."""
+        for shard in self._shards:
+            with shard.lock:
+                shard.keys.clear()
+
+
+class MongoRateLimiter:
+    """
+    Limiteur GCRA partagé entre workers, état dans MongoDB.
+
+    Document par clé : {_id: clé, tat: secondes epoch, expires_at: date}.
+    La mise à jour n'a lieu que si la requête est autorisée (filtre sur tat) ;
+    une clé refusée provoque une tentative d'insertion en double, signe du
+    refus.
+    """
+
+    def __init__(self, collection: Any):
+        self.collection = collection
+
+    async def acquire(self, key: str, limit: RateLimit) -> RateDecision:
+        now = time.time()
+        admitted = {"$lte": now + limit.tolerance}
+        new_tat = {"$add": [{"$max": [{"$ifNull": ["$tat", now]}, now]}, limit.interval]}
+        try:
+            await self.collection.find_one_and_update(
+                {"_id": key, "$or": [{"tat": admitted}, {"tat": {"$exists": False}}]},
+                [{"$set": {
+                    "tat": new_tat,
+                    "expires_at": {"$toDate": {"$multiply": [new_tat, 1000]}},
+                }}],
+                upsert=True, projection={"_id": 1}, return_document=ReturnDocument.AFTER)
+            return ALLOWED
+        except DuplicateKeyError:
+            document = await self.collection.find_one({"_id": key}, {"tat": 1})
+            tat = document["tat"] if document else now
+            return RateDecision(False, max(0.0, tat - now - limit.tolerance))
+
+
+def rate_limits_indexes() -> List[IndexModel]:
+    """Index de rate_limits : purge des clés inactives."""
+    return [IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="ttl_expires_at")]
+
+
+def retry_after_header(decision: RateDecision) -> Dict[str, str]:
+    """En-tête Retry-After (secondes entières, au moins 1)."""
+    return {"Retry-After": str(max(1, int(decision.retry_after + 0.999)))}
+
+
+_limiter: Any = None
+
+
+def get_rate_limiter() -> Any:
+    """
+    Retourne le limiteur partagé du processus, créé au premier appel.
+
+    RATE_LIMIT_BACKEND=memory (défaut) : RateLimiter en mémoire ;
+    RATE_LIMIT_BACKEND=mongodb : MongoRateLimiter sur la collection rate_limits.
+    """
+    global _limiter
+    if _limiter is None:
+        if RATE_LIMIT_BACKEND == "mongodb":
+            from app.db.session import get_engine
+
+            _limiter = MongoRateLimiter(get_engine().database[RATE_LIMITS_COLLECTION])
+        else:
+            _limiter = RateLimiter()
+    return _limiter
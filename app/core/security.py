@@ -0,0 +1,400 @@
+"""
+Jetons JWT (RS256) et révocation.
+
+Vérifier un jeton RS256 coûte un décodage, une vérification de signature
+RSA et, avec une liste noire en base, une requête MongoDB. Ce module réduit
+le cas courant (jeton valide, non révoqué) à des lectures en mémoire :
+
+    - les clés PEM sont analysées une seule fois (KeyStore), par kid ;
+    - les claims vérifiés sont mis en cache par jeton jusqu'à leur
+      expiration (TokenVerifier) ;
+    - la révocation passe par un filtre de Bloom puis un ensemble exact
+      (RevocationIndex) : un jeton absent du filtre n'est certainement pas
+      révoqué, aucune autre vérification n'est faite.
+
+La liste noire de référence est la collection revoked_tokens ({_id: jti,
+expires_at, revoked_at}), purgée par un index TTL sur expires_at. Chaque
+processus y lit les révocations récentes toutes les REVOCATION_SYNC_INTERVAL
+secondes (voir sync_revocations) : une révocation faite sur un autre
+processus y est appliquée après au plus cet intervalle.
+
+Configuration par variables d'environnement :
+
+    - JWT_PRIVATE_KEY / JWT_PRIVATE_KEY_FILE : clé privée PEM (émission)
+    - JWT_PUBLIC_KEY / JWT_PUBLIC_KEY_FILE : clé publique PEM (vérification)
+    - JWT_KEY_ID : identifiant (kid) de la clé courante (défaut "default")
+    - JWT_ALGORITHM : défaut RS256
+    - JWT_ACCESS_TOKEN_EXPIRE_MINUTES (défaut 30)
+    - JWT_REFRESH_TOKEN_EXPIRE_DAYS (défaut 7)
+    - REVOCATION_SYNC_INTERVAL (défaut 5)
+"""
+import asyncio
+import hashlib
+import math
+import os
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional
+
+import jwt
+from cryptography.hazmat.primitives.serialization import load_pem_private_key, load_pem_public_key
+from pymongo import ASCENDING, IndexModel
+
+from app.core.exceptions import NotAuthenticatedError
+
+JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "RS256")
+JWT_KEY_ID = os.getenv("JWT_KEY_ID", "default")
+ACCESS_TOKEN_EXPIRE = timedelta(minutes=int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "30")))
+REFRESH_TOKEN_EXPIRE = timedelta(days=int(os.getenv("JWT_REFRESH_TOKEN_EXPIRE_DAYS", "7")))
+REVOCATION_SYNC_INTERVAL = float(os.getenv("REVOCATION_SYNC_INTERVAL", "5"))
+
+REVOKED_TOKENS_COLLECTION = "revoked_tokens"
+
+ACCESS = "access"
+REFRESH = "refresh"
+
+REQUIRED_CLAIMS = ("exp", "iat", "sub", "jti")
+
+
+def _read_pem(name: str) -> Optional[bytes]:
+    value = os.getenv(name)
+    if value:
+        return value.encode("utf-8")
+    path = os.getenv(f"{name}_FILE")
+    if path:
+        with open(path, "rb") as handle:
+            return handle.read()
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Clés
+# ---------------------------------------------------------------------------
+
+class KeyStore:
+    """
+    Clés de signature et de vérification, analysées une seule fois.
+
+    Plusieurs clés publiques peuvent coexister (rotation) : le kid de
+    l'en-tête du jeton désigne la clé de vérification.
+
+    Attributs:
+        key_id: kid des jetons émis
+    """
+
+    def __init__(self, key_id: str = JWT_KEY_ID):
+        self.key_id = key_id
+        self._private_key: Any = None
+        self._public_keys: Dict[str, Any] = {}
+
+    @classmethod
+    def from_env(cls) -> "KeyStore":
+        """Charge les clés PEM des variables d'environnement."""
+        store = cls()
+        private_pem = _read_pem("JWT_PRIVATE_KEY")
+        if private_pem:
+            store.set_private_key(private_pem)
+        public_pem = _read_pem("JWT_PUBLIC_KEY")
+        if public_pem:
+            store.add_public_key(public_pem)
+        return store
+
+    def set_private_key(self, pem: bytes, password: Optional[bytes] = None) -> None:
+        """Définit la clé de signature (sa clé publique est ajoutée)."""
+        self._private_key = load_pem_private_key(pem, password=password)
+        self._public_keys[self.key_id] = self._private_key.public_key()
+
+    def add_public_key(self, pem: bytes, key_id: Optional[str] = None) -> None:
+        """Ajoute une clé de vérification (ex: clé précédente en rotation)."""
+        self._public_keys[key_id or self.key_id] = load_pem_public_key(pem)
+
+    @property
+    def private_key(self) -> Any:
+        if self._private_key is None:
+            raise RuntimeError("Aucune clé privée JWT configurée (JWT_PRIVATE_KEY).")
+        return self._private_key
+
+    def public_key(self, key_id: Optional[str]) -> Any:
+        """
+        Retourne la clé de vérification d'un kid.
+
+        Raises:
+            NotAuthenticatedError: Si le kid est inconnu
+        """
+        try:
+            return self._public_keys[key_id or self.key_id]
+        except KeyError:
+            raise NotAuthenticatedError("Jeton invalide.")
+
+
+# ---------------------------------------------------------------------------
+# Révocation
+# ---------------------------------------------------------------------------
+
+class BloomFilter:
+    """
+    Filtre de Bloom : appartenance probable, sans faux négatif.
+
+    Attributs:
+        capacity: Nombre d'éléments prévu
+        error_rate: Taux de faux positifs visé à pleine capacité
+    """
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        # Double hachage : k positions à partir de deux empreintes
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] >> (position & 7) & 1 for position in self._positions(item))
+
+
+class RevocationIndex:
+    """
+    Index en mémoire des jetons révoqués (jti).
+
+    Le filtre de Bloom répond au cas courant (non révoqué) ; seul un jti
+    présent dans le filtre est vérifié dans l'ensemble exact, qui élimine
+    les faux positifs. Les jti expirés sont retirés de l'ensemble à chaque
+    reconstruction du filtre.
+    """
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001):
+        self.error_rate = error_rate
+        self._bloom = BloomFilter(capacity, error_rate)
+        # _revoked maps: { jti: expiration (timestamp) }
+        self._revoked: Dict[str, float] = {}
+        self.last_sync: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def add(self, jti: str, expires_at: float) -> None:
+        """Marque un jti comme révoqué jusqu'à son expiration."""
+        if jti in self._revoked:
+            return
+        self._revoked[jti] = expires_at
+        self._bloom.add(jti)
+        if self._bloom.count > self._bloom.capacity:
+            self.rebuild()
+
+    def is_revoked(self, jti: str) -> bool:
+        """Retourne True si le jti est révoqué."""
+        if jti not in self._bloom:
+            return False
+        return jti in self._revoked
+
+    def rebuild(self, now: Optional[float] = None) -> None:
+        """Purge les jti expirés et reconstruit le filtre à la bonne taille."""
+        now = time.time() if now is None else now
+        self._revoked = {jti: expires for jti, expires in self._revoked.items() if expires > now}
+        capacity = max(self._bloom.capacity, len(self._revoked) * 2)
+        self._bloom = BloomFilter(capacity, self.error_rate)
+        for jti in self._revoked:
+            self._bloom.add(jti)
+
+
+def revoked_tokens_indexes() -> list:
+    """Index de revoked_tokens : purge TTL et lecture incrémentale."""
+    return [
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="ttl_expires_at"),
+        IndexModel([("revoked_at", ASCENDING)], name="revoked_at"),
+    ]
+
+
+def _timestamp(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+async def sync_revocations(collection: Any, index: RevocationIndex) -> int:
+    """
+    Charge dans l'index les révocations apparues depuis la dernière synchronisation.
+
+    Args:
+        collection: Collection motor revoked_tokens
+        index: Index à compléter
+
+    Returns:
+        int: Nombre de révocations lues
+    """
+    started = datetime.now(timezone.utc)
+    query = {"expires_at": {"$gt": started}}
+    if index.last_sync is not None:
+        # Marge d'une seconde : horloges des processus légèrement décalées
+        query["revoked_at"] = {"$gte": index.last_sync - timedelta(seconds=1)}
+    count = 0
+    async for document in collection.find(query, {"_id": 1, "expires_at": 1}):
+        index.add(document["_id"], _timestamp(document["expires_at"]))
+        count += 1
+    index.last_sync = started
+    return count
+
+
+async def run_revocation_sync(collection: Any, index: RevocationIndex,
+                              interval: float = REVOCATION_SYNC_INTERVAL) -> None:
+    """Synchronise l'index périodiquement (tâche de fond)."""
+    while True:
+        try:
+            await sync_revocations(collection, index)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            pass
+        await asyncio.sleep(interval)
+
+
+# ---------------------------------------------------------------------------
+# Émission et vérification
+# ---------------------------------------------------------------------------
+
+class TokenVerifier:
+    """
+    Émission et vérification des jetons, avec cache des claims vérifiés.
+
+    Un jeton déjà vérifié n'est ni redécodé ni revérifié tant qu'il n'a pas
+    expiré ; la révocation est contrôlée à chaque appel (en mémoire).
+
+    Attributs:
+        keys: Clés de signature et de vérification
+        revocations: Index des jetons révoqués
+        max_cached: Nombre maximal de jetons en cache (LRU)
+    """
+
+    def __init__(self, keys: KeyStore, revocations: Optional[RevocationIndex] = None,
+                 algorithm: str = JWT_ALGORITHM, max_cached: int = 50_000):
+        self.keys = keys
+        self.revocations = revocations if revocations is not None else RevocationIndex()
+        self.algorithm = algorithm
+        self.max_cached = max_cached
+        # _claims maps: { token: claims }
+        self._claims: "OrderedDict[str, dict]" = OrderedDict()
+
+    def create_token(self, subject: str, token_type: str = ACCESS,
+                     expires_delta: Optional[timedelta] = None,
+                     extra_claims: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Émet un jeton signé.
+
+        Args:
+            subject: Sujet (internal_id de l'utilisateur)
+            token_type: ACCESS ou REFRESH
+            expires_delta: Durée de validité (défaut selon le type)
+            extra_claims: Claims supplémentaires
+
+        Returns:
+            str: Jeton encodé
+        """
+        now = datetime.now(timezone.utc)
+        if expires_delta is None:
+            expires_delta = REFRESH_TOKEN_EXPIRE if token_type == REFRESH else ACCESS_TOKEN_EXPIRE
+        claims = {
+            **(extra_claims or {}),
+            "sub": subject,
+            "type": token_type,
+            "iat": now,
+            "exp": now + expires_delta,
+            "jti": uuid.uuid4().hex,
+        }
+        return jwt.encode(claims, self.keys.private_key, algorithm=self.algorithm,
+                          headers={"kid": self.keys.key_id})
+
+    def _decode(self, token: str) -> dict:
+        try:
+            header = jwt.get_unverified_header(token)
+            return jwt.decode(
+                token, self.keys.public_key(header.get("kid")), algorithms=[self.algorithm],
+                options={"require": list(REQUIRED_CLAIMS)})
+        except jwt.ExpiredSignatureError:
+            raise NotAuthenticatedError("Jeton expiré.")
+        except jwt.PyJWTError:
+            raise NotAuthenticatedError("Jeton invalide.")
+
+    def verify(self, token: str, token_type: str = ACCESS) -> dict:
+        """
+        Vérifie un jeton et retourne ses claims.
+
+        Args:
+            token: Jeton encodé
+            token_type: Type attendu (ACCESS ou REFRESH)
+
+        Returns:
+            dict: Claims vérifiés (ne pas modifier : partagés par le cache)
+
+        Raises:
+            NotAuthenticatedError: Jeton invalide, expiré, révoqué ou d'un
+                autre type
+        """
+        claims = self._claims.get(token)
+        if claims is None or claims["exp"] <= time.time():
+            claims = self._decode(token)
+            self._claims[token] = claims
+            while len(self._claims) > self.max_cached:
+                self._claims.popitem(last=False)
+        else:
+            self._claims.move_to_end(token)
+
+        if claims.get("type", ACCESS) != token_type:
+            raise NotAuthenticatedError("Type de jeton invalide.")
+        if self.revocations.is_revoked(claims["jti"]):
+            raise NotAuthenticatedError("Jeton révoqué.")
+        return claims
+
+    async def revoke(self, collection: Any, claims: dict) -> None:
+        """
+        Révoque un jeton (déconnexion) : liste noire en base et index local.
+
+        Args:
+            collection: Collection motor revoked_tokens
+            claims: Claims vérifiés du jeton
+        """
+        expires_at = datetime.fromtimestamp(claims["exp"], tz=timezone.utc)
+        await collection.update_one(
+            {"_id": claims["jti"]},
+            {"$setOnInsert": {"expires_at": expires_at, "revoked_at": datetime.now(timezone.utc),
+                              "sub": claims["sub"]}},
+            upsert=True)
+        self.revocations.add(claims["jti"], claims["exp"])
+
+    def clear(self) -> None:
+        """Vide le cache des claims (ex: rotation de clés)."""
+        self._claims.clear()
+
+
+_verifier: Optional[TokenVerifier] = None
+
+
+def get_token_verifier() -> TokenVerifier:
+    """Retourne le vérificateur partagé, clés lues dans l'environnement au premier appel."""
+    global _verifier
+    if _verifier is None:
+        _verifier = TokenVerifier(KeyStore.from_env())
+    return _verifier
+
+
+def split_bearer(authorization: Optional[str]) -> Optional[str]:
+    """Extrait le jeton d'un en-tête Authorization: Bearer <jeton>."""
+    if not authorization:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise NotAuthenticatedError("Schéma d'authentification invalide.")
+    return token.strip()
@@ -0,0 +1,123 @@
+"""
+Correspondance entre les champs des modèles et les documents MongoDB.
+
+Les routes dynamiques lisent les documents bruts via motor (avec projection)
+plutôt que d'hydrater des modèles ODMantic. Ce module fournit les
+métadonnées ODMantic (clés, index) de chaque champ d'un modèle.
+
+ODMantic ne propage pas __odm_fields__ aux sous-classes de ModelData : une
+sous-classe hérite du modèle pydantic « jumeau » de sa base, qui porte encore
+les champs ODM de celle-ci. Les champs sont donc fusionnés le long du MRO,
+et le champ primaire "id" ajouté automatiquement aux sous-classes est ignoré
+au profit de internal_id (stocké sous "_id").
+"""
+from enum import Enum
+from typing import Any, Dict, List, Type
+
+from odmantic.field import ODMBaseField, ODMField
+from pydantic import BaseModel
+
+# Clé MongoDB de internal_id (champ primaire de ModelData)
+PRIMARY_KEY = "_id"
+
+_odm_fields_cache: Dict[Type, Dict[str, ODMBaseField]] = {}
+_field_keys_cache: Dict[Type, Dict[str, str]] = {}
+
+
+def odm_fields(model: Type) -> Dict[str, ODMBaseField]:
+    """
+    Retourne les champs ODMantic d'un modèle, hérités compris.
+
+    Args:
+        model: Classe du modèle (ModelData ou sous-classe)
+
+    Returns:
+        Dict[str, ODMBaseField]: {nom du champ: champ ODMantic}, dans l'ordre
+        de déclaration
+    """
+    try:
+        return _odm_fields_cache[model]
+    except KeyError:
+        pass
+
+    fields: Dict[str, ODMBaseField] = {}
+    for base in reversed(model.__mro__):
+        fields.update(base.__dict__.get("__odm_fields__") or {})
+
+    auto_id = fields.get("id")
+    if "internal_id" in fields and isinstance(auto_id, ODMField) and auto_id.primary_field:
+        del fields["id"]
+
+    _odm_fields_cache[model] = fields
+    return fields
+
+
+def field_keys(model: Type) -> Dict[str, str]:
+    """
+    Retourne la correspondance nom de champ -> clé du document.
+
+    Args:
+        model: Classe du modèle (ModelData ou sous-classe)
+
+    Returns:
+        Dict[str, str]: {nom du champ: clé MongoDB}
+    """
+    try:
+        return _field_keys_cache[model]
+    except KeyError:
+        pass
+
+    keys = {name: field.key_name for name, field in odm_fields(model).items()}
+    if "internal_id" in keys:
+        keys["internal_id"] = PRIMARY_KEY
+
+    _field_keys_cache[model] = keys
+    return keys
+
+
+def model_subclasses(model: Type) -> List[Type]:
+    """
+    Retourne les sous-classes d'un modèle, à tous les niveaux.
+
+    Les sous-classes héritent du modèle pydantic « jumeau » de leur base
+    (__pydantic_model__) : elles sont cherchées sous les deux classes.
+    """
+    found: List[Type] = []
+    pending = [model]
+    while pending:
+        current = pending.pop()
+        for base in {current, getattr(current, "__pydantic_model__", current)}:
+            for subclass in base.__subclasses__():
+                if subclass not in found:
+                    found.append(subclass)
+                    pending.append(subclass)
+    return found
+
+
+def bson_value(value: Any) -> Any:
+    """Convertit une valeur de modèle en valeur encodable en BSON."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, BaseModel):
+        return bson_value(value.model_dump())
+    if isinstance(value, dict):
+        return {key: bson_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [bson_value(item) for item in value]
+    return value
+
+
+def to_document(instance: Any) -> dict:
+    """
+    Construit le document MongoDB d'une instance de modèle.
+
+    Args:
+        instance: Instance de ModelData (ou sous-classe)
+
+    Returns:
+        dict: Document prêt pour insert_one / insert_many
+    """
+    return {
+        key: bson_value(getattr(instance, name))
+        for name, key in field_keys(type(instance)).items()
+    }
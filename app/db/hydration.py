@@ -0,0 +1,231 @@
+"""
+Hydratation des documents lus dans MongoDB.
+
+Les routes dynamiques travaillent sur les documents bruts (dict). Quand un
+traitement a besoin de l'API des modèles (attributs, is_owned_by,
+sérialiseurs...), trois modes de construction existent :
+
+    - validate : validation pydantic complète, valeurs par défaut
+      comprises (coût d'une création d'instance)
+    - trusted : instance du modèle construite sans validation ni fabriques
+      de valeurs par défaut (uuid, datetime.now...). Réservé aux documents
+      issus de notre base, déjà validés à l'écriture
+    - view : vue en lecture seule sur le document, sans copie. Expose les
+      champs sous leur nom d'attribut et les méthodes de lecture du modèle
+      (is_owned_by, is_created_by, to_dict) ; toute affectation est refusée.
+      Une vue n'est pas une instance du modèle (isinstance)
+
+Dans les deux modes rapides, les valeurs sont celles du document, hormis
+les énumérations (stockées par valeur) qui sont reconstruites. Un champ
+absent du document (projection) prend sa valeur par défaut statique s'il en
+a une ; sinon il n'est pas défini et son accès lève AttributeError.
+
+Le mode est choisi par endpoint (EndpointConfig.hydration) pour les
+enregistrements remis à custom_auth_function ; par défaut celle-ci reçoit
+le document brut.
+"""
+from copy import copy
+from enum import Enum
+from typing import Any, Callable, ClassVar, Dict, Optional, Tuple, Type, get_args, get_origin
+
+from pydantic_core import PydanticUndefined
+
+from app.config.endpoint_options import HYDRATION_MODES, TRUSTED, VALIDATE, VIEW
+from app.db.base import field_keys
+from app.utils.formatters import SerializerFactory
+
+
+# Méthodes du modèle reprises par les vues (lecture seule)
+VIEW_METHODS = ("is_owned_by", "is_created_by", "__str__", "__repr__")
+
+Hydrator = Callable[[dict], Any]
+Decoder = Callable[[Any], Any]
+Field = Tuple[str, str, Any, Optional[Decoder]]
+
+_MISSING = object()
+_setattr = object.__setattr__
+
+# _fields_cache maps: { model: ((nom, clé, défaut statique ou _MISSING, décodeur), ...) }
+_fields_cache: Dict[Type, Tuple[Field, ...]] = {}
+_loaders: Dict[Type, Callable[[dict], Dict[str, Any]]] = {}
+_view_classes: Dict[Type, Type["DocumentView"]] = {}
+
+
+def _decoder(annotation: Any) -> Optional[Decoder]:
+    """Reconstruction des énumérations d'un type de champ (None si inutile)."""
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return lambda value: value if value is None or isinstance(value, annotation) else annotation(value)
+    origin, args = get_origin(annotation), get_args(annotation)
+    if origin in (list, set, frozenset, tuple) and args:
+        item = _decoder(args[0])
+        if item is not None:
+            return lambda values: values if values is None else type(values)([item(value) for value in values])
+        return None
+    for arg in args:
+        # Optional[...] / Union[...] : première alternative énumérée
+        decoder = _decoder(arg)
+        if decoder is not None:
+            return decoder
+    return None
+
+
+def _fields(model: Type) -> Tuple[Field, ...]:
+    """(nom, clé MongoDB, valeur par défaut statique, décodeur) de chaque champ d'un modèle."""
+    try:
+        return _fields_cache[model]
+    except KeyError:
+        fields = []
+        for name, key in field_keys(model).items():
+            info = model.model_fields[name]
+            default = _MISSING if info.default is PydanticUndefined else info.default
+            fields.append((name, key, default, _decoder(info.annotation)))
+        _fields_cache[model] = tuple(fields)
+        return _fields_cache[model]
+
+
+def _value(document: dict, key: str, default: Any, decoder: Optional[Decoder]) -> Any:
+    """Valeur d'un champ, _MISSING si absente sans défaut statique."""
+    value = document.get(key, default)
+    if value is default:
+        if isinstance(default, (list, dict, set)):
+            # Défaut mutable : jamais partagé entre instances
+            return copy(default)
+        return value
+    return value if decoder is None else decoder(value)
+
+
+def _loader(model: Type) -> Callable[[dict], Dict[str, Any]]:
+    """Compile la lecture des valeurs d'un document, indexées par nom de champ."""
+    try:
+        return _loaders[model]
+    except KeyError:
+        pass
+    fields = _fields(model)
+    plain = tuple((name, key) for name, key, _, decoder in fields if decoder is None)
+    decoded = tuple((name, key, decoder) for name, key, _, decoder in fields if decoder is not None)
+    defaults = tuple((name, key, default) for name, key, default, _ in fields if default is not _MISSING)
+    count = len(fields)
+
+    def load(document: dict) -> Dict[str, Any]:
+        values = {name: document[key] for name, key in plain if key in document}
+        for name, key, decoder in decoded:
+            if key in document:
+                values[name] = decoder(document[key])
+        if len(values) < count:
+            # Champs absents (projection) : défauts statiques
+            for name, key, default in defaults:
+                if name not in values:
+                    values[name] = _value(document, key, default, None)
+        return values
+
+    _loaders[model] = load
+    return load
+
+
+def validate(model: Type, document: dict) -> Any:
+    """Instance validée d'un document (mode validate)."""
+    return model.model_validate(_loader(model)(document))
+
+
+def construct(model: Type, document: dict) -> Any:
+    """
+    Instance d'un document sans validation (mode trusted).
+
+    L'instance est dans l'état d'un enregistrement fraîchement chargé :
+    aucun champ n'est marqué comme modifié.
+    """
+    values = _loader(model)(document)
+    instance = model.__new__(model)
+    _setattr(instance, "__dict__", values)
+    _setattr(instance, "__pydantic_fields_set__", set(values))
+    _setattr(instance, "__pydantic_extra__", None)
+    _setattr(instance, "__pydantic_private__", None)
+    _setattr(instance, "__fields_modified__", set())
+    return instance
+
+
+class DocumentView:
+    """
+    Vue en lecture seule d'un document MongoDB (mode view).
+
+    Les sous-classes générées par view_class() ajoutent une propriété par
+    champ du modèle.
+    """
+
+    __slots__ = ("_document",)
+
+    model: ClassVar[Type]
+
+    def __init__(self, document: dict):
+        object.__setattr__(self, "_document", document)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} est en lecture seule.")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} est en lecture seule.")
+
+    def to_dict(self, role: Any, owner: bool = False) -> dict:
+        """Sérialise le document avec les seuls champs autorisés pour un rôle."""
+        return SerializerFactory.get_document(self.model, role, owner)(self._document)
+
+
+def _view_property(key: str, default: Any, decoder: Optional[Decoder]) -> property:
+    if decoder is not None:
+        def get(self: DocumentView) -> Any:
+            value = _value(self._document, key, default, decoder)
+            if value is _MISSING:
+                raise AttributeError(key)
+            return value
+    elif default is _MISSING:
+        def get(self: DocumentView) -> Any:
+            try:
+                return self._document[key]
+            except KeyError:
+                raise AttributeError(key) from None
+    else:
+        def get(self: DocumentView) -> Any:
+            return self._document.get(key, default)
+    return property(get)
+
+
+def view_class(model: Type) -> Type[DocumentView]:
+    """Retourne (et génère si besoin) la classe de vue d'un modèle."""
+    try:
+        return _view_classes[model]
+    except KeyError:
+        namespace: Dict[str, Any] = {"__slots__": (), "model": model}
+        for name in VIEW_METHODS:
+            method = getattr(model, name, None)
+            if method is not None:
+                namespace[name] = method
+        for name, key, default, decoder in _fields(model):
+            namespace[name] = _view_property(key, default, decoder)
+        _view_classes[model] = type(f"{model.__name__}View", (DocumentView,), namespace)
+        return _view_classes[model]
+
+
+def view(model: Type, document: dict) -> DocumentView:
+    """Vue en lecture seule d'un document (mode view)."""
+    return view_class(model)(document)
+
+
+def hydrator(model: Type, mode: str) -> Hydrator:
+    """
+    Fonction de construction des documents d'un modèle selon un mode.
+
+    Raises:
+        ValueError: Si le mode est inconnu
+    """
+    if mode == VIEW:
+        return view_class(model)
+    if mode == TRUSTED:
+        return lambda document: construct(model, document)
+    if mode == VALIDATE:
+        return lambda document: validate(model, document)
+    raise ValueError(f"Mode d'hydratation inconnu : {mode} (disponibles : {', '.join(HYDRATION_MODES)}).")
+
+
+def hydrate(model: Type, document: dict, mode: str = TRUSTED) -> Any:
+    """Construit un document selon un mode (voir hydrator)."""
+    return hydrator(model, mode)(document)
@@ -0,0 +1,314 @@
+"""
+Accès à la base MongoDB.
+
+Fournit le client motor partagé par le processus et le moteur ODMantic
+construit dessus. Un seul client (donc un seul pool de connexions par
+serveur) est créé par processus : le gestionnaire SessionManager l'ouvre au
+démarrage de l'application, préchauffe le pool et le ferme à l'arrêt (voir
+le lifespan de app.main).
+
+La connexion est configurée par variables d'environnement :
+
+    - MONGODB_URL : URI de connexion (défaut mongodb://localhost:27017)
+    - MONGODB_DATABASE : nom de la base (défaut fastforge)
+    - MONGODB_MAX_POOL_SIZE / MONGODB_MIN_POOL_SIZE : bornes du pool par
+      serveur (défaut 100 / 10)
+    - MONGODB_MAX_CONNECTING : connexions ouvertes en parallèle par serveur
+      (défaut 2) ; évite les rafales d'ouvertures quand le trafic monte
+    - MONGODB_MAX_IDLE_TIME_MS : durée d'inactivité avant fermeture d'une
+      connexion (défaut 300000)
+    - MONGODB_WAIT_QUEUE_TIMEOUT_MS : attente maximale d'une connexion libre
+      (défaut 2000) ; au-delà la requête échoue au lieu de s'accumuler
+    - MONGODB_CONNECT_TIMEOUT_MS, MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+      MONGODB_SOCKET_TIMEOUT_MS : délais de connexion, de sélection du
+      serveur et des opérations (défaut 5000, 5000, 0 = aucun)
+    - MONGODB_COMPRESSORS : compression réseau, ex. "zstd,snappy,zlib"
+      (défaut aucune) ; MONGODB_ZLIB_LEVEL pour zlib (défaut -1)
+    - MONGODB_WARMUP_CONNECTIONS : connexions ouvertes au démarrage (défaut
+      MONGODB_MIN_POOL_SIZE)
+
+Les endpoints de lecture peuvent viser les secondaires
+(EndpointConfig.read_preference / read_concern) : reading() retourne un
+moteur dont la base porte ces options, sur le même client.
+"""
+import asyncio
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from odmantic import AIOEngine
+from pymongo import ReadPreference
+from pymongo.monitoring import ConnectionPoolListener
+from pymongo.read_concern import ReadConcern
+
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+MONGODB_DATABASE = os.getenv("MONGODB_DATABASE", "fastforge")
+MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+MONGODB_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "10"))
+MONGODB_MAX_CONNECTING = int(os.getenv("MONGODB_MAX_CONNECTING", "2"))
+MONGODB_MAX_IDLE_TIME_MS = int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "300000"))
+MONGODB_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "2000"))
+MONGODB_CONNECT_TIMEOUT_MS = int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "5000"))
+MONGODB_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGODB_SOCKET_TIMEOUT_MS = int(os.getenv("MONGODB_SOCKET_TIMEOUT_MS", "0"))
+MONGODB_COMPRESSORS = os.getenv("MONGODB_COMPRESSORS", "")
+MONGODB_ZLIB_LEVEL = int(os.getenv("MONGODB_ZLIB_LEVEL", "-1"))
+MONGODB_WARMUP_CONNECTIONS = int(os.getenv("MONGODB_WARMUP_CONNECTIONS", str(MONGODB_MIN_POOL_SIZE)))
+
+# Préférences de lecture de EndpointConfig.read_preference (voir
+# app.config.endpoint_options.READ_PREFERENCES)
+READ_PREFERENCE_MODES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
+
+def client_options() -> Dict[str, Any]:
+    """
+    Options du client motor, lues dans l'environnement.
+
+    Returns:
+        Dict[str, Any]: Arguments nommés de AsyncIOMotorClient
+    """
+    options: Dict[str, Any] = {
+        "maxPoolSize": MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": MONGODB_MIN_POOL_SIZE,
+        "maxConnecting": MONGODB_MAX_CONNECTING,
+        "maxIdleTimeMS": MONGODB_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+        "connectTimeoutMS": MONGODB_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        "socketTimeoutMS": MONGODB_SOCKET_TIMEOUT_MS or None,
+    }
+    compressors = [name.strip() for name in MONGODB_COMPRESSORS.split(",") if name.strip()]
+    if compressors:
+        options["compressors"] = compressors
+        if "zlib" in compressors:
+            options["zlibCompressionLevel"] = MONGODB_ZLIB_LEVEL
+    return options
+
+
+class PoolMetrics(ConnectionPoolListener):
+    """
+    Métriques du pool de connexions, alimentées par les événements pymongo.
+
+    Les événements sont publiés depuis les threads du driver : les compteurs
+    sont protégés par un verrou.
+
+    Attributs:
+        open: Connexions ouvertes (tous serveurs)
+        checked_out: Connexions en cours d'utilisation
+        waiting: Demandes de connexion en attente
+        max_checked_out: Pic de connexions utilisées simultanément
+        checkouts: Connexions obtenues
+        checkout_failures: Demandes échouées (délai dépassé, pool fermé...)
+        wait_time: Temps d'attente cumulé des connexions obtenues (s)
+        max_wait_time: Attente la plus longue (s)
+    """
+
+    def __init__(self, max_pool_size: int = MONGODB_MAX_POOL_SIZE):
+        self.max_pool_size = max_pool_size
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Remet les compteurs à zéro."""
+        with self._lock:
+            self.open = 0
+            self.checked_out = 0
+            self.waiting = 0
+            self.max_checked_out = 0
+            self.checkouts = 0
+            self.checkout_failures = 0
+            self.wait_time = 0.0
+            self.max_wait_time = 0.0
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def connection_created(self, event) -> None:
+        with self._lock:
+            self.open += 1
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        with self._lock:
+            self.open = max(0, self.open - 1)
+
+    def connection_check_out_started(self, event) -> None:
+        with self._lock:
+            self.waiting += 1
+
+    def connection_check_out_failed(self, event) -> None:
+        with self._lock:
+            self.waiting = max(0, self.waiting - 1)
+            self.checkout_failures += 1
+
+    def connection_checked_out(self, event) -> None:
+        duration = getattr(event, "duration", None) or 0.0
+        with self._lock:
+            self.waiting = max(0, self.waiting - 1)
+            self.checked_out += 1
+            self.checkouts += 1
+            self.max_checked_out = max(self.max_checked_out, self.checked_out)
+            self.wait_time += duration
+            self.max_wait_time = max(self.max_wait_time, duration)
+
+    def connection_checked_in(self, event) -> None:
+        with self._lock:
+            self.checked_out = max(0, self.checked_out - 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Retourne l'état courant du pool.
+
+        saturation est la part du pool (maxPoolSize) en cours d'utilisation :
+        proche de 1 avec des demandes en attente, le pool est trop petit ou
+        les requêtes trop lentes.
+        """
+        with self._lock:
+            return {
+                "open": self.open,
+                "checked_out": self.checked_out,
+                "waiting": self.waiting,
+                "max_checked_out": self.max_checked_out,
+                "max_pool_size": self.max_pool_size,
+                "saturation": self.checked_out / self.max_pool_size if self.max_pool_size else 0.0,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "avg_wait_ms": self.wait_time / self.checkouts * 1000 if self.checkouts else 0.0,
+                "max_wait_ms": self.max_wait_time * 1000,
+            }
+
+
+class SessionManager:
+    """
+    Client motor et moteur ODMantic du processus.
+
+    Le client est créé au premier accès (connect), avec les options de
+    client_options() et un PoolMetrics abonné aux événements du pool.
+
+    Attributs:
+        url: URI de connexion
+        database: Nom de la base
+        options: Options du client
+        metrics: Métriques du pool
+    """
+
+    def __init__(self, url: str = MONGODB_URL, database: str = MONGODB_DATABASE,
+                 options: Optional[Dict[str, Any]] = None):
+        self.url = url
+        self.database = database
+        self.options = client_options() if options is None else options
+        self.metrics = PoolMetrics(self.options.get("maxPoolSize", MONGODB_MAX_POOL_SIZE))
+        self._client: Optional[AsyncIOMotorClient] = None
+        self._engine: Optional[AIOEngine] = None
+
+    def connect(self) -> AIOEngine:
+        """Crée le client et le moteur s'ils n'existent pas ; retourne le moteur."""
+        if self._engine is None:
+            self._client = AsyncIOMotorClient(self.url, event_listeners=[self.metrics], **self.options)
+            self._engine = AIOEngine(client=self._client, database=self.database)
+        return self._engine
+
+    @property
+    def engine(self) -> AIOEngine:
+        return self.connect()
+
+    @property
+    def client(self) -> AsyncIOMotorClient:
+        self.connect()
+        return self._client
+
+    async def warmup(self, connections: int = MONGODB_WARMUP_CONNECTIONS) -> None:
+        """
+        Ouvre les connexions du pool avant les premières requêtes.
+
+        Des ping simultanés obligent le driver à ouvrir jusqu'à `connections`
+        connexions (dans la limite de maxConnecting à la fois) : le premier
+        pic de trafic ne paie pas l'établissement des connexions.
+
+        Raises:
+            pymongo.errors.PyMongoError: Si le serveur est injoignable
+        """
+        admin = self.client.admin
+        await asyncio.gather(*(admin.command("ping") for _ in range(max(1, connections))))
+
+    def close(self) -> None:
+        """Ferme le client ; un nouvel accès en recrée un."""
+        if self._client is not None:
+            self._client.close()
+        self._client = None
+        self._engine = None
+        _readers.clear()
+
+
+_manager: Optional[SessionManager] = None
+
+
+def get_session_manager() -> SessionManager:
+    """Retourne le gestionnaire partagé, créé au premier appel."""
+    global _manager
+    if _manager is None:
+        _manager = SessionManager()
+    return _manager
+
+
+def get_engine() -> AIOEngine:
+    """Retourne le moteur ODMantic partagé, créé au premier appel."""
+    return get_session_manager().engine
+
+
+# Moteurs de lecture, par moteur puis par (read_preference, read_concern)
+_readers: "WeakKeyDictionary[AIOEngine, Dict[Tuple[Optional[str], Optional[str]], AIOEngine]]" = \
+    WeakKeyDictionary()
+
+
+def reading(engine: AIOEngine, read_preference: Optional[str] = None,
+            read_concern: Optional[str] = None) -> AIOEngine:
+    """
+    Moteur dont les lectures utilisent les options données.
+
+    Le moteur retourné partage le client (et le pool) de `engine` ; seule sa
+    base porte la préférence et le niveau de lecture. Il est mis en cache :
+    les requêtes suivantes ne reconstruisent rien.
+
+    Args:
+        engine: Moteur de l'application
+        read_preference: Nom de READ_PREFERENCE_MODES, None pour celle du client
+        read_concern: Niveau de app.config.endpoint_options.READ_CONCERNS, None pour celui du client
+
+    Returns:
+        AIOEngine: `engine` lui-même sans option
+    """
+    if read_preference is None and read_concern is None:
+        return engine
+    key = (read_preference, read_concern)
+    readers = _readers.setdefault(engine, {})
+    reader = readers.get(key)
+    if reader is None:
+        options: Dict[str, Any] = {}
+        if read_preference is not None:
+            options["read_preference"] = READ_PREFERENCE_MODES[read_preference]
+        if read_concern is not None:
+            options["read_concern"] = ReadConcern(read_concern)
+        reader = AIOEngine(client=engine.client, database=engine.database_name)
+        reader.database = engine.client.get_database(engine.database_name, **options)
+        readers[key] = reader
+    return reader
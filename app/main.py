@@ -0,0 +1,94 @@
+"""
+Application FastAPI.
+
+Le lifespan gère les ressources partagées du processus :
+
+    - démarrage : routes des modèles compilées (dans un thread, pendant le
+      préchauffage du pool) avant la première requête, client MongoDB
+      unique (voir app.db.session), pool préchauffé, écrivain d'audit et
+      tâches de fond (réconciliation des statistiques, archivage,
+      synchronisation des révocations)
+    - arrêt : tâches annulées, file d'audit vidée, client fermé
+
+create_app compile la matrice des permissions des modèles (voir
+app.config.permissions_config), leurs sérialiseurs (voir
+app.utils.formatters) et leurs schémas (voir app.schemas.base) ; les routes
+des modèles sont montées par le registre (voir app.models.registry), le
+dashboard sous /admin.
+
+Variables d'environnement :
+
+    - STATS_READ_PREFERENCE : préférence de lecture de la réconciliation des
+      statistiques, ex. "secondaryPreferred" (défaut : celle du client)
+    - BACKGROUND_TASKS : "false" pour ne pas lancer les tâches de fond
+      (plusieurs workers : une seule instance suffit)
+"""
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import FastAPI
+
+from app.api.routes.admin import create_admin_router
+from app.config.permissions_config import PermissionsRegister, WritePermissionsRegister
+from app.core.security import REVOKED_TOKENS_COLLECTION, get_token_verifier, run_revocation_sync
+from app.db.session import get_session_manager, reading
+from app.models.registry import ModelRegistry, ModelRoutes
+from app.schemas.base import SchemaFactory
+from app.services.archive import run_archiver
+from app.services.audit import start_audit_writer, stop_audit_writer
+from app.services.stats import get_stats_store, run_stats_reconciliation
+from app.utils.formatters import SerializerFactory
+
+STATS_READ_PREFERENCE = os.getenv("STATS_READ_PREFERENCE") or None
+BACKGROUND_TASKS = os.getenv("BACKGROUND_TASKS", "true").lower() != "false"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    manager = get_session_manager()
+    engine = manager.engine
+    await asyncio.gather(manager.warmup(), asyncio.to_thread(compile_models, app))
+    await start_audit_writer(engine)
+
+    models = app.state.models
+    tasks = [asyncio.create_task(run_revocation_sync(
+        engine.database[REVOKED_TOKENS_COLLECTION], get_token_verifier().revocations))]
+    if BACKGROUND_TASKS:
+        tasks += [
+            asyncio.create_task(run_stats_reconciliation(
+                get_stats_store(), reading(engine, STATS_READ_PREFERENCE), models)),
+            asyncio.create_task(run_archiver(engine, models)),
+        ]
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await stop_audit_writer()
+        manager.close()
+
+
+def compile_models(app: FastAPI) -> None:
+    """Compile les routes des modèles montées par le registre et pas encore construites."""
+    for route in app.routes:
+        if isinstance(route, ModelRoutes) and not route.compiled:
+            route.compile()
+
+
+def create_app() -> FastAPI:
+    """Construit l'application : routes des modèles et dashboard."""
+    application = FastAPI(title="FastForge", lifespan=lifespan)
+    models = ModelRegistry.discover()
+    PermissionsRegister.freeze(models)
+    WritePermissionsRegister.freeze(models)
+    SerializerFactory.build(models)
+    SchemaFactory.build(models)
+    application.state.models = [routes.spec.model for routes in ModelRegistry.mount(application, models)]
+    application.include_router(create_admin_router(application.state.models))
+    return application
+
+
+app = create_app()
@@ -5,13 +5,28 @@ Ce module définit le modèle de base utilisé par tous les modèles de l'API.
 Il inclut les champs essentiels pour la traçabilité, l'ownership et le soft delete.
 """
 from datetime import datetime, timezone
-from typing import Optional
-from uuid import uuid4
+from typing import Any, ClassVar, Dict, Optional
 
 from bson import ObjectId
 from odmantic import Model, Field
+from pydantic import model_validator
 from app.config.user_roles import UserRole
+from app.config.model_config import ModelConfig
 from app.config.permissions_config import Permissions
+from app.utils.formatters import SerializerFactory
+from app.utils.public_ids import new_public_id
+
+
+# Champs gérés par l'API : jamais modifiables par le client
+SYSTEM_FIELDS = frozenset({
+    "internal_id",
+    "public_id",
+    "created_at",
+    "updated_at",
+    "is_active",
+    "created_by",
+    "owner_id",
+})
 
 
 @Permissions(UserRole.SUPERADMIN,
@@ -30,6 +45,7 @@ from app.config.permissions_config import Permissions
               "created_by",
               "owner_id"])
 @Permissions(UserRole.USER, ["public_id", "created_at", "updated_at"])
+@Permissions(UserRole.USERS, ["public_id", "created_at", "updated_at"])
 @Permissions(UserRole.PUBLIC, ["public_id", "created_at", "updated_at"])
 # @Permissions(UserRole.PUBLIC, PermissionsMode.WHITELIST, [])
 class ModelData(Model):
@@ -44,14 +60,35 @@ class ModelData(Model):
         is_active: Indicateur de soft delete (True = actif, False = supprimé)
         created_by: ID de l'utilisateur créateur (ObjectId)
         owner_id: ID du propriétaire de l'enregistrement (ObjectId)
+        public_id_strategy: Stratégie de génération du public_id ("uuid4",
+            "uuid7"... voir app.utils.public_ids) ; None pour la stratégie
+            par défaut (PUBLIC_ID_STRATEGY)
+        relations: Champs référençant un autre modèle ({champ: nom du
+            modèle}), expansables par ?expand= (voir app.services.relations)
+        api_config: Configuration API du modèle (endpoints, propriété,
+            stratégie de public_id...) ; None pour la configuration par
+            défaut (voir app.models.parser)
 
     Configuration:
         - Collection MongoDB générée automatiquement depuis le nom de la classe
         - Index sur public_id pour des recherches optimisées
         - Index sur owner_id pour les requêtes de propriété
-        - Index sur is_active pour filtrer les enregistrements actifs
+        - Pas d'index simple sur is_active : les listes utilisent des index
+          partiels {is_active: true} (voir app.services.pagination) et
+          l'archivage un index partiel des supprimés (app.services.archive)
     """
 
+    # Stratégie de public_id, redéfinissable par les sous-classes :
+    #     public_id_strategy: ClassVar[Optional[str]] = "uuid7"
+    public_id_strategy: ClassVar[Optional[str]] = None
+
+    # Relations vers d'autres modèles, redéfinissables par les sous-classes
+    relations: ClassVar[Dict[str, str]] = {"created_by": "User", "owner_id": "User"}
+
+    # Configuration API, redéfinissable par les sous-classes :
+    #     api_config: ClassVar[Optional[ModelConfig]] = ModelConfig(...)
+    api_config: ClassVar[Optional[ModelConfig]] = None
+
     # ID interne MongoDB - ne jamais exposer publiquement
     internal_id: ObjectId = Field(
         default_factory=ObjectId,
@@ -60,7 +97,7 @@ class ModelData(Model):
 
     # ID public - exposé via l'API (UUID pour éviter l'énumération)
     public_id: str = Field(
-        default_factory=lambda: str(uuid4()),
+        default_factory=new_public_id,
         unique=True,
         index=True
     )
@@ -74,7 +111,7 @@ class ModelData(Model):
             timezone.utc))
 
     # Soft delete - permet de désactiver sans supprimer
-    is_active: bool = Field(default=True, index=True)
+    is_active: bool = Field(default=True)
 
     # Traçabilité des créateurs
     created_by: Optional[ObjectId] = Field(default=None, index=True)
@@ -82,6 +119,14 @@ class ModelData(Model):
     # Système d'ownership
     owner_id: Optional[ObjectId] = Field(default=None, index=True)
 
+    @model_validator(mode="before")
+    @classmethod
+    def _generate_public_id(cls, data: Any) -> Any:
+        """Génère le public_id selon la stratégie du modèle, s'il n'est pas fourni."""
+        if cls.public_id_strategy is not None and isinstance(data, dict) and "public_id" not in data:
+            data = {**data, "public_id": new_public_id(cls.public_id_strategy)}
+        return data
+
     def update_timestamp(self) -> None:
         """Met à jour le timestamp de modification."""
         self.updated_at = datetime.now(timezone.utc)
@@ -155,24 +200,39 @@ class ModelData(Model):
         self.owner_id = new_owner_id
         self.update_timestamp()
 
+    def to_dict(self, role: UserRole, owner: bool = False) -> dict:
+        """
+        Sérialise l'enregistrement avec les seuls champs autorisés pour un rôle.
+
+        Utilise le sérialiseur précompilé de SerializerFactory : seuls les
+        champs visibles sont lus, sans model_dump() complet.
+
+        Args:
+            role: Rôle de l'appelant
+            owner: True si l'appelant est propriétaire de l'enregistrement
+
+        Returns:
+            dict: Dictionnaire limité aux champs autorisés
+        """
+        return SerializerFactory.get(type(self), role, owner)(self)
+
     @staticmethod
     def to_public_dict(obj: "ModelData", exclude_fields: Optional[list[str]] = None) -> dict:
         """
         Convertit le modèle en dictionnaire pour exposition publique.
 
+        Note:
+            Préférez to_dict(role) qui applique les permissions du rôle.
+
         Args:
             exclude_fields: Liste des champs supplémentaires à exclure
 
         Returns:
             dict: Dictionnaire sans les champs sensibles
         """
-        data = obj.model_dump()
-
-        # Supprimer les champs sensibles
-        for field in exclude_fields:
-            data.pop(field, None)
-
-        return data
+        # Les champs exclus ne sont pas sérialisés ; les valeurs imbriquées
+        # (listes, dictionnaires, modèles) sont des copies
+        return obj.model_dump(exclude=set(exclude_fields or ()))
 
     @staticmethod
     def to_owner_dict(cls) -> dict:
@@ -183,13 +243,8 @@ class ModelData(Model):
         Returns:
             dict: Dictionnaire avec les champs du propriétaire
         """
-        data = cls.model_dump()
-
         # Exclure uniquement l'internal_id
-        data.pop("internal_id", None)
-        data.pop("_id", None)
-
-        return data
+        return ModelData.to_public_dict(cls, exclude_fields=["internal_id", "_id"])
 
     def __repr__(self) -> str:
         """Représentation string du modèle."""
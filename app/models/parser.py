@@ -0,0 +1,100 @@
+"""
+Lecture et validation de la configuration API des modèles.
+
+parse_model lit la ModelConfig déclarée par un modèle (attribut de classe
+api_config, voir ModelData), complète les valeurs par défaut (collection,
+nom de schéma, description) et la valide une seule fois, au démarrage. Le
+résultat, ModelSpec, est ce que le registre compile en routes (voir
+app.models.registry) ; rien n'est plus vérifié par requête.
+"""
+import inspect
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Type
+
+from app.config.endpoint_config import EndpointConfig
+from app.config.model_config import ModelConfig
+
+
+class ModelSpec(NamedTuple):
+    """
+    Configuration validée d'un modèle.
+
+    Attributs:
+        model: Classe du modèle
+        config: ModelConfig complétée (copie de celle du modèle)
+        endpoints: Configuration de chaque endpoint ({nom: EndpointConfig},
+            lecture seule), transfert de propriété désactivé si la
+            configuration l'interdit
+    """
+
+    model: Type
+    config: ModelConfig
+    endpoints: Mapping[str, EndpointConfig]
+
+    @property
+    def prefix(self) -> str:
+        """Segment d'URL du modèle (/api/{prefix})."""
+        return self.config.table_name
+
+    @property
+    def tag(self) -> str:
+        """Tag OpenAPI des routes du modèle."""
+        return self.config.schema_name
+
+
+def _description(model: Type) -> str:
+    """Première ligne de la docstring du modèle."""
+    doc = inspect.getdoc(model) or ""
+    return doc.strip().split("\n", 1)[0]
+
+
+def resolve_endpoints(config: ModelConfig) -> Mapping[str, EndpointConfig]:
+    """
+    Configuration effective des endpoints.
+
+    Le transfert de propriété est désactivé si la configuration de propriété
+    l'interdit (OwnershipConfig.allow_ownership_transfer).
+    """
+    endpoints = dict(config.endpoints)
+    if not config.ownership.allow_ownership_transfer:
+        endpoints["transfer_ownership"] = EndpointConfig(enable=False)
+    return MappingProxyType(endpoints)
+
+
+def parse_model(model: Type) -> ModelSpec:
+    """
+    Lit et valide la configuration API d'un modèle.
+
+    La configuration déclarée, immuable, n'est pas modifiée : une copie est
+    complétée, ce qui permet de partager une même ModelConfig entre
+    plusieurs modèles.
+    La stratégie de public_id configurée est appliquée au modèle.
+
+    Args:
+        model: Classe du modèle (ModelData ou sous-classe)
+
+    Returns:
+        ModelSpec: Configuration validée
+
+    Raises:
+        ValueError: Si la configuration est invalide, ou si table_name ne
+            correspond pas à la collection du modèle
+    """
+    declared = getattr(model, "api_config", None) or ModelConfig()
+    config = declared.replace(
+        table_name=declared.table_name or model.__collection__,
+        schema_name=declared.schema_name or model.__name__,
+        description=declared.description or _description(model),
+    )
+    try:
+        config.validate_model_config()
+    except ValueError as error:
+        raise ValueError(f"{model.__name__}: {error}") from None
+    if config.table_name != model.__collection__:
+        # La collection est fixée par ODMantic (model_config["collection"])
+        raise ValueError(
+            f"{model.__name__}: table_name {config.table_name!r} ne correspond pas à "
+            f"la collection du modèle ({model.__collection__!r}).")
+    if config.public_id_strategy is not None:
+        model.public_id_strategy = config.public_id_strategy
+    return ModelSpec(model, config, resolve_endpoints(config))
@@ -0,0 +1,313 @@
+"""
+Registre des modèles de l'API.
+
+ModelRegistry trouve les modèles (sous-classes de ModelData), lit et valide
+leur ModelConfig une seule fois (voir app.models.parser) et compile leurs
+endpoints activés en routes FastAPI, niveau d'authentification résolu à la
+compilation (voir app.core.permissions.endpoint_access).
+
+Temps de démarrage : construire les routes d'un modèle coûte plusieurs
+dizaines de millisecondes (analyse des dépendances FastAPI, schémas
+pydantic), soit plusieurs secondes pour quelques centaines de modèles. mount
+monte donc les routes de chaque modèle sous forme compilable (ModelRoutes) :
+la configuration est validée à la création de l'application, les routes sont
+construites une seule fois, directement sur l'application (pas de seconde
+construction par include_router). L'application les compile dans son
+lifespan, avant de servir (voir app.main) ; à défaut (application sans
+lifespan, outils), elles le sont à la première requête qui atteint le
+modèle.
+
+Le document OpenAPI couvre toutes les routes et forcerait leur compilation :
+il est assemblé par modèle, et le fragment de chaque modèle est mis en cache
+sur disque (MODEL_PLAN_CACHE) avec l'empreinte de sa configuration compilée
+(champs, permissions, endpoints, version du code). Au démarrage suivant, les
+modèles dont l'empreinte n'a pas changé ne sont pas recompilés pour la
+documentation.
+"""
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+import fastapi
+import pydantic
+from fastapi import APIRouter, FastAPI
+from fastapi.openapi.utils import get_openapi
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
+
+from app.api.routes import dynamic
+from app.config.permissions_config import PermissionsRegister
+from app.config.user_roles import UserRole
+from app.core.permissions import endpoint_access
+from app.db.base import model_subclasses
+from app.models.parser import ModelSpec, parse_model
+from app.schemas import base as schemas
+
+# Fichier du cache des fragments OpenAPI ; vide pour le désactiver
+MODEL_PLAN_CACHE = os.getenv("MODEL_PLAN_CACHE", "")
+
+# Clé de scope où ModelRoutes mémorise la route trouvée par matches()
+ROUTE_SCOPE_KEY = "app.models.registry.route"
+
+# Code dont dépendent les routes générées : toute modification invalide le cache
+_CODE_MODULES = (dynamic, schemas)
+_code_version: Optional[str] = None
+
+
+def _callable_name(function: Any) -> Optional[str]:
+    if function is None:
+        return None
+    return f"{getattr(function, '__module__', '')}.{getattr(function, '__qualname__', repr(function))}"
+
+
+def code_version() -> str:
+    """Empreinte du code générant les routes (sources, versions FastAPI et pydantic)."""
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.sha256(f"{fastapi.__version__}|{pydantic.VERSION}".encode())
+        for module in _CODE_MODULES:
+            with open(module.__file__, "rb") as source:
+                digest.update(source.read())
+        _code_version = digest.hexdigest()
+    return _code_version
+
+
+def fingerprint(spec: ModelSpec) -> str:
+    """
+    Empreinte de la configuration compilée d'un modèle.
+
+    Couvre tout ce dont dépendent ses routes et leur documentation : champs,
+    permissions par rôle, endpoints, segment d'URL et tag, code générateur.
+    """
+    model = spec.model
+    plan = {
+        "code": code_version(),
+        "model": f"{model.__module__}.{model.__qualname__}",
+        "prefix": spec.prefix,
+        "tag": spec.tag,
+        "fields": [
+            [name, repr(info.annotation), repr(info.metadata), info.is_required()]
+            for name, info in model.model_fields.items()
+        ],
+        "permissions": {
+            role.value: sorted(PermissionsRegister.get_permissions(model, role)) for role in UserRole
+        },
+        "relations": getattr(model, "relations", {}),
+        "endpoints": {
+            name: [endpoint.enable, endpoint.user_role.value, _callable_name(endpoint.custom_auth_function),
+                   _callable_name(endpoint.access_filter), endpoint.rate_limit, endpoint.hydration]
+            for name, endpoint in sorted(spec.endpoints.items())
+        },
+    }
+    return hashlib.sha256(json.dumps(plan, sort_keys=True, default=repr).encode()).hexdigest()
+
+
+def _route_path(scope: Scope) -> str:
+    """Chemin de la requête relatif à root_path (comme les routes Starlette)."""
+    path = scope["path"]
+    root_path = scope.get("root_path", "")
+    if root_path and path.startswith(root_path):
+        return path[len(root_path):]
+    return path
+
+
+class ModelRoutes(BaseRoute):
+    """
+    Routes d'un modèle, construites à la première requête qui les atteint.
+
+    Attributs:
+        spec: Configuration validée du modèle
+        path: Préfixe des routes (/api/{prefix})
+    """
+
+    def __init__(self, spec: ModelSpec, dependency_overrides_provider: Optional[Any] = None):
+        self.spec = spec
+        self.path = f"/api/{spec.prefix}"
+        self._provider = dependency_overrides_provider
+        self._routes: Optional[List[BaseRoute]] = None
+
+    @property
+    def compiled(self) -> bool:
+        return self._routes is not None
+
+    @property
+    def routes(self) -> List[BaseRoute]:
+        """Routes FastAPI du modèle (compilées au premier accès)."""
+        if self._routes is None:
+            self.compile()
+        return self._routes
+
+    def compile(self) -> List[BaseRoute]:
+        """Construit les routes du modèle."""
+        self._routes = ModelRegistry.compile(self.spec, self._provider).routes
+        return self._routes
+
+    def matches(self, scope: Scope) -> Tuple[Match, Scope]:
+        if scope["type"] != "http":
+            return Match.NONE, {}
+        path = _route_path(scope)
+        if path != self.path and not path.startswith(self.path + "/"):
+            return Match.NONE, {}
+        partial = None
+        for route in self.routes:
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                return match, {**child_scope, ROUTE_SCOPE_KEY: route}
+            if match == Match.PARTIAL and partial is None:
+                partial = (match, {**child_scope, ROUTE_SCOPE_KEY: route})
+        return partial or (Match.NONE, {})
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await scope[ROUTE_SCOPE_KEY].handle(scope, receive, send)
+
+    def url_path_for(self, name: str, /, **path_params: Any):
+        if not name.startswith(f"{self.spec.model.__name__}."):
+            raise NoMatchFound(name, path_params)
+        for route in self.routes:
+            try:
+                return route.url_path_for(name, **path_params)
+            except NoMatchFound:
+                pass
+        raise NoMatchFound(name, path_params)
+
+    def openapi(self) -> dict:
+        """Fragment OpenAPI des routes du modèle : {"paths", "components"}."""
+        document = get_openapi(title="", version="", routes=self.routes)
+        return {"paths": document.get("paths", {}), "components": document.get("components", {})}
+
+
+def _load_cache(path: str) -> Dict[str, dict]:
+    try:
+        with open(path, encoding="utf-8") as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_cache(path: str, cache: Dict[str, dict]) -> None:
+    # Écriture atomique : un démarrage concurrent ne lit jamais un fichier partiel
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w", encoding="utf-8") as file:
+        json.dump(cache, file, separators=(",", ":"))
+    os.replace(temporary, path)
+
+
+class ModelRegistry:
+    """Registre des modèles de l'API et de leur configuration validée."""
+
+    # _specs maps: { modèle: ModelSpec }
+    _specs: Dict[Type, ModelSpec] = {}
+
+    @staticmethod
+    def discover() -> List[Type]:
+        """Modèles de l'API : sous-classes de ModelData (la base n'est pas exposée)."""
+        from app.models.model_data import ModelData
+        from app.models.user import User  # noqa: F401 (sous-classe à enregistrer)
+
+        return model_subclasses(ModelData)
+
+    @classmethod
+    def register(cls, model: Type) -> ModelSpec:
+        """
+        Lit et valide la configuration d'un modèle, une seule fois.
+
+        Raises:
+            ValueError: Si la configuration du modèle est invalide
+        """
+        try:
+            return cls._specs[model]
+        except KeyError:
+            spec = parse_model(model)
+            cls._specs[model] = spec
+            return spec
+
+    @classmethod
+    def specs(cls, models: Optional[Iterable[Type]] = None) -> List[ModelSpec]:
+        """Configurations validées des modèles donnés (défaut : tous les modèles)."""
+        return [cls.register(model) for model in (cls.discover() if models is None else models)]
+
+    @staticmethod
+    def compile(spec: ModelSpec, dependency_overrides_provider: Optional[Any] = None) -> APIRouter:
+        """Compile les endpoints activés d'un modèle en routes FastAPI."""
+        # Contrôles d'accès compilés avec les routes, pas à la première requête
+        for endpoint in spec.endpoints.values():
+            endpoint_access(endpoint)
+        return dynamic.create_crud_router(
+            spec.model, spec.endpoints, spec.prefix, tag=spec.tag, ownership=spec.config.ownership,
+            dependency_overrides_provider=dependency_overrides_provider)
+
+    @classmethod
+    def mount(cls, app: FastAPI, models: Optional[Iterable[Type]] = None, lazy: bool = True,
+              cache_path: Optional[str] = MODEL_PLAN_CACHE) -> List[ModelRoutes]:
+        """
+        Monte les routes des modèles sur une application.
+
+        Args:
+            app: Application FastAPI
+            models: Modèles à monter (défaut : tous les modèles)
+            lazy: False pour compiler toutes les routes immédiatement
+            cache_path: Fichier du cache des fragments OpenAPI (vide : aucun)
+
+        Returns:
+            List[ModelRoutes]: Routes montées, une entrée par modèle
+
+        Raises:
+            ValueError: Si la configuration d'un modèle est invalide
+        """
+        mounted = [ModelRoutes(spec, app) for spec in cls.specs(models)]
+        for routes in mounted:
+            if not lazy:
+                routes.compile()
+            app.router.routes.append(routes)
+        app.openapi = lambda: cls.openapi(app, cache_path)
+        return mounted
+
+    @staticmethod
+    def openapi(app: FastAPI, cache_path: Optional[str] = MODEL_PLAN_CACHE) -> dict:
+        """
+        Document OpenAPI de l'application, fragments des modèles compris.
+
+        Les fragments dont l'empreinte est dans le cache disque sont repris
+        tels quels, sans compiler les routes du modèle ; le cache est réécrit
+        si des fragments ont été régénérés.
+        """
+        if app.openapi_schema:
+            return app.openapi_schema
+        document = get_openapi(
+            title=app.title,
+            version=app.version,
+            openapi_version=app.openapi_version,
+            summary=app.summary,
+            description=app.description,
+            terms_of_service=app.terms_of_service,
+            contact=app.contact,
+            license_info=app.license_info,
+            routes=[route for route in app.routes if not isinstance(route, ModelRoutes)],
+            webhooks=app.webhooks.routes,
+            tags=app.openapi_tags,
+            servers=app.servers,
+            separate_input_output_schemas=app.separate_input_output_schemas,
+        )
+        cached = _load_cache(cache_path) if cache_path else {}
+        fragments: Dict[str, dict] = {}
+        for routes in (route for route in app.routes if isinstance(route, ModelRoutes)):
+            key = routes.path
+            digest = fingerprint(routes.spec)
+            fragment = cached.get(key)
+            if not isinstance(fragment, dict) or fragment.get("fingerprint") != digest:
+                fragment = {"fingerprint": digest, **routes.openapi()}
+            fragments[key] = fragment
+            document.setdefault("paths", {}).update(fragment["paths"])
+            for section, values in fragment["components"].items():
+                document.setdefault("components", {}).setdefault(section, {}).update(values)
+        if cache_path and fragments != cached:
+            _save_cache(cache_path, fragments)
+        app.openapi_schema = document
+        return document
+
+    @classmethod
+    def clear(cls) -> None:
+        """Vide le registre (les modèles seront revalidés)."""
+        cls._specs.clear()
@@ -6,20 +6,21 @@ de traçabilité, de propriété et de suppression douce de ModelData et ajoute
 des champs et méthodes spécifiques à l'utilisateur (gestion des mots de passe,
 rôles, vérification, dernière connexion).
 
-Note: Utilisez un algorithme de hachage de mot de passe sécurisé (argon2 ou bcrypt)
-en production. Le simple sha256 utilisé ici est à titre de démonstration uniquement.
+Note: Les mots de passe sont hachés par app.services.auth (scrypt ou bcrypt),
+dans un pool de workers pour ne pas bloquer la boucle asyncio : un mot de
+passe se définit et se vérifie avec PasswordService.set_password et
+PasswordService.authenticate, jamais depuis le modèle.
 """
 from __future__ import annotations
 
 from datetime import datetime, timezone
 from typing import Optional, List, Dict
-import hashlib
 
 from odmantic import Field
 
 from app.models.model_data import ModelData
 from app.config.user_roles import UserRole
-from app.config.permissions_config import Permissions
+from app.config.permissions_config import Permissions, WritePermissions
 
 
 # Annotations de permissions définissant quels champs chaque rôle peut accéder
@@ -34,6 +35,12 @@ from app.config.permissions_config import Permissions
     "email", "username", "is_verified", "last_login"
 ])
 @Permissions(UserRole.PUBLIC, [], overwrite_attrs=True)
+# Champs modifiables par l'API (création, modification, import) : les rôles
+# ne sont attribués que par un superadministrateur, is_verified par un
+# administrateur ; last_login et hashed_password ne s'écrivent jamais
+@WritePermissions(UserRole.SUPERADMIN, ["email", "username", "roles", "is_verified"])
+@WritePermissions(UserRole.ADMIN, ["email", "username", "is_verified"])
+@WritePermissions(UserRole.USER, ["email", "username"])
 class User(ModelData):
     """
     Modèle User.
@@ -78,38 +85,6 @@ class User(ModelData):
     # Méthodes utilitaires
     # ----------------------------
 
-    def set_password(self, raw_password: str) -> None:
-        """
-        Définit le mot de passe de l'utilisateur.
-
-        Commentaire: Cette implémentation utilise sha256 comme placeholder.
-        Remplacez par une fonction de hachage de mot de passe sécurisée
-        (argon2, bcrypt ou scrypt) via une bibliothèque éprouvée (ex: passlib)
-        en production.
-
-        Args:
-            raw_password: Mot de passe en clair
-        """
-        # Hachage simple de démonstration - PAS POUR LA PRODUCTION
-        digest = hashlib.sha256(raw_password.encode("utf-8")).hexdigest()
-        self.hashed_password = digest
-        self.update_timestamp()
-
-    def verify_password(self, raw_password: str) -> bool:
-        """
-        Vérifie un mot de passe candidat contre le hash stocké.
-
-        Args:
-            raw_password: Mot de passe en clair à vérifier
-
-        Returns:
-            bool: True si correspond, False sinon
-        """
-        if not self.hashed_password:
-            return False
-        candidate = hashlib.sha256(raw_password.encode("utf-8")).hexdigest()
-        return candidate == self.hashed_password
-
     def update_last_login(self) -> None:
         """Met à jour last_login à maintenant (UTC) et rafraîchit updated_at."""
         self.last_login = datetime.now(timezone.utc)
@@ -117,13 +92,13 @@ class User(ModelData):
 
     # Gestion des rôles
     def add_role(self, role: str) -> None:
-        """Ajoute un rôle à l'utilisateur s'il n'est pas déjà présent."""
+        """Ajoute un rôle à l'utilisateur s'il n'est pas déjà présent (à sauvegarder avec save_user)."""
         if role not in self.roles:
             self.roles.append(role)
             self.update_timestamp()
 
     def remove_role(self, role: str) -> None:
-        """Retire un rôle de l'utilisateur s'il est présent."""
+        """Retire un rôle de l'utilisateur s'il est présent (à sauvegarder avec save_user)."""
         if role in self.roles:
             self.roles.remove(role)
             self.update_timestamp()
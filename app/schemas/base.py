@@ -0,0 +1,173 @@
+"""
+Schémas pydantic générés pour les modèles de l'API.
+
+SchemaFactory produit, pour chaque modèle ModelData et chaque rôle, les
+classes décrivant ses échanges :
+
+    - Create : champs modifiables par le rôle (propriétaire), avec les types
+      et contraintes du modèle ; champs inconnus refusés
+    - Update : mêmes champs, tous facultatifs (modification partielle)
+    - Response : champs visibles par le rôle (propriétaire compris) ; les
+      ObjectId sont exposés en chaîne, tous les champs sont facultatifs
+      (?fields=, champs du seul propriétaire)
+    - List : page de réponses ({items, next_cursor, limit, total})
+
+Les classes dépendent de la matrice de PermissionsRegister : elles sont mises
+en cache par (modèle, type, masque), comme les sérialiseurs, et générées une
+fois au démarrage (build). Le routeur dynamique les remet à FastAPI : le
+validateur pydantic-core de chaque classe est compilé une seule fois et
+réutilisé pour la validation des corps de requête et la génération OpenAPI.
+Les réponses ne sont pas revalidées : leurs schémas ne servent qu'à la
+documentation.
+"""
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Type, Union, get_args, get_origin
+
+from bson import ObjectId
+from pydantic import BaseModel, ConfigDict, Field, create_model
+from pydantic.fields import FieldInfo
+
+from app.config.permissions_config import PermissionsRegister
+from app.config.user_roles import UserRole
+from app.services.permissions import writable_fields
+from app.utils.formatters import SerializerFactory
+
+CREATE = "Create"
+UPDATE = "Update"
+RESPONSE = "Response"
+LIST = "List"
+
+# Schémas des corps de requête : champs inconnus refusés
+REQUEST_CONFIG = ConfigDict(extra="forbid")
+RESPONSE_CONFIG = ConfigDict(arbitrary_types_allowed=True)
+
+
+class ModelSchemas(NamedTuple):
+    """Schémas d'un modèle pour un rôle."""
+
+    create: Type[BaseModel]
+    update: Type[BaseModel]
+    response: Type[BaseModel]
+    list: Type[BaseModel]
+
+
+def _response_annotation(annotation: Any) -> Any:
+    """Type exposé d'un champ : les ObjectId sont sérialisés en chaîne."""
+    if isinstance(annotation, type) and issubclass(annotation, ObjectId):
+        return str
+    args = get_args(annotation)
+    if not args:
+        return annotation
+    mapped = tuple(_response_annotation(arg) for arg in args)
+    if mapped == args:
+        return annotation
+    origin = get_origin(annotation)
+    if origin is Union:
+        return Union[mapped]
+    return origin[mapped]
+
+
+def _request_field(info: FieldInfo, required: bool) -> Tuple[Any, FieldInfo]:
+    """Définition d'un champ de corps de requête, contraintes du modèle comprises."""
+    field = FieldInfo.merge_field_infos(info)
+    if not required:
+        # Modification partielle : champ absent plutôt que valeur par défaut
+        field = FieldInfo.merge_field_infos(field, default=None, default_factory=None)
+    return info.annotation, field
+
+
+class SchemaFactory:
+    """Cache des schémas générés par modèle, type et masque."""
+
+    # _schemas maps: { (model, kind, mask): schema }
+    # Le masque fait partie de la clé : un enregistrement de permissions
+    # ultérieur produit un nouveau masque, donc jamais de schéma périmé.
+    _schemas: Dict[Tuple[Type, str, int], Type[BaseModel]] = {}
+
+    @staticmethod
+    def _name(model: Type, kind: str, mask: int) -> str:
+        return f"{model.__name__}{kind}_{mask:x}"
+
+    @classmethod
+    def _cached(cls, model: Type, kind: str, mask: int, build) -> Type[BaseModel]:
+        try:
+            return cls._schemas[(model, kind, mask)]
+        except KeyError:
+            schema = build()
+            cls._schemas[(model, kind, mask)] = schema
+            return schema
+
+    @classmethod
+    def create(cls, model: Type, role: UserRole) -> Type[BaseModel]:
+        """Schéma de création pour un rôle (champs modifiables du propriétaire)."""
+        names = sorted(writable_fields(model, role, owner=True))
+        mask = PermissionsRegister.mask_of(names)
+
+        def build() -> Type[BaseModel]:
+            fields = {
+                name: _request_field(model.model_fields[name], model.model_fields[name].is_required())
+                for name in names
+            }
+            return create_model(cls._name(model, CREATE, mask), __config__=REQUEST_CONFIG, **fields)
+
+        return cls._cached(model, CREATE, mask, build)
+
+    @classmethod
+    def update(cls, model: Type, role: UserRole) -> Type[BaseModel]:
+        """Schéma de modification partielle pour un rôle (tous les champs facultatifs)."""
+        names = sorted(writable_fields(model, role, owner=True))
+        mask = PermissionsRegister.mask_of(names)
+
+        def build() -> Type[BaseModel]:
+            fields = {name: _request_field(model.model_fields[name], False) for name in names}
+            return create_model(cls._name(model, UPDATE, mask), __config__=REQUEST_CONFIG, **fields)
+
+        return cls._cached(model, UPDATE, mask, build)
+
+    @classmethod
+    def response(cls, model: Type, role: UserRole) -> Type[BaseModel]:
+        """Schéma de réponse pour un rôle (champs visibles, propriétaire compris)."""
+        mask = SerializerFactory.effective_mask(model, role, owner=role != UserRole.PUBLIC)
+
+        def build() -> Type[BaseModel]:
+            fields = {
+                name: (Optional[_response_annotation(model.model_fields[name].annotation)], None)
+                for name in SerializerFactory.visible_fields(model, mask)
+            }
+            return create_model(cls._name(model, RESPONSE, mask), __config__=RESPONSE_CONFIG, **fields)
+
+        return cls._cached(model, RESPONSE, mask, build)
+
+    @classmethod
+    def list(cls, model: Type, role: UserRole) -> Type[BaseModel]:
+        """Schéma d'une page de réponses pour un rôle."""
+        response = cls.response(model, role)
+        mask = SerializerFactory.effective_mask(model, role, owner=role != UserRole.PUBLIC)
+
+        def build() -> Type[BaseModel]:
+            return create_model(
+                cls._name(model, LIST, mask),
+                items=(List[response], ...),
+                next_cursor=(Optional[str], None),
+                limit=(int, ...),
+                total=(Optional[int], Field(default=None, description="Avec ?count=true")),
+            )
+
+        return cls._cached(model, LIST, mask, build)
+
+    @classmethod
+    def get(cls, model: Type, role: UserRole) -> ModelSchemas:
+        """Retourne les schémas d'un modèle pour un rôle."""
+        return ModelSchemas(cls.create(model, role), cls.update(model, role),
+                            cls.response(model, role), cls.list(model, role))
+
+    @classmethod
+    def build(cls, models: Iterable[Type]) -> None:
+        """Génère au démarrage les schémas de chaque modèle, pour tous les rôles."""
+        for model in models:
+            for role in UserRole:
+                cls.get(model, role)
+
+    @classmethod
+    def clear(cls) -> None:
+        """Vide le cache des schémas."""
+        cls._schemas.clear()
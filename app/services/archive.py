@@ -0,0 +1,165 @@
+"""
+Archivage des enregistrements supprimés (soft delete).
+
+Un enregistrement supprimé reste dans sa collection (is_active = False) :
+sans purge, les supprimés s'accumulent et gonflent l'ensemble de travail et
+les index. L'archiveur déplace les enregistrements supprimés depuis plus de
+ARCHIVE_AFTER_DAYS jours (updated_at, défaut 90) vers la collection
+{collection}_archive, par lots de ARCHIVE_BATCH_SIZE séparés de
+ARCHIVE_PAUSE secondes pour ne pas concurrencer le trafic.
+
+Un lot est copié (insert_many) puis supprimé de la collection principale,
+sous condition qu'il soit toujours supprimé : un enregistrement restauré
+entre les deux étapes reste en place et sa copie archivée est retirée. Une
+reprise après interruption est sans effet de bord (copies déjà présentes
+ignorées).
+
+La restauration (POST /api/{model}/{public_id}/restore) cherche aussi dans
+l'archive : unarchive() réinsère l'enregistrement, toujours supprimé, dans
+la collection principale, puis la restauration suit son cours normal.
+"""
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, List, Type
+
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+ARCHIVE_SUFFIX = "_archive"
+ARCHIVE_AFTER_DAYS = float(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+ARCHIVE_PAUSE = float(os.getenv("ARCHIVE_PAUSE", "0.5"))
+ARCHIVE_INTERVAL = float(os.getenv("ARCHIVE_INTERVAL", "3600"))
+
+# Enregistrements candidats à l'archivage
+DELETED_FILTER = {"is_active": False}
+
+# Code d'erreur MongoDB des doublons de clé unique
+DUPLICATE_KEY = 11000
+
+
+def archive_name(model: Type) -> str:
+    """Nom de la collection d'archive d'un modèle."""
+    return model.__collection__ + ARCHIVE_SUFFIX
+
+
+def get_archive_collection(engine: Any, model: Type) -> Any:
+    """Collection d'archive d'un modèle."""
+    return engine.database[archive_name(model)]
+
+
+def archive_indexes() -> List[IndexModel]:
+    """
+    Index partiel des candidats à l'archivage (collection principale) :
+    enregistrements supprimés, par date de suppression.
+    """
+    return [IndexModel([("updated_at", ASCENDING)], name="deleted_updated_at",
+                       partialFilterExpression=DELETED_FILTER)]
+
+
+def archived_indexes() -> List[IndexModel]:
+    """Index de la collection d'archive : recherche par public_id (restauration)."""
+    return [IndexModel([("public_id", ASCENDING)], name="public_id", unique=True)]
+
+
+async def archive_batch(collection: Any, archive: Any, cutoff: datetime,
+                        batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """
+    Archive un lot d'enregistrements supprimés avant cutoff.
+
+    Returns:
+        int: Nombre d'enregistrements archivés (0 : plus rien à archiver)
+    """
+    candidates = {**DELETED_FILTER, "updated_at": {"$lt": cutoff}}
+    documents = [
+        document
+        async for document in collection.find(candidates).sort("updated_at", ASCENDING).limit(batch_size)
+    ]
+    if not documents:
+        return 0
+
+    try:
+        await archive.insert_many(documents, ordered=False)
+    except BulkWriteError as error:
+        # Copies laissées par un lot interrompu : déjà archivées
+        if any(write_error["code"] != DUPLICATE_KEY for write_error in error.details.get("writeErrors", [])):
+            raise
+
+    ids = [document["_id"] for document in documents]
+    result = await collection.delete_many({"_id": {"$in": ids}, **candidates})
+    if result.deleted_count < len(ids):
+        # Restaurés entre la lecture et la suppression : copie archivée retirée
+        kept = await collection.distinct("_id", {"_id": {"$in": ids}})
+        if kept:
+            await archive.delete_many({"_id": {"$in": kept}})
+    return result.deleted_count
+
+
+async def archive_model(collection: Any, archive: Any, max_age: float = ARCHIVE_AFTER_DAYS,
+                        batch_size: int = ARCHIVE_BATCH_SIZE, pause: float = ARCHIVE_PAUSE) -> int:
+    """
+    Archive tous les enregistrements supprimés depuis plus de max_age jours.
+
+    Returns:
+        int: Nombre total d'enregistrements archivés
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=max_age)
+    total = 0
+    while True:
+        archived = await archive_batch(collection, archive, cutoff, batch_size)
+        total += archived
+        if archived < batch_size:
+            return total
+        await asyncio.sleep(pause)
+
+
+async def unarchive(collection: Any, archive: Any, query: dict) -> bool:
+    """
+    Ramène dans la collection principale l'enregistrement archivé qui répond
+    à query (il y reste supprimé jusqu'à sa restauration).
+
+    Returns:
+        bool: True si un enregistrement a été ramené
+    """
+    document = await archive.find_one(query)
+    if document is None:
+        return False
+    try:
+        await collection.insert_one(document)
+    except DuplicateKeyError:
+        # Déjà ramené (restauration concurrente ou interrompue)
+        pass
+    await archive.delete_one({"_id": document["_id"]})
+    return True
+
+
+async def ensure_archive_indexes(engine: Any, models: Iterable[Type]) -> None:
+    """Crée les index utilisés par l'archiveur et la restauration."""
+    for model in models:
+        await engine.get_collection(model).create_indexes(archive_indexes())
+        await get_archive_collection(engine, model).create_indexes(archived_indexes())
+
+
+async def run_archiver(engine: Any, models: Iterable[type], interval: float = ARCHIVE_INTERVAL,
+                       max_age: float = ARCHIVE_AFTER_DAYS) -> None:
+    """
+    Archive périodiquement les enregistrements supprimés (tâche de fond).
+
+    Les index de l'archiveur sont créés au premier passage réussi : une
+    erreur (réseau, droits) est retentée au passage suivant, comme un lot.
+    """
+    models = list(models)
+    indexed = set()
+    while True:
+        for model in models:
+            try:
+                if model not in indexed:
+                    await ensure_archive_indexes(engine, [model])
+                    indexed.add(model)
+                await archive_model(engine.get_collection(model), get_archive_collection(engine, model), max_age)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                pass
+        await asyncio.sleep(interval)
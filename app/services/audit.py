@@ -0,0 +1,285 @@
+"""
+Journal d'audit des lectures et modifications.
+
+Écrire un document d'audit par requête, de façon synchrone, doublerait la
+charge d'écriture et ajouterait un aller-retour MongoDB à chaque réponse.
+Les entrées sont donc déposées dans une file bornée du processus, puis
+écrites par une tâche de fond en lots (insert_many) : dès que batch_size
+entrées sont en attente, ou au plus tard flush_interval secondes après la
+première.
+
+La collection audit_logs est plafonnée (capped, AUDIT_CAPPED_SIZE octets) :
+les entrées les plus anciennes sont écrasées, sans purge ni index TTL à
+maintenir, et l'ordre d'insertion est conservé.
+
+Quand la file est pleine (base lente ou indisponible), AUDIT_OVERFLOW
+choisit le comportement :
+
+    - block (défaut) : la requête attend une place (aucune perte)
+    - drop : l'entrée est abandonnée et comptée
+    - spill : l'entrée est ajoutée au fichier local AUDIT_SPILL_PATH (NDJSON),
+      rejoué dans la collection dès que la file est vide
+
+Un lot refusé par la base suit la même politique (spill) ou est compté
+comme perdu. stop() écrit les entrées en attente avant l'arrêt du processus.
+"""
+import asyncio
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from bson import json_util
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import CollectionInvalid, PyMongoError
+
+AUDIT_COLLECTION = "audit_logs"
+AUDIT_CAPPED_SIZE = int(os.getenv("AUDIT_CAPPED_SIZE", str(1024 * 1024 * 1024)))
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1"))
+AUDIT_OVERFLOW = os.getenv("AUDIT_OVERFLOW", "block")
+AUDIT_SPILL_PATH = os.getenv("AUDIT_SPILL_PATH", "audit_spill.ndjson")
+
+OVERFLOW_POLICIES = ("block", "drop", "spill")
+
+_STOP = object()
+
+
+def audit_entry(action: str, model: Optional[str], user: Optional[Any],
+                targets: Iterable[str] = (), **details: Any) -> dict:
+    """
+    Construit une entrée d'audit.
+
+    Args:
+        action: Action (read, list, create, update, delete...)
+        model: Collection concernée
+        user: Utilisateur authentifié ou None
+        targets: public_id des enregistrements concernés
+        details: Informations complémentaires (ex: count)
+
+    Returns:
+        dict: Document à écrire dans audit_logs
+    """
+    entry = {
+        "ts": datetime.now(timezone.utc),
+        "action": action,
+        "model": model,
+        "actor": user.internal_id if user is not None else None,
+        "targets": list(targets),
+    }
+    entry.update(details)
+    return entry
+
+
+def audit_logs_indexes() -> List[IndexModel]:
+    """
+    Index des requêtes de /admin/logs : toutes trient par date décroissante
+    puis par _id (pagination keyset : les entrées d'un même lot partagent
+    leur ts), filtrées par auteur, par modèle (et action) ou par
+    enregistrement.
+    """
+    page = [("ts", DESCENDING), ("_id", DESCENDING)]
+    return [
+        IndexModel(page, name="ts"),
+        IndexModel([("actor", ASCENDING), *page], name="actor_ts"),
+        IndexModel([("model", ASCENDING), ("action", ASCENDING), *page], name="model_action_ts"),
+        IndexModel([("targets", ASCENDING), *page], name="targets_ts"),
+    ]
+
+
+async def ensure_audit_collection(database: Any, name: str = AUDIT_COLLECTION,
+                                  size: int = AUDIT_CAPPED_SIZE) -> Any:
+    """Crée la collection plafonnée et ses index si nécessaire."""
+    try:
+        await database.create_collection(name, capped=True, size=size)
+    except CollectionInvalid:
+        pass
+    collection = database[name]
+    await collection.create_indexes(audit_logs_indexes())
+    return collection
+
+
+class AuditWriter:
+    """
+    Écriture en lots des entrées d'audit.
+
+    Attributs:
+        collection: Collection cible (audit_logs)
+        batch_size: Nombre maximal d'entrées par insert_many
+        flush_interval: Attente maximale d'une entrée avant écriture (secondes)
+        overflow: Politique quand la file est pleine (block, drop, spill)
+        spill_path: Fichier de débordement (politique spill)
+    """
+
+    def __init__(self, collection: Any, queue_size: int = AUDIT_QUEUE_SIZE,
+                 batch_size: int = AUDIT_BATCH_SIZE, flush_interval: float = AUDIT_FLUSH_INTERVAL,
+                 overflow: str = AUDIT_OVERFLOW, spill_path: str = AUDIT_SPILL_PATH):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Politique de débordement inconnue : {overflow!r}.")
+        self.collection = collection
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.spill_path = spill_path
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self.written = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.batches = 0
+
+    # ----------------------------
+    # Dépôt
+    # ----------------------------
+
+    async def log(self, entry: dict) -> None:
+        """Dépose une entrée (ne fait jamais échouer la requête)."""
+        if self._closed:
+            self._overflow([entry])
+            return
+        if self._task is None:
+            self.start()
+        if self.overflow == "block":
+            await self._queue.put(entry)
+            return
+        try:
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            self._overflow([entry])
+
+    def _overflow(self, entries: List[dict]) -> None:
+        """Entrées sans place : fichier local (spill) ou abandon."""
+        if self.overflow == "spill":
+            try:
+                with open(self.spill_path, "a", encoding="utf-8") as spill:
+                    spill.writelines(json_util.dumps(entry) + "\n" for entry in entries)
+                self.spilled += len(entries)
+                return
+            except OSError:
+                pass
+        self.dropped += len(entries)
+
+    # ----------------------------
+    # Écriture
+    # ----------------------------
+
+    def start(self) -> None:
+        """Démarre la tâche d'écriture (boucle d'événements courante)."""
+        if self._task is None:
+            self._closed = False
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        await self.replay_spill()
+        while True:
+            batch = []
+            entry = await self._queue.get()
+            deadline = loop.time() + self.flush_interval
+            while entry is not _STOP:
+                batch.append(entry)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    entry = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        entry = await asyncio.wait_for(self._queue.get(), timeout)
+                    except TimeoutError:
+                        break
+            if batch:
+                await self._write(batch)
+            if entry is _STOP:
+                return
+            if self._queue.empty():
+                await self.replay_spill()
+
+    async def _write(self, batch: List[dict]) -> bool:
+        try:
+            await self.collection.insert_many(batch, ordered=False)
+        except PyMongoError:
+            self._overflow(batch)
+            return False
+        self.written += len(batch)
+        self.batches += 1
+        return True
+
+    async def replay_spill(self) -> None:
+        """Rejoue le fichier de débordement dans la collection."""
+        if self.overflow != "spill" or not os.path.exists(self.spill_path):
+            return
+        replaying = f"{self.spill_path}.replay"
+        try:
+            os.replace(self.spill_path, replaying)
+            lines = await asyncio.to_thread(_read_lines, replaying)
+        except OSError:
+            return
+        entries = [json_util.loads(line) for line in lines if line.strip()]
+        for start in range(0, len(entries), self.batch_size):
+            await self._write(entries[start:start + self.batch_size])
+        os.remove(replaying)
+
+    async def stop(self) -> None:
+        """Écrit les entrées en attente puis arrête la tâche d'écriture."""
+        if self._task is None:
+            return
+        self._closed = True
+        await self._queue.put(_STOP)
+        try:
+            await self._task
+        finally:
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Entrées en attente, écrites, débordées et perdues."""
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "batches": self.batches,
+            "spilled": self.spilled,
+            "dropped": self.dropped,
+            "overflow": self.overflow,
+        }
+
+
+def _read_lines(path: str) -> List[str]:
+    with open(path, encoding="utf-8") as spill:
+        return spill.readlines()
+
+
+_writer: Optional[AuditWriter] = None
+
+
+def get_audit_writer(engine: Any) -> AuditWriter:
+    """
+    Retourne l'écrivain d'audit du processus, créé au premier appel sur la
+    base du moteur donné (la collection plafonnée est créée au démarrage).
+    """
+    global _writer
+    if _writer is None:
+        _writer = AuditWriter(engine.database[AUDIT_COLLECTION])
+    return _writer
+
+
+async def start_audit_writer(engine: Any) -> AuditWriter:
+    """Prépare audit_logs (plafonnée, indexée) et démarre l'écriture."""
+    writer = get_audit_writer(engine)
+    writer.collection = await ensure_audit_collection(engine.database)
+    writer.start()
+    return writer
+
+
+async def stop_audit_writer() -> None:
+    """Écrit les entrées en attente (arrêt du processus)."""
+    if _writer is not None:
+        await _writer.stop()
+
+
+async def audit(engine: Any, action: str, model: Optional[str], user: Optional[Any],
+                targets: Iterable[str] = (), **details: Any) -> None:
+    """Journalise une action (voir audit_entry)."""
+    await get_audit_writer(engine).log(audit_entry(action, model, user, targets, **details))
@@ -0,0 +1,322 @@
+"""
+Services d'authentification : hachage des mots de passe.
+
+Un hachage de mot de passe coûte volontairement des dizaines de
+millisecondes de calcul. Exécuté dans la requête, il bloquerait la boucle
+asyncio : pendant une vague de connexions, tous les autres endpoints
+attendraient. PasswordService exécute donc hachage et vérification dans un
+pool de workers borné (threads par défaut : scrypt et bcrypt libèrent le
+GIL pendant le calcul), et limite le nombre d'opérations en attente.
+
+Les paramètres de coût sont réglables. Un hash produit avec d'anciens
+paramètres (ou l'ancien sha256) reste vérifiable ; il est recalculé de façon
+transparente à la connexion suivante (voir PasswordService.authenticate).
+
+Configuration par variables d'environnement :
+
+    - PASSWORD_SCHEME : scrypt (défaut) ou bcrypt (paquet bcrypt requis)
+    - PASSWORD_SCRYPT_LOG_N, PASSWORD_SCRYPT_R, PASSWORD_SCRYPT_P : coût
+      scrypt (défaut 14, 8, 1 : N = 2**14, 16 Mio par hash)
+    - PASSWORD_BCRYPT_ROUNDS : coût bcrypt (défaut 12)
+    - PASSWORD_WORKERS : taille du pool (défaut : nombre de CPU)
+    - PASSWORD_EXECUTOR : thread (défaut) ou process
+"""
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+
+try:
+    import bcrypt
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    bcrypt = None
+
+SCHEMES = ("scrypt", "bcrypt")
+
+SCRYPT_PREFIX = "$scrypt$"
+BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+SCRYPT_SALT_BYTES = 16
+SCRYPT_KEY_BYTES = 32
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.b64decode(data + "=" * (-len(data) % 4))
+
+
+def _is_legacy_sha256(encoded: str) -> bool:
+    return len(encoded) == 64 and all(char in "0123456789abcdef" for char in encoded)
+
+
+class PasswordHasher:
+    """
+    Politique de hachage des mots de passe (calcul synchrone).
+
+    Format des hash scrypt : $scrypt$ln=<log2 N>,r=<r>,p=<p>$<sel>$<clé>
+    (base64 sans remplissage). Les hash bcrypt gardent leur format natif.
+
+    Attributs:
+        scheme: Algorithme des nouveaux hash ("scrypt" ou "bcrypt")
+        scrypt_log_n: log2 du coût CPU/mémoire N de scrypt
+        scrypt_r: Taille de bloc scrypt
+        scrypt_p: Parallélisme scrypt
+        bcrypt_rounds: Coût bcrypt (log2 des itérations)
+    """
+
+    def __init__(self, scheme: str = "scrypt", scrypt_log_n: int = 14, scrypt_r: int = 8,
+                 scrypt_p: int = 1, bcrypt_rounds: int = 12):
+        if scheme not in SCHEMES:
+            raise ValueError(f"Algorithme inconnu : {scheme}. Valeurs possibles : {', '.join(SCHEMES)}.")
+        if scheme == "bcrypt" and bcrypt is None:
+            raise ValueError("L'algorithme bcrypt nécessite le paquet bcrypt.")
+        self.scheme = scheme
+        self.scrypt_log_n = scrypt_log_n
+        self.scrypt_r = scrypt_r
+        self.scrypt_p = scrypt_p
+        self.bcrypt_rounds = bcrypt_rounds
+
+    @classmethod
+    def from_env(cls) -> "PasswordHasher":
+        """Construit la politique à partir des variables d'environnement."""
+        return cls(
+            scheme=os.getenv("PASSWORD_SCHEME", "scrypt"),
+            scrypt_log_n=int(os.getenv("PASSWORD_SCRYPT_LOG_N", "14")),
+            scrypt_r=int(os.getenv("PASSWORD_SCRYPT_R", "8")),
+            scrypt_p=int(os.getenv("PASSWORD_SCRYPT_P", "1")),
+            bcrypt_rounds=int(os.getenv("PASSWORD_BCRYPT_ROUNDS", "12")),
+        )
+
+    # ----------------------------
+    # scrypt
+    # ----------------------------
+
+    @staticmethod
+    def _scrypt(password: str, salt: bytes, log_n: int, r: int, p: int) -> bytes:
+        n = 1 << log_n
+        return hashlib.scrypt(
+            password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+            maxmem=256 * r * (n + p + 2), dklen=SCRYPT_KEY_BYTES)
+
+    @staticmethod
+    def _parse_scrypt(encoded: str) -> Tuple[int, int, int, bytes, bytes]:
+        params, salt, key = encoded[len(SCRYPT_PREFIX):].split("$")
+        values = dict(item.split("=") for item in params.split(","))
+        return int(values["ln"]), int(values["r"]), int(values["p"]), _b64decode(salt), _b64decode(key)
+
+    # ----------------------------
+    # API
+    # ----------------------------
+
+    def hash(self, password: str) -> str:
+        """
+        Hache un mot de passe avec les paramètres courants.
+
+        Args:
+            password: Mot de passe en clair
+
+        Returns:
+            str: Hash encodé (algorithme, paramètres, sel)
+        """
+        if self.scheme == "bcrypt":
+            return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(self.bcrypt_rounds)).decode("ascii")
+        salt = secrets.token_bytes(SCRYPT_SALT_BYTES)
+        key = self._scrypt(password, salt, self.scrypt_log_n, self.scrypt_r, self.scrypt_p)
+        return (f"{SCRYPT_PREFIX}ln={self.scrypt_log_n},r={self.scrypt_r},p={self.scrypt_p}"
+                f"${_b64encode(salt)}${_b64encode(key)}")
+
+    def verify(self, password: str, encoded: Optional[str]) -> bool:
+        """
+        Vérifie un mot de passe contre un hash (paramètres lus dans le hash).
+
+        Args:
+            password: Mot de passe en clair
+            encoded: Hash stocké
+
+        Returns:
+            bool: True si le mot de passe correspond
+        """
+        if not encoded:
+            return False
+        if encoded.startswith(SCRYPT_PREFIX):
+            try:
+                log_n, r, p, salt, key = self._parse_scrypt(encoded)
+            except (KeyError, ValueError):
+                return False
+            return hmac.compare_digest(self._scrypt(password, salt, log_n, r, p), key)
+        if encoded.startswith(BCRYPT_PREFIXES):
+            if bcrypt is None:
+                return False
+            return bcrypt.checkpw(password.encode("utf-8"), encoded.encode("ascii"))
+        if _is_legacy_sha256(encoded):
+            candidate = hashlib.sha256(password.encode("utf-8")).hexdigest()
+            return hmac.compare_digest(candidate, encoded)
+        return False
+
+    def needs_rehash(self, encoded: Optional[str]) -> bool:
+        """
+        Indique si un hash doit être recalculé avec les paramètres courants.
+
+        Returns:
+            bool: True si l'algorithme ou les paramètres ont changé
+        """
+        if not encoded:
+            return False
+        if self.scheme == "scrypt":
+            if not encoded.startswith(SCRYPT_PREFIX):
+                return True
+            try:
+                log_n, r, p, _, _ = self._parse_scrypt(encoded)
+            except (KeyError, ValueError):
+                return True
+            return (log_n, r, p) != (self.scrypt_log_n, self.scrypt_r, self.scrypt_p)
+        if not encoded.startswith(BCRYPT_PREFIXES):
+            return True
+        return int(encoded.split("$")[2]) != self.bcrypt_rounds
+
+    def verify_and_update(self, password: str, encoded: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """
+        Vérifie un mot de passe et recalcule son hash si nécessaire.
+
+        Returns:
+            Tuple[bool, Optional[str]]: (valide, nouveau hash ou None)
+        """
+        if not self.verify(password, encoded):
+            return False, None
+        if self.needs_rehash(encoded):
+            return True, self.hash(password)
+        return True, None
+
+
+class PasswordService:
+    """
+    Hachage et vérification asynchrones dans un pool de workers borné.
+
+    Attributs:
+        hasher: Politique de hachage
+        max_workers: Taille du pool (calculs simultanés)
+        max_pending: Opérations admises en même temps (calcul + file) ;
+            les suivantes attendent sans occuper le pool
+    """
+
+    def __init__(self, hasher: Optional[PasswordHasher] = None, max_workers: Optional[int] = None,
+                 executor: str = "thread", max_pending: Optional[int] = None):
+        self.hasher = hasher or PasswordHasher.from_env()
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.max_workers * 4
+        self._executor: Executor
+        if executor == "process":
+            self._executor = ProcessPoolExecutor(self.max_workers)
+        elif executor == "thread":
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="password")
+        else:
+            raise ValueError(f"Type de pool inconnu : {executor}.")
+        self._slots = asyncio.Semaphore(self.max_pending)
+
+    @classmethod
+    def from_env(cls, hasher: Optional[PasswordHasher] = None) -> "PasswordService":
+        """Construit le service à partir des variables d'environnement."""
+        workers = os.getenv("PASSWORD_WORKERS")
+        return cls(hasher, max_workers=int(workers) if workers else None,
+                   executor=os.getenv("PASSWORD_EXECUTOR", "thread"))
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def hash(self, password: str) -> str:
+        """Hache un mot de passe hors de la boucle asyncio."""
+        return await self._run(self.hasher.hash, password)
+
+    async def verify(self, password: str, encoded: Optional[str]) -> bool:
+        """
+        Vérifie un mot de passe hors de la boucle asyncio.
+
+        Sans hash stocké (utilisateur inconnu, compte sans mot de passe), un
+        hash est tout de même calculé : la réponse prend le même temps et ne
+        révèle pas l'existence du compte.
+        """
+        if not encoded:
+            await self._run(self.hasher.hash, password)
+            return False
+        return await self._run(self.hasher.verify, password, encoded)
+
+    async def verify_and_update(self, password: str, encoded: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """Vérifie et recalcule si nécessaire, en une seule tâche du pool."""
+        if not encoded:
+            await self._run(self.hasher.hash, password)
+            return False, None
+        return await self._run(self.hasher.verify_and_update, password, encoded)
+
+    async def set_password(self, user: Any, password: str) -> None:
+        """
+        Définit le mot de passe d'un utilisateur.
+
+        Args:
+            user: Utilisateur à modifier (à sauvegarder par l'appelant avec
+                app.core.principal.save_user)
+            password: Mot de passe en clair
+        """
+        user.hashed_password = await self.hash(password)
+        user.update_timestamp()
+
+    async def authenticate(self, user: Any, password: str) -> bool:
+        """
+        Vérifie le mot de passe d'un utilisateur à la connexion.
+
+        Si le hash stocké utilise d'anciens paramètres, il est remplacé par un
+        hash aux paramètres courants : l'appelant sauvegarde l'utilisateur
+        (avec last_login) comme pour toute connexion réussie.
+
+        Args:
+            user: Utilisateur qui se connecte (ou None si inconnu)
+            password: Mot de passe en clair
+
+        Returns:
+            bool: True si le mot de passe correspond
+        """
+        valid, new_hash = await self.verify_and_update(
+            password, user.hashed_password if user is not None else None)
+        if valid and new_hash is not None:
+            user.hashed_password = new_hash
+            user.update_timestamp()
+        return valid
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Arrête le pool de workers."""
+        self._executor.shutdown(wait=wait)
+
+
+_hasher: Optional[PasswordHasher] = None
+_service: Optional[PasswordService] = None
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Retourne la politique de hachage partagée, créée au premier appel."""
+    global _hasher
+    if _hasher is None:
+        _hasher = PasswordHasher.from_env()
+    return _hasher
+
+
+def get_password_service() -> PasswordService:
+    """Retourne le service de hachage partagé, créé au premier appel."""
+    global _service
+    if _service is None:
+        _service = PasswordService.from_env(get_password_hasher())
+    return _service
+
+
+def shutdown_password_service() -> None:
+    """Arrête le pool du service partagé (arrêt de l'application)."""
+    global _service
+    if _service is not None:
+        _service.shutdown()
+        _service = None
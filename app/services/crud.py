@@ -0,0 +1,407 @@
+"""
+Écritures du CRUD dynamique, unitaires et par lots.
+
+Chaque élément d'un lot suit les mêmes contrôles qu'une écriture unitaire :
+
+    - authentification de l'endpoint (EndpointConfig), vérifiée une fois
+      par requête, puis fonction personnalisée appliquée élément par élément
+    - champs autorisés selon WritePermissionsRegister (writable_fields)
+    - created_by / owner_id / horodatages renseignés comme le fait ModelData
+    - propriété et règles d'accès compilées dans le filtre (access_query)
+
+Un lot est écrit en un seul aller-retour (insert_many ou bulk_write), en mode
+ordonné (arrêt à la première erreur, éléments suivants « skipped ») ou non
+ordonné, avec un résultat par élément. Un public_id répété dans un lot est
+refusé. Le statut d'une modification suit le résultat de bulk_write : un
+enregistrement supprimé ou modifié entre la lecture et l'écriture est
+signalé « not_found ».
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from pydantic import TypeAdapter, ValidationError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from typing_extensions import Annotated
+
+from app.config.endpoint_config import EndpointConfig
+from app.config.user_roles import UserRole
+from app.core.permissions import is_owner, passes_custom_auth
+from app.db.base import bson_value, field_keys, to_document
+from app.services.ownership import access_query
+from app.services.permissions import writable_fields
+
+MAX_BULK_ITEMS = 1000
+
+# Statuts d'un élément de lot
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+FAILED = "error"
+NOT_FOUND = "not_found"
+SKIPPED = "skipped"
+
+# Rappel après écriture d'un lot, avec les documents écrits
+OnWritten = Callable[[List[dict]], Awaitable[None]]
+
+_adapters: Dict[Tuple[Type, str], TypeAdapter] = {}
+
+
+class ItemError(Exception):
+    """Erreur de validation ou d'autorisation d'un élément."""
+
+
+def item_result(index: int, status: str, public_id: Optional[str] = None,
+                error: Optional[str] = None) -> dict:
+    """Résultat d'un élément de lot."""
+    result = {"index": index, "status": status, "public_id": public_id}
+    if error is not None:
+        result["error"] = error
+    return result
+
+
+def summarize(results: List[dict], ordered: bool) -> dict:
+    """Réponse d'une opération par lot."""
+    failed = sum(1 for result in results if result["status"] in (FAILED, NOT_FOUND, SKIPPED))
+    return {
+        "ordered": ordered,
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "results": results,
+    }
+
+
+def _adapter(model: Type, name: str) -> TypeAdapter:
+    """Validateur d'un champ, avec ses contraintes (max_length...)."""
+    try:
+        return _adapters[(model, name)]
+    except KeyError:
+        field = model.model_fields[name]
+        annotation = Annotated[(field.annotation, *field.metadata)] if field.metadata else field.annotation
+        adapter = TypeAdapter(annotation)
+        _adapters[(model, name)] = adapter
+        return adapter
+
+
+def validation_message(error: ValidationError) -> str:
+    """Message court d'une erreur de validation : « champ : raison » par erreur."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc'])} : {detail['msg']}"
+        for detail in error.errors())
+
+
+def check_fields(model: Type, payload: dict, role: UserRole, owner: bool) -> None:
+    """
+    Vérifie que tous les champs fournis sont modifiables par l'appelant.
+
+    Raises:
+        ItemError: Si un champ est inconnu ou non modifiable
+    """
+    forbidden = set(payload) - writable_fields(model, role, owner)
+    if forbidden:
+        raise ItemError(f"Champs non modifiables : {', '.join(sorted(forbidden))}.")
+
+
+def prepare_create(model: Type, endpoint: EndpointConfig, payload: Any,
+                   user: Optional[Any], role: UserRole) -> dict:
+    """
+    Valide un élément à créer et construit son document.
+
+    L'instance est construite par le modèle : public_id, created_at et
+    updated_at reçoivent leurs valeurs par défaut, created_by et owner_id
+    l'utilisateur courant.
+
+    Raises:
+        ItemError: Si l'élément est invalide ou refusé
+    """
+    if not isinstance(payload, dict):
+        raise ItemError("Chaque élément doit être un objet.")
+    check_fields(model, payload, role, owner=True)
+    user_id = user.internal_id if user is not None else None
+    try:
+        instance = model(**payload, created_by=user_id, owner_id=user_id)
+    except ValidationError as error:
+        raise ItemError(validation_message(error))
+
+    document = to_document(instance)
+    if not passes_custom_auth(endpoint, user, document, model):
+        raise ItemError("Accès refusé.")
+    return document
+
+
+def prepare_update(model: Type, payload: dict, role: UserRole, owner: bool) -> dict:
+    """
+    Valide des modifications partielles et construit l'opérateur $set.
+
+    Raises:
+        ItemError: Si un champ est invalide ou non modifiable
+    """
+    check_fields(model, payload, role, owner)
+    keys = field_keys(model)
+    changes = {}
+    for name, value in payload.items():
+        try:
+            changes[keys[name]] = bson_value(_adapter(model, name).validate_python(value))
+        except ValidationError as error:
+            raise ItemError(f"{name} : {error.errors()[0]['msg']}")
+    changes["updated_at"] = datetime.now(timezone.utc)
+    return {"$set": changes}
+
+
+def soft_delete_update() -> dict:
+    """Opérateur équivalent à ModelData.soft_delete()."""
+    return {"$set": {"is_active": False, "updated_at": datetime.now(timezone.utc)}}
+
+
+def restore_update() -> dict:
+    """Opérateur équivalent à ModelData.restore()."""
+    return {"$set": {"is_active": True, "updated_at": datetime.now(timezone.utc)}}
+
+
+def transfer_update(owner_id: Any) -> dict:
+    """Opérateur équivalent à ModelData.transfer_ownership()."""
+    return {"$set": {"owner_id": owner_id, "updated_at": datetime.now(timezone.utc)}}
+
+
+def write_errors(error: BulkWriteError) -> Dict[int, str]:
+    """Index de l'opération -> message, pour chaque erreur d'écriture."""
+    return {
+        write_error["index"]: write_error.get("errmsg", "Erreur d'écriture.")
+        for write_error in error.details.get("writeErrors", [])
+    }
+
+
+def _apply_write_outcome(results: List[dict], positions: List[int], errors: Dict[int, str],
+                         ordered: bool, success: str) -> None:
+    """Reporte le résultat du lot sur les éléments écrits."""
+    stop = min(errors) if ordered and errors else None
+    for op_index, position in enumerate(positions):
+        if op_index in errors:
+            results[position].update(status=FAILED, error=errors[op_index])
+        elif stop is not None and op_index > stop:
+            results[position]["status"] = SKIPPED
+        else:
+            results[position]["status"] = success
+
+
+def _written(results: List[dict], positions: List[int], documents: List[dict],
+             success: str) -> List[dict]:
+    """Documents des éléments écrits avec succès."""
+    return [
+        document
+        for position, document in zip(positions, documents)
+        if results[position]["status"] == success
+    ]
+
+
+def _stop_at_first_failure(results: List[dict], ordered: bool) -> Optional[int]:
+    """Position du premier élément refusé avant écriture, en mode ordonné."""
+    if not ordered:
+        return None
+    for result in results:
+        if result["status"] in (FAILED, NOT_FOUND):
+            return result["index"]
+    return None
+
+
+async def bulk_create(collection: Any, model: Type, endpoint: EndpointConfig,
+                      items: List[Any], user: Optional[Any], role: UserRole,
+                      ordered: bool = True, on_written: Optional[OnWritten] = None) -> dict:
+    """
+    Crée un lot d'enregistrements en un seul insert_many.
+
+    on_written reçoit les documents effectivement insérés.
+
+    Returns:
+        dict: Résumé et résultat de chaque élément
+    """
+    results: List[dict] = []
+    documents: List[dict] = []
+    positions: List[int] = []
+    for index, payload in enumerate(items):
+        try:
+            document = prepare_create(model, endpoint, payload, user, role)
+        except ItemError as error:
+            results.append(item_result(index, FAILED, error=str(error)))
+            continue
+        results.append(item_result(index, SKIPPED, document["public_id"]))
+        documents.append(document)
+        positions.append(index)
+
+    stop = _stop_at_first_failure(results, ordered)
+    if stop is not None:
+        kept = [i for i, position in enumerate(positions) if position < stop]
+        documents = [documents[i] for i in kept]
+        positions = [positions[i] for i in kept]
+
+    errors: Dict[int, str] = {}
+    if documents:
+        try:
+            await collection.insert_many(documents, ordered=ordered)
+        except BulkWriteError as error:
+            errors = write_errors(error)
+    _apply_write_outcome(results, positions, errors, ordered, CREATED)
+    if on_written is not None:
+        await on_written(_written(results, positions, documents, CREATED))
+    return summarize(results, ordered)
+
+
+async def _accessible(collection: Any, endpoint: EndpointConfig, user: Optional[Any],
+                      role: UserRole, public_ids: List[str], model: Optional[Type] = None) -> Dict[str, dict]:
+    """Lit en une requête les enregistrements du lot accessibles à l'appelant."""
+    projection = None if endpoint.custom_auth_function is not None else {
+        "public_id": 1, "owner_id": 1, "updated_at": 1}
+    query = access_query(endpoint, user, role, {"public_id": {"$in": public_ids}})
+    return {
+        document["public_id"]: document
+        async for document in collection.find(query, projection)
+        if passes_custom_auth(endpoint, user, document, model)
+    }
+
+
+async def _bulk_modify(collection: Any, endpoint: EndpointConfig, user: Optional[Any],
+                       role: UserRole, entries: List[Tuple[Any, Any]], ordered: bool,
+                       build_update, success: str, on_written: Optional[OnWritten] = None,
+                       model: Optional[Type] = None) -> dict:
+    """
+    Applique un lot de mises à jour en un seul bulk_write.
+
+    entries contient des couples (public_id, données) ; build_update(données,
+    propriétaire) retourne l'opérateur de mise à jour ou lève ItemError.
+    on_written reçoit les documents lus avant écriture (_id, public_id,
+    owner_id) des seuls éléments que bulk_write a réellement modifiés (voir
+    _check_matched) : les statistiques ne comptent ni les doublons ni les
+    écritures perdues face à une écriture concurrente. model sert à hydrater les documents remis à la
+    fonction d'accès personnalisée (EndpointConfig.hydration).
+    """
+    public_ids = [public_id for public_id, _ in entries if isinstance(public_id, str)]
+    accessible = await _accessible(collection, endpoint, user, role, public_ids, model)
+    # Horodatage commun au lot : identifie les documents réellement écrits
+    stamp = _batch_timestamp(document.get("updated_at") for document in accessible.values())
+
+    results: List[dict] = []
+    operations: List[UpdateOne] = []
+    positions: List[int] = []
+    targets: List[dict] = []
+    seen = set()
+    for index, (public_id, data) in enumerate(entries):
+        if isinstance(public_id, str) and public_id in seen:
+            results.append(item_result(index, FAILED, public_id, "public_id en double dans le lot."))
+            continue
+        seen.add(public_id)
+        document = accessible.get(public_id) if isinstance(public_id, str) else None
+        if document is None:
+            results.append(item_result(index, NOT_FOUND, public_id if isinstance(public_id, str) else None))
+            continue
+        try:
+            update = build_update(data, is_owner(user, document))
+        except ItemError as error:
+            results.append(item_result(index, FAILED, public_id, str(error)))
+            continue
+        update["$set"]["updated_at"] = stamp
+        results.append(item_result(index, SKIPPED, public_id))
+        operations.append(UpdateOne(
+            access_query(endpoint, user, role, {"public_id": public_id}), update))
+        positions.append(index)
+        targets.append(document)
+
+    stop = _stop_at_first_failure(results, ordered)
+    if stop is not None:
+        kept = [i for i, position in enumerate(positions) if position < stop]
+        operations = [operations[i] for i in kept]
+        positions = [positions[i] for i in kept]
+        targets = [targets[i] for i in kept]
+
+    errors: Dict[int, str] = {}
+    matched = 0
+    if operations:
+        try:
+            matched = (await collection.bulk_write(operations, ordered=ordered)).matched_count
+        except BulkWriteError as error:
+            errors = write_errors(error)
+            matched = error.details.get("nMatched", 0)
+    _apply_write_outcome(results, positions, errors, ordered, success)
+    await _check_matched(collection, results, positions, matched, stamp, success)
+    if on_written is not None:
+        await on_written(_written(results, positions, targets, success))
+    return summarize(results, ordered)
+
+
+def _batch_timestamp(previous: Iterable[Optional[datetime]] = ()) -> datetime:
+    """
+    Horodatage d'un lot, tronqué à la milliseconde (précision des dates BSON)
+    et postérieur aux updated_at lus avant écriture : seul un document écrit
+    par le lot (ou par une écriture concurrente de la même milliseconde)
+    peut le porter.
+    """
+    now = datetime.now(timezone.utc)
+    stamp = now.replace(microsecond=now.microsecond // 1000 * 1000)
+    for value in previous:
+        if isinstance(value, datetime):
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            stamp = max(stamp, value.replace(microsecond=value.microsecond // 1000 * 1000) + timedelta(milliseconds=1))
+    return stamp
+
+
+async def _check_matched(collection: Any, results: List[dict], positions: List[int],
+                         matched: int, stamp: datetime, success: str) -> None:
+    """
+    Signale « not_found » les opérations qui n'ont trouvé aucun document.
+
+    bulk_write ne donne que des totaux : quand moins de documents ont été
+    trouvés que d'opérations réussies (enregistrement supprimé ou modifié
+    entre la lecture et l'écriture), les documents portant l'horodatage du
+    lot sont relus pour savoir lesquels ont été écrits.
+    """
+    written = [position for position in positions if results[position]["status"] == success]
+    if matched >= len(written):
+        return
+    query = {"public_id": {"$in": [results[position]["public_id"] for position in written]},
+             "updated_at": stamp}
+    applied = {document["public_id"] async for document in collection.find(query, {"public_id": 1, "_id": 0})}
+    for position in written:
+        if results[position]["public_id"] not in applied:
+            results[position]["status"] = NOT_FOUND
+
+
+async def bulk_update(collection: Any, model: Type, endpoint: EndpointConfig,
+                      items: List[Any], user: Optional[Any], role: UserRole,
+                      ordered: bool = True, on_written: Optional[OnWritten] = None) -> dict:
+    """
+    Met à jour un lot d'enregistrements ({"public_id": ..., "data": {...}}).
+
+    on_written reçoit les documents effectivement modifiés par ce lot.
+
+    Returns:
+        dict: Résumé et résultat de chaque élément
+    """
+    entries = [
+        (item.get("public_id"), item.get("data")) if isinstance(item, dict) else (None, None)
+        for item in items
+    ]
+
+    def build_update(data: Any, owner: bool) -> dict:
+        if not isinstance(data, dict) or not data:
+            raise ItemError("data doit être un objet non vide.")
+        return prepare_update(model, data, role, owner)
+
+    return await _bulk_modify(collection, endpoint, user, role, entries, ordered, build_update, UPDATED,
+                              on_written, model)
+
+
+async def bulk_soft_delete(collection: Any, endpoint: EndpointConfig, public_ids: List[Any],
+                           user: Optional[Any], role: UserRole, ordered: bool = True,
+                           on_written: Optional[OnWritten] = None, model: Optional[Type] = None) -> dict:
+    """
+    Supprime (soft delete) un lot d'enregistrements.
+
+    on_written reçoit les documents effectivement supprimés par ce lot.
+
+    Returns:
+        dict: Résumé et résultat de chaque élément
+    """
+    entries = [(public_id, None) for public_id in public_ids]
+    return await _bulk_modify(
+        collection, endpoint, user, role, entries, ordered,
+        lambda data, owner: soft_delete_update(), DELETED, on_written, model)
@@ -0,0 +1,182 @@
+"""
+Export en flux des collections (NDJSON ou CSV).
+
+Les documents sont lus par un curseur motor trié sur _id, par lots de taille
+bornée : un seul lot est en mémoire à la fois et chaque lot encodé n'est
+produit qu'une fois le précédent envoyé au client. La mémoire utilisée ne
+dépend donc pas de la taille de la collection.
+
+Après chaque lot, un jeton de reprise chiffré (dernier _id exporté) est émis :
+une ligne {"_cursor": ...} en NDJSON, la colonne _cursor de la dernière
+ligne du lot en CSV. Un export interrompu reprend avec ?cursor=<jeton>, sans
+doublon ni trou.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from pymongo import ASCENDING
+
+from app.config.user_roles import UserRole
+from app.core.exceptions import BadRequestError
+from app.db.base import PRIMARY_KEY
+from app.services.pagination import decode_cursor, encode_cursor
+from app.services.permissions import readable_masks
+from app.utils.formatters import SerializerFactory
+
+# Formats disponibles : { format: media type }
+EXPORT_FORMATS: Dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+DEFAULT_BATCH_SIZE = 500
+MAX_BATCH_SIZE = 5000
+
+CURSOR_FIELD = "_cursor"
+
+Serializer = Callable[[dict], dict]
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_record(record: dict) -> str:
+    """Encode un enregistrement sur une ligne JSON."""
+    return json.dumps(record, default=_json_default, ensure_ascii=False, separators=(",", ":"))
+
+
+def _csv_value(value: Any) -> Any:
+    """Valeur d'une cellule CSV : les listes et objets sont encodés en JSON."""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=_json_default, ensure_ascii=False)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def export_columns(model: Type, role: UserRole, requested: Optional[Iterable[str]] = None) -> Tuple[str, ...]:
+    """
+    Colonnes d'un export CSV : champs lisibles par le rôle (propriétaire inclus).
+
+    Args:
+        model: Classe du modèle
+        role: Rôle effectif de l'appelant
+        requested: Champs demandés (?fields=), None pour tous
+
+    Returns:
+        Tuple[str, ...]: Noms des colonnes, dans l'ordre du modèle
+    """
+    mask, owner_mask = readable_masks(model, role, True, requested)
+    return SerializerFactory.visible_fields(model, mask | owner_mask)
+
+
+# ---------------------------------------------------------------------------
+# Reprise
+# ---------------------------------------------------------------------------
+
+def _scope(model: Type) -> List[str]:
+    return [model.__collection__, "export"]
+
+
+def resume_token(model: Type, last_id: Any) -> str:
+    """Jeton de reprise pointant après le document last_id."""
+    return encode_cursor({"s": _scope(model), "i": last_id})
+
+
+def resume_filter(model: Type, query: dict, token: Optional[str]) -> dict:
+    """
+    Ajoute au filtre la position d'un jeton de reprise.
+
+    Raises:
+        BadRequestError: Si le jeton est invalide ou émis pour un autre modèle
+    """
+    if not token:
+        return query
+    payload = decode_cursor(token)
+    if payload.get("s") != _scope(model):
+        raise BadRequestError("Curseur émis pour une autre requête.")
+    bound = {PRIMARY_KEY: {"$gt": payload["i"]}}
+    return {"$and": [query, bound]} if query else bound
+
+
+# ---------------------------------------------------------------------------
+# Flux
+# ---------------------------------------------------------------------------
+
+async def iter_batches(collection: Any, query: dict, projection: Optional[dict],
+                       batch_size: int) -> AsyncIterator[List[dict]]:
+    """
+    Parcourt la requête par lots de batch_size documents, triés sur _id.
+
+    Le curseur motor lit lui aussi par lots de batch_size : le serveur ne
+    renvoie jamais plus d'un lot d'avance.
+    """
+    cursor = collection.find(query, projection).sort(PRIMARY_KEY, ASCENDING).batch_size(batch_size)
+    batch: List[dict] = []
+    async for document in cursor:
+        batch.append(document)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _rows(batch: List[dict], serialize: Serializer,
+          accept: Optional[Callable[[dict], bool]]) -> List[dict]:
+    return [serialize(document) for document in batch if accept is None or accept(document)]
+
+
+async def stream_ndjson(model: Type, batches: AsyncIterator[List[dict]], serialize: Serializer,
+                        accept: Optional[Callable[[dict], bool]] = None) -> AsyncIterator[str]:
+    """
+    Encode les lots en NDJSON, une ligne de reprise après chaque lot.
+
+    Args:
+        model: Classe du modèle
+        batches: Lots de documents bruts (voir iter_batches)
+        serialize: Sérialiseur des documents (champs visibles du rôle)
+        accept: Filtre supplémentaire par document (fonction d'accès personnalisée)
+    """
+    async for batch in batches:
+        lines = [encode_record(row) for row in _rows(batch, serialize, accept)]
+        lines.append(encode_record({CURSOR_FIELD: resume_token(model, batch[-1][PRIMARY_KEY])}))
+        yield "\n".join(lines) + "\n"
+
+
+async def stream_csv(model: Type, batches: AsyncIterator[List[dict]], serialize: Serializer,
+                     columns: Tuple[str, ...],
+                     accept: Optional[Callable[[dict], bool]] = None) -> AsyncIterator[str]:
+    """
+    Encode les lots en CSV (en-tête puis lignes), le jeton de reprise dans la
+    colonne _cursor de la dernière ligne de chaque lot.
+
+    Args:
+        model: Classe du modèle
+        batches: Lots de documents bruts (voir iter_batches)
+        serialize: Sérialiseur des documents (champs visibles du rôle)
+        columns: Colonnes de l'export (voir export_columns)
+        accept: Filtre supplémentaire par document (fonction d'accès personnalisée)
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=(*columns, CURSOR_FIELD),
+                            restval="", extrasaction="ignore")
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    async for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        rows = [{name: _csv_value(value) for name, value in row.items()}
+                for row in _rows(batch, serialize, accept)]
+        if not rows:
+            continue
+        rows[-1][CURSOR_FIELD] = resume_token(model, batch[-1][PRIMARY_KEY])
+        writer.writerows(rows)
+        yield buffer.getvalue()
@@ -0,0 +1,429 @@
+"""
+Import en flux (NDJSON ou CSV) par lots.
+
+Le fichier est lu et analysé au fil de l'eau, jamais chargé en entier. Le
+traitement est un pipeline à trois étages reliés par des files bornées :
+
+    lecture / analyse -> validation (ModelData) -> écriture (insert_many)
+
+La validation du lot N+1 avance pendant l'écriture du lot N. Quand la base
+écrit moins vite que la validation, les files se remplissent et l'étage
+amont attend : au plus queue_size lots sont en attente entre deux étages.
+
+Chaque ligne est validée comme une création unitaire (voir
+app.services.crud.prepare_create) : champs modifiables du rôle, fonction
+d'accès personnalisée, created_by et owner_id de l'appelant. Les champs
+système éventuellement présents (export relu) sont ignorés : l'import crée
+toujours de nouveaux enregistrements. Les lignes refusées sont rapportées
+avec leur numéro de ligne dans le fichier.
+
+Suivi d'un import :
+    - chaque import est un job de la collection import_jobs (statut et
+      compteurs), mis à jour après chaque lot via on_progress (voir
+      save_job) : il se consulte pendant l'import ;
+    - le rapport ne détaille que les MAX_REPORTED_ERRORS premières
+      erreurs ; toutes sont copiées, lot par lot, dans import_errors ;
+    - une erreur autre qu'un refus de ligne (base indisponible...) arrête
+      l'import : ImportFailed porte alors le rapport partiel (lignes déjà
+      écrites, erreurs déjà rapportées).
+
+Jobs et erreurs expirent IMPORT_RETENTION secondes (défaut 7 jours) après
+la dernière mise à jour.
+"""
+import asyncio
+import csv
+import inspect
+import json
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterable, AsyncIterator, Callable, List, Optional, Tuple, Type
+
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from app.config.endpoint_config import EndpointConfig
+from app.config.user_roles import UserRole
+from app.models.model_data import SYSTEM_FIELDS
+from app.services import crud
+from app.services.export import CURSOR_FIELD
+
+IMPORT_FORMATS = ("ndjson", "csv")
+
+DEFAULT_BATCH_SIZE = 500
+MAX_BATCH_SIZE = 5000
+
+# Lots en attente entre deux étages du pipeline
+DEFAULT_QUEUE_SIZE = 4
+
+# Erreurs détaillées dans le rapport (les suivantes sont seulement comptées)
+MAX_REPORTED_ERRORS = 1000
+
+IMPORT_JOBS_COLLECTION = "import_jobs"
+IMPORT_ERRORS_COLLECTION = "import_errors"
+IMPORT_RETENTION = int(os.getenv("IMPORT_RETENTION", str(7 * 24 * 3600)))
+
+# Statuts d'un import
+RUNNING, COMPLETED, FAILED = "running", "completed", "failed"
+
+# Colonnes ignorées à l'import
+IGNORED_FIELDS = SYSTEM_FIELDS | {CURSOR_FIELD}
+
+# Ligne analysée : (numéro de ligne, données, erreur d'analyse)
+ParsedRow = Tuple[int, Optional[dict], Optional[str]]
+
+
+class ImportReport:
+    """
+    Progression et résultat d'un import.
+
+    Attributs:
+        import_id: Identifiant du job (import_jobs, import_errors)
+        status: running, completed ou failed
+        error: Cause de l'arrêt d'un import failed
+        rows: Lignes traitées
+        inserted: Enregistrements créés
+        failed: Lignes refusées
+        errors: Détail des premières erreurs ({"row", "error"})
+    """
+
+    def __init__(self, import_id: Optional[str] = None):
+        self.import_id = import_id or uuid.uuid4().hex
+        self.status = RUNNING
+        self.error: Optional[str] = None
+        self.rows = 0
+        self.inserted = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+        # Erreurs pas encore copiées dans import_errors
+        self._unsaved: List[dict] = []
+
+    def fail(self, row: int, error: str) -> None:
+        """Enregistre le refus d'une ligne."""
+        self.failed += 1
+        entry = {"row": row, "error": error}
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(entry)
+        self._unsaved.append(entry)
+
+    def take_unsaved(self) -> List[dict]:
+        """Retourne et oublie les erreurs pas encore copiées."""
+        unsaved, self._unsaved = self._unsaved, []
+        return unsaved
+
+    def summary(self) -> dict:
+        """Statut et compteurs (sans le détail des erreurs)."""
+        return {
+            "import_id": self.import_id,
+            "status": self.status,
+            "error": self.error,
+            "rows": self.rows,
+            "inserted": self.inserted,
+            "failed": self.failed,
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            **self.summary(),
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+class ImportFailed(Exception):
+    """
+    Import arrêté par une erreur autre qu'un refus de ligne.
+
+    Attributs:
+        report: Rapport partiel (status failed)
+    """
+
+    def __init__(self, report: ImportReport):
+        super().__init__(report.error)
+        self.report = report
+
+
+# ---------------------------------------------------------------------------
+# Jobs et erreurs
+# ---------------------------------------------------------------------------
+
+def import_jobs_indexes() -> List[IndexModel]:
+    """Index de import_jobs : purge TTL."""
+    return [IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="ttl_expires_at")]
+
+
+def import_errors_indexes() -> List[IndexModel]:
+    """Index de import_errors : lecture paginée par job (row, _id), purge TTL."""
+    return [
+        IndexModel([("import_id", ASCENDING), ("row", ASCENDING), ("_id", ASCENDING)], name="import_row"),
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="ttl_expires_at"),
+    ]
+
+
+def _expires_at() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=IMPORT_RETENTION)
+
+
+async def start_job(collection: Any, report: ImportReport, model: str, user: Optional[Any]) -> None:
+    """
+    Crée le job d'un import.
+
+    Raises:
+        DuplicateKeyError: Si un job porte déjà cet identifiant
+    """
+    now = datetime.now(timezone.utc)
+    await collection.insert_one({
+        "_id": report.import_id,
+        **report.summary(),
+        "model": model,
+        "actor": user.internal_id if user is not None else None,
+        "started_at": now,
+        "updated_at": now,
+        "expires_at": _expires_at(),
+    })
+
+
+async def save_job(collection: Any, report: ImportReport) -> None:
+    """Met à jour le statut et les compteurs d'un job (voir on_progress)."""
+    now = datetime.now(timezone.utc)
+    await collection.update_one(
+        {"_id": report.import_id},
+        {"$set": {**report.summary(), "updated_at": now, "expires_at": _expires_at()}})
+
+
+async def save_errors(collection: Any, report: ImportReport) -> None:
+    """Copie dans import_errors les erreurs rapportées depuis le dernier appel."""
+    unsaved = report.take_unsaved()
+    if unsaved:
+        expires_at = _expires_at()
+        await collection.insert_many(
+            [{"import_id": report.import_id, **entry, "expires_at": expires_at} for entry in unsaved],
+            ordered=False)
+
+
+# ---------------------------------------------------------------------------
+# Analyse
+# ---------------------------------------------------------------------------
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[Tuple[int, Optional[str]]]:
+    """
+    Découpe un flux d'octets en lignes numérotées.
+
+    Le découpage se fait sur les octets (un saut de ligne n'apparaît jamais
+    dans un caractère UTF-8 multi-octets) : une ligne mal encodée est
+    rapportée (None) sans interrompre l'import.
+    """
+    pending = b""
+    number = 0
+    first = True
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for raw in lines:
+            number += 1
+            if first:
+                raw, first = raw.removeprefix(b"\xef\xbb\xbf"), False
+            yield number, _decode(raw)
+    if pending:
+        if first:
+            pending = pending.removeprefix(b"\xef\xbb\xbf")
+        yield number + 1, _decode(pending)
+
+
+def _decode(raw: bytes) -> Optional[str]:
+    try:
+        return raw.decode("utf-8").rstrip("\r")
+    except UnicodeDecodeError:
+        return None
+
+
+def _clean(payload: dict) -> dict:
+    return {name: value for name, value in payload.items() if name not in IGNORED_FIELDS}
+
+
+async def parse_ndjson(chunks: AsyncIterable[bytes]) -> AsyncIterator[ParsedRow]:
+    """Analyse un flux NDJSON, un objet par ligne (lignes vides ignorées)."""
+    async for number, line in iter_lines(chunks):
+        if line is None:
+            yield number, None, "Encodage invalide (UTF-8 attendu)."
+            continue
+        if not line.strip():
+            continue
+        try:
+            payload = json.loads(line)
+        except json.JSONDecodeError as error:
+            yield number, None, f"JSON invalide : {error.msg}."
+            continue
+        if not isinstance(payload, dict):
+            yield number, None, "Chaque ligne doit être un objet."
+            continue
+        yield number, _clean(payload), None
+
+
+def _csv_value(value: str) -> Any:
+    """Valeur d'une cellule : listes et objets sont relus depuis le JSON de l'export."""
+    if value[:1] in ("[", "{"):
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            pass
+    return value
+
+
+async def parse_csv(chunks: AsyncIterable[bytes]) -> AsyncIterator[ParsedRow]:
+    """
+    Analyse un flux CSV dont la première ligne est l'en-tête.
+
+    Un enregistrement peut s'étendre sur plusieurs lignes (champ entre
+    guillemets) : les lignes sont regroupées tant que le nombre de
+    guillemets est impair. Les cellules vides sont omises (valeur par défaut
+    du modèle).
+    """
+    header: Optional[List[str]] = None
+    record: List[str] = []
+    start = 0
+    async for number, line in iter_lines(chunks):
+        if line is None:
+            yield number, None, "Encodage invalide (UTF-8 attendu)."
+            continue
+        if not record:
+            start = number
+        record.append(line)
+        if sum(part.count('"') for part in record) % 2:
+            continue
+        text, record = "\n".join(record), []
+        if not text.strip():
+            continue
+
+        values = next(csv.reader([text]))
+        if header is None:
+            header = values
+            continue
+        if len(values) != len(header):
+            yield start, None, f"{len(values)} colonnes au lieu de {len(header)}."
+            continue
+        yield start, _clean({
+            name: _csv_value(value) for name, value in zip(header, values) if value != ""}), None
+
+    if record:
+        yield start, None, "Guillemet non fermé."
+
+
+PARSERS = {"ndjson": parse_ndjson, "csv": parse_csv}
+
+
+# ---------------------------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------------------------
+
+async def import_records(
+        collection: Any,
+        model: Type,
+        endpoint: EndpointConfig,
+        chunks: AsyncIterable[bytes],
+        user: Optional[Any],
+        role: UserRole,
+        import_format: str = "ndjson",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        on_progress: Optional[Callable[[ImportReport], Any]] = None,
+        report: Optional[ImportReport] = None,
+        errors_collection: Optional[Any] = None) -> ImportReport:
+    """
+    Importe un flux NDJSON ou CSV dans la collection d'un modèle.
+
+    Args:
+        collection: Collection motor du modèle
+        model: Classe du modèle (sous-classe de ModelData)
+        endpoint: Configuration de l'endpoint (fonction d'accès personnalisée)
+        chunks: Flux d'octets du fichier (ex: request.stream())
+        user: Utilisateur qui importe (created_by, owner_id)
+        role: Rôle effectif de l'appelant
+        import_format: "ndjson" ou "csv"
+        batch_size: Lignes par lot validé et écrit
+        queue_size: Lots en attente entre deux étages
+        on_progress: Appelé (ou attendu s'il est asynchrone) avec le rapport
+            après chaque lot
+        report: Rapport à compléter (défaut : nouveau rapport)
+        errors_collection: Collection où copier toutes les erreurs, lot
+            par lot (voir save_errors)
+
+    Returns:
+        ImportReport: Compteurs et erreurs par ligne
+
+    Raises:
+        ImportFailed: Si une erreur autre qu'un refus de ligne arrête
+            l'import (rapport partiel)
+    """
+    report = report if report is not None else ImportReport()
+    parsed: asyncio.Queue = asyncio.Queue(queue_size)
+    validated: asyncio.Queue = asyncio.Queue(queue_size)
+
+    async def read() -> None:
+        rows: List[ParsedRow] = []
+        async for row in PARSERS[import_format](chunks):
+            rows.append(row)
+            if len(rows) >= batch_size:
+                await parsed.put(rows)
+                rows = []
+        if rows:
+            await parsed.put(rows)
+        await parsed.put(None)
+
+    async def validate() -> None:
+        while (rows := await parsed.get()) is not None:
+            documents, numbers = [], []
+            for number, payload, error in rows:
+                report.rows += 1
+                if error is None:
+                    try:
+                        documents.append(crud.prepare_create(model, endpoint, payload, user, role))
+                        numbers.append(number)
+                        continue
+                    except crud.ItemError as item_error:
+                        error = str(item_error)
+                report.fail(number, error)
+            # Un lot entièrement refusé est transmis aussi : ses erreurs sont
+            # copiées et la progression rapportée
+            await validated.put((documents, numbers))
+            # La validation ne rend pas la main d'elle-même tant que la file
+            # n'est pas pleine : l'écriture en cours doit pouvoir avancer
+            await asyncio.sleep(0)
+        await validated.put(None)
+
+    async def write() -> None:
+        while (batch := await validated.get()) is not None:
+            documents, numbers = batch
+            errors = {}
+            if documents:
+                try:
+                    await collection.insert_many(documents, ordered=False)
+                except BulkWriteError as error:
+                    errors = crud.write_errors(error)
+            for index, message in errors.items():
+                report.fail(numbers[index], message)
+            report.inserted += len(documents) - len(errors)
+            if errors_collection is not None:
+                await save_errors(errors_collection, report)
+            if on_progress is not None:
+                progress = on_progress(report)
+                if inspect.isawaitable(progress):
+                    await progress
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            group.create_task(read())
+            group.create_task(validate())
+            group.create_task(write())
+    except ExceptionGroup as failure:
+        # Première cause : les autres étages sont annulés par le TaskGroup
+        error = failure.exceptions[0]
+        report.status, report.error = FAILED, f"{type(error).__name__}: {error}"
+        if errors_collection is not None:
+            try:
+                await save_errors(errors_collection, report)
+            except PyMongoError:
+                pass
+        raise ImportFailed(report) from error
+    report.status = COMPLETED
+    return report
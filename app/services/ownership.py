@@ -0,0 +1,57 @@
+"""
+Services de propriété : restriction des requêtes aux enregistrements accessibles.
+
+Plutôt que de charger un enregistrement puis d'appeler is_owned_by, la règle
+de propriété (UserRole.USER) et les règles d'accès personnalisées
+(EndpointConfig.access_filter : équipe, hiérarchie...) sont compilées dans le
+filtre MongoDB. Seuls les documents accessibles sont lus et comptés ; avec
+l'index composé partiel (owner_id, clé de tri, _id), une liste « mes
+enregistrements » devient un simple parcours de plage d'index.
+"""
+from typing import Any, List, Optional, Type
+
+from pymongo import IndexModel
+
+from app.config.endpoint_config import EndpointConfig
+from app.config.user_roles import UserRole
+from app.core.permissions import requires_ownership
+from app.services.pagination import ACTIVE_FILTER, keyset_indexes
+
+
+def access_query(
+        endpoint: EndpointConfig,
+        user: Optional[Any],
+        role: UserRole,
+        query: Optional[dict] = None,
+        include_inactive: bool = False) -> dict:
+    """
+    Construit le filtre MongoDB des enregistrements accessibles à l'appelant.
+
+    Args:
+        endpoint: Configuration de l'endpoint
+        user: Utilisateur authentifié ou None
+        role: Rôle effectif de l'appelant
+        query: Critères propres à la requête (ex: public_id)
+        include_inactive: True pour inclure les enregistrements supprimés
+            (administration : export, restauration)
+
+    Returns:
+        dict: Filtre combinant critères, is_active, propriété et règles d'accès
+    """
+    scoped = {} if include_inactive else dict(ACTIVE_FILTER)
+    if query:
+        scoped.update(query)
+    if requires_ownership(endpoint, role):
+        # Égalités placées en tête : elles suivent l'ordre de l'index composé
+        scoped = {"owner_id": user.internal_id, **scoped}
+    if endpoint.access_filter is not None:
+        scoped = {"$and": [scoped, endpoint.access_filter(user)]}
+    return scoped
+
+
+def ownership_indexes(model: Type) -> List[IndexModel]:
+    """
+    Index composés partiels (owner_id, clé de tri, _id) des listes
+    restreintes au propriétaire.
+    """
+    return keyset_indexes(model, equality_fields=("owner_id",))
@@ -0,0 +1,271 @@
+"""
+Pagination par curseur (keyset) des listes d'entités.
+
+Chaque page est lue par une requête de plage sur un index (clé de tri, _id)
+au lieu de skip() : la page N+1000 coûte autant que la première. La position
+est transmise au client sous forme de curseur opaque chiffré et authentifié
+(AES-256-GCM), lié à la collection et au tri pour lesquels il a été émis : le
+client ne peut ni le falsifier ni lire la clé de tri et l'_id qu'il contient,
+même s'il n'a pas accès à ces champs.
+
+La clé est dérivée de CURSOR_SECRET (ou SECRET_KEY). À défaut, un secret
+aléatoire est généré par processus : les curseurs ne sont alors pas valides
+d'un worker à l'autre.
+"""
+import base64
+import hashlib
+import json
+import os
+import secrets
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Type, get_args, get_origin
+
+from bson import json_util
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from app.config.permissions_config import PermissionsRegister
+from app.config.user_roles import UserRole
+from app.core.exceptions import BadRequestError
+from app.db.base import PRIMARY_KEY, field_keys, odm_fields
+
+CURSOR_SECRET = (
+    os.getenv("CURSOR_SECRET") or os.getenv("SECRET_KEY") or secrets.token_hex(32)
+).encode("utf-8")
+
+# Clé AES-256 des curseurs (dérivée : le secret peut être de toute longueur)
+_CURSOR_CIPHER = AESGCM(hashlib.sha256(b"cursor:" + CURSOR_SECRET).digest())
+
+# Taille du nonce AES-GCM (octets)
+_NONCE_SIZE = 12
+
+DEFAULT_SORT = "-created_at"
+
+# Filtre de base de toutes les lectures : enregistrements non supprimés
+ACTIVE_FILTER = {"is_active": True}
+
+# Champs toujours triables en plus des champs indexés du modèle
+TIMESTAMP_FIELDS = ("created_at", "updated_at")
+
+_sortable_cache: Dict[Type, FrozenSet[str]] = {}
+
+
+def sortable_fields(model: Type) -> FrozenSet[str]:
+    """
+    Retourne les champs utilisables comme clé de tri.
+
+    Seuls les horodatages et les champs indexés non optionnels et scalaires
+    sont retenus : une clé nulle ou multiple ne peut pas servir de borne, et
+    un booléen (is_active...) ne départage rien.
+
+    Args:
+        model: Classe du modèle
+
+    Returns:
+        FrozenSet[str]: Noms des champs triables
+    """
+    try:
+        return _sortable_cache[model]
+    except KeyError:
+        pass
+
+    fields = set(name for name in TIMESTAMP_FIELDS if name in model.model_fields)
+    for name, field in odm_fields(model).items():
+        if not (getattr(field, "index", False) or getattr(field, "unique", False)):
+            continue
+        annotation = model.model_fields[name].annotation
+        if annotation is bool or type(None) in get_args(annotation):
+            continue
+        if get_origin(annotation) in (list, set, tuple, dict):
+            continue
+        fields.add(name)
+
+    _sortable_cache[model] = frozenset(fields)
+    return _sortable_cache[model]
+
+
+def parse_sort(model: Type, sort: Optional[str], role: UserRole) -> Tuple[str, int]:
+    """
+    Interprète le paramètre ?sort=champ ou ?sort=-champ (décroissant).
+
+    L'ordre des résultats révèle celui de la clé de tri : un tri explicite
+    n'est accepté que sur un champ lisible par le rôle de l'appelant (le
+    curseur, chiffré, ne révèle pas sa valeur).
+
+    Returns:
+        Tuple[str, int]: (nom du champ, ASCENDING ou DESCENDING)
+
+    Raises:
+        BadRequestError: Si le champ n'est pas triable
+    """
+    explicit = bool(sort)
+    sort = sort or DEFAULT_SORT
+    direction = DESCENDING if sort.startswith("-") else ASCENDING
+    name = sort.lstrip("-+")
+    allowed = sortable_fields(model)
+    if explicit:
+        allowed = frozenset(
+            field for field in allowed if PermissionsRegister.has_access(model, role, field))
+    if name not in allowed:
+        raise BadRequestError(
+            f"Tri impossible sur '{name}'. Champs triables : {', '.join(sorted(allowed))}.")
+    return name, direction
+
+
+# ---------------------------------------------------------------------------
+# Curseurs chiffrés
+# ---------------------------------------------------------------------------
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """Sérialise et chiffre un curseur (valeurs BSON acceptées)."""
+    raw = json_util.dumps(payload, separators=(",", ":")).encode("utf-8")
+    nonce = secrets.token_bytes(_NONCE_SIZE)
+    return _b64encode(nonce + _CURSOR_CIPHER.encrypt(nonce, raw, None))
+
+
+def decode_cursor(token: str) -> Dict[str, Any]:
+    """
+    Déchiffre un curseur, vérifie son intégrité et retourne son contenu.
+
+    Raises:
+        BadRequestError: Si le curseur est mal formé ou falsifié
+    """
+    try:
+        data = _b64decode(token)
+        raw = _CURSOR_CIPHER.decrypt(data[:_NONCE_SIZE], data[_NONCE_SIZE:], None)
+    except (ValueError, InvalidTag):
+        raise BadRequestError("Curseur invalide.")
+    try:
+        return json_util.loads(raw)
+    except (ValueError, json.JSONDecodeError):
+        raise BadRequestError("Curseur invalide.")
+
+
+# ---------------------------------------------------------------------------
+# Requêtes keyset
+# ---------------------------------------------------------------------------
+
+class Keyset:
+    """
+    Requête keyset d'une page d'une collection sur (clé de tri, _id).
+
+    Attributs:
+        collection_name: Collection lue (le curseur y est lié)
+        key: Clé MongoDB de tri
+        field: Nom du champ de tri lié au curseur (défaut : key)
+        direction: ASCENDING ou DESCENDING
+        limit: Taille de page
+    """
+
+    def __init__(self, collection_name: str, key: str, direction: int, limit: int,
+                 field: Optional[str] = None):
+        self.collection_name = collection_name
+        self.key = key
+        self.field = field or key
+        self.direction = direction
+        self.limit = limit
+
+    @property
+    def sort(self) -> List[Tuple[str, int]]:
+        """Spécification de tri, _id départageant les égalités."""
+        return [(self.key, self.direction), (PRIMARY_KEY, self.direction)]
+
+    def _scope(self) -> List[Any]:
+        return [self.collection_name, self.field, self.direction]
+
+    def filter(self, query: dict, cursor: Optional[str]) -> dict:
+        """
+        Ajoute au filtre la borne du curseur (aucune borne pour la 1re page).
+
+        Raises:
+            BadRequestError: Si le curseur a été émis pour un autre tri ou modèle
+        """
+        if not cursor:
+            return query
+        payload = decode_cursor(cursor)
+        if payload.get("s") != self._scope():
+            raise BadRequestError("Curseur émis pour une autre requête.")
+
+        operator = "$gt" if self.direction == ASCENDING else "$lt"
+        value, last_id = payload["v"], payload["i"]
+        bound = {"$or": [
+            {self.key: {operator: value}},
+            {self.key: value, PRIMARY_KEY: {operator: last_id}},
+        ]}
+        return {"$and": [query, bound]} if query else bound
+
+    def next_cursor(self, last_document: dict) -> str:
+        """Curseur pointant après le dernier document de la page."""
+        return encode_cursor({
+            "s": self._scope(),
+            "v": last_document[self.key],
+            "i": last_document[PRIMARY_KEY],
+        })
+
+    async def fetch(self, collection: Any, query: dict, projection: Optional[dict],
+                    cursor: Optional[str]) -> Tuple[List[dict], Optional[str]]:
+        """
+        Lit une page (limit + 1 documents pour savoir s'il y a une suite).
+
+        Returns:
+            Tuple[List[dict], Optional[str]]: documents de la page et curseur
+            suivant (None en fin de liste)
+        """
+        documents = await collection.find(self.filter(query, cursor), projection) \
+            .sort(self.sort).limit(self.limit + 1).to_list(self.limit + 1)
+        if len(documents) <= self.limit:
+            return documents, None
+        documents = documents[:self.limit]
+        return documents, self.next_cursor(documents[-1])
+
+
+class KeysetPage(Keyset):
+    """
+    Requête keyset d'une page d'un modèle sur (champ de tri, _id).
+
+    Attributs:
+        model: Classe du modèle
+    """
+
+    def __init__(self, model: Type, field: str, direction: int, limit: int):
+        super().__init__(model.__collection__, field_keys(model)[field], direction, limit, field)
+        self.model = model
+
+    @property
+    def required_fields(self) -> Tuple[str, ...]:
+        """Champs à projeter pour pouvoir émettre le curseur suivant."""
+        return (self.field, "internal_id")
+
+
+def keyset_indexes(model: Type, equality_fields: Tuple[str, ...] = ()) -> List[IndexModel]:
+    """
+    Index composés servant la pagination des enregistrements actifs.
+
+    Un index (égalités..., clé, _id) par champ triable : les égalités
+    (owner_id...) précèdent la plage sur la clé, la lecture est un simple
+    parcours d'index. Les index sont partiels (is_active: true) : toutes les
+    listes filtrent les enregistrements actifs, les enregistrements supprimés
+    n'occupent ni disque ni mémoire d'index.
+
+    Args:
+        model: Classe du modèle
+        equality_fields: Champs filtrés par égalité, dans l'ordre de l'index
+    """
+    keys = field_keys(model)
+    prefix = [(keys[name], ASCENDING) for name in equality_fields]
+    indexes = []
+    for name in sorted(sortable_fields(model)):
+        key = keys[name]
+        indexes.append(IndexModel(
+            prefix + [(key, ASCENDING), (PRIMARY_KEY, ASCENDING)],
+            name="_".join(["keyset", *(keys[field] for field in equality_fields), "active", key]),
+            partialFilterExpression=ACTIVE_FILTER))
+    return indexes
@@ -0,0 +1,169 @@
+"""
+Services de permissions appliqués aux lectures MongoDB.
+
+Les champs qu'un rôle ne peut jamais voir (hashed_password, profile,
+internal_id...) sont exclus dès la requête grâce à une projection construite
+à partir des masques de PermissionsRegister : ils ne quittent pas la base et
+ne sont ni décodés ni validés.
+"""
+from typing import Any, Callable, Dict, FrozenSet, Iterable, NamedTuple, Optional, Tuple, Type
+
+from app.config.endpoint_config import EndpointConfig
+from app.config.permissions_config import PermissionsRegister, WritePermissionsRegister
+from app.config.user_roles import UserRole
+from app.core.permissions import is_owner, requires_ownership
+from app.db.base import PRIMARY_KEY, field_keys
+from app.models.model_data import SYSTEM_FIELDS
+from app.utils.formatters import SerializerFactory
+
+# _projection_cache maps: { (model, mask, extra_keys): projection }
+_projection_cache: Dict[Tuple[Type, int, Tuple[str, ...]], dict] = {}
+
+
+def readable_masks(
+        model: Type,
+        role: UserRole,
+        authenticated: bool,
+        requested: Optional[Iterable[str]] = None) -> Tuple[int, int]:
+    """
+    Retourne les masques lisibles par l'appelant.
+
+    Args:
+        model: Classe du modèle
+        role: Rôle effectif de l'appelant
+        authenticated: False pour un appel anonyme (jamais propriétaire)
+        requested: Champs demandés (?fields=), None pour tous
+
+    Returns:
+        Tuple[int, int]: (masque hors propriété, masque du propriétaire)
+    """
+    mask = SerializerFactory.effective_mask(model, role, owner=False)
+    owner_mask = SerializerFactory.effective_mask(model, role, owner=True) if authenticated else mask
+    if requested is not None:
+        requested_mask = PermissionsRegister.mask_of(requested)
+        mask &= requested_mask
+        owner_mask &= requested_mask
+    return mask, owner_mask
+
+
+def writable_fields(model: Type, role: UserRole, owner: bool = True) -> FrozenSet[str]:
+    """
+    Champs qu'un appelant peut renseigner en écriture.
+
+    Les champs modifiables sont déclarés à part (WritePermissions, voir
+    WritePermissionsRegister) : un champ lisible n'est pas modifiable pour
+    autant (roles, is_verified, last_login...). Un appelant n'écrit que les
+    champs déclarés pour son rôle (et pour UserRole.USER s'il est
+    propriétaire) qu'il peut aussi lire, hors champs système de ModelData
+    (identifiants, horodatages, propriété, soft delete).
+
+    Args:
+        model: Classe du modèle
+        role: Rôle effectif de l'appelant
+        owner: True si l'appelant est (ou deviendra) propriétaire
+
+    Returns:
+        FrozenSet[str]: Noms des champs modifiables
+    """
+    write_mask = WritePermissionsRegister.get_mask(model, role)
+    if owner:
+        write_mask |= WritePermissionsRegister.get_mask(model, UserRole.USER)
+    mask = SerializerFactory.effective_mask(model, role, owner) & write_mask
+    return frozenset(SerializerFactory.visible_fields(model, mask)) - SYSTEM_FIELDS
+
+
+def build_projection(model: Type, mask: int, extra_fields: Iterable[str] = ()) -> dict:
+    """
+    Construit la projection MongoDB des champs d'un masque.
+
+    Args:
+        model: Classe du modèle
+        mask: Masque des champs à lire
+        extra_fields: Champs nécessaires au traitement mais non exposés
+            (ex: owner_id pour décider de la propriété)
+
+    Returns:
+        dict: Projection en inclusion ({clé: 1}), _id exclu s'il n'est pas demandé
+    """
+    keys = field_keys(model)
+    extra = tuple(keys[name] for name in extra_fields if name in keys)
+    cache_key = (model, mask, extra)
+    try:
+        return _projection_cache[cache_key]
+    except KeyError:
+        pass
+
+    projection = {
+        keys[name]: 1 for name in SerializerFactory.visible_fields(model, mask)}
+    for key in extra:
+        projection[key] = 1
+    if not projection:
+        # Une projection vide renverrait le document complet
+        projection[PRIMARY_KEY] = 1
+    elif PRIMARY_KEY not in projection:
+        projection[PRIMARY_KEY] = 0
+
+    _projection_cache[cache_key] = projection
+    return projection
+
+
+class ReadPlan(NamedTuple):
+    """Projection MongoDB et sérialiseur d'une lecture."""
+
+    projection: Optional[dict]
+    serialize: Callable[[dict], dict]
+
+
+def plan_read(
+        model: Type,
+        endpoint: EndpointConfig,
+        user: Optional[Any],
+        role: UserRole,
+        requested: Optional[Iterable[str]] = None,
+        extra_fields: Iterable[str] = ()) -> ReadPlan:
+    """
+    Prépare la projection et la sérialisation d'une lecture.
+
+    Les champs visibles par le seul propriétaire sont projetés dès qu'un
+    utilisateur est connecté, avec owner_id, puis le sérialiseur est choisi
+    document par document. Quand la propriété est imposée par le filtre de
+    la requête (UserRole.USER), tous les documents lus appartiennent à
+    l'appelant : le sérialiseur du propriétaire est utilisé directement.
+    Une fonction d'accès personnalisée reçoit le document complet : aucune
+    projection n'est alors appliquée.
+
+    Args:
+        model: Classe du modèle
+        endpoint: Configuration de l'endpoint
+        user: Utilisateur authentifié ou None
+        role: Rôle effectif de l'appelant
+        requested: Champs demandés (?fields=), None pour tous
+        extra_fields: Champs à lire sans les exposer (ex: clé de pagination)
+
+    Returns:
+        ReadPlan: Projection (None pour le document complet) et sérialiseur
+    """
+    mask, owner_mask = readable_masks(model, role, user is not None, requested)
+    extra_fields = tuple(extra_fields)
+
+    if requires_ownership(endpoint, role):
+        mask = owner_mask
+    elif owner_mask != mask:
+        extra_fields += ("owner_id",)
+
+    projection = None
+    if endpoint.custom_auth_function is None:
+        projection = build_projection(model, mask | owner_mask, extra_fields)
+
+    serialize = SerializerFactory.document_for_mask(model, mask)
+    if owner_mask == mask:
+        return ReadPlan(projection, serialize)
+
+    serialize_owned = SerializerFactory.document_for_mask(model, owner_mask)
+
+    def serialize_for_caller(document: dict) -> dict:
+        if is_owner(user, document):
+            return serialize_owned(document)
+        return serialize(document)
+
+    return ReadPlan(projection, serialize_for_caller)
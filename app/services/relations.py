@@ -0,0 +1,193 @@
+"""
+Expansion des relations entre modèles (?expand=owner_id,created_by).
+
+Un modèle déclare ses relations par son attribut de classe relations
+({champ: nom du modèle lié}, voir ModelData). Expanser une relation remplace
+l'ObjectId du champ par le résumé de l'enregistrement lié, limité aux champs
+que l'appelant peut lire sur le modèle lié (PermissionsRegister), comme une
+lecture de ce modèle par le routeur dynamique.
+
+Sans regroupement, une page de 100 lignes coûterait une requête par ligne et
+par relation. RelationLoader regroupe les chargements à la manière d'un
+DataLoader : les identifiants demandés pendant un même tour de boucle sont
+lus en une seule requête $in par modèle lié, et chaque enregistrement n'est
+lu qu'une fois par requête HTTP (mémoïsation). Le chargeur est créé par
+requête (dépendance get_relation_loader) : rien n'est partagé entre
+appelants.
+"""
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+from bson import ObjectId
+
+from app.config.endpoint_config import EndpointConfig
+from app.config.permissions_config import PermissionsRegister
+from app.core.exceptions import ValidationFailedError
+from app.core.permissions import resolve_role
+from app.db.base import PRIMARY_KEY, field_keys, model_subclasses
+from app.services.pagination import ACTIVE_FILTER
+from app.services.permissions import ReadPlan, plan_read, readable_masks
+
+# Lecture des enregistrements liés : endpoint par défaut (utilisateurs connectés)
+RELATED_ENDPOINT = EndpointConfig()
+
+# _models_cache maps: { nom du modèle: classe }
+_models_cache: Dict[str, Type] = {}
+
+
+def related_model(name: str) -> Type:
+    """
+    Classe d'un modèle lié, par nom (ModelData ou l'une de ses sous-classes).
+
+    Raises:
+        LookupError: Si aucun modèle ne porte ce nom
+    """
+    try:
+        return _models_cache[name]
+    except KeyError:
+        pass
+    from app.models.model_data import ModelData
+    from app.models.user import User  # noqa: F401 (sous-classe à enregistrer)
+
+    for model in [ModelData, *model_subclasses(ModelData)]:
+        _models_cache.setdefault(model.__name__, model)
+    try:
+        return _models_cache[name]
+    except KeyError:
+        raise LookupError(f"Modèle inconnu : {name}.") from None
+
+
+def relations(model: Type) -> Dict[str, Type]:
+    """Relations d'un modèle : {champ: modèle lié}."""
+    return {name: related_model(target) for name, target in getattr(model, "relations", {}).items()}
+
+
+def parse_expand(model: Type, role: Any, authenticated: bool, expand: Optional[str],
+                 requested: Optional[Iterable[str]] = None) -> Tuple[str, ...]:
+    """
+    Valide le paramètre ?expand=a,b.
+
+    Seules les relations dont le champ est lisible par l'appelant (y compris
+    en tant que propriétaire) peuvent être expansées.
+
+    Raises:
+        ValidationFailedError: Si un champ n'est pas une relation lisible
+    """
+    if not expand:
+        return ()
+    declared = getattr(model, "relations", {})
+    _, owner_mask = readable_masks(model, role, authenticated, requested)
+    fields = []
+    for name in (part.strip() for part in expand.split(",")):
+        if not name or name in fields:
+            continue
+        if name not in declared or not owner_mask & PermissionsRegister.mask_of((name,)):
+            raise ValidationFailedError(f"Relation inconnue : {name}.")
+        fields.append(name)
+    return tuple(fields)
+
+
+class RelationLoader:
+    """
+    Chargeur d'enregistrements liés d'une requête HTTP, par lots.
+
+    Attributs:
+        queries: Nombre de requêtes MongoDB émises
+    """
+
+    def __init__(self, engine: Any, user: Optional[Any]):
+        self.engine = engine
+        self.user = user
+        self.role = resolve_role(user)
+        self.queries = 0
+        self._futures: Dict[Tuple[Type, ObjectId], asyncio.Future] = {}
+        self._pending: Dict[Type, List[ObjectId]] = {}
+        self._plans: Dict[Type, ReadPlan] = {}
+        self._dispatching: Optional[asyncio.Task] = None
+
+    def _plan(self, model: Type) -> ReadPlan:
+        try:
+            return self._plans[model]
+        except KeyError:
+            plan = plan_read(model, RELATED_ENDPOINT, self.user, self.role)
+            # _id lu pour rattacher chaque document à sa demande, jamais exposé
+            # s'il n'est pas visible
+            plan = ReadPlan({**plan.projection, PRIMARY_KEY: 1}, plan.serialize)
+            self._plans[model] = plan
+            return plan
+
+    def load(self, model: Type, key: ObjectId) -> "asyncio.Future[Optional[dict]]":
+        """
+        Demande le résumé d'un enregistrement lié (None s'il est absent ou
+        supprimé). Les demandes d'un même tour de boucle sont regroupées.
+        """
+        future = self._futures.get((model, key))
+        if future is not None:
+            return future
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._futures[(model, key)] = future
+        if not self._pending:
+            loop.call_soon(self._schedule)
+        self._pending.setdefault(model, []).append(key)
+        return future
+
+    async def load_many(self, model: Type, keys: Sequence[ObjectId]) -> List[Optional[dict]]:
+        """Résumés de plusieurs enregistrements liés, dans l'ordre des clés."""
+        return list(await asyncio.gather(*(self.load(model, key) for key in keys)))
+
+    def _schedule(self) -> None:
+        # Tâche conservée : la boucle ne garde qu'une référence faible
+        self._dispatching = asyncio.get_running_loop().create_task(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        for model, keys in pending.items():
+            futures = [self._futures[(model, key)] for key in keys]
+            try:
+                plan = self._plan(model)
+                self.queries += 1
+                found = {
+                    document[PRIMARY_KEY]: plan.serialize(document)
+                    async for document in self.engine.get_collection(model).find(
+                        {PRIMARY_KEY: {"$in": keys}, **ACTIVE_FILTER}, plan.projection)
+                }
+            except Exception as error:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            for key, future in zip(keys, futures):
+                if not future.done():
+                    future.set_result(found.get(key))
+
+
+async def expand(loader: RelationLoader, model: Type, documents: Sequence[dict],
+                 items: List[dict], fields: Iterable[str]) -> None:
+    """
+    Remplace, dans les éléments sérialisés, les champs de relation par le
+    résumé de l'enregistrement lié.
+
+    Args:
+        loader: Chargeur de la requête
+        model: Modèle des documents
+        documents: Documents MongoDB lus (alignés sur items)
+        items: Éléments sérialisés, modifiés en place
+        fields: Champs à expanser (voir parse_expand)
+    """
+    targets = relations(model)
+    keys = field_keys(model)
+    loads = []
+    for field in fields:
+        key = keys[field]
+        related = targets[field]
+        for document, item in zip(documents, items):
+            value = document.get(key)
+            # Champ absent de l'élément : non visible pour cet enregistrement
+            if field in item and isinstance(value, ObjectId):
+                loads.append((item, field, loader.load(related, value)))
+    if not loads:
+        return
+    summaries = await asyncio.gather(*(future for _, _, future in loads))
+    for (item, field, _), summary in zip(loads, summaries):
+        item[field] = summary
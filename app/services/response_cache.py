@@ -0,0 +1,257 @@
+"""
+Cache des réponses des lectures publiques, avec ETag et 304.
+
+Les endpoints de lecture configurés UserRole.PUBLIC renvoient le même corps
+à tous les appelants d'un même rôle : la réponse est encodée une fois puis
+servie depuis la mémoire, clé (modèle, public_id ou forme de la requête,
+rôle). Chaque entrée porte un ETag fort calculé à partir de updated_at des
+documents : un client qui renvoie l'ETag (If-None-Match) reçoit un 304 sans
+que le corps soit resérialisé ni renvoyé.
+
+Une réponse n'est mise en cache que si elle ne dépend pas de l'appelant :
+pas de fonction d'accès personnalisée, pas de filtre d'accès, pas de champs
+réservés au propriétaire pour ce rôle.
+
+Invalidation : les écritures du routeur dynamique retirent les entrées du
+document modifié et périment toutes les listes du modèle. Une lecture prend
+la génération du modèle (generation()) avant d'interroger la base et la
+remet à put() : si une écriture a invalidé le modèle pendant la lecture, la
+réponse est servie sans être mise en cache. Les écritures
+faites hors du routeur sont prises en compte à l'expiration des entrées
+(RESPONSE_CACHE_TTL, défaut 60 s). La taille totale des corps en cache est
+bornée (RESPONSE_CACHE_MAX_BYTES, défaut 32 Mio), éviction LRU.
+"""
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, NamedTuple, Optional, Set, Tuple, Type
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+
+from app.config.endpoint_config import EndpointConfig
+from app.config.user_roles import UserRole
+from app.services.permissions import readable_masks
+
+# Champs lus en plus des champs visibles pour calculer l'ETag
+ETAG_FIELDS = ("public_id", "updated_at")
+
+CacheKey = Tuple[Hashable, ...]
+
+
+def compute_etag(key: CacheKey, documents: Iterable[dict], *extra: Any) -> str:
+    """
+    ETag fort d'une réponse : empreinte de la clé et de (public_id,
+    updated_at) de chaque document.
+    """
+    digest = hashlib.blake2b(repr(key).encode("utf-8"), digest_size=16)
+    for document in documents:
+        digest.update(f"|{document.get('public_id')}@{document.get('updated_at')}".encode("utf-8"))
+    for value in extra:
+        digest.update(f"|{value}".encode("utf-8"))
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Compare l'en-tête If-None-Match à un ETag (comparaison faible, RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(","))
+
+
+class CachedResponse(NamedTuple):
+    """Réponse encodée en cache."""
+
+    etag: str
+    body: bytes
+    public_id: Optional[str]
+    generation: int
+    expires: float
+
+
+class ResponseCache:
+    """
+    Cache LRU des réponses encodées, borné en octets.
+
+    Attributs:
+        max_bytes: Taille maximale cumulée des corps en cache
+        ttl: Durée de vie d'une entrée (secondes)
+        hits: Réponses servies depuis le cache
+        misses: Réponses calculées
+        not_modified: Réponses 304 (cache ou non)
+        evictions: Entrées évincées faute de place
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, ttl: float = 60.0, clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[CacheKey, CachedResponse]" = OrderedDict()
+        # _by_document maps: { (model, public_id): {clés des entrées du document} }
+        self._by_document: Dict[Tuple[Type, str], Set[CacheKey]] = {}
+        # _generations maps: { model: génération des listes }
+        self._generations: Dict[Type, int] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ----------------------------
+    # Clés
+    # ----------------------------
+
+    @staticmethod
+    def cache_key(model: Type, endpoint: EndpointConfig, user: Optional[Any], role: UserRole,
+                  requested: Optional[Iterable[str]], *shape: Hashable) -> Optional[CacheKey]:
+        """
+        Clé de cache d'une lecture, None si la réponse dépend de l'appelant.
+
+        Args:
+            model: Classe du modèle
+            endpoint: Configuration de l'endpoint
+            user: Utilisateur authentifié ou None
+            role: Rôle effectif de l'appelant
+            requested: Champs demandés (?fields=)
+            shape: public_id, ou paramètres de la liste (curseur, tri...)
+        """
+        if endpoint.user_role != UserRole.PUBLIC:
+            return None
+        if endpoint.custom_auth_function is not None or endpoint.access_filter is not None:
+            return None
+        mask, owner_mask = readable_masks(model, role, user is not None, requested)
+        if mask != owner_mask:
+            return None
+        return (model, role, mask, *shape)
+
+    # ----------------------------
+    # Lecture / écriture
+    # ----------------------------
+
+    def get(self, key: CacheKey) -> Optional[CachedResponse]:
+        """Retourne l'entrée valide d'une clé (compte un succès ou un échec)."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            stale = entry.expires <= self._clock() or (
+                entry.public_id is None and entry.generation != self._generations.get(key[0], 0))
+            if not stale:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self._remove(key)
+        self.misses += 1
+        return None
+
+    def generation(self, model: Type) -> int:
+        """Génération courante d'un modèle, à prendre avant la lecture en base (voir put)."""
+        return self._generations.get(model, 0)
+
+    def put(self, key: CacheKey, etag: str, content: Any, public_id: Optional[str] = None,
+            generation: Optional[int] = None) -> CachedResponse:
+        """
+        Encode et met en cache une réponse.
+
+        Args:
+            key: Clé (voir cache_key)
+            etag: ETag de la réponse
+            content: Corps (dict sérialisable)
+            public_id: Document de la réponse (None pour une liste)
+            generation: Génération du modèle prise avant la lecture ; si une
+                écriture l'a changée depuis, l'entrée n'est pas conservée
+
+        Returns:
+            CachedResponse: Entrée créée
+        """
+        current = self._generations.get(key[0], 0)
+        body = JSONResponse(jsonable_encoder(content)).body
+        entry = CachedResponse(etag, body, public_id, current, self._clock() + self.ttl)
+        if len(body) > self.max_bytes or (generation is not None and generation != current):
+            return entry
+        self._remove(key)
+        self._entries[key] = entry
+        self._bytes += len(body)
+        if public_id is not None:
+            self._by_document.setdefault((key[0], public_id), set()).add(key)
+        while self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+        return entry
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= len(entry.body)
+        if entry.public_id is not None:
+            keys = self._by_document.get((key[0], entry.public_id))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_document[(key[0], entry.public_id)]
+
+    # ----------------------------
+    # Réponses
+    # ----------------------------
+
+    def respond(self, entry: CachedResponse, if_none_match: Optional[str]) -> Response:
+        """Réponse HTTP d'une entrée : 304 si le client a déjà cette version."""
+        if etag_matches(if_none_match, entry.etag):
+            return self.not_modified_response(entry.etag)
+        return Response(entry.body, media_type="application/json", headers=self._headers(entry.etag))
+
+    def not_modified_response(self, etag: str) -> Response:
+        """Réponse 304 (sans corps)."""
+        self.not_modified += 1
+        return Response(status_code=304, headers=self._headers(etag))
+
+    @staticmethod
+    def _headers(etag: str) -> Dict[str, str]:
+        return {"ETag": etag, "Cache-Control": "no-cache"}
+
+    # ----------------------------
+    # Invalidation et métriques
+    # ----------------------------
+
+    def invalidate(self, model: Type, public_ids: Iterable[str] = ()) -> None:
+        """
+        Invalide les entrées touchées par une écriture.
+
+        Args:
+            model: Modèle écrit (toutes ses listes sont périmées)
+            public_ids: Documents modifiés ou supprimés
+        """
+        self._generations[model] = self._generations.get(model, 0) + 1
+        for public_id in public_ids:
+            for key in list(self._by_document.get((model, public_id), ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_document.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Taille, taux de succès et nombre de 304 du cache."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "not_modified": self.not_modified,
+            "evictions": self.evictions,
+        }
+
+
+response_cache = ResponseCache(
+    max_bytes=int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", "60")),
+)
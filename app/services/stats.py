@@ -0,0 +1,270 @@
+"""
+Statistiques des modèles, tenues à jour incrémentalement.
+
+Les tableaux de bord (/admin/stats, /admin/stats/{model}) affichent pour
+chaque modèle : total, actifs, supprimés (soft delete), enregistrements
+actifs par propriétaire et créations par jour. Plutôt que de recompter la
+collection à chaque rafraîchissement, chaque écriture du routeur dynamique
+(création, soft delete, restauration, transfert de propriété) applique un
+delta aux compteurs :
+
+    {"total": 1, "active": 1, "owners.<owner_id>": 1, "days.2025-01-31": 1}
+
+Deux stockages :
+
+    - StatsStore (défaut) : compteurs en mémoire du processus
+    - MongoStatsStore (STATS_BACKEND=mongodb) : un document par modèle dans
+      la petite collection model_stats, mis à jour par $inc ; compteurs
+      communs à tous les workers
+
+Les écritures faites hors du routeur (scripts, imports, autres services) et
+les courses entre écritures concurrentes font dériver les compteurs : une
+réconciliation périodique (STATS_RECONCILE_INTERVAL, défaut 1 h) les
+remplace par un comptage réel, en une agrégation par modèle.
+"""
+import asyncio
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from bson import ObjectId
+
+from app.services.archive import get_archive_collection
+
+STATS_BACKEND = os.getenv("STATS_BACKEND", "memory")
+STATS_COLLECTION = "model_stats"
+STATS_RECONCILE_INTERVAL = float(os.getenv("STATS_RECONCILE_INTERVAL", "3600"))
+
+COUNTERS = ("total", "active", "deleted")
+
+Delta = Dict[str, int]
+
+
+def day_of(value: Optional[datetime]) -> str:
+    """Jour UTC (AAAA-MM-JJ) d'une date de création."""
+    if value is None:
+        value = datetime.now(timezone.utc)
+    elif value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%d")
+
+
+def _add(delta: Delta, key: str, amount: int) -> None:
+    delta[key] = delta.get(key, 0) + amount
+
+
+def _owners(delta: Delta, documents: Iterable[dict], amount: int) -> Delta:
+    for document in documents:
+        if document.get("owner_id") is not None:
+            _add(delta, f"owners.{document['owner_id']}", amount)
+    return delta
+
+
+# ----------------------------
+# Deltas
+# ----------------------------
+
+def created_delta(documents: List[dict]) -> Delta:
+    """Delta d'une création d'enregistrements (actifs)."""
+    delta = {"total": len(documents), "active": len(documents)}
+    for document in documents:
+        _add(delta, f"days.{day_of(document.get('created_at'))}", 1)
+    return _owners(delta, documents, 1)
+
+
+def soft_deleted_delta(documents: List[dict]) -> Delta:
+    """Delta d'un soft delete d'enregistrements actifs."""
+    return _owners({"active": -len(documents), "deleted": len(documents)}, documents, -1)
+
+
+def restored_delta(documents: List[dict]) -> Delta:
+    """Delta d'une restauration d'enregistrements supprimés."""
+    return _owners({"active": len(documents), "deleted": -len(documents)}, documents, 1)
+
+
+def transferred_delta(previous_owner: Optional[ObjectId], new_owner: ObjectId) -> Delta:
+    """Delta du transfert de propriété d'un enregistrement actif."""
+    delta: Delta = {}
+    _owners(delta, [{"owner_id": previous_owner}], -1)
+    return _owners(delta, [{"owner_id": new_owner}], 1)
+
+
+def empty_counters() -> Dict[str, Any]:
+    """Compteurs d'un modèle sans enregistrement."""
+    return {"total": 0, "active": 0, "deleted": 0, "owners": {}, "days": {}, "reconciled_at": None}
+
+
+def summary(counters: Dict[str, Any]) -> Dict[str, Any]:
+    """Compteurs globaux d'un modèle (sans le détail par propriétaire et par jour)."""
+    return {name: counters.get(name, 0) for name in COUNTERS} | {"reconciled_at": counters.get("reconciled_at")}
+
+
+# ----------------------------
+# Comptage réel
+# ----------------------------
+
+COUNT_PIPELINE = [{"$facet": {
+    "status": [{"$group": {"_id": "$is_active", "count": {"$sum": 1}}}],
+    "owners": [
+        {"$match": {"is_active": True, "owner_id": {"$ne": None}}},
+        {"$group": {"_id": "$owner_id", "count": {"$sum": 1}}},
+    ],
+    "days": [{"$group": {
+        "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}},
+        "count": {"$sum": 1},
+    }}],
+}}]
+
+
+async def count_collection(collection: Any) -> Dict[str, Any]:
+    """
+    Recompte les statistiques d'une collection (une agrégation).
+
+    Returns:
+        dict: Compteurs réels, horodatés (reconciled_at)
+    """
+    result = empty_counters()
+    async for facets in collection.aggregate(COUNT_PIPELINE):
+        for group in facets["status"]:
+            result["active" if group["_id"] is not False else "deleted"] += group["count"]
+        result["owners"] = {str(group["_id"]): group["count"] for group in facets["owners"]}
+        result["days"] = {group["_id"]: group["count"] for group in facets["days"] if group["_id"]}
+    result["total"] = result["active"] + result["deleted"]
+    result["reconciled_at"] = datetime.now(timezone.utc)
+    return result
+
+
+# ----------------------------
+# Stockages
+# ----------------------------
+
+class StatsStore:
+    """Compteurs en mémoire du processus, par nom de collection."""
+
+    def __init__(self):
+        # _models maps: { collection: compteurs (voir empty_counters) }
+        self._models: Dict[str, Dict[str, Any]] = {}
+
+    async def apply(self, name: str, delta: Delta) -> None:
+        """Applique un delta aux compteurs d'un modèle."""
+        counters = self._models.setdefault(name, empty_counters())
+        for key, amount in delta.items():
+            group, _, member = key.partition(".")
+            if not member:
+                counters[group] += amount
+                continue
+            values = counters[group]
+            values[member] = values.get(member, 0) + amount
+            if values[member] == 0:
+                del values[member]
+
+    async def get(self, name: str) -> Dict[str, Any]:
+        """Compteurs d'un modèle."""
+        counters = self._models.get(name, empty_counters())
+        return {**counters, "owners": dict(counters["owners"]), "days": dict(counters["days"])}
+
+    async def all(self) -> Dict[str, Dict[str, Any]]:
+        """Compteurs globaux de tous les modèles."""
+        return {name: summary(counters) for name, counters in self._models.items()}
+
+    async def replace(self, name: str, counters: Dict[str, Any]) -> None:
+        """Remplace les compteurs d'un modèle (réconciliation)."""
+        self._models[name] = counters
+
+
+class MongoStatsStore:
+    """
+    Compteurs partagés entre workers, un document par modèle :
+    {_id: collection, total, active, deleted, owners: {...}, days: {...}}.
+    """
+
+    def __init__(self, collection: Any):
+        self.collection = collection
+
+    async def apply(self, name: str, delta: Delta) -> None:
+        if delta:
+            await self.collection.update_one({"_id": name}, {"$inc": delta}, upsert=True)
+
+    async def get(self, name: str) -> Dict[str, Any]:
+        document = await self.collection.find_one({"_id": name}, {"_id": 0})
+        return empty_counters() | (document or {})
+
+    async def all(self) -> Dict[str, Dict[str, Any]]:
+        projection = {name: 1 for name in COUNTERS} | {"reconciled_at": 1}
+        return {
+            document["_id"]: summary(document)
+            async for document in self.collection.find({}, projection)
+        }
+
+    async def replace(self, name: str, counters: Dict[str, Any]) -> None:
+        await self.collection.replace_one({"_id": name}, counters, upsert=True)
+
+
+async def record(store: Any, model: type, delta: Delta) -> None:
+    """
+    Applique le delta d'une écriture réussie.
+
+    Les statistiques ne doivent jamais faire échouer l'écriture : une erreur
+    est ignorée, la réconciliation corrigera les compteurs.
+    """
+    if not any(delta.values()):
+        return
+    try:
+        await store.apply(model.__collection__, delta)
+    except Exception:
+        pass
+
+
+def merge_archived(counters: Dict[str, Any], archived: Dict[str, Any]) -> Dict[str, Any]:
+    """Ajoute les enregistrements archivés (tous supprimés) aux compteurs."""
+    counters["deleted"] += archived["total"]
+    counters["total"] += archived["total"]
+    for day, count in archived["days"].items():
+        counters["days"][day] = counters["days"].get(day, 0) + count
+    return counters
+
+
+async def reconcile(store: Any, engine: Any, models: Iterable[type]) -> None:
+    """
+    Remplace les compteurs de chaque modèle par un comptage réel (collection
+    principale et archive : l'archivage ne change pas les statistiques).
+    """
+    for model in models:
+        counters = await count_collection(engine.get_collection(model))
+        archived = await count_collection(get_archive_collection(engine, model))
+        await store.replace(model.__collection__, merge_archived(counters, archived))
+
+
+async def run_stats_reconciliation(store: Any, engine: Any, models: Iterable[type],
+                                   interval: float = STATS_RECONCILE_INTERVAL) -> None:
+    """Réconcilie les compteurs périodiquement (tâche de fond)."""
+    models = list(models)
+    while True:
+        try:
+            await reconcile(store, engine, models)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            pass
+        await asyncio.sleep(interval)
+
+
+_store: Any = None
+
+
+def get_stats_store() -> Any:
+    """
+    Retourne le stockage des statistiques du processus, créé au premier appel.
+
+    STATS_BACKEND=memory (défaut) : StatsStore en mémoire ;
+    STATS_BACKEND=mongodb : MongoStatsStore sur la collection model_stats.
+    """
+    global _store
+    if _store is None:
+        if STATS_BACKEND == "mongodb":
+            from app.db.session import get_engine
+
+            _store = MongoStatsStore(get_engine().database[STATS_COLLECTION])
+        else:
+            _store = StatsStore()
+    return _store
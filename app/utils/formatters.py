@@ -0,0 +1,234 @@
+"""
+Sérialisation des modèles selon les permissions.
+
+Ce module génère, pour chaque couple (modèle, rôle) et selon que
+l'appelant est propriétaire ou non de l'enregistrement, une fonction de
+sérialisation dédiée. Chaque fonction ne lit que les champs autorisés par
+PermissionsRegister, sans passer par model_dump() ni construire d'ensembles
+intermédiaires. Les valeurs scalaires sont reprises telles quelles ; les
+valeurs imbriquées (listes, dictionnaires, modèles) sont copiées comme le
+ferait model_dump() : modifier le résultat ne modifie jamais l'instance.
+Deux variantes existent : sur les instances de modèles et
+sur les documents MongoDB bruts lus avec projection.
+"""
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from enum import Enum
+from operator import attrgetter
+from types import NoneType, UnionType
+from typing import Any, Callable, Dict, Iterable, Tuple, Type, Union, get_args, get_origin
+from uuid import UUID
+
+from bson import ObjectId
+
+from app.config.permissions_config import PermissionsRegister
+from app.config.user_roles import UserRole
+from app.db.base import field_keys
+
+Serializer = Callable[[Any], dict]
+
+# Types immuables exposés sans copie
+SCALAR_TYPES = (str, int, float, bool, bytes, Decimal, date, datetime, time, timedelta, UUID, ObjectId, Enum)
+
+
+def dump_value(value: Any) -> Any:
+    """Copie une valeur imbriquée comme model_dump() : modèles en dict, conteneurs copiés."""
+    if isinstance(value, SCALAR_TYPES) or value is None:
+        return value
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if isinstance(value, dict):
+        return {key: dump_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return type(value)(dump_value(item) for item in value)
+    return value
+
+
+def is_scalar_field(model: Type, name: str) -> bool:
+    """True si le champ est annoté d'un type scalaire (ou Optional d'un tel type)."""
+    declared = getattr(model, "model_fields", None)
+    if declared is None or name not in declared:
+        return False
+    annotation = declared[name].annotation
+    candidates = get_args(annotation) if get_origin(annotation) in (Union, UnionType) else (annotation,)
+    return all(
+        candidate is NoneType or (isinstance(candidate, type) and issubclass(candidate, SCALAR_TYPES))
+        for candidate in candidates)
+
+
+def compile_serializer(fields: Tuple[str, ...], nested: Tuple[str, ...] = ()) -> Serializer:
+    """
+    Construit une fonction qui lit uniquement les champs donnés.
+
+    Args:
+        fields: Noms des attributs à exposer, dans l'ordre de sortie
+        nested: Champs dont la valeur est copiée (voir dump_value) plutôt
+            que partagée avec l'instance
+
+    Returns:
+        Serializer: Fonction obj -> dict
+    """
+    if not fields:
+        return lambda obj: {}
+    if len(fields) == 1:
+        name = fields[0]
+        if nested:
+            return lambda obj: {name: dump_value(getattr(obj, name))}
+        return lambda obj: {name: getattr(obj, name)}
+
+    getter = attrgetter(*fields)
+    if not nested:
+        return lambda obj: dict(zip(fields, getter(obj)))
+
+    def serialize(obj: Any) -> dict:
+        data = dict(zip(fields, getter(obj)))
+        for name in nested:
+            data[name] = dump_value(data[name])
+        return data
+
+    return serialize
+
+
+def compile_document_serializer(
+        fields: Tuple[Tuple[str, str], ...],
+        object_id_fields: Tuple[str, ...] = ()) -> Serializer:
+    """
+    Construit une fonction qui lit les champs donnés dans un document brut.
+
+    Args:
+        fields: Couples (nom du champ, clé MongoDB), dans l'ordre de sortie
+        object_id_fields: Champs ObjectId convertis en chaîne pour le JSON
+
+    Returns:
+        Serializer: Fonction document -> dict (champs absents à None)
+    """
+    if not object_id_fields:
+        def serialize(document: dict) -> dict:
+            get = document.get
+            return {name: get(key) for name, key in fields}
+
+        return serialize
+
+    def serialize_with_ids(document: dict) -> dict:
+        get = document.get
+        data = {name: get(key) for name, key in fields}
+        for name in object_id_fields:
+            value = data[name]
+            if value is not None:
+                data[name] = str(value)
+        return data
+
+    return serialize_with_ids
+
+
+def is_object_id_field(model: Type, name: str) -> bool:
+    """True si le champ est annoté ObjectId ou Optional[ObjectId]."""
+    annotation = model.model_fields[name].annotation
+    return any(
+        isinstance(candidate, type) and issubclass(candidate, ObjectId)
+        for candidate in (annotation, *get_args(annotation)))
+
+
+class SerializerFactory:
+    """Cache des fonctions de sérialisation compilées par modèle et masque."""
+
+    # _serializers maps: { (model, mask): serializer }
+    # Le masque fait partie de la clé : un enregistrement de permissions
+    # ultérieur produit un nouveau masque, donc jamais de sérialiseur périmé.
+    _serializers: Dict[Tuple[Type, int], Serializer] = {}
+    _document_serializers: Dict[Tuple[Type, int], Serializer] = {}
+
+    @staticmethod
+    def effective_mask(model: Type, role: UserRole, owner: bool = False) -> int:
+        """
+        Masque des champs visibles pour un rôle.
+
+        Le propriétaire d'un enregistrement voit en plus les champs du rôle
+        UserRole.USER (niveau d'accès « propriétaire »).
+        """
+        mask = PermissionsRegister.get_mask(model, role)
+        if owner:
+            mask |= PermissionsRegister.get_mask(model, UserRole.USER)
+        return mask
+
+    @staticmethod
+    def visible_fields(model: Type, mask: int) -> Tuple[str, ...]:
+        """Champs d'un masque effectivement déclarés par le modèle."""
+        declared = getattr(model, "model_fields", None)
+        return tuple(
+            name for name in PermissionsRegister.fields_of(mask)
+            if declared is None or name in declared)
+
+    @classmethod
+    def for_mask(cls, model: Type, mask: int) -> Serializer:
+        """Retourne (et compile si besoin) le sérialiseur d'un masque."""
+        try:
+            return cls._serializers[(model, mask)]
+        except KeyError:
+            fields = cls.visible_fields(model, mask)
+            serializer = compile_serializer(
+                fields, tuple(name for name in fields if not is_scalar_field(model, name)))
+            cls._serializers[(model, mask)] = serializer
+            return serializer
+
+    @classmethod
+    def document_for_mask(cls, model: Type, mask: int) -> Serializer:
+        """Retourne (et compile si besoin) le sérialiseur de documents d'un masque."""
+        try:
+            return cls._document_serializers[(model, mask)]
+        except KeyError:
+            keys = field_keys(model)
+            fields = cls.visible_fields(model, mask)
+            serializer = compile_document_serializer(
+                tuple((name, keys[name]) for name in fields),
+                tuple(name for name in fields if is_object_id_field(model, name)))
+            cls._document_serializers[(model, mask)] = serializer
+            return serializer
+
+    @classmethod
+    def get(cls, model: Type, role: UserRole, owner: bool = False) -> Serializer:
+        """
+        Retourne le sérialiseur d'un modèle pour un rôle.
+
+        Args:
+            model: Classe du modèle (ModelData ou sous-classe)
+            role: Rôle de l'appelant
+            owner: True si l'appelant est propriétaire de l'enregistrement
+
+        Returns:
+            Serializer: Fonction obj -> dict limitée aux champs autorisés
+        """
+        return cls.for_mask(model, cls.effective_mask(model, role, owner))
+
+    @classmethod
+    def get_document(cls, model: Type, role: UserRole, owner: bool = False) -> Serializer:
+        """
+        Retourne le sérialiseur de documents MongoDB bruts d'un modèle pour un rôle.
+
+        Args:
+            model: Classe du modèle (ModelData ou sous-classe)
+            role: Rôle de l'appelant
+            owner: True si l'appelant est propriétaire de l'enregistrement
+
+        Returns:
+            Serializer: Fonction document -> dict limitée aux champs autorisés
+        """
+        return cls.document_for_mask(model, cls.effective_mask(model, role, owner))
+
+    @classmethod
+    def build(cls, models: Iterable[Type]) -> None:
+        """
+        Génère au démarrage les sérialiseurs de chaque modèle, pour tous les
+        rôles, propriétaire ou non.
+        """
+        for model in models:
+            for role in UserRole:
+                for owner in (False, True):
+                    cls.get(model, role, owner)
+                    cls.get_document(model, role, owner)
+
+    @classmethod
+    def clear(cls) -> None:
+        """Vide le cache des sérialiseurs."""
+        cls._serializers.clear()
+        cls._document_serializers.clear()
@@ -0,0 +1,129 @@
+"""
+Génération des identifiants publics (public_id).
+
+Chaque modèle choisit sa stratégie par son attribut de classe
+public_id_strategy (voir ModelData) ; à défaut, la variable d'environnement
+PUBLIC_ID_STRATEGY s'applique (défaut uuid4). Stratégies fournies :
+
+    - uuid4 : aléatoire. Chaque insertion tombe à un endroit quelconque de
+      l'index unique public_id : dès que l'index dépasse le cache, les
+      insertions paient des lectures de pages et les pages coupées en deux
+      restent à moitié vides
+    - uuid7 : ordonné dans le temps (RFC 9562) : 48 bits d'horodatage en
+      millisecondes, un compteur de 12 bits qui garantit l'ordre strict au
+      sein d'une même milliseconde, puis 62 bits aléatoires. Les insertions
+      s'ajoutent en fin d'index (pages pleines, seule la dernière page est
+      chaude) et le tri par public_id suit l'ordre de création, ce qui en
+      fait une clé de pagination par curseur naturelle (?sort=public_id)
+
+Un UUIDv7 révèle la milliseconde de création de l'enregistrement, au même
+titre que created_at. D'autres stratégies s'enregistrent avec
+register_public_id_strategy().
+"""
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+PublicIdGenerator = Callable[[], str]
+
+# Bits du compteur de l'UUIDv7 (champ rand_a)
+_COUNTER_BITS = 12
+_COUNTER_MAX = (1 << _COUNTER_BITS) - 1
+# Le compteur démarre sous cette valeur à chaque milliseconde : la moitié
+# haute reste disponible pour les identifiants suivants
+_COUNTER_SEED_MAX = _COUNTER_MAX >> 1
+
+_VERSION_7 = 0x7 << 76
+_VARIANT = 0b10 << 62
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid4_public_id() -> str:
+    """public_id aléatoire (UUIDv4)."""
+    return str(uuid.uuid4())
+
+
+def uuid7_public_id() -> str:
+    """
+    public_id ordonné dans le temps (UUIDv7, RFC 9562, méthode du compteur).
+
+    Les identifiants générés par un même processus sont strictement
+    croissants, y compris au sein d'une milliseconde ou si l'horloge recule :
+    l'horodatage n'est alors jamais inférieur au précédent.
+    """
+    global _last_ms, _counter
+    random = int.from_bytes(os.urandom(10), "big")
+    with _lock:
+        now = time.time_ns() // 1_000_000
+        if now > _last_ms:
+            _last_ms = now
+            _counter = (random >> 64) & _COUNTER_SEED_MAX
+        else:
+            _counter += 1
+            if _counter > _COUNTER_MAX:
+                # Compteur épuisé : emprunt sur la milliseconde suivante
+                _last_ms += 1
+                _counter = (random >> 64) & _COUNTER_SEED_MAX
+        timestamp, counter = _last_ms, _counter
+    value = (timestamp << 80) | _VERSION_7 | (counter << 64) | _VARIANT | (random & ((1 << 62) - 1))
+    return str(uuid.UUID(int=value))
+
+
+def uuid7_datetime(public_id: str) -> datetime:
+    """
+    Date de création encodée dans un public_id UUIDv7.
+
+    Raises:
+        ValueError: Si public_id n'est pas un UUIDv7
+    """
+    value = uuid.UUID(public_id)
+    if value.version != 7:
+        raise ValueError(f"{public_id} n'est pas un UUIDv7.")
+    return datetime.fromtimestamp((value.int >> 80) / 1000, tz=timezone.utc)
+
+
+PUBLIC_ID_STRATEGIES: Dict[str, PublicIdGenerator] = {
+    "uuid4": uuid4_public_id,
+    "uuid7": uuid7_public_id,
+}
+
+DEFAULT_PUBLIC_ID_STRATEGY = os.getenv("PUBLIC_ID_STRATEGY", "uuid4")
+
+
+def register_public_id_strategy(name: str, generator: PublicIdGenerator) -> None:
+    """
+    Enregistre une stratégie de génération de public_id.
+
+    Args:
+        name: Nom de la stratégie (valeur de public_id_strategy)
+        generator: Fonction sans argument retournant un public_id unique
+    """
+    if not callable(generator):
+        raise ValueError("Le générateur de public_id doit être appelable.")
+    PUBLIC_ID_STRATEGIES[name] = generator
+
+
+def public_id_generator(strategy: Optional[str] = None) -> PublicIdGenerator:
+    """
+    Générateur d'une stratégie (None : PUBLIC_ID_STRATEGY).
+
+    Raises:
+        ValueError: Si la stratégie est inconnue
+    """
+    name = strategy or DEFAULT_PUBLIC_ID_STRATEGY
+    try:
+        return PUBLIC_ID_STRATEGIES[name]
+    except KeyError:
+        raise ValueError(
+            f"Stratégie de public_id inconnue : {name} (disponibles : {', '.join(PUBLIC_ID_STRATEGIES)}).")
+
+
+def new_public_id(strategy: Optional[str] = None) -> str:
+    """Nouveau public_id selon une stratégie (None : PUBLIC_ID_STRATEGY)."""
+    return public_id_generator(strategy)()
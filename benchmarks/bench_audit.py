@@ -0,0 +1,82 @@
+"""
+Benchmark of the per-request cost of audit logging.
+
+Compares, for REQUESTS sequential requests each producing one audit entry:
+
+    - insert_one: one awaited insert per request (simulated round trip)
+    - AuditWriter: entry queued, written in batches by insert_many in the
+      background (one simulated round trip per batch)
+
+The database round trip is simulated with asyncio.sleep(DB_ROUND_TRIP) so
+the numbers do not depend on a running server; set it to your measured
+insert latency. Each request yields to the event loop once, as a real
+request does while it is served. The AuditWriter figure includes the final
+flush on stop().
+
+Usage:
+    python -m benchmarks.bench_audit
+"""
+import asyncio
+import time
+
+from app.services.audit import AuditWriter, audit_entry
+
+REQUESTS = 20_000
+DB_ROUND_TRIP = 0.0005
+
+
+class SimulatedCollection:
+    """Collection whose writes cost one simulated round trip."""
+
+    def __init__(self):
+        self.documents = 0
+        self.round_trips = 0
+
+    async def insert_one(self, document):
+        await asyncio.sleep(DB_ROUND_TRIP)
+        self.documents += 1
+        self.round_trips += 1
+
+    async def insert_many(self, documents, ordered=True):
+        await asyncio.sleep(DB_ROUND_TRIP)
+        self.documents += len(documents)
+        self.round_trips += 1
+
+
+async def synchronous() -> tuple:
+    collection = SimulatedCollection()
+    for i in range(REQUESTS):
+        await asyncio.sleep(0)
+        await collection.insert_one(audit_entry("read", "items", None, [str(i)]))
+    return collection, 0
+
+
+async def batched(overflow: str) -> tuple:
+    collection = SimulatedCollection()
+    writer = AuditWriter(collection, overflow=overflow)
+    for i in range(REQUESTS):
+        await asyncio.sleep(0)
+        await writer.log(audit_entry("read", "items", None, [str(i)]))
+    await writer.stop()
+    return collection, writer.dropped
+
+
+def measure(run) -> tuple:
+    start = time.perf_counter()
+    collection, dropped = asyncio.run(run)
+    elapsed = time.perf_counter() - start
+    return elapsed / REQUESTS * 1e6, collection, dropped
+
+
+def main() -> None:
+    print(f"{REQUESTS} requests, simulated DB round trip {DB_ROUND_TRIP * 1000:.1f} ms\n")
+    print(f"{'mode':<22}{'µs/request':>12}{'round trips':>14}{'dropped':>10}")
+    for name, run in (("insert_one", synchronous()),
+                      ("AuditWriter (block)", batched("block")),
+                      ("AuditWriter (drop)", batched("drop"))):
+        per_request, collection, dropped = measure(run)
+        print(f"{name:<22}{per_request:>12.1f}{collection.round_trips:>14,}{dropped:>10,}")
+
+
+if __name__ == "__main__":
+    main()
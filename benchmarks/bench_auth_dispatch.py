@@ -0,0 +1,90 @@
+"""
+Benchmark of the per-request auth dispatch of an endpoint.
+
+For every UserRole level, an endpoint is configured with that user_role and
+called by the callers it admits (anonymous for PUBLIC, a regular user, an
+administrator, a superadministrator). Each call does what the request path
+does before and after reading a record:
+
+    - interpreted: check_endpoint_access, which inspects the configuration
+      and branches on user_role on every call, then the custom auth check
+      as it was written before compilation (branching on
+      custom_auth_function and hydration)
+    - compiled: endpoint_access(endpoint).authorize and .check_record,
+      compiled once per configuration
+
+Rejected callers are not measured: raising 401/403 costs the same in both
+cases. Reports nanoseconds per request and the speedup.
+
+Usage:
+    python -m benchmarks.bench_auth_dispatch
+"""
+import time
+
+from app.config.endpoint_config import EndpointConfig
+from app.config.user_roles import UserRole
+from app.core.permissions import check_endpoint_access, endpoint_access
+from app.db.hydration import hydrate
+from app.models.user import User
+
+CALLS = 200_000
+ROUNDS = 5
+
+
+def interpreted_record_check(endpoint: EndpointConfig, user, document, model=None) -> bool:
+    """Custom auth check as done on every request before compilation."""
+    if endpoint.custom_auth_function is None:
+        return True
+    if endpoint.hydration is not None and model is not None:
+        document = hydrate(model, document, endpoint.hydration)
+    return bool(endpoint.custom_auth_function(user, document))
+
+
+def callers(required: UserRole) -> list:
+    admitted = {
+        UserRole.PUBLIC: [None],
+        UserRole.USERS: [User(email="user@example.com")],
+        UserRole.USER: [User(email="user@example.com")],
+        UserRole.ADMIN: [User(email="admin@example.com", roles=[UserRole.ADMIN])],
+        UserRole.SUPERADMIN: [User(email="root@example.com", roles=[UserRole.SUPERADMIN])],
+    }[required]
+    if required in (UserRole.USERS, UserRole.USER):
+        admitted += [User(email="admin@example.com", roles=[UserRole.ADMIN])]
+    return admitted
+
+
+def best(function, *args) -> float:
+    """Best time per call of function(*args), in nanoseconds."""
+    result = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for _ in range(CALLS):
+            function(*args)
+        result = min(result, time.perf_counter() - start)
+    return result / CALLS * 1e9
+
+
+def main() -> None:
+    document = {"owner_id": None}
+    print(f"{'user_role':<12}{'interpreted ns':>16}{'compiled ns':>14}{'speedup':>10}")
+    for required in UserRole:
+        endpoint = EndpointConfig(user_role=required)
+
+        def interpreted(user):
+            check_endpoint_access(endpoint, user)
+            interpreted_record_check(endpoint, user, document)
+
+        access = endpoint_access(endpoint)
+
+        def compiled(user, authorize=access.authorize, check_record=access.check_record):
+            authorize(user)
+            check_record(user, document)
+
+        admitted = callers(required)
+        before = sum(best(interpreted, user) for user in admitted) / len(admitted)
+        after = sum(best(compiled, user) for user in admitted) / len(admitted)
+        print(f"{required.value:<12}{before:>16.1f}{after:>14.1f}{before / after:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark of the hydration modes of documents read from MongoDB.
+
+Builds a page of RECORDS User documents (as stored by the API), then for
+each mode hydrates every document, checks ownership with is_owned_by and
+serializes it for the ADMIN role, the way a list endpoint with a
+custom_auth_function does:
+
+    - validate: pydantic validation of every document (the cost ODMantic
+      pays when reading), default factories included
+    - trusted: model instance built without validation
+    - view: read-only view over the document
+
+Reports the best time per document and the speedup over validate.
+
+Usage:
+    python -m benchmarks.bench_hydration
+"""
+import time
+
+from bson import ObjectId
+
+from app.config.user_roles import UserRole
+from app.db.hydration import HYDRATION_MODES, hydrator
+from app.models.user import User
+from app.services.crud import to_document
+
+RECORDS = 5_000
+ROUNDS = 5
+
+
+def documents() -> list:
+    owner = ObjectId()
+    return [
+        to_document(User(email=f"user{i}@example.com", username=f"user{i}", owner_id=owner))
+        for i in range(RECORDS)
+    ]
+
+
+def measure(mode: str, page: list) -> float:
+    """Return the best time per document in microseconds."""
+    hydrate = hydrator(User, mode)
+    owner = page[0]["owner_id"]
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for document in page:
+            record = hydrate(document)
+            if record.is_owned_by(owner):
+                record.to_dict(UserRole.ADMIN)
+        best = min(best, time.perf_counter() - start)
+    return best / len(page) * 1e6
+
+
+def main() -> None:
+    page = documents()
+    print(f"{RECORDS} User documents, hydrate + is_owned_by + to_dict(ADMIN)\n")
+    print(f"{'mode':<10}{'µs/document':>14}{'speedup':>10}")
+    baseline = None
+    for mode in HYDRATION_MODES:
+        per_document = measure(mode, page)
+        baseline = baseline or per_document
+        print(f"{mode:<10}{per_document:>14.2f}{baseline / per_document:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
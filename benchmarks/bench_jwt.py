@@ -0,0 +1,85 @@
+"""
+Benchmark of token verification per request.
+
+Compares, for the same RS256 access token:
+
+    - PEM + DB: jwt.decode() with the PEM public key (parsed on each call)
+      followed by a blacklist lookup in MongoDB (simulated round trip)
+    - parsed key + DB: key parsed once, blacklist still looked up per request
+    - TokenVerifier: cached claims and in-memory revocation index
+      (Bloom filter, then exact set)
+
+The database round trip is simulated with asyncio.sleep(DB_ROUND_TRIP) so
+the numbers do not depend on a running server; set it to your measured
+find_one latency.
+
+Usage:
+    python -m benchmarks.bench_jwt
+"""
+import asyncio
+import time
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from app.core.security import KeyStore, TokenVerifier
+
+REQUESTS = 2_000
+DB_ROUND_TRIP = 0.0005
+REVOKED = 50_000
+
+
+def main() -> None:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+    public_pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+
+    keys = KeyStore()
+    keys.set_private_key(private_pem)
+    verifier = TokenVerifier(keys)
+    for i in range(REVOKED):
+        verifier.revocations.add(f"revoked-{i}", time.time() + 3600)
+    token = verifier.create_token("user-1")
+    public_key = keys.public_key(None)
+
+    async def blacklist_lookup(jti: str) -> bool:
+        await asyncio.sleep(DB_ROUND_TRIP)
+        return False
+
+    async def pem_and_db():
+        claims = jwt.decode(token, public_pem, algorithms=["RS256"])
+        await blacklist_lookup(claims["jti"])
+
+    async def parsed_key_and_db():
+        claims = jwt.decode(token, public_key, algorithms=["RS256"])
+        await blacklist_lookup(claims["jti"])
+
+    async def cached():
+        verifier.verify(token)
+
+    async def run(check) -> float:
+        start = time.perf_counter()
+        for _ in range(REQUESTS):
+            await check()
+        return REQUESTS / (time.perf_counter() - start)
+
+    print(f"{REQUESTS} sequential verifications, {REVOKED} revoked tokens in the index, "
+          f"simulated DB round trip {DB_ROUND_TRIP * 1000:.1f} ms\n")
+    print(f"{'mode':<20}{'verifications/s':>18}")
+    for name, check in (("PEM + DB", pem_and_db), ("parsed key + DB", parsed_key_and_db),
+                        ("TokenVerifier", cached)):
+        print(f"{name:<20}{asyncio.run(run(check)):>18,.0f}")
+
+    jtis = [f"live-{i}" for i in range(100_000)]
+    start = time.perf_counter()
+    for jti in jtis:
+        verifier.revocations.is_revoked(jti)
+    elapsed = time.perf_counter() - start
+    print(f"\nrevocation check (not revoked): {elapsed / len(jtis) * 1e6:.2f} µs per token")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Login storm benchmark: event loop latency while passwords are verified.
+
+Simulates a burst of concurrent logins while a probe coroutine plays the
+role of the other endpoints: it wakes up every millisecond and records how
+late it was scheduled. Compares verification inside the request (blocking
+the event loop) with PasswordService (bounded worker pool) and reports the
+probe's p50/p99 latency and the login throughput.
+
+Usage:
+    python -m benchmarks.bench_password
+"""
+import asyncio
+import statistics
+import time
+
+from app.services.auth import PasswordHasher, PasswordService
+
+LOGINS = 64
+PROBE_INTERVAL = 0.001
+
+
+def percentile(values: list, ratio: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+async def probe(latencies: list, stop: asyncio.Event) -> None:
+    """Other endpoints: measure the scheduling delay of a 1 ms sleep."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        latencies.append((time.perf_counter() - start - PROBE_INTERVAL) * 1000)
+
+
+async def storm(login) -> tuple:
+    """Run LOGINS concurrent logins alongside the probe."""
+    latencies: list = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(latencies, stop))
+    await asyncio.sleep(0.05)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(LOGINS)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await probe_task
+    return latencies, elapsed
+
+
+def main() -> None:
+    hasher = PasswordHasher()
+    encoded = hasher.hash("correct horse battery staple")
+    service = PasswordService(hasher)
+
+    async def inline_login():
+        hasher.verify("correct horse battery staple", encoded)
+
+    async def pooled_login():
+        await service.verify("correct horse battery staple", encoded)
+
+    async def idle():
+        return None
+
+    print(f"scrypt ln={hasher.scrypt_log_n}, {LOGINS} concurrent logins, "
+          f"{service.max_workers} workers\n")
+    print(f"{'mode':<22}{'probe p50 ms':>14}{'probe p99 ms':>14}{'logins/s':>12}")
+    for name, login in (("no logins", idle), ("inline verify", inline_login), ("PasswordService", pooled_login)):
+        latencies, elapsed = asyncio.run(storm(login))
+        throughput = LOGINS / elapsed if login is not idle else 0
+        print(f"{name:<22}{statistics.median(latencies):>14.2f}"
+              f"{percentile(latencies, 0.99):>14.2f}{throughput:>12.0f}")
+    service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Micro-benchmark of PermissionsRegister.has_access on deep inheritance chains.
+
+Compares the uncached MRO walk (what every call used to pay) with the
+compiled matrix lookup. The cached lookup should stay flat whatever the
+depth of the chain.
+
+ODMantic rebuilds the bases of Model subclasses, so a ModelData chain keeps a
+short MRO; a plain class chain is measured as well to show the walk growing
+with the depth.
+
+Usage:
+    python -m benchmarks.bench_permissions
+"""
+import timeit
+
+from app.config.permissions_config import PermissionsRegister
+from app.config.user_roles import UserRole
+from app.models.model_data import ModelData
+
+DEPTHS = [1, 8, 32, 128]
+NUMBER = 100_000
+
+
+class PlainRoot:
+    """Root of the plain class chains."""
+
+
+PermissionsRegister.register(PlainRoot, UserRole.USER, ["public_id"])
+
+
+def build_chain(root: type, depth: int) -> type:
+    """Build a chain of `depth` subclasses of root, each registering one attribute."""
+    model = root
+    for level in range(depth):
+        model = type(f"Bench{root.__name__}{depth}_{level}", (model,), {})
+        PermissionsRegister.register(model, UserRole.USER, [f"field_{level}"])
+    return model
+
+
+def main() -> None:
+    print(f"{'root':>10} {'depth':>6} {'mro':>5} {'mro walk (ns)':>14} {'has_access (ns)':>16}")
+    for root in (ModelData, PlainRoot):
+        for depth in DEPTHS:
+            bench(root, depth)
+    print()
+    bench_projection()
+
+
+def bench(root: type, depth: int) -> None:
+    """Time both lookups for one chain."""
+    model = build_chain(root, depth)
+    PermissionsRegister.freeze([model])
+
+    bit = PermissionsRegister.field_bit("public_id")
+    uncached = timeit.timeit(
+        lambda: PermissionsRegister._compile(model, UserRole.USER) >> bit & 1,
+        number=NUMBER // 10) / (NUMBER // 10)
+    cached = timeit.timeit(
+        lambda: PermissionsRegister.has_access(model, UserRole.USER, "public_id"),
+        number=NUMBER) / NUMBER
+
+    print(f"{root.__name__:>10} {depth:>6} {len(model.__mro__):>5} "
+          f"{uncached * 1e9:>14.0f} {cached * 1e9:>16.0f}")
+
+
+def bench_projection() -> None:
+    """Compare a ?fields= projection done with sets and with masks."""
+    from app.models.user import User
+
+    requested = ["email", "username", "public_id", "profile", "unknown"]
+    requested_mask = PermissionsRegister.mask_of(requested)
+    with_sets = timeit.timeit(
+        lambda: set(PermissionsRegister.get_permissions(User, UserRole.ADMIN)) & set(requested),
+        number=NUMBER) / NUMBER
+    with_masks = timeit.timeit(
+        lambda: PermissionsRegister.get_mask(User, UserRole.ADMIN) & requested_mask,
+        number=NUMBER) / NUMBER
+    print(f"projection with sets: {with_sets * 1e9:.0f} ns, with masks: {with_masks * 1e9:.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
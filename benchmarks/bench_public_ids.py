@@ -0,0 +1,142 @@
+"""
+Benchmark of the public_id strategies (uuid4 versus uuid7).
+
+Three measurements:
+
+    - generation: cost of one id, in microseconds
+    - index simulation: INSERTS ids inserted in order of generation into a
+      simulated unique index (leaf pages of PAGE_KEYS keys, LRU cache of
+      CACHE_PAGES pages). Reports the leaf pages read from disk (cache
+      misses), the index size and the page fill factor, and an insert rate
+      derived from INSERT_COST per insert plus MISS_COST per page read.
+      Like WiredTiger, a page that overflows at the right end of the index
+      keeps its keys and starts a new page (append split); any other page
+      is split in half.
+    - MongoDB (optional): with a server URL as argument, INSERTS documents
+      are inserted in batches of BATCH with each strategy into scratch
+      collections, then the size of their public_id index is read from
+      collStats. The collections are dropped afterwards.
+
+Usage:
+    python -m benchmarks.bench_public_ids [mongodb://localhost:27017]
+"""
+import sys
+import time
+from bisect import bisect_right, insort
+from collections import OrderedDict
+
+from app.utils.public_ids import PUBLIC_ID_STRATEGIES
+
+INSERTS = 200_000
+PAGE_KEYS = 128
+PAGE_SIZE = 4096
+CACHE_PAGES = 200
+INSERT_COST = 0.00002
+MISS_COST = 0.0001
+BATCH = 1_000
+STRATEGIES = ("uuid4", "uuid7")
+
+
+def generation(strategy: str, count: int = INSERTS) -> float:
+    """Return the mean cost of one id in microseconds."""
+    generate = PUBLIC_ID_STRATEGIES[strategy]
+    start = time.perf_counter()
+    for _ in range(count):
+        generate()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+class SimulatedIndex:
+    """Leaf level of a B-tree index with an LRU page cache."""
+
+    def __init__(self):
+        self.pages = [[]]
+        self.firsts = [""]
+        self.cache = OrderedDict()
+        self.reads = 0
+
+    def touch(self, page: list, new: bool = False) -> None:
+        key = id(page)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return
+        if not new:
+            self.reads += 1
+        self.cache[key] = page
+        if len(self.cache) > CACHE_PAGES:
+            self.cache.popitem(last=False)
+
+    def insert(self, key: str) -> None:
+        position = bisect_right(self.firsts, key) - 1
+        page = self.pages[position]
+        self.touch(page)
+        insort(page, key)
+        if len(page) <= PAGE_KEYS:
+            return
+        if position == len(self.pages) - 1 and page[-1] == key:
+            new_page = [page.pop()]
+        else:
+            new_page = page[PAGE_KEYS // 2:]
+            del page[PAGE_KEYS // 2:]
+        self.pages.insert(position + 1, new_page)
+        self.firsts.insert(position + 1, new_page[0])
+        self.touch(new_page, new=True)
+
+
+def simulate(strategy: str) -> dict:
+    generate = PUBLIC_ID_STRATEGIES[strategy]
+    index = SimulatedIndex()
+    for _ in range(INSERTS):
+        index.insert(generate())
+    pages = len(index.pages)
+    return {
+        "reads": index.reads,
+        "size": pages * PAGE_SIZE,
+        "fill": INSERTS / (pages * PAGE_KEYS),
+        "rate": INSERTS / (INSERTS * INSERT_COST + index.reads * MISS_COST),
+    }
+
+
+def mongodb(url: str) -> None:
+    from pymongo import MongoClient
+
+    client = MongoClient(url)
+    database = client["bench_public_ids"]
+    print(f"\nMongoDB {url}: {INSERTS:,} documents, batches of {BATCH:,}\n")
+    print(f"{'strategy':<10}{'inserts/s':>12}{'public_id index':>18}")
+    try:
+        for strategy in STRATEGIES:
+            generate = PUBLIC_ID_STRATEGIES[strategy]
+            collection = database[strategy]
+            collection.drop()
+            collection.create_index("public_id", unique=True)
+            start = time.perf_counter()
+            for _ in range(INSERTS // BATCH):
+                collection.insert_many([{"public_id": generate()} for _ in range(BATCH)], ordered=False)
+            rate = INSERTS / (time.perf_counter() - start)
+            size = database.command("collStats", strategy)["indexSizes"]["public_id_1"]
+            print(f"{strategy:<10}{rate:>12,.0f}{size / 1024:>15,.0f} KiB")
+    finally:
+        client.drop_database(database.name)
+        client.close()
+
+
+def main() -> None:
+    print(f"{'strategy':<10}{'µs/id':>8}")
+    for strategy in STRATEGIES:
+        print(f"{strategy:<10}{generation(strategy):>8.2f}")
+
+    print(f"\nSimulated index: {INSERTS:,} inserts, {PAGE_KEYS} keys/page, {CACHE_PAGES} cached pages, "
+          f"{INSERT_COST * 1e6:.0f} µs per insert + {MISS_COST * 1e6:.0f} µs per page read\n")
+    print(f"{'strategy':<10}{'page reads':>12}{'index size':>14}{'fill':>8}{'inserts/s':>12}")
+    for strategy in STRATEGIES:
+        result = simulate(strategy)
+        print(f"{strategy:<10}{result['reads']:>12,}{result['size'] / 1024:>10,.0f} KiB"
+              f"{result['fill']:>8.0%}{result['rate']:>12,.0f}")
+
+    if len(sys.argv) > 1:
+        mongodb(sys.argv[1])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark of the in-memory GCRA rate limiter.
+
+Measures the cost of one limiter decision for a single hot key, for many
+distinct callers (100k keys, forcing sweeps and evictions), and the total
+throughput when several threads hit the limiter at once (the way sync
+endpoints run in FastAPI's thread pool) with 1 shard versus 16 shards.
+
+Usage:
+    python -m benchmarks.bench_rate_limit
+"""
+import threading
+import time
+
+from app.core.rate_limit import RateLimit, RateLimiter
+
+HITS = 200_000
+THREADS = 8
+LIMIT = RateLimit(1_000_000, 1)
+
+
+def per_hit(limiter: RateLimiter, keys: list) -> float:
+    """Return the mean cost of one decision in microseconds."""
+    count = len(keys)
+    start = time.perf_counter()
+    for i in range(HITS):
+        limiter.hit(keys[i % count], LIMIT)
+    return (time.perf_counter() - start) / HITS * 1e6
+
+
+def threaded(shards: int) -> float:
+    """Return decisions per second with THREADS concurrent threads."""
+    limiter = RateLimiter(shards=shards)
+    per_thread = HITS // THREADS
+
+    def worker(index: int) -> None:
+        keys = [f"user-{index}-{i}" for i in range(256)]
+        for i in range(per_thread):
+            limiter.hit(keys[i & 255], LIMIT)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(THREADS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return per_thread * THREADS / (time.perf_counter() - start)
+
+
+def main() -> None:
+    print(f"{'scenario':<34}{'µs/decision':>14}")
+    print(f"{'single hot key':<34}{per_hit(RateLimiter(), ['user-1']):>14.2f}")
+    keys = [f"user-{i}" for i in range(100_000)]
+    limiter = RateLimiter(max_keys=4096)
+    print(f"{'100k keys, 4096 per shard':<34}{per_hit(limiter, keys):>14.2f}")
+    print(f"  keys held after run: {len(limiter):,}\n")
+
+    print(f"{'threads':<10}{'shards':>8}{'decisions/s':>16}")
+    for shards in (1, 16):
+        print(f"{THREADS:<10}{shards:>8}{threaded(shards):>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark of the compiled role serializers against model_dump() + pop.
+
+Serializes a page of User documents the way the former to_public_dict did
+(dump everything, then pop the fields the role may not see) and with the
+serializer generated by SerializerFactory. Reports CPU time and peak
+allocations for each role.
+
+Usage:
+    python -m benchmarks.bench_serializers
+"""
+import time
+import tracemalloc
+
+from bson import ObjectId
+
+from app.config.permissions_config import PermissionsRegister
+from app.config.user_roles import UserRole
+from app.models.user import User
+from app.utils.formatters import SerializerFactory
+
+RECORDS = 5_000
+ROUNDS = 5
+
+
+def dump_and_pop(records: list, role: UserRole) -> list:
+    """Former approach: full model_dump() then remove excluded fields."""
+    allowed = PermissionsRegister.get_permissions(User, role)
+    excluded = [name for name in User.model_fields if name not in allowed]
+    page = []
+    for record in records:
+        data = record.model_dump()
+        for field in excluded:
+            data.pop(field, None)
+        page.append(data)
+    return page
+
+
+def compiled(records: list, role: UserRole) -> list:
+    """New approach: precompiled serializer reading only visible fields."""
+    serializer = SerializerFactory.get(User, role)
+    return [serializer(record) for record in records]
+
+
+def measure(func, records: list, role: UserRole) -> tuple:
+    """Return (best time in ms, peak allocation in KiB)."""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        func(records, role)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(records, role)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000, peak / 1024
+
+
+def main() -> None:
+    records = [
+        User(
+            email=f"user{i}@example.com",
+            username=f"user{i}",
+            hashed_password="x" * 64,
+            profile={"theme": "dark", "avatar": f"/avatars/{i}.png"},
+            owner_id=ObjectId(),
+        )
+        for i in range(RECORDS)
+    ]
+    SerializerFactory.build([User])
+
+    print(f"{RECORDS} records")
+    print(f"{'role':>11} {'dump+pop ms':>12} {'KiB':>8} {'compiled ms':>12} {'KiB':>8}")
+    for role in UserRole:
+        old_ms, old_kib = measure(dump_and_pop, records, role)
+        new_ms, new_kib = measure(compiled, records, role)
+        print(f"{role.value:>11} {old_ms:>12.1f} {old_kib:>8.0f} {new_ms:>12.1f} {new_kib:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
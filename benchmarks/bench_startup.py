@@ -0,0 +1,124 @@
+"""
+Benchmark of application startup with many configured models.
+
+Defines MODELS ModelData subclasses (four fields, field permissions, a
+ModelConfig), then measures in a fresh interpreter for each scenario:
+
+    - include_router: create_crud_router + app.include_router per model,
+      the way routers were mounted before the registry (routes are built
+      twice: once on the router, once when included)
+    - eager: ModelRegistry.mount(lazy=False), every route built once
+    - lazy: ModelRegistry.mount(), configuration validated at startup and
+      routes built on the first request reaching each model
+
+Model definition (the application's own import cost) is excluded from the
+startup time. For the lazy scenario, the first request on one model and the
+first /openapi.json are also measured, without and with the OpenAPI cache
+on disk.
+
+Usage:
+    python -m benchmarks.bench_startup
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import ClassVar, Optional
+
+MODELS = 200
+SCENARIOS = ("include_router", "eager", "lazy")
+
+
+def define_models(count: int = MODELS) -> list:
+    from odmantic import Field
+
+    from app.config.endpoint_config import EndpointConfig
+    from app.config.model_config import ModelConfig
+    from app.config.permissions_config import PermissionsRegister
+    from app.config.user_roles import UserRole
+    from app.models.model_data import ModelData
+
+    models = []
+    for i in range(count):
+        namespace = {
+            "__module__": __name__,
+            "__doc__": f"Article {i}.",
+            "__annotations__": {"title": str, "body": Optional[str], "rank": int, "tag": Optional[str],
+                                "api_config": ClassVar[Optional[ModelConfig]]},
+            "title": Field(..., max_length=200),
+            "body": None,
+            "rank": 0,
+            "tag": None,
+            "api_config": ModelConfig(endpoints={"get_all": EndpointConfig(user_role=UserRole.PUBLIC)}),
+        }
+        model = type(ModelData)(f"Article{i}", (ModelData,), namespace)
+        for role in UserRole:
+            PermissionsRegister.register(model, role, ["title", "body", "rank", "tag"])
+        models.append(model)
+    return models
+
+
+def run(scenario: str, cache_path: str) -> dict:
+    """Run one scenario in this interpreter and return its timings in seconds."""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.api.routes.dynamic import create_crud_router
+    from app.core.deps import get_current_user, get_engine
+    from app.models.registry import ModelRegistry
+
+    models = define_models()
+    app = FastAPI()
+    app.dependency_overrides[get_current_user] = lambda: None
+    app.dependency_overrides[get_engine] = lambda: None
+
+    start = time.perf_counter()
+    if scenario == "include_router":
+        for model in models:
+            app.include_router(create_crud_router(model))
+    else:
+        ModelRegistry.mount(app, models, lazy=scenario == "lazy", cache_path=cache_path)
+    timings = {"startup": time.perf_counter() - start}
+    if scenario != "lazy":
+        return timings
+
+    client = TestClient(app)
+    start = time.perf_counter()
+    client.get(f"/api/{models[0].__collection__}/unknown")
+    timings["first_request"] = time.perf_counter() - start
+    start = time.perf_counter()
+    client.get("/openapi.json")
+    timings["openapi"] = time.perf_counter() - start
+    return timings
+
+
+def measure(scenario: str, cache_path: str = "") -> dict:
+    """Run one scenario in a fresh interpreter."""
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", scenario, cache_path],
+        check=True, capture_output=True, text=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main() -> None:
+    if len(sys.argv) > 1:
+        print(json.dumps(run(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else "")))
+        return
+
+    print(f"{MODELS} models, 10 endpoints each\n")
+    print(f"{'scenario':<16}{'startup (s)':>12}")
+    for scenario in SCENARIOS:
+        print(f"{scenario:<16}{measure(scenario)['startup']:>12.3f}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache_path = os.path.join(directory, "plan.json")
+        cold = measure("lazy", cache_path)
+        warm = measure("lazy", cache_path)
+    print(f"\nlazy, first request on one model: {cold['first_request'] * 1000:.1f} ms")
+    print(f"lazy, first /openapi.json: {cold['openapi']:.3f} s cold, {warm['openapi']:.3f} s with the disk cache")
+
+
+if __name__ == "__main__":
+    main()
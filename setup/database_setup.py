@@ -0,0 +1,262 @@
+"""
+Synchronisation déclarative des index MongoDB.
+
+Les index attendus sont collectés puis comparés aux index existants :
+
+    - index des champs (Field(index=True, unique=True)) de chaque modèle ;
+      un index unique sur un champ optionnel est partiel (valeurs non
+      nulles), sinon deux documents sans valeur seraient en conflit
+    - index composés des requêtes du routeur dynamique, partiels sur les
+      enregistrements actifs : keyset_indexes (listes paginées),
+      ownership_indexes (listes du propriétaire), archive_indexes
+      (candidats à l'archivage)
+    - index des collections techniques : revoked_tokens, rate_limits,
+      audit_logs, import_jobs, import_errors, archives
+
+Rapport par collection :
+
+    - manquants : créés (sauf --dry-run), un par un, sans bloquer la
+      collection (construction hybride depuis MongoDB 4.2, option
+      background pour les versions antérieures)
+    - en conflit : même nom, définition différente (à reconstruire)
+    - redondants : non déclarés, ou préfixe d'un autre index de mêmes
+      options ; jamais supprimés automatiquement
+    - utilisation ($indexStats) : opérations depuis le dernier démarrage du
+      serveur, les index inutilisés ralentissent les écritures pour rien
+
+Usage:
+    python -m setup.database_setup [--dry-run]
+"""
+import argparse
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Type, get_args
+
+from bson import ObjectId, json_util
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from app.core.rate_limit import RATE_LIMITS_COLLECTION, rate_limits_indexes
+from app.core.security import REVOKED_TOKENS_COLLECTION, revoked_tokens_indexes
+from app.db.base import PRIMARY_KEY, odm_fields
+from app.models.registry import ModelRegistry
+from app.services.archive import archive_indexes, archive_name, archived_indexes
+from app.services.audit import AUDIT_COLLECTION, audit_logs_indexes
+from app.services.importer import (IMPORT_ERRORS_COLLECTION, IMPORT_JOBS_COLLECTION, import_errors_indexes,
+                                   import_jobs_indexes)
+from app.services.ownership import ownership_indexes
+from app.services.pagination import keyset_indexes
+
+# Options qui distinguent deux index de même clé
+INDEX_OPTIONS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds")
+
+# Types BSON des valeurs non nulles d'un champ optionnel unique
+BSON_TYPES = {str: "string", int: "number", float: "number", datetime: "date", ObjectId: "objectId"}
+
+IndexSignature = Tuple[Tuple[Tuple[str, Any], ...], Tuple[Tuple[str, Any], ...]]
+
+
+# ----------------------------
+# Index déclarés
+# ----------------------------
+
+def field_indexes(model: Type) -> List[IndexModel]:
+    """Index simples déclarés sur les champs d'un modèle (noms par défaut de MongoDB)."""
+    indexes = []
+    for name, field in odm_fields(model).items():
+        index, unique = getattr(field, "index", False), getattr(field, "unique", False)
+        if field.key_name == PRIMARY_KEY or not (index or unique):
+            continue
+        options: Dict[str, Any] = {"unique": True} if unique else {}
+        args = get_args(model.model_fields[name].annotation)
+        if unique and type(None) in args:
+            bson_type = next((BSON_TYPES[arg] for arg in args if arg in BSON_TYPES), None)
+            if bson_type is not None:
+                options["partialFilterExpression"] = {field.key_name: {"$type": bson_type}}
+        indexes.append(IndexModel([(field.key_name, ASCENDING)], **options))
+    return indexes
+
+
+def model_indexes(model: Type) -> List[IndexModel]:
+    """Index de la collection d'un modèle : champs et requêtes du routeur."""
+    return field_indexes(model) + keyset_indexes(model) + ownership_indexes(model) + archive_indexes()
+
+
+def registered_models() -> List[Type]:
+    """Modèles exposés par l'API (voir ModelRegistry.discover), un par collection."""
+    models: Dict[str, Type] = {}
+    for model in ModelRegistry.discover():
+        models.setdefault(model.__collection__, model)
+    return list(models.values())
+
+
+def declared_indexes(models: Iterable[Type]) -> Dict[str, List[IndexModel]]:
+    """Index attendus, par collection."""
+    declared: Dict[str, List[IndexModel]] = {
+        REVOKED_TOKENS_COLLECTION: revoked_tokens_indexes(),
+        RATE_LIMITS_COLLECTION: rate_limits_indexes(),
+        AUDIT_COLLECTION: audit_logs_indexes(),
+        IMPORT_JOBS_COLLECTION: import_jobs_indexes(),
+        IMPORT_ERRORS_COLLECTION: import_errors_indexes(),
+    }
+    for model in models:
+        declared[model.__collection__] = model_indexes(model)
+        declared[archive_name(model)] = archived_indexes()
+    return declared
+
+
+# ----------------------------
+# Comparaison
+# ----------------------------
+
+def signature(spec: Dict[str, Any]) -> IndexSignature:
+    """Clé et options d'un index (IndexModel.document ou index_information())."""
+    key = spec["key"].items() if isinstance(spec["key"], dict) else spec["key"]
+    options = tuple((name, json_util.dumps(spec[name], sort_keys=True))
+                    for name in INDEX_OPTIONS if spec.get(name))
+    return tuple((field, int(direction) if isinstance(direction, (int, float)) else direction)
+                 for field, direction in key), options
+
+
+class IndexPlan(NamedTuple):
+    """
+    Écart entre les index déclarés et existants d'une collection.
+
+    Attributs:
+        collection: Nom de la collection
+        missing: Index déclarés absents
+        conflicting: Noms des index existants de même nom mais de définition différente
+        redundant: {nom: raison} des index existants superflus
+        usage: {nom: opérations depuis le démarrage du serveur}
+    """
+
+    collection: str
+    missing: List[IndexModel]
+    conflicting: List[str]
+    redundant: Dict[str, str]
+    usage: Dict[str, int]
+
+
+def diff_indexes(collection: str, declared: List[IndexModel], existing: Dict[str, Dict[str, Any]],
+                 usage: Optional[Dict[str, int]] = None) -> IndexPlan:
+    """
+    Compare les index déclarés aux index existants (index_information()).
+
+    Un index existant de même clé et mêmes options qu'un index déclaré le
+    satisfait, quel que soit son nom.
+    """
+    existing = {name: spec for name, spec in existing.items() if name != "_id_"}
+    existing_signatures = {signature(spec): name for name, spec in existing.items()}
+    declared_names = set()
+    missing, conflicting = [], []
+    for index in declared:
+        document = index.document
+        match = existing_signatures.get(signature(document))
+        if match is not None:
+            declared_names.add(match)
+        elif document["name"] in existing:
+            conflicting.append(document["name"])
+            declared_names.add(document["name"])
+        else:
+            missing.append(index)
+
+    redundant = {}
+    for name, spec in existing.items():
+        key, options = signature(spec)
+        for other_name, other in existing.items():
+            other_key, other_options = signature(other)
+            covers = len(other_key) > len(key) and other_key[:len(key)] == key
+            if other_name != name and covers and options == other_options and not spec.get("unique"):
+                redundant[name] = f"préfixe de {other_name}"
+                break
+        else:
+            if name not in declared_names:
+                redundant[name] = "non déclaré"
+    return IndexPlan(collection, missing, conflicting, redundant, usage or {})
+
+
+# ----------------------------
+# Base de données
+# ----------------------------
+
+async def index_usage(collection: Any) -> Dict[str, int]:
+    """Opérations par index depuis le démarrage du serveur ($indexStats)."""
+    try:
+        return {
+            stats["name"]: stats["accesses"]["ops"]
+            async for stats in collection.aggregate([{"$indexStats": {}}])
+        }
+    except OperationFailure:
+        return {}
+
+
+async def sync_indexes(database: Any, declared: Dict[str, List[IndexModel]],
+                       apply: bool = True) -> List[IndexPlan]:
+    """
+    Compare et crée les index manquants de chaque collection.
+
+    Args:
+        database: Base motor
+        declared: Index attendus par collection (voir declared_indexes)
+        apply: False pour seulement produire le rapport
+
+    Returns:
+        List[IndexPlan]: Écart constaté avant création, par collection
+    """
+    plans = []
+    for name, indexes in declared.items():
+        collection = database[name]
+        existing = await collection.index_information()
+        plan = diff_indexes(name, indexes, existing, await index_usage(collection))
+        if apply:
+            for index in plan.missing:
+                # Un par un : un échec (doublons d'un index unique...) n'empêche pas les autres
+                document = dict(index.document)
+                keys = list(document.pop("key").items())
+                try:
+                    await collection.create_index(keys, background=True, **document)
+                except OperationFailure as error:
+                    plan.conflicting.append(f"{document['name']} ({(error.details or {}).get('errmsg', error)})")
+        plans.append(plan)
+    return plans
+
+
+def format_report(plans: List[IndexPlan], applied: bool) -> str:
+    """Rapport lisible de la synchronisation."""
+    lines = []
+    for plan in plans:
+        if not (plan.missing or plan.conflicting or plan.redundant):
+            continue
+        lines.append(f"{plan.collection}")
+        for index in plan.missing:
+            lines.append(f"  {'créé' if applied else 'manquant'} : {index.document['name']}")
+        for name in plan.conflicting:
+            lines.append(f"  en conflit : {name}")
+        for name, reason in plan.redundant.items():
+            ops = plan.usage.get(name)
+            used = "" if ops is None else f", {ops} opérations"
+            lines.append(f"  redondant : {name} ({reason}{used})")
+    unused = [
+        f"{plan.collection}.{name}"
+        for plan in plans for name, ops in plan.usage.items()
+        if ops == 0 and name != "_id_"
+    ]
+    if unused:
+        lines.append("inutilisés depuis le démarrage du serveur : " + ", ".join(unused))
+    return "\n".join(lines) or "Index à jour."
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Synchronise les index MongoDB des modèles.")
+    parser.add_argument("--dry-run", action="store_true", help="rapport seul, aucun index créé")
+    args = parser.parse_args(argv)
+
+    from app.db.session import get_engine
+
+    declared = declared_indexes(registered_models())
+    plans = asyncio.run(sync_indexes(get_engine().database, declared, apply=not args.dry_run))
+    print(format_report(plans, applied=not args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+# tests/api/test_admin.py
+
+import json
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pymongo.errors import AutoReconnect, DuplicateKeyError
+
+from app.api.routes import admin
+from app.api.routes.admin import create_admin_router
+from app.config.user_roles import UserRole
+from app.core.deps import get_current_user, get_engine
+from app.models.user import User
+from app.services import importer
+from app.services.audit import AUDIT_COLLECTION
+
+
+# ------------------------------------------------------------
+# Fixtures
+# ------------------------------------------------------------
+
+def matches(document, query):
+    """Evaluate the equality, $lt, $gt, $and and $or filters built by the admin routes."""
+    for key, expected in query.items():
+        if key == "$and":
+            if not all(matches(document, part) for part in expected):
+                return False
+        elif key == "$or":
+            if not any(matches(document, part) for part in expected):
+                return False
+        elif isinstance(expected, dict) and "$lt" in expected:
+            if not document.get(key) < expected["$lt"]:
+                return False
+        elif isinstance(expected, dict) and "$gt" in expected:
+            if not document.get(key) > expected["$gt"]:
+                return False
+        elif document.get(key) != expected:
+            return False
+    return True
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, keys):
+        for key, direction in reversed(keys):
+            self.documents.sort(key=lambda document: document[key], reverse=direction < 0)
+        return self
+
+    def limit(self, count):
+        self.documents = self.documents[:count]
+        return self
+
+    async def to_list(self, length):
+        return self.documents[:length]
+
+
+class FakeCollection:
+    def __init__(self, documents=(), fail_on_insert=None):
+        self.documents = [dict(document) for document in documents]
+        self.inserts = 0
+        self.fail_on_insert = fail_on_insert
+
+    def find(self, query, projection=None):
+        return FakeCursor([dict(document) for document in self.documents if matches(document, query)])
+
+    async def find_one(self, query):
+        found = [document for document in self.documents if matches(document, query)]
+        return dict(found[0]) if found else None
+
+    async def insert_one(self, document):
+        if any(existing["_id"] == document["_id"] for existing in self.documents):
+            raise DuplicateKeyError("duplicate _id")
+        self.documents.append(dict(document))
+
+    async def insert_many(self, documents, ordered=True):
+        self.inserts += 1
+        if self.inserts == self.fail_on_insert:
+            raise AutoReconnect("connection lost")
+        self.documents += [{"_id": ObjectId(), **document} for document in documents]
+
+    async def update_one(self, query, update):
+        for document in self.documents:
+            if matches(document, query):
+                document.update(update["$set"])
+
+
+class FakeEngine:
+    def __init__(self, collections):
+        self.database = collections
+
+    def get_collection(self, model):
+        return self.database[model.__collection__]
+
+
+def client_for(collections):
+    app = FastAPI()
+    app.include_router(create_admin_router([User]))
+    app.dependency_overrides[get_current_user] = lambda: User(email="admin@example.com",
+                                                              roles=[UserRole.ADMIN])
+    app.dependency_overrides[get_engine] = lambda: FakeEngine(collections)
+    return TestClient(app)
+
+
+@pytest.fixture
+def audit_logs():
+    """Fixture returning five entries written by one batch (same ts), then an older one (naive UTC, as read from MongoDB)."""
+    batch = datetime(2025, 1, 1)
+    entries = [{"_id": ObjectId(), "ts": batch, "action": "update", "actor": None} for _ in range(5)]
+    entries.append({"_id": ObjectId(), "ts": datetime(2024, 1, 1),
+                    "action": "create", "actor": None})
+    return FakeCollection(entries)
+
+
+@pytest.fixture
+def import_collections(monkeypatch):
+    """Fixture returning the collections of an import whose second user batch fails, audit calls recorded."""
+    audited = []
+
+    async def audit(engine, action, model, user, targets=(), **details):
+        audited.append((action, details))
+    monkeypatch.setattr(admin.audit_service, "audit", audit)
+    return audited, {
+        "user": FakeCollection(fail_on_insert=2),
+        importer.IMPORT_JOBS_COLLECTION: FakeCollection(),
+        importer.IMPORT_ERRORS_COLLECTION: FakeCollection(),
+    }
+
+
+# ------------------------------------------------------------
+# Audit logs
+# ------------------------------------------------------------
+
+def test_logs_pages_do_not_skip_entries_sharing_a_timestamp(audit_logs):
+    """Ensure every entry of a batch is returned once across pages."""
+    client = client_for({AUDIT_COLLECTION: audit_logs})
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        body = client.get("/admin/logs", params=params).json()
+        seen += [(entry["ts"], entry["action"]) for entry in body["items"]]
+        assert all("_id" not in entry for entry in body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == len(audit_logs.documents)
+    assert [action for _, action in seen] == ["update"] * 5 + ["create"]
+
+
+def test_logs_reject_cursor_of_another_query(audit_logs):
+    """Ensure a forged or foreign cursor is refused."""
+    client = client_for({AUDIT_COLLECTION: audit_logs})
+    response = client.get("/admin/logs", params={"cursor": "abc.def"})
+    assert response.status_code == 400
+
+
+# ------------------------------------------------------------
+# Import
+# ------------------------------------------------------------
+
+def test_import_failure_returns_and_audits_partial_report(import_collections):
+    """Ensure a write failure keeps the rows already written in the response, the job and the audit."""
+    audited, collections = import_collections
+    client = client_for(collections)
+    lines = ["not json"] + [json.dumps({"email": f"user{i}@example.com"}) for i in range(4)]
+    import_id = "a" * 32
+
+    response = client.post("/admin/import/user", params={"batch_size": 3, "import_id": import_id},
+                           content="\n".join(lines).encode())
+
+    assert response.status_code == 500
+    body = response.json()
+    assert (body["status"], body["inserted"], body["failed"]) == ("failed", 2, 1)
+    assert audited == [("import", {"count": 2, "import_id": import_id, "status": "failed"})]
+
+    job = client.get(f"/admin/imports/{import_id}").json()
+    assert (job["status"], job["rows"], job["inserted"], job["model"]) == ("failed", 5, 2, "user")
+    assert client.post("/admin/import/user", params={"import_id": import_id}, content=b"").status_code == 409
+
+
+def test_import_errors_are_paginated(import_collections, monkeypatch):
+    """Ensure every row error is readable, beyond the detailed limit of the report."""
+    monkeypatch.setattr(importer, "MAX_REPORTED_ERRORS", 1)
+    _, collections = import_collections
+    client = client_for(collections)
+
+    body = client.post("/admin/import/user", content=b"x\ny\nz").json()
+    assert body["status"] == "completed" and len(body["errors"]) == 1
+
+    rows, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get(f"/admin/imports/{body['import_id']}/errors", params=params).json()
+        rows += [error["row"] for error in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert rows == [1, 2, 3]
+    assert client.get(f"/admin/imports/{'b' * 32}/errors").status_code == 404
@@ -0,0 +1,210 @@
+# tests/api/test_dynamic.py
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes import dynamic
+from app.api.routes.dynamic import create_crud_router
+from app.config.user_roles import UserRole
+from app.core import principal as principal_module
+from app.core.deps import get_current_user, get_engine
+from app.core.principal import Principal, PrincipalCache
+from app.models.user import User
+from app.services import stats
+from app.services.crud import to_document
+
+
+# ------------------------------------------------------------
+# Fixtures
+# ------------------------------------------------------------
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def __aiter__(self):
+        async def iterate():
+            for document in self.documents:
+                yield document
+        return iterate()
+
+
+def matches(document, query):
+    """Evaluate the equality, $in and $and filters built by the router."""
+    for key, expected in query.items():
+        if key == "$and":
+            if not all(matches(document, part) for part in expected):
+                return False
+        elif isinstance(expected, dict) and "$in" in expected:
+            if document.get(key) not in expected["$in"]:
+                return False
+        elif document.get(key) != expected:
+            return False
+    return True
+
+
+class FakeCollection:
+    """In-memory collection implementing the calls made by the dynamic router."""
+
+    def __init__(self, documents=()):
+        self.documents = [dict(document) for document in documents]
+
+    def _first(self, query):
+        return next((document for document in self.documents if matches(document, query)), None)
+
+    def find(self, query, projection=None):
+        return FakeCursor([dict(document) for document in self.documents if matches(document, query)])
+
+    async def bulk_write(self, operations, ordered=True):
+        matched = 0
+        for operation in operations:
+            document = self._first(operation._filter)
+            if document is not None:
+                document.update(operation._doc["$set"])
+                matched += 1
+        return SimpleNamespace(matched_count=matched, modified_count=matched)
+
+    async def find_one(self, query, projection=None):
+        document = self._first(query)
+        return dict(document) if document is not None else None
+
+    async def insert_one(self, document):
+        self.documents.append(dict(document))
+
+    async def update_one(self, query, update):
+        document = self._first(query)
+        if document is not None:
+            document.update(update["$set"])
+        matched = int(document is not None)
+        return SimpleNamespace(matched_count=matched, modified_count=matched)
+
+    async def find_one_and_update(self, query, update, projection=None, return_document=None):
+        document = self._first(query)
+        if document is None:
+            return None
+        document.update(update["$set"])
+        return dict(document)
+
+
+class FakeEngine:
+    def __init__(self, collection):
+        self.collection = collection
+
+    def get_collection(self, model):
+        return self.collection
+
+
+@pytest.fixture(autouse=True)
+def no_audit(monkeypatch):
+    """Keep the audit writer out of the request path."""
+    async def audit(*args, **kwargs):
+        return None
+    monkeypatch.setattr(dynamic, "audit", audit)
+
+
+@pytest.fixture(autouse=True)
+def stats_store(monkeypatch):
+    """Fresh in-memory statistics for each test."""
+    store = stats.StatsStore()
+    monkeypatch.setattr(stats, "_store", store)
+    return store
+
+
+@pytest.fixture
+def stored():
+    """Fixture returning a stored regular user."""
+    return User(email="jane@example.com", username="jane")
+
+
+@pytest.fixture
+def collection(stored):
+    return FakeCollection([to_document(stored)])
+
+
+def client_for(collection, caller):
+    app = FastAPI()
+    app.include_router(create_crud_router(User))
+    app.dependency_overrides[get_current_user] = lambda: caller
+    app.dependency_overrides[get_engine] = lambda: FakeEngine(collection)
+    return TestClient(app)
+
+
+def caller_with(role):
+    return User(email=f"{role.value}@example.com", roles=[role])
+
+
+# ------------------------------------------------------------
+# Write permissions
+# ------------------------------------------------------------
+
+def test_admin_cannot_grant_roles(collection, stored):
+    """Ensure an administrator cannot promote a user through PUT."""
+    client = client_for(collection, caller_with(UserRole.ADMIN))
+    response = client.put(f"/api/user/{stored.public_id}", json={"roles": ["superadmin"]})
+    assert response.status_code == 422
+    assert collection.documents[0]["roles"] == ["user"]
+
+
+def test_superadmin_can_grant_roles(collection, stored):
+    """Ensure roles stay writable by superadministrators."""
+    client = client_for(collection, caller_with(UserRole.SUPERADMIN))
+    response = client.put(f"/api/user/{stored.public_id}", json={"roles": ["admin"]})
+    assert response.status_code == 200
+    assert response.json()["roles"] == ["admin"]
+
+
+@pytest.mark.parametrize("field, value", [("is_verified", True), ("last_login", "2025-01-01T00:00:00Z")])
+def test_users_cannot_create_with_privileged_fields(collection, field, value):
+    """Ensure an authenticated caller cannot self-verify or forge a login date."""
+    client = client_for(collection, caller_with(UserRole.USER))
+    response = client.post("/api/user", json={"email": "new@example.com", field: value})
+    assert response.status_code == 422
+    assert len(collection.documents) == 1
+
+
+# ------------------------------------------------------------
+# Statistics
+# ------------------------------------------------------------
+
+def test_bulk_delete_counts_each_record_once(collection, stored, stats_store):
+    """Ensure a repeated public_id is deleted and counted once."""
+    client = client_for(collection, caller_with(UserRole.SUPERADMIN))
+    response = client.request("DELETE", "/api/user/_bulk", json=[stored.public_id, stored.public_id])
+    assert response.status_code == 200
+    assert response.json()["succeeded"] == 1
+    counters = asyncio.run(stats_store.get(User.__collection__))
+    assert (counters["active"], counters["deleted"]) == (-1, 1)
+
+
+# ------------------------------------------------------------
+# Principal cache
+# ------------------------------------------------------------
+
+@pytest.fixture
+def principals(monkeypatch, stored):
+    """Fixture returning an isolated process cache holding the stored user's principal."""
+    cache = PrincipalCache()
+    monkeypatch.setattr(principal_module, "principal_cache", cache)
+    cache.put(Principal.from_user(stored))
+    return cache
+
+
+@pytest.mark.parametrize("method, path, body", [
+    ("PUT", "/api/user/{public_id}", {"roles": ["admin"]}),
+    ("DELETE", "/api/user/{public_id}", None),
+    ("PUT", "/api/user/_bulk", [{"public_id": "{public_id}", "data": {"roles": ["admin"]}}]),
+    ("DELETE", "/api/user/_bulk", ["{public_id}"]),
+    ("POST", "/api/user/{public_id}/transfer", {"owner": "{public_id}"}),
+])
+def test_user_writes_invalidate_cached_principal(collection, stored, principals, method, path, body):
+    """Ensure writes to the users collection drop the written user's cached principal."""
+    client = client_for(collection, caller_with(UserRole.SUPERADMIN))
+    body = json.loads(json.dumps(body).replace("{public_id}", stored.public_id))
+    response = client.request(method, path.format(public_id=stored.public_id), json=body)
+    assert response.status_code < 300
+    assert principals.get(stored.internal_id) is None
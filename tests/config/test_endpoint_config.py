@@ -0,0 +1,75 @@
+# tests/config/test_endpoint_config.py
+
+import subprocess
+import sys
+
+import pytest
+
+from app.config.endpoint_config import EndpointConfig
+from app.config.model_config import DEFAULT_ENDPOINTS, ModelConfig
+from app.config.user_roles import UserRole
+from app.core.exceptions import NotAuthenticatedError
+from app.core.permissions import endpoint_access
+from app.models.user import User
+
+
+# ------------------------------------------------------------
+# Immutability
+# ------------------------------------------------------------
+
+def test_configs_are_slotted_and_immutable():
+    """Ensure configuration objects have no __dict__ and reject assignments."""
+    endpoint = EndpointConfig()
+    config = ModelConfig()
+    assert not hasattr(endpoint, "__dict__")
+    with pytest.raises(AttributeError):
+        endpoint.user_role = UserRole.PUBLIC
+    with pytest.raises(AttributeError):
+        config.table_name = "user"
+    with pytest.raises(TypeError):
+        config.endpoints["delete"] = EndpointConfig(enable=False)
+
+
+def test_replace_derives_a_validated_copy():
+    """Ensure replace() keeps the original untouched and validates the copy."""
+    endpoint = EndpointConfig(user_role=UserRole.ADMIN)
+    public = endpoint.replace(user_role=UserRole.PUBLIC)
+    assert endpoint.user_role is UserRole.ADMIN
+    assert endpoint_access(public).authorize(None) is UserRole.PUBLIC
+    with pytest.raises(ValueError):
+        endpoint.replace(hydration="lazy")
+
+
+def test_default_endpoints_are_shared():
+    """Ensure model configurations reuse the default endpoint objects."""
+    assert ModelConfig().endpoints["get_one"] is DEFAULT_ENDPOINTS["get_one"]
+
+
+# ------------------------------------------------------------
+# Compiled auth
+# ------------------------------------------------------------
+
+def test_configuration_is_validated_at_construction():
+    """Ensure invalid endpoint settings fail when the configuration is built."""
+    with pytest.raises(ValueError):
+        EndpointConfig(user_role="admin")
+
+
+def test_compiled_checks_follow_configuration():
+    """Ensure authorize and check_record are compiled once from the settings."""
+    endpoint = EndpointConfig(custom_auth_function=lambda user, record: record["team"] == "a")
+    access = endpoint_access(endpoint)
+    assert endpoint_access(endpoint) is access
+    with pytest.raises(NotAuthenticatedError):
+        access.authorize(None)
+    assert access.check_record(None, {"team": "a"})
+    assert not access.check_record(None, {"team": "b"})
+    assert endpoint_access(EndpointConfig()).check_record(None, {"team": "b"})
+    assert endpoint_access(EndpointConfig()).authorize(User(email="user@example.com")) is UserRole.USERS
+
+
+def test_config_package_does_not_import_core_or_db():
+    """Ensure importing the configuration does not pull in the core and db layers."""
+    code = ("import sys, app.config.endpoint_config, app.config.model_config; "
+            "sys.exit(any(name.startswith(('app.core', 'app.db')) for name in sys.modules))")
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
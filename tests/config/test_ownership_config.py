@@ -0,0 +1,29 @@
+# tests/config/test_ownership_config.py
+
+from bson import ObjectId
+
+from app.config.ownership_config import OwnershipConfig
+from app.config.user_roles import UserRole
+from app.models.user import User
+
+
+# ------------------------------------------------------------
+# Transfer rule
+# ------------------------------------------------------------
+
+def test_can_transfer_allows_admins_and_permitted_owners():
+    """Ensure administrators, and owners whose account allows it, may transfer a record."""
+    owner = User(email="owner@example.com")
+    record = {"owner_id": owner.internal_id}
+    rule = OwnershipConfig().can_transfer
+
+    assert rule(UserRole.ADMIN, User(email="admin@example.com"), {"owner_id": ObjectId()})
+    assert not rule(UserRole.USERS, owner, record)
+    owner.allow_ownership_transfer = True
+    assert rule(UserRole.USERS, owner, record)
+    assert not rule(UserRole.USERS, User(email="other@example.com", allow_ownership_transfer=True), record)
+
+
+def test_disabled_transfers_are_always_refused():
+    """Ensure allow_ownership_transfer=False refuses everyone."""
+    assert not OwnershipConfig(allow_ownership_transfer=False).can_transfer(UserRole.SUPERADMIN, None, {})
@@ -1,8 +1,13 @@
 # File: tests/test_permissions_register.py
 
+import copy
+
 import pytest
 from app.config.permissions_config import PermissionsRegister, Permissions, AllUserRolePermissions
 from app.config.user_roles import UserRole
+from app.models.model_data import ModelData
+from app.models.registry import ModelRegistry
+from app.models.user import User
 
 
 # ---------------------------------------------------------------------------
@@ -19,6 +24,16 @@ class ChildModel(BaseModel):
     pass
 
 
+@pytest.fixture
+def clean_registry():
+    """Empty the global registry for a test, then restore the app's own registrations."""
+    saved_registry = copy.deepcopy(PermissionsRegister._registry)
+    PermissionsRegister.reset()
+    yield
+    PermissionsRegister.reset()
+    PermissionsRegister._registry.update(saved_registry)
+
+
 # ---------------------------------------------------------------------------
 # Unit test suite for PermissionsRegister
 # ---------------------------------------------------------------------------
@@ -26,11 +41,9 @@ class ChildModel(BaseModel):
 class TestPermissionsRegister:
 
     @pytest.fixture(autouse=True)
-    def reset_registry(self):
+    def reset_registry(self, clean_registry):
         """Ensure the global registry is clean before and after each test."""
-        PermissionsRegister._registry.clear()
         yield
-        PermissionsRegister._registry.clear()
 
     # -----------------------------------------------------------------------
     # Basic registration behavior
@@ -41,23 +54,24 @@ class TestPermissionsRegister:
         PermissionsRegister.register(BaseModel, UserRole.ADMIN, ["name", "email"])
         assert "BaseModel" in PermissionsRegister._registry
         assert UserRole.ADMIN in PermissionsRegister._registry["BaseModel"]
-        assert PermissionsRegister._registry["BaseModel"][UserRole.ADMIN]["attributes"] == {"name", "email"}
+        mask = PermissionsRegister._registry["BaseModel"][UserRole.ADMIN]["mask"]
+        assert set(PermissionsRegister.fields_of(mask)) == {"name", "email"}
 
     def test_register_merges_attributes_when_overwrite_false(self):
         """Should merge new attributes if overwrite=False."""
         PermissionsRegister.register(BaseModel, UserRole.ADMIN, ["a", "b"])
         PermissionsRegister.register(BaseModel, UserRole.ADMIN, ["c"], overwrite=False)
 
-        attrs = PermissionsRegister._registry["BaseModel"][UserRole.ADMIN]["attributes"]
-        assert attrs == {"a", "b", "c"}
+        mask = PermissionsRegister._registry["BaseModel"][UserRole.ADMIN]["mask"]
+        assert set(PermissionsRegister.fields_of(mask)) == {"a", "b", "c"}
 
     def test_register_overwrites_attributes_when_overwrite_true(self):
         """Should replace existing attributes if overwrite=True."""
         PermissionsRegister.register(BaseModel, UserRole.ADMIN, ["x", "y"])
         PermissionsRegister.register(BaseModel, UserRole.ADMIN, ["z"], overwrite=True)
 
-        attrs = PermissionsRegister._registry["BaseModel"][UserRole.ADMIN]["attributes"]
-        assert attrs == {"z"}
+        mask = PermissionsRegister._registry["BaseModel"][UserRole.ADMIN]["mask"]
+        assert set(PermissionsRegister.fields_of(mask)) == {"z"}
         assert PermissionsRegister._registry["BaseModel"][UserRole.ADMIN]["overwrite"] is True
 
     # -----------------------------------------------------------------------
@@ -137,6 +151,95 @@ class TestPermissionsRegister:
         assert PermissionsRegister.has_access(AnotherModel, UserRole.ADMIN, "b1") is True
         assert PermissionsRegister.has_access(AnotherModel, UserRole.ADMIN, "b2") is False
 
+    # -----------------------------------------------------------------------
+    # Compiled matrix
+    # -----------------------------------------------------------------------
+
+    def test_get_permissions_returns_frozenset(self):
+        """Compiled permissions should be immutable."""
+        PermissionsRegister.register(BaseModel, UserRole.ADMIN, ["a"])
+        result = PermissionsRegister.get_permissions(BaseModel, UserRole.ADMIN)
+        assert isinstance(result, frozenset)
+
+    def test_get_permissions_is_cached(self):
+        """Repeated lookups should return the same compiled object."""
+        PermissionsRegister.register(BaseModel, UserRole.ADMIN, ["a"])
+        first = PermissionsRegister.get_permissions(ChildModel, UserRole.ADMIN)
+        second = PermissionsRegister.get_permissions(ChildModel, UserRole.ADMIN)
+        assert first is second
+
+    def test_register_invalidates_compiled_permissions(self):
+        """A later registration on a base class should reach compiled subclasses."""
+        PermissionsRegister.register(BaseModel, UserRole.ADMIN, ["a"])
+        assert PermissionsRegister.get_permissions(ChildModel, UserRole.ADMIN) == {"a"}
+
+        PermissionsRegister.register(BaseModel, UserRole.ADMIN, ["b"])
+        assert PermissionsRegister.get_permissions(ChildModel, UserRole.ADMIN) == {"a", "b"}
+
+    def test_freeze_compiles_given_models(self):
+        """freeze() should fill the matrix for every role of the given models."""
+        PermissionsRegister.register(BaseModel, UserRole.ADMIN, ["a"])
+        PermissionsRegister.freeze([BaseModel, ChildModel])
+
+        for role in UserRole:
+            assert (BaseModel, role) in PermissionsRegister._matrix
+            assert (ChildModel, role) in PermissionsRegister._matrix
+        assert PermissionsRegister._matrix[(ChildModel, UserRole.ADMIN)] == PermissionsRegister.mask_of(["a"])
+
+    def test_freeze_compiles_discovered_models(self):
+        """freeze() should compile the models found by ModelRegistry.discover()."""
+        PermissionsRegister.register(ModelData, UserRole.ADMIN, ["public_id"])
+        PermissionsRegister.freeze(ModelRegistry.discover())
+
+        for role in UserRole:
+            assert (User, role) in PermissionsRegister._matrix
+        assert (ModelData, UserRole.ADMIN) not in PermissionsRegister._matrix
+
+    # -----------------------------------------------------------------------
+    # Bitmasks
+    # -----------------------------------------------------------------------
+
+    def test_field_bits_are_stable(self):
+        """An attribute should keep the same bit position across models."""
+        PermissionsRegister.register(BaseModel, UserRole.ADMIN, ["shared"])
+        bit = PermissionsRegister.field_bit("shared")
+        PermissionsRegister.register(ChildModel, UserRole.USER, ["other", "shared"])
+        assert PermissionsRegister.field_bit("shared") == bit
+
+    def test_field_index_follows_declared_fields(self):
+        """Pydantic fields should be indexed in declaration order."""
+        from app.models.model_data import ModelData
+
+        index = PermissionsRegister.field_index(ModelData)
+        assert list(index) == list(ModelData.model_fields)
+        assert list(index.values()) == sorted(index.values())
+
+    def test_get_mask_merges_bases_with_or(self):
+        """The mask of a child should be the union of its chain."""
+        PermissionsRegister.register(BaseModel, UserRole.ADMIN, ["a"])
+        PermissionsRegister.register(ChildModel, UserRole.ADMIN, ["b"])
+        mask = PermissionsRegister.get_mask(ChildModel, UserRole.ADMIN)
+        assert mask == PermissionsRegister.mask_of(["a", "b"])
+
+    def test_get_mask_respects_overwrite(self):
+        """overwrite=True on the child should drop the bits of its bases."""
+        PermissionsRegister.register(BaseModel, UserRole.ADMIN, ["a"])
+        PermissionsRegister.register(ChildModel, UserRole.ADMIN, ["b"], overwrite=True)
+        mask = PermissionsRegister.get_mask(ChildModel, UserRole.ADMIN)
+        assert mask == PermissionsRegister.mask_of(["b"])
+
+    def test_filter_mask_intersects_requested_fields(self):
+        """Requested fields should be narrowed to the permitted ones."""
+        PermissionsRegister.register(BaseModel, UserRole.USER, ["a", "b"])
+        mask = PermissionsRegister.filter_mask(BaseModel, UserRole.USER, ["b", "c", "unknown"])
+        assert PermissionsRegister.fields_of(mask) == ("b",)
+
+    def test_has_access_unknown_attribute_is_false(self):
+        """An attribute never seen by the register should not be accessible."""
+        PermissionsRegister.register(BaseModel, UserRole.USER, ["a"])
+        assert PermissionsRegister.has_access(BaseModel, UserRole.USER, "never_registered_attribute") is False
+        assert "never_registered_attribute" not in PermissionsRegister._field_bits
+
 
 # ---------------------------------------------------------------------------
 # Tests for decorators
@@ -145,11 +248,9 @@ class TestPermissionsRegister:
 class TestDecorators:
 
     @pytest.fixture(autouse=True)
-    def reset_registry(self):
+    def reset_registry(self, clean_registry):
         """Ensure registry is clean before and after each test."""
-        PermissionsRegister._registry.clear()
         yield
-        PermissionsRegister._registry.clear()
 
     def test_permissions_decorator_registers_attributes(self):
         """Decorator @Permissions should register attributes correctly."""
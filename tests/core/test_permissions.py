@@ -0,0 +1,112 @@
+# tests/core/test_permissions.py
+
+import pytest
+from bson import ObjectId
+
+from app.config.endpoint_config import EndpointConfig
+from app.config.user_roles import UserRole
+from app.core.exceptions import NotAuthenticatedError, PermissionDeniedError
+from app.core.permissions import (
+    can_access_record,
+    check_endpoint_access,
+    compile_access,
+    requires_ownership,
+    resolve_role,
+)
+from app.models.model_data import ModelData
+from app.models.user import User
+
+
+@pytest.fixture
+def user():
+    """Fixture returning a regular user."""
+    return User(email="user@example.com")
+
+
+@pytest.fixture
+def admin():
+    """Fixture returning an administrator."""
+    return User(email="admin@example.com", roles=[UserRole.USER, UserRole.ADMIN])
+
+
+# ------------------------------------------------------------
+# Role resolution
+# ------------------------------------------------------------
+
+def test_resolve_role_levels(user, admin):
+    """Ensure callers are mapped to the role used for field permissions."""
+    assert resolve_role(None) is UserRole.PUBLIC
+    assert resolve_role(user) is UserRole.USERS
+    assert resolve_role(admin) is UserRole.ADMIN
+    assert resolve_role(User(email="s@example.com", roles=[UserRole.SUPERADMIN])) is UserRole.SUPERADMIN
+
+
+# ------------------------------------------------------------
+# Endpoint access
+# ------------------------------------------------------------
+
+def test_public_endpoint_allows_anonymous():
+    """Ensure PUBLIC endpoints need no authentication."""
+    assert check_endpoint_access(EndpointConfig(user_role=UserRole.PUBLIC), None) is UserRole.PUBLIC
+
+
+@pytest.mark.parametrize("required", [UserRole.USERS, UserRole.USER, UserRole.ADMIN])
+def test_protected_endpoints_reject_anonymous(required):
+    """Ensure protected endpoints raise 401 for anonymous callers."""
+    with pytest.raises(NotAuthenticatedError):
+        check_endpoint_access(EndpointConfig(user_role=required), None)
+
+
+def test_admin_endpoint_rejects_regular_user(user, admin):
+    """Ensure ADMIN endpoints require an administrator."""
+    endpoint = EndpointConfig(user_role=UserRole.ADMIN)
+    with pytest.raises(PermissionDeniedError):
+        check_endpoint_access(endpoint, user)
+    assert check_endpoint_access(endpoint, admin) is UserRole.ADMIN
+
+
+@pytest.mark.parametrize("required", list(UserRole))
+def test_compiled_access_matches_check_endpoint_access(required, user, admin):
+    """Ensure the compiled check behaves like check_endpoint_access for every caller."""
+    endpoint = EndpointConfig(user_role=required)
+    authorize = compile_access(endpoint)
+    for caller in (None, user, admin, User(email="s@example.com", roles=[UserRole.SUPERADMIN])):
+        try:
+            expected = check_endpoint_access(endpoint, caller)
+        except (NotAuthenticatedError, PermissionDeniedError) as error:
+            with pytest.raises(type(error)):
+                authorize(caller)
+        else:
+            assert authorize(caller) is expected
+
+
+# ------------------------------------------------------------
+# Record access
+# ------------------------------------------------------------
+
+def test_owner_endpoint_limits_regular_users(user, admin):
+    """Ensure USER endpoints restrict regular users to their records."""
+    endpoint = EndpointConfig(user_role=UserRole.USER)
+    owned = {"owner_id": user.internal_id}
+    other = {"owner_id": ObjectId()}
+
+    assert requires_ownership(endpoint, UserRole.USERS)
+    assert can_access_record(endpoint, user, UserRole.USERS, owned)
+    assert not can_access_record(endpoint, user, UserRole.USERS, other)
+    assert can_access_record(endpoint, admin, UserRole.ADMIN, other)
+
+
+def test_custom_auth_function_is_applied(user):
+    """Ensure the custom function decides record access."""
+    endpoint = EndpointConfig(custom_auth_function=lambda caller, document: document.get("shared", False))
+    assert can_access_record(endpoint, user, UserRole.USERS, {"shared": True})
+    assert not can_access_record(endpoint, user, UserRole.USERS, {"shared": False})
+
+
+def test_custom_auth_function_receives_hydrated_record(user):
+    """Ensure hydration hands the custom function a record with the model API."""
+    endpoint = EndpointConfig(custom_auth_function=lambda caller, record: record.is_owned_by(caller.internal_id),
+                              hydration="view")
+    owned = {"owner_id": user.internal_id}
+    assert can_access_record(endpoint, user, UserRole.USERS, owned, ModelData)
+    assert not can_access_record(endpoint, user, UserRole.USERS, {"owner_id": ObjectId()}, ModelData)
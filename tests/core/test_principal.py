@@ -0,0 +1,182 @@
+# tests/core/test_principal.py
+
+import asyncio
+
+import pytest
+from bson import ObjectId
+
+from app.config.user_roles import UserRole
+from app.core import principal as principal_module
+from app.core.permissions import resolve_role
+from app.core.principal import Principal, PrincipalCache, handle_change, load_principal, save_user
+from app.models.user import User
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingCollection:
+    """In-memory users collection counting find_one calls."""
+
+    def __init__(self, documents):
+        self.documents = {document["_id"]: document for document in documents}
+        self.reads = 0
+
+    async def find_one(self, query, projection=None):
+        self.reads += 1
+        return self.documents.get(query["_id"])
+
+
+def _principal(**overrides):
+    values = dict(internal_id=ObjectId(), roles=(UserRole.USER,), groupes=(),
+                  is_active=True, allow_ownership_transfer=False)
+    values.update(overrides)
+    return Principal(**values)
+
+
+class SavingEngine:
+    async def save(self, instance):
+        return instance
+
+
+def _load(principal):
+    async def loader(_):
+        return principal
+    return loader
+
+
+# ------------------------------------------------------------
+# Principal
+# ------------------------------------------------------------
+
+def test_principal_from_document_is_trimmed():
+    """Ensure principals only carry the access-control fields."""
+    document = {"_id": ObjectId(), "roles": ["admin"], "groupes": ["team-a"], "is_active": True}
+    principal = Principal.from_document(document)
+    assert principal.roles == (UserRole.ADMIN,)
+    assert principal.groupes == ("team-a",)
+    assert resolve_role(principal) == UserRole.ADMIN
+
+
+# ------------------------------------------------------------
+# TTL / LRU
+# ------------------------------------------------------------
+
+def test_cache_expires_entries():
+    """Ensure entries are dropped after their TTL."""
+    clock = FakeClock()
+    cache = PrincipalCache(ttl=10, clock=clock)
+    principal = _principal()
+    cache.put(principal)
+    assert cache.get(principal.internal_id) is principal
+    clock.now = 11
+    assert cache.get(principal.internal_id) is None
+
+
+def test_cache_evicts_least_recently_used():
+    """Ensure the cache keeps at most max_size entries, evicting the coldest."""
+    cache = PrincipalCache(max_size=2)
+    first, second, third = _principal(), _principal(), _principal()
+    cache.put(first)
+    cache.put(second)
+    cache.get(first.internal_id)
+    cache.put(third)
+    assert cache.get(second.internal_id) is None
+    assert cache.get(first.internal_id) is first
+
+
+def test_load_principal_reads_database_once():
+    """Ensure repeated lookups are served from the cache."""
+    internal_id = ObjectId()
+    collection = CountingCollection([{"_id": internal_id, "roles": ["user"]}])
+    cache = PrincipalCache()
+
+    async def lookups():
+        for _ in range(3):
+            await load_principal(collection, internal_id, cache)
+
+    asyncio.run(lookups())
+    assert collection.reads == 1
+    assert cache.stats()["hits"] == 2
+
+
+def test_invalidation_during_load_is_not_cached():
+    """Ensure a load racing with an invalidation does not store stale data."""
+    cache = PrincipalCache()
+    principal = _principal()
+
+    async def loader(_):
+        cache.invalidate(principal.internal_id)
+        return principal
+
+    asyncio.run(cache.get_or_load(principal.internal_id, loader))
+    assert cache.get(principal.internal_id) is None
+
+
+# ------------------------------------------------------------
+# Invalidation
+# ------------------------------------------------------------
+
+@pytest.fixture
+def cached_user(monkeypatch):
+    """Fixture returning a user whose principal is in an isolated process cache."""
+    cache = PrincipalCache()
+    monkeypatch.setattr(principal_module, "principal_cache", cache)
+    user = User(email="user@example.com")
+    cache.put(Principal.from_user(user))
+    return user, cache
+
+
+@pytest.mark.parametrize("mutate", [
+    lambda user: user.add_role(UserRole.ADMIN),
+    lambda user: user.remove_role(UserRole.USER),
+    lambda user: user.soft_delete(),
+])
+def test_saved_user_changes_invalidate_principal(cached_user, mutate):
+    """Ensure role and activation changes drop the cached principal once saved, not before."""
+    user, cache = cached_user
+    mutate(user)
+    assert cache.get(user.internal_id) is not None
+    asyncio.run(save_user(SavingEngine(), user))
+    assert cache.get(user.internal_id) is None
+
+
+def test_save_user_invalidates_after_the_write(cached_user):
+    """Ensure a principal loaded while the user is being saved is dropped afterwards."""
+    user, cache = cached_user
+    stale = Principal.from_user(user)
+    cache.clear()
+    user.add_role(UserRole.ADMIN)
+
+    class LoadingEngine:
+        async def save(self, instance):
+            # A request loads the principal before the write lands
+            await cache.get_or_load(instance.internal_id, _load(stale))
+            assert cache.get(instance.internal_id) is stale
+            return instance
+
+    asyncio.run(save_user(LoadingEngine(), user))
+    assert cache.get(user.internal_id) is None
+
+
+def test_change_stream_ignores_unrelated_updates():
+    """Ensure only updates touching principal fields invalidate."""
+    cache = PrincipalCache()
+    principal = _principal()
+    cache.put(principal)
+    key = {"_id": principal.internal_id}
+
+    handle_change(cache, {"operationType": "update", "documentKey": key,
+                          "updateDescription": {"updatedFields": {"last_login": 1}}})
+    assert cache.get(principal.internal_id) is principal
+
+    handle_change(cache, {"operationType": "update", "documentKey": key,
+                          "updateDescription": {"updatedFields": {"roles.1": "admin"}}})
+    assert cache.get(principal.internal_id) is None
@@ -0,0 +1,108 @@
+# tests/core/test_rate_limit.py
+
+import pytest
+
+from app.config.endpoint_config import EndpointConfig
+from app.core.rate_limit import RateLimit, RateLimiter
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+# ------------------------------------------------------------
+# Limits
+# ------------------------------------------------------------
+
+@pytest.mark.parametrize("text, expected", [
+    ("100/minute", RateLimit(100, 60)),
+    ("10 per second", RateLimit(10, 1)),
+    ("1000/2hours", RateLimit(1000, 7200)),
+])
+def test_parse_limits(text, expected):
+    """Ensure the usual rate limit notations are understood."""
+    assert RateLimit.parse(text) == expected
+
+
+def test_endpoint_config_rejects_invalid_limits():
+    """Ensure configuration typos are caught by validate_config."""
+    with pytest.raises(ValueError):
+        EndpointConfig(rate_limit="lots/minute").validate_config()
+    assert EndpointConfig(rate_limit="5/second").validate_config()
+
+
+# ------------------------------------------------------------
+# GCRA
+# ------------------------------------------------------------
+
+def test_burst_then_reject_with_retry_after(clock):
+    """Ensure a full bucket allows a burst of count then rejects."""
+    limiter = RateLimiter(clock=clock)
+    limit = RateLimit(3, 3)
+    assert all(limiter.hit("key", limit).allowed for _ in range(3))
+    decision = limiter.hit("key", limit)
+    assert not decision.allowed
+    assert decision.retry_after == pytest.approx(1.0)
+
+
+def test_bucket_refills_over_time(clock):
+    """Ensure one request is allowed again after one emission interval."""
+    limiter = RateLimiter(clock=clock)
+    limit = RateLimit(2, 10)
+    limiter.hit("key", limit)
+    limiter.hit("key", limit)
+    assert not limiter.hit("key", limit).allowed
+    clock.now += 5
+    assert limiter.hit("key", limit).allowed
+    assert not limiter.hit("key", limit).allowed
+
+
+def test_keys_are_independent(clock):
+    """Ensure callers do not share a bucket."""
+    limiter = RateLimiter(clock=clock)
+    limit = RateLimit(1, 60)
+    assert limiter.hit("alice", limit).allowed
+    assert limiter.hit("bob", limit).allowed
+    assert not limiter.hit("alice", limit).allowed
+
+
+# ------------------------------------------------------------
+# Bounded memory
+# ------------------------------------------------------------
+
+def test_idle_keys_are_swept(clock):
+    """Ensure keys whose bucket refilled are dropped without losing state."""
+    limiter = RateLimiter(shards=1, sweep_every=1_000_000, clock=clock)
+    limit = RateLimit(10, 1)
+    for i in range(100):
+        limiter.hit(f"key-{i}", limit)
+    clock.now += 1
+    limiter.sweep()
+    assert len(limiter) == 0
+
+
+def test_max_keys_evicts_oldest(clock):
+    """Ensure a shard never holds more than max_keys entries."""
+    limiter = RateLimiter(shards=1, max_keys=10, clock=clock)
+    limit = RateLimit(1, 60)
+    for i in range(50):
+        limiter.hit(f"key-{i}", limit)
+    assert len(limiter) == 10
+    assert not limiter.hit("key-49", limit).allowed
+
+
+def test_shard_count_must_be_power_of_two():
+    """Ensure shard selection by mask stays uniform."""
+    with pytest.raises(ValueError):
+        RateLimiter(shards=3)
@@ -0,0 +1,156 @@
+# tests/core/test_security.py
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from app.core.exceptions import NotAuthenticatedError
+from app.core.security import (
+    REFRESH, BloomFilter, KeyStore, RevocationIndex, TokenVerifier, split_bearer, sync_revocations)
+
+
+@pytest.fixture(scope="module")
+def private_pem():
+    """Fixture returning a PEM encoded RSA private key."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+
+
+@pytest.fixture
+def verifier(private_pem):
+    """Fixture returning a verifier signing with the test key."""
+    keys = KeyStore(key_id="test")
+    keys.set_private_key(private_pem)
+    return TokenVerifier(keys)
+
+
+class RevokedCollection:
+    """In-memory revoked_tokens collection."""
+
+    def __init__(self):
+        self.documents = {}
+
+    async def update_one(self, query, update, upsert=False):
+        self.documents.setdefault(query["_id"], {"_id": query["_id"], **update["$setOnInsert"]})
+
+    def find(self, query, projection=None):
+        async def documents():
+            for document in list(self.documents.values()):
+                if document["expires_at"] > query["expires_at"]["$gt"]:
+                    yield document
+        return documents()
+
+
+# ------------------------------------------------------------
+# Tokens
+# ------------------------------------------------------------
+
+def test_token_roundtrip(verifier):
+    """Ensure issued tokens verify and carry the RS256 kid header."""
+    token = verifier.create_token("user-1")
+    claims = verifier.verify(token)
+    assert claims["sub"] == "user-1"
+    assert claims["type"] == "access"
+
+
+def test_verified_claims_are_cached(verifier, monkeypatch):
+    """Ensure a verified token is not decoded again before expiry."""
+    token = verifier.create_token("user-1")
+    verifier.verify(token)
+    monkeypatch.setattr(verifier, "_decode", lambda _: pytest.fail("token decoded twice"))
+    verifier.verify(token)
+
+
+def test_expired_cached_claims_are_rechecked(verifier, monkeypatch):
+    """Ensure cached claims are not served past their expiry."""
+    token = verifier.create_token("user-1")
+    verifier.verify(token)
+    verifier._claims[token] = {**verifier._claims[token], "exp": time.time() - 1}
+
+    def expired(_):
+        raise NotAuthenticatedError("Jeton expiré.")
+
+    monkeypatch.setattr(verifier, "_decode", expired)
+    with pytest.raises(NotAuthenticatedError, match="expiré"):
+        verifier.verify(token)
+
+
+def test_token_type_is_enforced(verifier):
+    """Ensure refresh tokens cannot be used as access tokens."""
+    token = verifier.create_token("user-1", token_type=REFRESH)
+    with pytest.raises(NotAuthenticatedError):
+        verifier.verify(token)
+    assert verifier.verify(token, REFRESH)["sub"] == "user-1"
+
+
+def test_tampered_and_foreign_tokens_are_rejected(verifier, private_pem):
+    """Ensure bad signatures and unknown key ids are refused."""
+    token = verifier.create_token("user-1")
+    with pytest.raises(NotAuthenticatedError):
+        verifier.verify(token[:-4] + "AAAA")
+
+    other = KeyStore(key_id="other")
+    other.set_private_key(private_pem)
+    with pytest.raises(NotAuthenticatedError):
+        verifier.verify(TokenVerifier(other).create_token("user-1"))
+
+
+def test_split_bearer():
+    """Ensure only Bearer credentials are accepted."""
+    assert split_bearer(None) is None
+    assert split_bearer("Bearer abc") == "abc"
+    with pytest.raises(NotAuthenticatedError):
+        split_bearer("Basic abc")
+
+
+# ------------------------------------------------------------
+# Revocation
+# ------------------------------------------------------------
+
+def test_bloom_filter_has_no_false_negatives():
+    """Ensure every added item is reported as present."""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"jti-{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+    assert false_positives < 300
+
+
+def test_revocation_index_rebuild_drops_expired_entries():
+    """Ensure expired revocations are purged when the filter is rebuilt."""
+    index = RevocationIndex(capacity=10)
+    index.add("old", expires_at=time.time() - 1)
+    index.add("live", expires_at=time.time() + 60)
+    index.rebuild()
+    assert not index.is_revoked("old")
+    assert index.is_revoked("live")
+
+
+def test_revoked_token_is_refused(verifier):
+    """Ensure a revoked token fails even with cached claims."""
+    collection = RevokedCollection()
+    token = verifier.create_token("user-1")
+    claims = verifier.verify(token)
+    asyncio.run(verifier.revoke(collection, claims))
+    with pytest.raises(NotAuthenticatedError, match="révoqué"):
+        verifier.verify(token)
+    assert claims["jti"] in collection.documents
+
+
+def test_sync_loads_revocations_from_other_nodes(verifier):
+    """Ensure revocations written by another process reach the local index."""
+    collection = RevokedCollection()
+    claims = verifier.verify(verifier.create_token("user-1"))
+    asyncio.run(collection.update_one({"_id": claims["jti"]}, {"$setOnInsert": {
+        "expires_at": datetime.now(timezone.utc) + timedelta(minutes=5),
+        "revoked_at": datetime.now(timezone.utc)}}))
+
+    assert asyncio.run(sync_revocations(collection, verifier.revocations)) == 1
+    assert verifier.revocations.is_revoked(claims["jti"])
@@ -0,0 +1,83 @@
+# tests/db/test_hydration.py
+
+import pytest
+from bson import ObjectId
+
+from app.config.user_roles import UserRole
+from app.db.hydration import construct, hydrate, hydrator, validate, view
+from app.models.user import User
+from app.services.auth import get_password_hasher
+from app.services.crud import to_document
+from app.utils.formatters import SerializerFactory
+
+
+# ------------------------------------------------------------
+# Fixtures
+# ------------------------------------------------------------
+
+@pytest.fixture
+def document():
+    """Fixture returning the MongoDB document of a stored user."""
+    user = User(email="jane@example.com", username="jane", owner_id=ObjectId())
+    user.hashed_password = get_password_hasher().hash("secret")
+    return to_document(user)
+
+
+# ------------------------------------------------------------
+# Trusted instances
+# ------------------------------------------------------------
+
+def test_construct_matches_validated_instance(document):
+    """Ensure a trusted instance holds the same values as a validated one."""
+    trusted, validated = construct(User, document), validate(User, document)
+    assert isinstance(trusted, User)
+    assert trusted.model_dump() == validated.model_dump(exclude={"id"})
+    assert trusted.roles == [UserRole.USER]
+    assert trusted.internal_id == document["_id"]
+
+
+def test_construct_keeps_model_api(document):
+    """Ensure a trusted instance behaves like a regular model instance."""
+    record = construct(User, document)
+    assert record.is_owned_by(document["owner_id"])
+    assert record.to_dict(UserRole.ADMIN) == validate(User, document).to_dict(UserRole.ADMIN)
+    record.username = "john"
+    assert record.username == "john"
+
+
+def test_construct_uses_static_defaults_for_missing_fields(document):
+    """Ensure projected-out fields fall back to static defaults, never factories."""
+    record = construct(User, {"_id": document["_id"], "email": document["email"]})
+    assert record.is_verified is False
+    with pytest.raises(AttributeError):
+        record.public_id
+
+
+# ------------------------------------------------------------
+# Read-only views
+# ------------------------------------------------------------
+
+def test_view_exposes_fields_and_methods(document):
+    """Ensure a view reads fields by attribute name and keeps read methods."""
+    record = view(User, document)
+    assert record.internal_id == document["_id"]
+    assert record.roles == [UserRole.USER]
+    assert record.is_owned_by(document["owner_id"])
+    assert not record.is_created_by(ObjectId())
+    assert record.to_dict(UserRole.PUBLIC) == construct(User, document).to_dict(UserRole.PUBLIC)
+    assert SerializerFactory.get(User, UserRole.ADMIN)(record) == construct(User, document).to_dict(UserRole.ADMIN)
+
+
+def test_view_is_read_only(document):
+    """Ensure assignments on a view are refused."""
+    record = view(User, document)
+    with pytest.raises(AttributeError):
+        record.username = "john"
+    assert document["username"] == "jane"
+
+
+def test_unknown_mode(document):
+    """Ensure an unknown hydration mode is rejected."""
+    with pytest.raises(ValueError):
+        hydrator(User, "lazy")
+    assert hydrate(User, document, "view").username == "jane"
@@ -0,0 +1,104 @@
+# tests/db/test_session.py
+
+from types import SimpleNamespace
+
+import pytest
+from pymongo import ReadPreference
+from pymongo.read_concern import ReadConcern
+
+from app.config.endpoint_config import EndpointConfig
+from app.config.endpoint_options import READ_PREFERENCES
+from app.db import session
+from app.db.session import PoolMetrics, SessionManager, reading
+
+
+# ------------------------------------------------------------
+# Fixtures
+# ------------------------------------------------------------
+
+@pytest.fixture
+def manager():
+    """Fixture returning a session manager closed after the test (no I/O until used)."""
+    manager = SessionManager(options={**session.client_options(), "connect": False})
+    yield manager
+    manager.close()
+
+
+# ------------------------------------------------------------
+# Client options
+# ------------------------------------------------------------
+
+def test_client_options_enable_compression_from_environment(monkeypatch):
+    """Ensure compressors are parsed and the zlib level only set with zlib."""
+    assert "compressors" not in session.client_options()
+    monkeypatch.setattr(session, "MONGODB_COMPRESSORS", "zstd, zlib")
+    monkeypatch.setattr(session, "MONGODB_ZLIB_LEVEL", 6)
+    options = session.client_options()
+    assert options["compressors"] == ["zstd", "zlib"]
+    assert options["zlibCompressionLevel"] == 6
+
+
+def test_manager_shares_one_tuned_client(manager):
+    """Ensure the engine is built once on a client carrying the pool settings."""
+    assert manager.engine is manager.engine
+    pool = manager.client.options.pool_options
+    assert pool.max_pool_size == session.MONGODB_MAX_POOL_SIZE
+    assert pool.min_pool_size == session.MONGODB_MIN_POOL_SIZE
+    assert manager.metrics in manager.client.options.event_listeners
+
+
+# ------------------------------------------------------------
+# Pool metrics
+# ------------------------------------------------------------
+
+def test_pool_metrics_track_saturation_and_waits():
+    """Ensure checkouts, waits and failures are reflected in the snapshot."""
+    metrics = PoolMetrics(max_pool_size=4)
+    for _ in range(3):
+        metrics.connection_created(None)
+        metrics.connection_check_out_started(None)
+        metrics.connection_checked_out(SimpleNamespace(duration=0.002))
+    metrics.connection_check_out_started(None)
+    metrics.connection_check_out_failed(SimpleNamespace(duration=2.0))
+    metrics.connection_checked_in(None)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["open"] == 3
+    assert snapshot["checked_out"] == 2
+    assert snapshot["max_checked_out"] == 3
+    assert snapshot["waiting"] == 0
+    assert snapshot["saturation"] == 0.5
+    assert snapshot["checkout_failures"] == 1
+    assert snapshot["avg_wait_ms"] == pytest.approx(2.0)
+
+
+# ------------------------------------------------------------
+# Read options
+# ------------------------------------------------------------
+
+def test_reading_shares_the_client_and_caches_engines(manager):
+    """Ensure read options produce a cached engine on the same client."""
+    engine = manager.engine
+    assert reading(engine) is engine
+
+    reader = reading(engine, "secondaryPreferred", "majority")
+    assert reader is reading(engine, "secondaryPreferred", "majority")
+    assert reader.client is engine.client
+    assert reader.database.read_preference == ReadPreference.SECONDARY_PREFERRED
+    assert reader.database.read_concern == ReadConcern("majority")
+    assert engine.database.read_preference == ReadPreference.PRIMARY
+
+
+def test_read_preference_modes_cover_accepted_names():
+    """Ensure every read preference accepted by the configuration maps to a driver mode."""
+    assert tuple(session.READ_PREFERENCE_MODES) == READ_PREFERENCES
+
+
+@pytest.mark.parametrize("options", [
+    {"read_preference": "secondaries"},
+    {"read_concern": "strong"},
+])
+def test_endpoint_rejects_unknown_read_options(options):
+    """Ensure read options are validated when the configuration is built."""
+    with pytest.raises(ValueError):
+        EndpointConfig(**options)
@@ -217,3 +217,32 @@ def test_set_owner_with_none_user_does_not_crash(sample_model):
     """Ensure set_owner can handle None as user_id."""
     sample_model.set_owner(None)
     assert sample_model.owner_id is None
+
+
+def test_to_public_dict_accepts_none_exclude_fields(sample_model):
+    """Ensure exclude_fields=None keeps every field."""
+    result = ModelData.to_public_dict(sample_model, exclude_fields=None)
+    assert set(result) == set(ModelData.model_fields)
+
+
+def test_to_dict_applies_role_permissions(sample_model):
+    """Ensure to_dict only exposes the fields of the given role."""
+    from app.config.user_roles import UserRole
+
+    public = sample_model.to_dict(UserRole.PUBLIC)
+    admin = sample_model.to_dict(UserRole.ADMIN)
+    assert set(public) == {"public_id", "created_at", "updated_at"}
+    assert "owner_id" in admin
+    assert "internal_id" not in admin
+
+
+def test_to_public_dict_returns_copies_of_nested_values():
+    """Ensure the result does not share lists or dicts with the instance."""
+    from app.models.user import User
+
+    user = User(email="jane@example.com", groupes=["staff"], profile={"theme": {"dark": True}})
+    result = ModelData.to_public_dict(user)
+    result["groupes"].append("admins")
+    result["profile"]["theme"]["dark"] = False
+    assert user.groupes == ["staff"]
+    assert user.profile == {"theme": {"dark": True}}
@@ -0,0 +1,60 @@
+# tests/models/test_parser.py
+
+import pytest
+
+from app.config.endpoint_config import EndpointConfig
+from app.config.model_config import ModelConfig
+from app.config.ownership_config import OwnershipConfig
+from app.config.user_roles import UserRole
+from app.models.parser import parse_model
+from app.models.user import User
+
+
+# ------------------------------------------------------------
+# Defaults
+# ------------------------------------------------------------
+
+def test_parse_model_fills_defaults():
+    """Ensure models without a ModelConfig get the collection, class name and default endpoints."""
+    spec = parse_model(User)
+    assert (spec.prefix, spec.tag) == ("user", "User")
+    assert spec.config.description == "Modèle User."
+    assert spec.endpoints["restore"].user_role is UserRole.ADMIN
+    assert spec.endpoints["get_all"].enable
+
+
+def test_parse_model_applies_declared_config(monkeypatch):
+    """Ensure declared endpoints, ownership and public id strategy are applied without mutating the declaration."""
+    declared = ModelConfig(
+        schema_name="Accounts",
+        endpoints={"delete": EndpointConfig(enable=False)},
+        ownership=OwnershipConfig(allow_ownership_transfer=False),
+        public_id_strategy="uuid7",
+    )
+    monkeypatch.setattr(User, "api_config", declared)
+    monkeypatch.setattr(User, "public_id_strategy", None)
+
+    spec = parse_model(User)
+
+    assert spec.tag == "Accounts"
+    assert not spec.endpoints["delete"].enable
+    assert not spec.endpoints["transfer_ownership"].enable
+    assert User.public_id_strategy == "uuid7"
+    assert declared.table_name is None
+
+
+# ------------------------------------------------------------
+# Validation
+# ------------------------------------------------------------
+
+@pytest.mark.parametrize("config", [
+    ModelConfig(endpoints={"archive": EndpointConfig()}),
+    ModelConfig(endpoints={"get_all": "public"}),
+    ModelConfig(table_name="accounts"),
+    ModelConfig(public_id_strategy="uuid1"),
+])
+def test_parse_model_rejects_invalid_config(monkeypatch, config):
+    """Ensure invalid configurations fail at startup with the model name."""
+    monkeypatch.setattr(User, "api_config", config)
+    with pytest.raises(ValueError, match="^User"):
+        parse_model(User)
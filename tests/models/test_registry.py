@@ -0,0 +1,94 @@
+# tests/models/test_registry.py
+
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.deps import get_current_user, get_engine
+from app.models.registry import ModelRegistry
+from app.models.user import User
+
+
+# ------------------------------------------------------------
+# Fixtures
+# ------------------------------------------------------------
+
+@pytest.fixture
+def app():
+    """Fixture returning an application with anonymous callers and no database."""
+    app = FastAPI()
+    app.dependency_overrides[get_current_user] = lambda: None
+    app.dependency_overrides[get_engine] = lambda: None
+    return app
+
+
+# ------------------------------------------------------------
+# Discovery
+# ------------------------------------------------------------
+
+def test_discover_finds_model_subclasses():
+    """Ensure API models are found through ModelData's subclasses, without the base class."""
+    models = ModelRegistry.discover()
+    assert User in models
+    assert all(model.__name__ != "ModelData" for model in models)
+
+
+def test_register_validates_once():
+    """Ensure a model's configuration is parsed once."""
+    ModelRegistry.clear()
+    assert ModelRegistry.register(User) is ModelRegistry.register(User)
+
+
+# ------------------------------------------------------------
+# Routes
+# ------------------------------------------------------------
+
+def test_routes_compile_on_first_request(app):
+    """Ensure model routes are built when first reached, with overrides and auth applied."""
+    mounted, = ModelRegistry.mount(app, [User], cache_path="")
+    client = TestClient(app)
+
+    assert not mounted.compiled
+    assert client.get("/api/other").status_code == 404
+    assert not mounted.compiled
+    assert client.get("/api/user").status_code == 401
+    assert mounted.compiled
+    assert client.delete("/api/user").status_code == 405
+    assert app.url_path_for("User.get_one", public_id="abc") == "/api/user/abc"
+
+
+def test_eager_mount_compiles_immediately(app):
+    """Ensure lazy=False builds every route at startup."""
+    mounted, = ModelRegistry.mount(app, [User], lazy=False, cache_path="")
+    assert mounted.compiled
+
+
+# ------------------------------------------------------------
+# OpenAPI cache
+# ------------------------------------------------------------
+
+def test_openapi_fragments_are_reused_from_disk(app, tmp_path):
+    """Ensure a warm start serves documentation without compiling model routes."""
+    cache = tmp_path / "plan.json"
+    ModelRegistry.mount(app, [User], cache_path=str(cache))
+    cold = TestClient(app).get("/openapi.json").json()
+    assert "/api/user/{public_id}" in cold["paths"]
+    assert set(json.loads(cache.read_text())) == {"/api/user"}
+
+    warm_app = FastAPI()
+    mounted, = ModelRegistry.mount(warm_app, [User], cache_path=str(cache))
+    warm = TestClient(warm_app).get("/openapi.json").json()
+    assert not mounted.compiled
+    assert warm == cold
+
+
+def test_openapi_fragment_is_rebuilt_when_fingerprint_changes(app, tmp_path):
+    """Ensure stale fragments are regenerated."""
+    cache = tmp_path / "plan.json"
+    cache.write_text(json.dumps({"/api/user": {"fingerprint": "stale", "paths": {}, "components": {}}}))
+    mounted, = ModelRegistry.mount(app, [User], cache_path=str(cache))
+    document = TestClient(app).get("/openapi.json").json()
+    assert mounted.compiled
+    assert "/api/user" in document["paths"]
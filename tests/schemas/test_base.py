@@ -0,0 +1,61 @@
+# tests/schemas/test_base.py
+
+from typing import List
+
+import pytest
+from pydantic import ValidationError
+
+from app.config.user_roles import UserRole
+from app.models.model_data import ModelData
+from app.models.user import User
+from app.schemas.base import SchemaFactory
+from app.services.permissions import writable_fields
+
+
+# ------------------------------------------------------------
+# Request schemas
+# ------------------------------------------------------------
+
+def test_create_schema_follows_writable_fields_and_constraints():
+    """Ensure create schemas keep only writable fields, with the model's constraints."""
+    schema = SchemaFactory.create(User, UserRole.ADMIN)
+    assert set(schema.model_fields) == writable_fields(User, UserRole.ADMIN, owner=True)
+    assert schema.model_fields["email"].is_required()
+    with pytest.raises(ValidationError):
+        schema(email="a" * 300)
+    with pytest.raises(ValidationError):
+        schema(email="user@example.com", hashed_password="secret")
+
+
+def test_update_schema_is_partial():
+    """Ensure update schemas accept partial bodies and only dump what was sent."""
+    schema = SchemaFactory.update(User, UserRole.ADMIN)
+    assert schema().model_dump(exclude_unset=True) == {}
+    assert schema(username="neo").model_dump(exclude_unset=True) == {"username": "neo"}
+
+
+# ------------------------------------------------------------
+# Response schemas
+# ------------------------------------------------------------
+
+def test_response_schema_follows_role_visibility():
+    """Ensure response schemas expose ObjectIds as strings and hide unreadable fields."""
+    schema = SchemaFactory.response(User, UserRole.ADMIN)
+    assert "hashed_password" not in schema.model_fields
+    assert schema(owner_id="6ad456eeaf802423b683a553").owner_id == "6ad456eeaf802423b683a553"
+    listing = SchemaFactory.list(User, UserRole.ADMIN)
+    assert listing.model_fields["items"].annotation == List[schema]
+
+
+# ------------------------------------------------------------
+# Cache
+# ------------------------------------------------------------
+
+def test_schemas_are_built_once_and_shared_by_equal_masks():
+    """Ensure schemas are cached and roles with the same permissions share classes."""
+    SchemaFactory.clear()
+    SchemaFactory.build([ModelData, User])
+    built = dict(SchemaFactory._schemas)
+    assert SchemaFactory.get(User, UserRole.ADMIN).create is SchemaFactory.create(User, UserRole.ADMIN)
+    assert SchemaFactory._schemas == built
+    assert len(built) < 2 * 4 * len(UserRole)
@@ -0,0 +1,183 @@
+# tests/services/test_archive.py
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from app.services import archive
+
+
+# ------------------------------------------------------------
+# Fixtures
+# ------------------------------------------------------------
+
+def matches(document, query):
+    for key, condition in query.items():
+        value = document.get(key)
+        if isinstance(condition, dict):
+            if "$lt" in condition and not value < condition["$lt"]:
+                return False
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, key, direction):
+        self.documents.sort(key=lambda document: document[key], reverse=direction < 0)
+        return self
+
+    def limit(self, count):
+        self.documents = self.documents[:count]
+        return self
+
+    def __aiter__(self):
+        async def iterate():
+            for document in self.documents:
+                yield document
+        return iterate()
+
+
+class FakeCollection:
+    """In-memory collection supporting the operations used by the archiver."""
+
+    def __init__(self, documents=(), index_failures=0):
+        self.documents = {document["_id"]: dict(document) for document in documents}
+        self.index_failures = index_failures
+        self.indexes = []
+
+    async def create_indexes(self, indexes):
+        if self.index_failures:
+            self.index_failures -= 1
+            raise OSError("network unreachable")
+        self.indexes += indexes
+
+    def find(self, query):
+        return FakeCursor([dict(d) for d in self.documents.values() if matches(d, query)])
+
+    async def find_one(self, query):
+        return next((dict(d) for d in self.documents.values() if matches(d, query)), None)
+
+    async def insert_one(self, document):
+        if document["_id"] in self.documents:
+            raise DuplicateKeyError("duplicate")
+        self.documents[document["_id"]] = dict(document)
+
+    async def insert_many(self, documents, ordered=True):
+        errors = []
+        for index, document in enumerate(documents):
+            try:
+                await self.insert_one(document)
+            except DuplicateKeyError:
+                errors.append({"index": index, "code": 11000})
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+
+    async def delete_many(self, query):
+        removed = [key for key, d in self.documents.items() if matches(d, query)]
+        for key in removed:
+            del self.documents[key]
+        return SimpleNamespace(deleted_count=len(removed))
+
+    async def delete_one(self, query):
+        for key, document in self.documents.items():
+            if matches(document, query):
+                del self.documents[key]
+                return
+
+    async def distinct(self, key, query):
+        return [d[key] for d in self.documents.values() if matches(d, query)]
+
+
+class FakeEngine:
+    def __init__(self, collection, archived):
+        self.collection = collection
+        self.database = {"item_archive": archived}
+
+    def get_collection(self, model):
+        return self.collection
+
+
+def record(days_ago, is_active=False):
+    updated_at = datetime.now(timezone.utc) - timedelta(days=days_ago)
+    return {"_id": ObjectId(), "public_id": str(ObjectId()), "is_active": is_active, "updated_at": updated_at}
+
+
+@pytest.fixture
+def records():
+    """Fixture returning old deleted, recent deleted and old active records."""
+    return [record(200), record(150), record(10), record(300, is_active=True)]
+
+
+# ------------------------------------------------------------
+# Archiving
+# ------------------------------------------------------------
+
+def test_archive_index_is_partial_on_deleted_records():
+    """Ensure the candidate index only covers soft-deleted records."""
+    index = archive.archive_indexes()[0].document
+    assert index["partialFilterExpression"] == {"is_active": False}
+    assert list(index["key"]) == ["updated_at"]
+
+
+def test_archive_moves_old_deleted_records(records):
+    """Ensure only records deleted before the cutoff are moved, in batches."""
+    collection, archived = FakeCollection(records), FakeCollection()
+    moved = asyncio.run(archive.archive_model(collection, archived, max_age=90, batch_size=1, pause=0))
+    assert moved == 2
+    assert set(archived.documents) == {records[0]["_id"], records[1]["_id"]}
+    assert set(collection.documents) == {records[2]["_id"], records[3]["_id"]}
+
+
+def test_archive_resumes_after_interrupted_batch(records):
+    """Ensure copies left by an interrupted batch do not block the next run."""
+    collection, archived = FakeCollection(records), FakeCollection([records[0]])
+    moved = asyncio.run(archive.archive_model(collection, archived, max_age=90, pause=0))
+    assert moved == 2
+    assert records[0]["_id"] not in collection.documents
+
+
+def test_archiver_retries_index_creation(records):
+    """Ensure a failed index creation at startup is retried instead of ending the task."""
+    collection, archived = FakeCollection(records, index_failures=1), FakeCollection()
+
+    class Item:
+        __collection__ = "item"
+
+    async def scenario():
+        task = asyncio.create_task(archive.run_archiver(FakeEngine(collection, archived), [Item], interval=0))
+        for _ in range(100):
+            await asyncio.sleep(0)
+            if archived.documents:
+                break
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return task
+
+    task = asyncio.run(scenario())
+    assert task.cancelled()
+    assert collection.indexes and archived.indexes
+    assert set(archived.documents) == {records[0]["_id"], records[1]["_id"]}
+
+
+# ------------------------------------------------------------
+# Restore
+# ------------------------------------------------------------
+
+def test_unarchive_brings_record_back_deleted(records):
+    """Ensure an archived record returns to the live collection, still deleted."""
+    collection, archived = FakeCollection(), FakeCollection([records[0]])
+    query = {"public_id": records[0]["public_id"], "is_active": False}
+    assert asyncio.run(archive.unarchive(collection, archived, query)) is True
+    assert collection.documents[records[0]["_id"]]["is_active"] is False
+    assert not archived.documents
+    assert asyncio.run(archive.unarchive(collection, archived, query)) is False
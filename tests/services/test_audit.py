@@ -0,0 +1,131 @@
+# tests/services/test_audit.py
+
+import asyncio
+
+import pytest
+from pymongo.errors import AutoReconnect
+
+from app.services.audit import AuditWriter, audit_entry
+
+
+# ------------------------------------------------------------
+# Fixtures
+# ------------------------------------------------------------
+
+class FakeCollection:
+    """Collection recording insert_many batches, optionally failing."""
+
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.fail = fail
+
+    async def insert_many(self, documents, ordered=True):
+        if self.fail:
+            raise AutoReconnect("down")
+        self.batches.append(list(documents))
+
+
+@pytest.fixture
+def collection():
+    """Fixture returning an empty fake collection."""
+    return FakeCollection()
+
+
+def entries(count):
+    return [audit_entry("read", "items", None, [f"id-{i}"]) for i in range(count)]
+
+
+# ------------------------------------------------------------
+# Flushing
+# ------------------------------------------------------------
+
+def test_flush_by_size(collection):
+    """Ensure full batches are written without waiting for the interval."""
+
+    async def run():
+        writer = AuditWriter(collection, batch_size=10, flush_interval=60)
+        for entry in entries(25):
+            await writer.log(entry)
+        await asyncio.sleep(0.01)
+        sizes = [len(batch) for batch in collection.batches]
+        await writer.stop()
+        return sizes
+
+    assert asyncio.run(run()) == [10, 10]
+    assert [len(batch) for batch in collection.batches] == [10, 10, 5]
+
+
+def test_flush_by_time(collection):
+    """Ensure a partial batch is written after flush_interval."""
+
+    async def run():
+        writer = AuditWriter(collection, batch_size=100, flush_interval=0.05)
+        for entry in entries(3):
+            await writer.log(entry)
+        await asyncio.sleep(0.2)
+        return writer.stats()
+
+    stats = asyncio.run(run())
+    assert stats["written"] == 3
+    assert stats["batches"] == 1
+
+
+def test_stop_flushes_pending_entries(collection):
+    """Ensure stop() writes everything queued before returning."""
+
+    async def run():
+        writer = AuditWriter(collection, batch_size=100, flush_interval=60)
+        for entry in entries(7):
+            await writer.log(entry)
+        await writer.stop()
+        await writer.log(entries(1)[0])
+        return writer.stats()
+
+    stats = asyncio.run(run())
+    assert sum(len(batch) for batch in collection.batches) == 7
+    assert stats["dropped"] == 1
+
+
+# ------------------------------------------------------------
+# Overflow
+# ------------------------------------------------------------
+
+def test_unknown_overflow_policy(collection):
+    """Ensure an invalid policy is rejected at construction."""
+    with pytest.raises(ValueError):
+        AuditWriter(collection, overflow="ignore")
+
+
+def test_drop_policy_counts_overflow(collection):
+    """Ensure entries beyond the queue size are dropped and counted."""
+
+    async def run():
+        writer = AuditWriter(collection, queue_size=5, batch_size=100, flush_interval=60, overflow="drop")
+        for entry in entries(8):
+            await writer.log(entry)
+        dropped = writer.stats()["dropped"]
+        await writer.stop()
+        return dropped
+
+    assert asyncio.run(run()) == 3
+
+
+def test_spill_and_replay(tmp_path):
+    """Ensure failed batches are spilled to disk and replayed once the database is back."""
+    spill_path = str(tmp_path / "audit.ndjson")
+    collection = FakeCollection(fail=True)
+
+    async def run():
+        writer = AuditWriter(collection, batch_size=100, flush_interval=60,
+                             overflow="spill", spill_path=spill_path)
+        for entry in entries(4):
+            await writer.log(entry)
+        await writer.stop()
+        spilled = writer.stats()["spilled"]
+        collection.fail = False
+        await writer.replay_spill()
+        return spilled
+
+    assert asyncio.run(run()) == 4
+    assert [entry["targets"] for entry in collection.batches[0]] == [[f"id-{i}"] for i in range(4)]
+    assert not (tmp_path / "audit.ndjson").exists()
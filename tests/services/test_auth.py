@@ -0,0 +1,116 @@
+# tests/services/test_auth.py
+
+import asyncio
+import hashlib
+
+import pytest
+
+from app.models.user import User
+from app.services.auth import PasswordHasher, PasswordService
+
+
+@pytest.fixture
+def hasher():
+    """Fixture returning a cheap scrypt policy to keep tests fast."""
+    return PasswordHasher(scrypt_log_n=4)
+
+
+@pytest.fixture
+def service(hasher):
+    """Fixture returning a two-worker password service."""
+    service = PasswordService(hasher, max_workers=2)
+    yield service
+    service.shutdown()
+
+
+# ------------------------------------------------------------
+# Hash policy
+# ------------------------------------------------------------
+
+def test_hash_roundtrip(hasher):
+    """Ensure a hash verifies the right password only."""
+    encoded = hasher.hash("secret")
+    assert encoded.startswith("$scrypt$ln=4,r=8,p=1$")
+    assert hasher.verify("secret", encoded)
+    assert not hasher.verify("wrong", encoded)
+
+
+def test_hashes_are_salted(hasher):
+    """Ensure two hashes of the same password differ."""
+    assert hasher.hash("secret") != hasher.hash("secret")
+
+
+def test_verify_rejects_missing_or_malformed_hashes(hasher):
+    """Ensure unknown formats never verify."""
+    assert not hasher.verify("secret", None)
+    assert not hasher.verify("secret", "$scrypt$broken")
+    assert not hasher.verify("secret", "plaintext")
+
+
+def test_cost_change_triggers_rehash(hasher):
+    """Ensure hashes made with older parameters are flagged for rehash."""
+    encoded = hasher.hash("secret")
+    assert not hasher.needs_rehash(encoded)
+    assert PasswordHasher(scrypt_log_n=5).needs_rehash(encoded)
+
+
+def test_legacy_sha256_hash_is_verified_and_upgraded(hasher):
+    """Ensure former sha256 hashes still log in and get replaced."""
+    legacy = hashlib.sha256(b"secret").hexdigest()
+    valid, new_hash = hasher.verify_and_update("secret", legacy)
+    assert valid
+    assert new_hash.startswith("$scrypt$")
+
+
+def test_bcrypt_scheme_when_available():
+    """Ensure bcrypt hashes are produced and verified when the package is installed."""
+    pytest.importorskip("bcrypt")
+    hasher = PasswordHasher(scheme="bcrypt", bcrypt_rounds=4)
+    encoded = hasher.hash("secret")
+    assert hasher.verify("secret", encoded)
+    assert PasswordHasher(scheme="bcrypt", bcrypt_rounds=5).needs_rehash(encoded)
+
+
+def test_unknown_scheme_is_rejected():
+    """Ensure configuration typos fail early."""
+    with pytest.raises(ValueError):
+        PasswordHasher(scheme="md5")
+
+
+# ------------------------------------------------------------
+# Async service
+# ------------------------------------------------------------
+
+def test_authenticate_rehashes_on_login(hasher, service):
+    """Ensure a successful login transparently upgrades an outdated hash."""
+    user = User(email="user@example.com")
+    user.hashed_password = PasswordHasher(scrypt_log_n=3).hash("secret")
+    old_hash = user.hashed_password
+
+    assert asyncio.run(service.authenticate(user, "secret"))
+    assert user.hashed_password != old_hash
+    assert not hasher.needs_rehash(user.hashed_password)
+
+
+def test_authenticate_keeps_hash_on_failure(service):
+    """Ensure a failed login leaves the stored hash untouched."""
+    user = User(email="user@example.com")
+    asyncio.run(service.set_password(user, "secret"))
+    old_hash = user.hashed_password
+    assert not asyncio.run(service.authenticate(user, "wrong"))
+    assert user.hashed_password == old_hash
+
+
+def test_authenticate_unknown_user(service):
+    """Ensure unknown users are refused without error."""
+    assert not asyncio.run(service.authenticate(None, "secret"))
+
+
+def test_concurrent_verifications(hasher, service):
+    """Ensure many concurrent verifications complete through the bounded pool."""
+    encoded = hasher.hash("secret")
+
+    async def storm():
+        return await asyncio.gather(*(service.verify("secret", encoded) for _ in range(20)))
+
+    assert all(asyncio.run(storm()))
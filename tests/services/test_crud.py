@@ -0,0 +1,209 @@
+# tests/services/test_crud.py
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.config.endpoint_config import EndpointConfig
+from app.config.user_roles import UserRole
+from app.models.user import User
+from app.services import crud
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def __aiter__(self):
+        async def iterate():
+            for document in self.documents:
+                yield document
+        return iterate()
+
+
+def matches(document, query):
+    """Evaluate the equality and $in filters built by crud."""
+    for key, expected in query.items():
+        if isinstance(expected, dict) and "$in" in expected:
+            if document.get(key) not in expected["$in"]:
+                return False
+        elif document.get(key) != expected:
+            return False
+    return True
+
+
+class FakeCollection:
+    """In-memory collection for bulk writes; before_write simulates a concurrent writer."""
+
+    def __init__(self, documents):
+        self.documents = [dict(document) for document in documents]
+        self.before_write = None
+
+    def find(self, query, projection=None):
+        return FakeCursor([dict(document) for document in self.documents if matches(document, query)])
+
+    async def bulk_write(self, operations, ordered=True):
+        if self.before_write is not None:
+            self.before_write(self.documents)
+        matched = 0
+        for operation in operations:
+            document = next((d for d in self.documents if matches(d, operation._filter)), None)
+            if document is not None:
+                document.update(operation._doc["$set"])
+                matched += 1
+        return SimpleNamespace(matched_count=matched, modified_count=matched)
+
+
+@pytest.fixture
+def user():
+    """Fixture returning a regular authenticated user."""
+    return User(email="user@example.com")
+
+
+@pytest.fixture
+def stored(user):
+    """Fixture returning a collection of three users owned by the caller."""
+    documents = [crud.to_document(User(email=f"u{i}@example.com", owner_id=user.internal_id)) for i in range(3)]
+    return FakeCollection(documents)
+
+
+def bulk_delete(collection, public_ids, user, ordered=False):
+    written = []
+
+    async def on_written(documents):
+        written.extend(documents)
+
+    summary = asyncio.run(crud.bulk_soft_delete(
+        collection, EndpointConfig(), public_ids, user, UserRole.USERS, ordered, on_written))
+    return summary, written
+
+
+# ------------------------------------------------------------
+# Per-item validation
+# ------------------------------------------------------------
+
+def test_prepare_create_sets_system_fields(user):
+    """Ensure created documents get ownership, timestamps and a public id like ModelData."""
+    document = crud.prepare_create(User, EndpointConfig(), {"email": "new@example.com"},
+                                   user, UserRole.USERS)
+    assert document["created_by"] == user.internal_id
+    assert document["owner_id"] == user.internal_id
+    assert document["public_id"]
+    assert document["created_at"] <= document["updated_at"]
+    assert document["is_active"] is True
+    assert "_id" in document
+
+
+def test_prepare_create_rejects_system_fields(user):
+    """Ensure callers cannot set system fields such as owner_id."""
+    with pytest.raises(crud.ItemError, match="owner_id"):
+        crud.prepare_create(User, EndpointConfig(),
+                            {"email": "new@example.com", "owner_id": None}, user, UserRole.USERS)
+
+
+@pytest.mark.parametrize("field, value", [("is_verified", True), ("last_login", "2025-01-01T00:00:00"),
+                                          ("roles", ["superadmin"]), ("hashed_password", "x")])
+def test_prepare_create_rejects_privileged_fields(user, field, value):
+    """Ensure creations and imports cannot set privileged fields."""
+    with pytest.raises(crud.ItemError, match=field):
+        crud.prepare_create(User, EndpointConfig(), {"email": "new@example.com", field: value},
+                            user, UserRole.USERS)
+
+
+def test_prepare_update_rejects_role_changes_below_superadmin():
+    """Ensure administrators cannot grant roles."""
+    with pytest.raises(crud.ItemError, match="roles"):
+        crud.prepare_update(User, {"roles": ["superadmin"]}, UserRole.ADMIN, owner=False)
+    update = crud.prepare_update(User, {"roles": ["admin"]}, UserRole.SUPERADMIN, owner=False)
+    assert update["$set"]["roles"] == ["admin"]
+
+
+def test_prepare_create_rejects_non_objects(user):
+    """Ensure every bulk item must be a JSON object."""
+    with pytest.raises(crud.ItemError):
+        crud.prepare_create(User, EndpointConfig(), ["email"], user, UserRole.USERS)
+
+
+def test_prepare_create_applies_custom_auth(user):
+    """Ensure the endpoint custom auth function sees the document to create."""
+    endpoint = EndpointConfig(custom_auth_function=lambda u, doc: doc["username"] == "ok")
+    with pytest.raises(crud.ItemError, match="Accès refusé"):
+        crud.prepare_create(User, endpoint, {"email": "a@example.com", "username": "ko"},
+                            user, UserRole.USERS)
+    crud.prepare_create(User, endpoint, {"email": "a@example.com", "username": "ok"},
+                        user, UserRole.USERS)
+
+
+def test_prepare_update_validates_field_constraints():
+    """Ensure partial updates keep the model field constraints."""
+    with pytest.raises(crud.ItemError, match="username"):
+        crud.prepare_update(User, {"username": "x" * 500}, UserRole.USERS, owner=True)
+
+
+def test_prepare_update_builds_set_with_timestamp():
+    """Ensure updates only $set the given fields plus updated_at."""
+    update = crud.prepare_update(User, {"username": "renamed"}, UserRole.USERS, owner=True)
+    assert set(update["$set"]) == {"username", "updated_at"}
+
+
+def test_prepare_update_requires_writable_fields():
+    """Ensure non owners cannot update owner-only fields."""
+    with pytest.raises(crud.ItemError):
+        crud.prepare_update(User, {"username": "renamed"}, UserRole.PUBLIC, owner=False)
+
+
+# ------------------------------------------------------------
+# Batch outcome
+# ------------------------------------------------------------
+
+def test_ordered_write_error_skips_following_items():
+    """Ensure an ordered batch reports items after the first write error as skipped."""
+    results = [crud.item_result(i, crud.SKIPPED, str(i)) for i in range(3)]
+    crud._apply_write_outcome(results, [0, 1, 2], {1: "duplicate"}, True, crud.CREATED)
+    assert [r["status"] for r in results] == [crud.CREATED, crud.FAILED, crud.SKIPPED]
+
+
+def test_unordered_write_error_keeps_other_items():
+    """Ensure an unordered batch only fails the items that errored."""
+    results = [crud.item_result(i, crud.SKIPPED, str(i)) for i in range(3)]
+    crud._apply_write_outcome(results, [0, 1, 2], {1: "duplicate"}, False, crud.CREATED)
+    assert [r["status"] for r in results] == [crud.CREATED, crud.FAILED, crud.CREATED]
+
+
+def test_summarize_counts_failures():
+    """Ensure the summary counts failed, missing and skipped items."""
+    results = [
+        crud.item_result(0, crud.CREATED),
+        crud.item_result(1, crud.FAILED, error="boom"),
+        crud.item_result(2, crud.SKIPPED),
+    ]
+    summary = crud.summarize(results, ordered=True)
+    assert summary["succeeded"] == 1
+    assert summary["failed"] == 2
+
+
+# ------------------------------------------------------------
+# Bulk writes
+# ------------------------------------------------------------
+
+def test_bulk_rejects_repeated_public_ids(stored, user):
+    """Ensure a public_id repeated in a batch is written and reported once."""
+    public_id = stored.documents[0]["public_id"]
+    summary, written = bulk_delete(stored, [public_id, public_id], user)
+    assert [r["status"] for r in summary["results"]] == [crud.DELETED, crud.FAILED]
+    assert [document["public_id"] for document in written] == [public_id]
+
+
+def test_bulk_reports_items_lost_to_a_concurrent_write(stored, user):
+    """Ensure an operation that matched no document is not reported as written."""
+    public_ids = [document["public_id"] for document in stored.documents]
+
+    def concurrent_delete(documents):
+        documents[1]["is_active"] = False
+
+    stored.before_write = concurrent_delete
+    summary, written = bulk_delete(stored, public_ids, user)
+    assert [r["status"] for r in summary["results"]] == [crud.DELETED, crud.NOT_FOUND, crud.DELETED]
+    assert summary["failed"] == 1
+    assert [document["public_id"] for document in written] == [public_ids[0], public_ids[2]]
@@ -0,0 +1,99 @@
+# tests/services/test_export.py
+
+import asyncio
+import json
+
+import pytest
+from bson import ObjectId
+
+from app.config.user_roles import UserRole
+from app.core.exceptions import BadRequestError
+from app.models.user import User
+from app.services import export
+
+
+async def _batches(*batches):
+    for batch in batches:
+        yield batch
+
+
+def _collect(stream):
+    async def run():
+        return [chunk async for chunk in stream]
+    return asyncio.run(run())
+
+
+# ------------------------------------------------------------
+# Resume tokens
+# ------------------------------------------------------------
+
+def test_resume_filter_starts_after_token():
+    """Ensure a resume token bounds the export after the last exported _id."""
+    last_id = ObjectId()
+    token = export.resume_token(User, last_id)
+    query = export.resume_filter(User, {"is_active": True}, token)
+    assert query == {"$and": [{"is_active": True}, {"_id": {"$gt": last_id}}]}
+
+
+def test_resume_filter_without_token_keeps_query():
+    """Ensure the first export request is not bounded."""
+    assert export.resume_filter(User, {"is_active": True}, None) == {"is_active": True}
+
+
+def test_resume_filter_rejects_foreign_tokens():
+    """Ensure pagination cursors cannot be replayed as export tokens."""
+    from app.services.pagination import encode_cursor
+
+    with pytest.raises(BadRequestError):
+        export.resume_filter(User, {}, encode_cursor({"s": ["user", "created_at", 1], "i": 1}))
+
+
+# ------------------------------------------------------------
+# Encoding
+# ------------------------------------------------------------
+
+def test_export_columns_follow_role_permissions():
+    """Ensure CSV columns never include fields hidden from the role."""
+    columns = export.export_columns(User, UserRole.ADMIN)
+    assert "email" in columns
+    assert "hashed_password" not in columns
+
+
+def test_stream_ndjson_emits_checkpoint_per_batch():
+    """Ensure each NDJSON batch ends with a resume token line."""
+    first, second = ObjectId(), ObjectId()
+    chunks = _collect(export.stream_ndjson(
+        User,
+        _batches([{"_id": first, "email": "a@example.com"}], [{"_id": second, "email": "b@example.com"}]),
+        lambda document: {"email": document["email"]}))
+
+    assert len(chunks) == 2
+    lines = [json.loads(line) for line in chunks[0].splitlines()]
+    assert lines[0] == {"email": "a@example.com"}
+    resumed = export.resume_filter(User, {}, lines[1][export.CURSOR_FIELD])
+    assert resumed == {"_id": {"$gt": first}}
+
+
+def test_stream_csv_writes_header_and_token_on_last_row():
+    """Ensure CSV exports flatten lists and carry the resume token on the last row."""
+    documents = [{"_id": ObjectId(), "email": f"{i}@example.com", "roles": ["user"]} for i in range(2)]
+    chunks = _collect(export.stream_csv(
+        User, _batches(documents),
+        lambda document: {"email": document["email"], "roles": document["roles"]},
+        ("email", "roles")))
+
+    assert chunks[0].strip() == "email,roles,_cursor"
+    rows = chunks[1].strip().splitlines()
+    assert rows[0] == '0@example.com,"[""user""]",'
+    assert not rows[1].endswith(",")
+
+
+def test_stream_applies_accept_filter():
+    """Ensure documents refused by a custom access rule are not exported."""
+    documents = [{"_id": ObjectId(), "email": "a@example.com"}, {"_id": ObjectId(), "email": "b@example.com"}]
+    chunks = _collect(export.stream_ndjson(
+        User, _batches(documents), lambda document: {"email": document["email"]},
+        accept=lambda document: document["email"].startswith("b")))
+    lines = chunks[0].splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0]) == {"email": "b@example.com"}
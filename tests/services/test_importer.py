@@ -0,0 +1,156 @@
+# tests/services/test_importer.py
+
+import asyncio
+import json
+
+import pytest
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+from app.config.endpoint_config import EndpointConfig
+from app.config.user_roles import UserRole
+from app.models.user import User
+from app.services import importer
+
+
+async def _chunks(data: bytes, size: int = 5):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def _parse(parser, data: bytes):
+    async def run():
+        return [row async for row in parser(_chunks(data))]
+    return asyncio.run(run())
+
+
+class RecordingCollection:
+    """In-memory collection recording insert_many batches."""
+
+    def __init__(self, duplicates=(), fail_on_batch=None):
+        self.batches = []
+        self.duplicates = set(duplicates)
+        self.fail_on_batch = fail_on_batch
+
+    async def insert_many(self, documents, ordered=True):
+        if len(self.batches) == self.fail_on_batch:
+            raise AutoReconnect("connection lost")
+        self.batches.append(documents)
+        errors = [{"index": index, "errmsg": "duplicate"}
+                  for index, document in enumerate(documents) if document.get("email") in self.duplicates]
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+
+
+# ------------------------------------------------------------
+# Incremental parsing
+# ------------------------------------------------------------
+
+def test_parse_ndjson_reports_line_numbers():
+    """Ensure NDJSON rows keep their line number and bad lines become row errors."""
+    data = b'{"email": "a@example.com"}\n\nnot json\n[1]\n{"email": "\xc3\xa9@example.com"}'
+    rows = _parse(importer.parse_ndjson, data)
+    assert [(number, error is None) for number, _, error in rows] == [
+        (1, True), (3, False), (4, False), (5, True)]
+    assert rows[-1][1] == {"email": "é@example.com"}
+
+
+def test_parse_ndjson_reports_invalid_encoding():
+    """Ensure a badly encoded line does not abort the import."""
+    rows = _parse(importer.parse_ndjson, b'{"email": "\xff"}\n{"email": "b@example.com"}\n')
+    assert rows[0][2] is not None
+    assert rows[1][1] == {"email": "b@example.com"}
+
+
+def test_parse_csv_handles_quoted_newlines_and_json_cells():
+    """Ensure CSV records may span lines and exported JSON cells are decoded."""
+    data = ('email,username,roles\n'
+            'a@example.com,"two\nlines","[""user""]"\n'
+            'b@example.com,,\n'
+            'c@example.com\n').encode("utf-8")
+    rows = _parse(importer.parse_csv, data)
+    assert rows[0] == (2, {"email": "a@example.com", "username": "two\nlines", "roles": ["user"]}, None)
+    assert rows[1] == (4, {"email": "b@example.com"}, None)
+    assert rows[2][0] == 5 and rows[2][2] is not None
+
+
+def test_parse_drops_system_and_cursor_columns():
+    """Ensure re-importing an export does not try to set system fields."""
+    data = json.dumps({"email": "a@example.com", "public_id": "x", "_cursor": "t"}).encode()
+    assert _parse(importer.parse_ndjson, data)[0][1] == {"email": "a@example.com"}
+
+
+# ------------------------------------------------------------
+# Pipeline
+# ------------------------------------------------------------
+
+def test_import_records_writes_batches_and_reports_errors():
+    """Ensure rows are written per batch and validation and write errors map to lines."""
+    admin = User(email="admin@example.com", roles=[UserRole.ADMIN])
+    lines = [json.dumps({"email": f"user{i}@example.com"}) for i in range(5)]
+    lines.insert(2, json.dumps({"email": "x@example.com", "hashed_password": "h"}))
+    collection = RecordingCollection(duplicates={"user4@example.com"})
+    progress = []
+
+    report = asyncio.run(importer.import_records(
+        collection, User, EndpointConfig(), _chunks("\n".join(lines).encode()),
+        admin, UserRole.ADMIN, "ndjson", batch_size=2, queue_size=1,
+        on_progress=lambda current: progress.append(current.inserted)))
+
+    assert [len(batch) for batch in collection.batches] == [2, 1, 2]
+    assert report.rows == 6
+    assert report.inserted == 4
+    assert sorted(error["row"] for error in report.errors) == [3, 6]
+    assert progress == [2, 3, 4]
+    assert all(document["owner_id"] == admin.internal_id
+               for batch in collection.batches for document in batch)
+
+
+def test_import_report_truncates_errors(monkeypatch):
+    """Ensure the report keeps counting errors beyond the detailed limit."""
+    monkeypatch.setattr(importer, "MAX_REPORTED_ERRORS", 1)
+    report = importer.ImportReport()
+    report.fail(1, "a")
+    report.fail(2, "b")
+    assert report.to_dict()["failed"] == 2
+    assert report.to_dict()["errors_truncated"] is True
+
+
+def test_import_records_saves_every_error(monkeypatch):
+    """Ensure errors beyond the detailed limit are copied to the errors collection, batch by batch."""
+    monkeypatch.setattr(importer, "MAX_REPORTED_ERRORS", 1)
+    admin = User(email="admin@example.com", roles=[UserRole.ADMIN])
+    lines = ["not json"] * 3 + [json.dumps({"email": "a@example.com"})]
+    errors = RecordingCollection()
+    progress = []
+
+    async def on_progress(current):
+        progress.append(len(errors.batches))
+
+    report = asyncio.run(importer.import_records(
+        RecordingCollection(), User, EndpointConfig(), _chunks("\n".join(lines).encode()),
+        admin, UserRole.ADMIN, "ndjson", batch_size=2, queue_size=1,
+        on_progress=on_progress, errors_collection=errors))
+
+    assert report.status == importer.COMPLETED
+    assert len(report.errors) == 1 and report.to_dict()["errors_truncated"] is True
+    assert [[entry["row"] for entry in batch] for batch in errors.batches] == [[1, 2], [3]]
+    assert all(entry["import_id"] == report.import_id for batch in errors.batches for entry in batch)
+    assert progress == [1, 2]
+
+
+def test_import_records_keeps_partial_report_on_failure():
+    """Ensure a write failure stops the import with the rows already written."""
+    admin = User(email="admin@example.com", roles=[UserRole.ADMIN])
+    lines = [json.dumps({"email": f"user{i}@example.com"}) for i in range(6)]
+    collection = RecordingCollection(fail_on_batch=1)
+
+    with pytest.raises(importer.ImportFailed) as failure:
+        asyncio.run(importer.import_records(
+            collection, User, EndpointConfig(), _chunks("\n".join(lines).encode()),
+            admin, UserRole.ADMIN, "ndjson", batch_size=2, queue_size=1))
+
+    report = failure.value.report
+    assert isinstance(failure.value.__cause__, AutoReconnect)
+    assert report.status == importer.FAILED
+    assert report.inserted == 2
+    assert "AutoReconnect" in report.error
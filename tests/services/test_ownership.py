@@ -0,0 +1,60 @@
+# tests/services/test_ownership.py
+
+import pytest
+
+from app.config.endpoint_config import EndpointConfig
+from app.config.user_roles import UserRole
+from app.models.user import User
+from app.services.ownership import access_query, ownership_indexes
+
+
+@pytest.fixture
+def user():
+    """Fixture returning a regular user in one team."""
+    return User(email="user@example.com", groupes=["team-a"])
+
+
+# ------------------------------------------------------------
+# Query scoping
+# ------------------------------------------------------------
+
+def test_access_query_filters_active_records(user):
+    """Ensure every read excludes soft deleted records."""
+    query = access_query(EndpointConfig(), user, UserRole.USERS, {"public_id": "abc"})
+    assert query == {"is_active": True, "public_id": "abc"}
+
+
+def test_access_query_pushes_ownership_down(user):
+    """Ensure USER endpoints restrict regular users to their records in the filter."""
+    query = access_query(EndpointConfig(user_role=UserRole.USER), user, UserRole.USERS)
+    assert query == {"owner_id": user.internal_id, "is_active": True}
+    assert list(query) == ["owner_id", "is_active"]
+
+
+def test_access_query_admins_are_not_restricted(user):
+    """Ensure administrators see every record of USER endpoints."""
+    query = access_query(EndpointConfig(user_role=UserRole.USER), user, UserRole.ADMIN)
+    assert "owner_id" not in query
+
+
+def test_access_query_applies_custom_access_filter(user):
+    """Ensure access_filter rules (team, hierarchy...) are compiled in the query."""
+    endpoint = EndpointConfig(access_filter=lambda caller: {"groupes": {"$in": caller.groupes}})
+    query = access_query(endpoint, user, UserRole.USERS)
+    assert query == {"$and": [{"is_active": True}, {"groupes": {"$in": ["team-a"]}}]}
+
+
+# ------------------------------------------------------------
+# Indexes
+# ------------------------------------------------------------
+
+def test_ownership_indexes_match_query_shape():
+    """Ensure a partial (owner_id, created_at, _id) index on active records is provided."""
+    indexes = {index.document["name"]: list(index.document["key"]) for index in ownership_indexes(User)}
+    assert indexes["keyset_owner_id_active_created_at"] == ["owner_id", "created_at", "_id"]
+
+
+def test_access_query_can_include_inactive_records(user):
+    """Ensure admin operations can opt out of the soft delete filter."""
+    query = access_query(EndpointConfig(), user, UserRole.ADMIN, include_inactive=True)
+    assert query == {}
@@ -0,0 +1,122 @@
+# tests/services/test_pagination.py
+
+import base64
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+
+from app.config.user_roles import UserRole
+from app.core.exceptions import BadRequestError
+from app.models.model_data import ModelData
+from app.models.user import User
+from app.services.pagination import (
+    KeysetPage,
+    decode_cursor,
+    encode_cursor,
+    keyset_indexes,
+    parse_sort,
+    sortable_fields,
+)
+
+
+# ------------------------------------------------------------
+# Cursors
+# ------------------------------------------------------------
+
+def test_cursor_roundtrip_keeps_bson_values():
+    """Ensure datetimes and ObjectIds survive encoding."""
+    object_id = ObjectId()
+    payload = {"v": datetime(2025, 1, 1, 12, 30), "i": object_id}
+    decoded = decode_cursor(encode_cursor(payload))
+    assert decoded["i"] == object_id
+    assert decoded["v"].replace(tzinfo=None) == datetime(2025, 1, 1, 12, 30)
+
+
+def test_tampered_cursor_is_rejected():
+    """Ensure a modified payload fails authentication."""
+    token = encode_cursor({"v": 1, "i": ObjectId()})
+    forged = token[:-2] + ("A" if token[-2] != "A" else "B") + token[-1]
+    with pytest.raises(BadRequestError):
+        decode_cursor(forged)
+
+
+def test_cursor_does_not_reveal_its_payload():
+    """Ensure sort values and _id cannot be read back by callers without access to them."""
+    object_id = ObjectId()
+    token = encode_cursor({"v": datetime(2025, 1, 1), "i": object_id})
+    raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    assert object_id.binary not in raw
+    assert str(object_id).encode() not in raw and b"2025" not in raw
+
+
+@pytest.mark.parametrize("token", ["", "abc", "abc.def", "a.b.c"])
+def test_malformed_cursor_is_rejected(token):
+    """Ensure garbage cursors raise a 400."""
+    with pytest.raises(BadRequestError):
+        decode_cursor(token)
+
+
+# ------------------------------------------------------------
+# Sort keys
+# ------------------------------------------------------------
+
+def test_sortable_fields_are_indexed_scalars():
+    """Ensure only timestamps and non-nullable indexed scalars are sortable."""
+    assert sortable_fields(ModelData) == {"created_at", "updated_at", "public_id"}
+    assert sortable_fields(User) == {"created_at", "updated_at", "public_id", "email"}
+
+
+def test_parse_sort_defaults_to_newest_first():
+    """Ensure the default sort is created_at descending."""
+    assert parse_sort(User, None, UserRole.PUBLIC) == ("created_at", DESCENDING)
+    assert parse_sort(User, "email", UserRole.ADMIN) == ("email", ASCENDING)
+    assert parse_sort(User, "-email", UserRole.ADMIN) == ("email", DESCENDING)
+
+
+def test_parse_sort_rejects_unreadable_or_unindexed_fields():
+    """Ensure callers cannot sort on hidden or unindexed fields."""
+    with pytest.raises(BadRequestError):
+        parse_sort(User, "hashed_password", UserRole.SUPERADMIN)
+    with pytest.raises(BadRequestError):
+        parse_sort(User, "email", UserRole.PUBLIC)
+
+
+# ------------------------------------------------------------
+# Keyset queries
+# ------------------------------------------------------------
+
+def test_first_page_has_no_bound():
+    """Ensure the first page only uses the base filter."""
+    page = KeysetPage(User, "created_at", DESCENDING, 10)
+    assert page.filter({"is_active": True}, None) == {"is_active": True}
+    assert page.sort == [("created_at", DESCENDING), ("_id", DESCENDING)]
+
+
+def test_next_page_bound_follows_direction():
+    """Ensure the cursor becomes a range on (key, _id)."""
+    last = {"_id": ObjectId(), "created_at": datetime(2025, 1, 1)}
+    page = KeysetPage(User, "created_at", DESCENDING, 10)
+    query = page.filter({"is_active": True}, page.next_cursor(last))
+
+    bound = query["$and"][1]["$or"]
+    assert query["$and"][0] == {"is_active": True}
+    assert bound[0] == {"created_at": {"$lt": datetime(2025, 1, 1)}}
+    assert bound[1]["_id"] == {"$lt": last["_id"]}
+
+
+def test_cursor_bound_to_its_query():
+    """Ensure a cursor cannot be replayed with another sort."""
+    last = {"_id": ObjectId(), "created_at": datetime(2025, 1, 1), "email": "a@b.c"}
+    cursor = KeysetPage(User, "created_at", DESCENDING, 10).next_cursor(last)
+    with pytest.raises(BadRequestError):
+        KeysetPage(User, "email", ASCENDING, 10).filter({}, cursor)
+
+
+def test_keyset_indexes_match_query_shape():
+    """Ensure a partial (key, _id) index on active records exists for each sortable field."""
+    indexes = {index.document["name"]: index.document for index in keyset_indexes(User)}
+    assert list(indexes["keyset_active_created_at"]["key"]) == ["created_at", "_id"]
+    assert indexes["keyset_active_created_at"]["partialFilterExpression"] == {"is_active": True}
+    assert len(indexes) == len(sortable_fields(User))
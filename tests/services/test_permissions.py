@@ -0,0 +1,142 @@
+# tests/services/test_permissions.py
+
+import pytest
+from bson import ObjectId
+
+from app.config.endpoint_config import EndpointConfig
+from app.config.permissions_config import PermissionsRegister
+from app.config.user_roles import UserRole
+from app.models.model_data import ModelData
+from app.models.user import User
+from app.services.permissions import build_projection, plan_read, readable_masks, writable_fields
+
+
+# ------------------------------------------------------------
+# Fixtures
+# ------------------------------------------------------------
+
+@pytest.fixture
+def caller():
+    """Fixture returning an authenticated regular user."""
+    return User(email="caller@example.com")
+
+
+@pytest.fixture
+def document(caller):
+    """Fixture returning a raw User document owned by the caller."""
+    return {
+        "_id": ObjectId(),
+        "public_id": "abc",
+        "email": "owned@example.com",
+        "hashed_password": "secret",
+        "profile": {"theme": "dark"},
+        "owner_id": caller.internal_id,
+    }
+
+
+# ------------------------------------------------------------
+# Projections
+# ------------------------------------------------------------
+
+def test_projection_excludes_sensitive_fields():
+    """Ensure fields no role may see are never projected."""
+    for role in UserRole:
+        mask, owner_mask = readable_masks(User, role, authenticated=True)
+        projection = build_projection(User, mask | owner_mask)
+        assert "hashed_password" not in projection
+        assert "profile" not in projection
+
+
+def test_projection_excludes_internal_id_below_superadmin():
+    """Ensure _id is explicitly excluded unless internal_id is visible."""
+    admin_mask, _ = readable_masks(ModelData, UserRole.ADMIN, authenticated=True)
+    superadmin_mask, _ = readable_masks(ModelData, UserRole.SUPERADMIN, authenticated=True)
+    assert build_projection(ModelData, admin_mask)["_id"] == 0
+    assert build_projection(ModelData, superadmin_mask)["_id"] == 1
+
+
+def test_projection_never_empty():
+    """Ensure an empty mask does not turn into a full document read."""
+    assert build_projection(User, 0) == {"_id": 1}
+
+
+def test_projection_adds_extra_fields():
+    """Ensure fields needed for processing are projected."""
+    mask, _ = readable_masks(User, UserRole.PUBLIC, authenticated=False)
+    assert build_projection(User, mask, ("owner_id",)) == {"owner_id": 1, "_id": 0}
+
+
+def test_readable_masks_respect_requested_fields():
+    """Ensure ?fields= narrows both masks."""
+    mask, owner_mask = readable_masks(User, UserRole.USERS, True, ["email", "public_id"])
+    assert build_projection(User, mask) == {"public_id": 1, "_id": 0}
+    assert build_projection(User, owner_mask) == {"public_id": 1, "email": 1, "_id": 0}
+
+
+# ------------------------------------------------------------
+# Read plans
+# ------------------------------------------------------------
+
+def test_plan_read_projects_owner_fields_with_owner_id(caller):
+    """Ensure owner-only fields and owner_id are fetched for authenticated callers."""
+    plan = plan_read(User, EndpointConfig(), caller, UserRole.USERS)
+    assert plan.projection["email"] == 1
+    assert plan.projection["owner_id"] == 1
+
+
+def test_plan_read_serializes_per_document_ownership(caller, document):
+    """Ensure the owner serializer is only used on owned documents."""
+    plan = plan_read(User, EndpointConfig(), caller, UserRole.USERS)
+    assert plan.serialize(document)["email"] == "owned@example.com"
+
+    document["owner_id"] = ObjectId()
+    assert "email" not in plan.serialize(document)
+    assert "owner_id" not in plan.serialize(document)
+
+
+def test_plan_read_anonymous_caller_has_no_owner_fields():
+    """Ensure anonymous reads do not fetch ownership data."""
+    plan = plan_read(User, EndpointConfig(user_role=UserRole.PUBLIC), None, UserRole.PUBLIC)
+    assert "owner_id" not in plan.projection
+
+
+def test_plan_read_custom_auth_reads_full_document(caller):
+    """Ensure custom auth functions receive complete documents."""
+    endpoint = EndpointConfig(custom_auth_function=lambda user, document: True)
+    plan = plan_read(User, endpoint, caller, UserRole.USERS)
+    assert plan.projection is None
+
+
+def test_plan_read_converts_object_ids(document):
+    """Ensure ObjectId values are exposed as strings."""
+    admin = User(email="admin@example.com", roles=[UserRole.SUPERADMIN])
+    plan = plan_read(User, EndpointConfig(), admin, UserRole.SUPERADMIN)
+    result = plan.serialize(document)
+    assert result["internal_id"] == str(document["_id"])
+    assert result["owner_id"] == str(document["owner_id"])
+
+
+def test_plan_read_owner_endpoint_skips_owner_id(caller):
+    """Ensure ownership enforced by the query needs no per-document check."""
+    plan = plan_read(User, EndpointConfig(user_role=UserRole.USER), caller, UserRole.USERS)
+    assert "owner_id" not in plan.projection
+    assert plan.serialize({"email": "mine@example.com"})["email"] == "mine@example.com"
+
+
+# ------------------------------------------------------------
+# Writable fields
+# ------------------------------------------------------------
+
+def test_writable_fields_are_registered_separately_from_readable_ones():
+    """Ensure readable privileged fields are not writable by default."""
+    assert PermissionsRegister.has_access(User, UserRole.ADMIN, "roles")
+    assert "roles" not in writable_fields(User, UserRole.ADMIN)
+    assert "roles" in writable_fields(User, UserRole.SUPERADMIN)
+    assert "is_verified" not in writable_fields(User, UserRole.USERS, owner=True)
+
+
+@pytest.mark.parametrize("role", list(UserRole))
+def test_server_managed_fields_are_never_writable(role):
+    """Ensure no role can write login, password or system fields."""
+    writable = writable_fields(User, role, owner=True)
+    assert not writable & {"last_login", "hashed_password", "owner_id", "internal_id", "is_active"}
@@ -0,0 +1,141 @@
+# tests/services/test_relations.py
+
+import asyncio
+
+import pytest
+from bson import ObjectId
+
+from app.config.user_roles import UserRole
+from app.core.exceptions import ValidationFailedError
+from app.models.model_data import ModelData
+from app.models.user import User
+from app.services import relations
+from app.services.crud import to_document
+from app.utils.formatters import SerializerFactory
+
+
+# ------------------------------------------------------------
+# Fixtures
+# ------------------------------------------------------------
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def __aiter__(self):
+        async def iterate():
+            for document in self.documents:
+                yield document
+        return iterate()
+
+
+class FakeCollection:
+    """Collection answering {_id: {$in: [...]}, is_active: True} and counting queries."""
+
+    def __init__(self, documents):
+        self.documents = {document["_id"]: document for document in documents}
+        self.queries = []
+
+    def find(self, query, projection):
+        self.queries.append(query)
+        found = [self.documents[key] for key in query["_id"]["$in"]
+                 if key in self.documents and self.documents[key]["is_active"]]
+        return FakeCursor([
+            {key: value for key, value in document.items() if projection.get(key)}
+            for document in found
+        ])
+
+
+class FakeEngine:
+    def __init__(self, collection):
+        self.collection = collection
+
+    def get_collection(self, model):
+        return self.collection
+
+
+@pytest.fixture
+def users():
+    """Fixture returning ten stored users, the last one soft-deleted."""
+    documents = [to_document(User(email=f"user{i}@example.com", username=f"user{i}")) for i in range(10)]
+    documents[-1]["is_active"] = False
+    return documents
+
+
+@pytest.fixture
+def admin():
+    """Fixture returning an authenticated administrator."""
+    return User(email="admin@example.com", roles=[UserRole.ADMIN])
+
+
+def page(users, rows=100):
+    return [
+        {"_id": ObjectId(), "public_id": str(i), "owner_id": users[i % 10]["_id"],
+         "created_by": users[(i + 1) % 10]["_id"]}
+        for i in range(rows)
+    ]
+
+
+# ------------------------------------------------------------
+# Expansion
+# ------------------------------------------------------------
+
+def test_page_expansion_takes_one_query(users, admin):
+    """Ensure a 100-row page with two relations costs a single $in query."""
+    collection = FakeCollection(users)
+    loader = relations.RelationLoader(FakeEngine(collection), admin)
+    documents = page(users)
+    serialize = SerializerFactory.get_document(ModelData, UserRole.ADMIN)
+    items = [serialize(document) for document in documents]
+
+    asyncio.run(relations.expand(loader, ModelData, documents, items, ("owner_id", "created_by")))
+
+    assert loader.queries == 1
+    assert len(collection.queries[0]["_id"]["$in"]) == 10
+    assert items[0]["owner_id"]["email"] == "user0@example.com"
+    assert items[0]["created_by"]["email"] == "user1@example.com"
+    assert items[9]["owner_id"] is None
+
+
+def test_related_fields_follow_caller_permissions(users, admin):
+    """Ensure summaries only contain what the caller may read on the related model."""
+    collection = FakeCollection(users)
+    loader = relations.RelationLoader(FakeEngine(collection), admin)
+    documents = page(users, rows=1)
+    items = [SerializerFactory.get_document(ModelData, UserRole.ADMIN)(documents[0])]
+
+    asyncio.run(relations.expand(loader, ModelData, documents, items, ("owner_id",)))
+
+    summary = items[0]["owner_id"]
+    assert "hashed_password" not in summary
+    assert "internal_id" not in summary
+
+
+def test_loader_memoizes_within_request(users, admin):
+    """Ensure records already loaded are not queried again."""
+    collection = FakeCollection(users)
+    loader = relations.RelationLoader(FakeEngine(collection), admin)
+
+    async def run():
+        first = await loader.load_many(User, [users[0]["_id"], users[1]["_id"]])
+        second = await loader.load(User, users[0]["_id"])
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert loader.queries == 1
+    assert second is first[0]
+
+
+# ------------------------------------------------------------
+# Parameter
+# ------------------------------------------------------------
+
+def test_parse_expand_rejects_hidden_or_unknown_fields():
+    """Ensure only relations readable by the caller can be expanded."""
+    assert relations.parse_expand(ModelData, UserRole.ADMIN, True, "owner_id, created_by") == (
+        "owner_id", "created_by")
+    assert relations.parse_expand(ModelData, UserRole.ADMIN, True, None) == ()
+    with pytest.raises(ValidationFailedError):
+        relations.parse_expand(ModelData, UserRole.ADMIN, True, "public_id")
+    with pytest.raises(ValidationFailedError):
+        relations.parse_expand(ModelData, UserRole.PUBLIC, False, "owner_id")
@@ -0,0 +1,150 @@
+# tests/services/test_response_cache.py
+
+import json
+
+import pytest
+
+from app.config.endpoint_config import EndpointConfig
+from app.config.user_roles import UserRole
+from app.models.model_data import ModelData
+from app.services.response_cache import ResponseCache, compute_etag, etag_matches
+
+
+# ------------------------------------------------------------
+# Fixtures
+# ------------------------------------------------------------
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Fixture returning a manual clock."""
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    """Fixture returning an empty cache with a 60 s TTL."""
+    return ResponseCache(max_bytes=1024, ttl=60, clock=clock)
+
+
+@pytest.fixture
+def public():
+    """Fixture returning a public read endpoint."""
+    return EndpointConfig(user_role=UserRole.PUBLIC)
+
+
+def key(public_id="abc"):
+    return (ModelData, UserRole.PUBLIC, 1, "one", public_id)
+
+
+# ------------------------------------------------------------
+# Keys and ETags
+# ------------------------------------------------------------
+
+def test_cache_key_only_for_public_endpoints(public):
+    """Ensure responses of non public endpoints are never cached."""
+    assert ResponseCache.cache_key(ModelData, public, None, UserRole.PUBLIC, None, "one", "a") is not None
+    restricted = EndpointConfig(user_role=UserRole.USERS)
+    assert ResponseCache.cache_key(ModelData, restricted, None, UserRole.USERS, None, "one", "a") is None
+
+
+def test_cache_key_skips_caller_dependent_endpoints():
+    """Ensure an access filter or custom auth function disables caching."""
+    filtered = EndpointConfig(user_role=UserRole.PUBLIC, access_filter=lambda user: {})
+    assert ResponseCache.cache_key(ModelData, filtered, None, UserRole.PUBLIC, None, "one", "a") is None
+
+
+def test_etag_changes_with_updated_at():
+    """Ensure the ETag is strong and follows updated_at."""
+    first = compute_etag(key(), [{"public_id": "abc", "updated_at": 1}])
+    assert first.startswith('"') and first.endswith('"')
+    assert first == compute_etag(key(), [{"public_id": "abc", "updated_at": 1}])
+    assert first != compute_etag(key(), [{"public_id": "abc", "updated_at": 2}])
+
+
+def test_etag_matches_header_lists():
+    """Ensure If-None-Match lists, weak tags and * are honoured."""
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
+
+
+# ------------------------------------------------------------
+# Cache behaviour
+# ------------------------------------------------------------
+
+def test_hit_returns_encoded_body(cache):
+    """Ensure a cached response is served with its ETag."""
+    cache.put(key(), '"e1"', {"public_id": "abc"}, "abc")
+    response = cache.respond(cache.get(key()), None)
+    assert json.loads(response.body) == {"public_id": "abc"}
+    assert response.headers["etag"] == '"e1"'
+    assert cache.stats()["hits"] == 1
+
+
+def test_if_none_match_returns_304(cache):
+    """Ensure a matching If-None-Match gets an empty 304."""
+    entry = cache.put(key(), '"e1"', {"public_id": "abc"}, "abc")
+    response = cache.respond(entry, '"e1"')
+    assert response.status_code == 304
+    assert response.body == b""
+    assert cache.stats()["not_modified"] == 1
+
+
+def test_entries_expire(cache, clock):
+    """Ensure entries are dropped after the TTL."""
+    cache.put(key(), '"e1"', {}, "abc")
+    clock.now = 61
+    assert cache.get(key()) is None
+    assert len(cache) == 0
+
+
+def test_invalidate_document_and_lists(cache):
+    """Ensure a write drops the document entries and every list of the model."""
+    list_key = (ModelData, UserRole.PUBLIC, 1, "list", None, 20, None, False)
+    cache.put(key("abc"), '"e1"', {}, "abc")
+    cache.put(key("def"), '"e2"', {}, "def")
+    cache.put(list_key, '"e3"', {"items": []})
+    cache.invalidate(ModelData, ["abc"])
+    assert cache.get(key("abc")) is None
+    assert cache.get(list_key) is None
+    assert cache.get(key("def")) is not None
+
+
+def test_write_during_read_prevents_caching(cache):
+    """Ensure a response read before an invalidation is not cached."""
+    list_key = (ModelData, UserRole.PUBLIC, 1, "list", None, 20, None, False)
+    document_generation = cache.generation(ModelData)
+    list_generation = cache.generation(ModelData)
+    cache.invalidate(ModelData, ["abc"])
+
+    entry = cache.put(key("abc"), '"old"', {"public_id": "abc"}, "abc", document_generation)
+    cache.put(list_key, '"old"', {"items": []}, generation=list_generation)
+    assert entry.etag == '"old"'
+    assert cache.get(key("abc")) is None
+    assert cache.get(list_key) is None
+
+    cache.put(key("abc"), '"new"', {"public_id": "abc"}, "abc", cache.generation(ModelData))
+    assert cache.get(key("abc")).etag == '"new"'
+
+
+def test_eviction_is_size_bounded(cache):
+    """Ensure least recently used entries are evicted past max_bytes."""
+    body = {"data": "x" * 300}
+    for public_id in ("a", "b", "c", "d"):
+        cache.put(key(public_id), '"e"', body, public_id)
+    stats = cache.stats()
+    assert stats["bytes"] <= cache.max_bytes
+    assert stats["evictions"] == 1
+    assert cache.get(key("a")) is None
+    assert cache.get(key("d")) is not None
@@ -0,0 +1,97 @@
+# tests/services/test_stats.py
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from bson import ObjectId
+
+from app.services import stats
+
+
+# ------------------------------------------------------------
+# Fixtures
+# ------------------------------------------------------------
+
+@pytest.fixture
+def owner():
+    """Fixture returning an owner id."""
+    return ObjectId()
+
+
+@pytest.fixture
+def documents(owner):
+    """Fixture returning two created documents of the same owner."""
+    created_at = datetime(2025, 1, 31, 23, 30, tzinfo=timezone.utc)
+    return [{"owner_id": owner, "created_at": created_at} for _ in range(2)]
+
+
+def apply(store, *deltas):
+    async def run():
+        for delta in deltas:
+            await store.apply("items", delta)
+        return await store.get("items")
+    return asyncio.run(run())
+
+
+# ------------------------------------------------------------
+# Deltas
+# ------------------------------------------------------------
+
+def test_created_delta(documents, owner):
+    """Ensure creations count totals, owners and creation days."""
+    assert stats.created_delta(documents) == {
+        "total": 2, "active": 2, f"owners.{owner}": 2, "days.2025-01-31": 2}
+
+
+def test_day_is_utc():
+    """Ensure creation days are computed in UTC."""
+    assert stats.day_of(datetime.fromisoformat("2025-02-01T00:30:00+01:00")) == "2025-01-31"
+
+
+def test_transfer_without_previous_owner():
+    """Ensure a transfer from no owner only credits the new one."""
+    new_owner = ObjectId()
+    assert stats.transferred_delta(None, new_owner) == {f"owners.{new_owner}": 1}
+
+
+# ------------------------------------------------------------
+# Store
+# ------------------------------------------------------------
+
+def test_store_tracks_lifecycle(documents, owner):
+    """Ensure create, delete, restore and transfer keep counters consistent."""
+    new_owner = ObjectId()
+    counters = apply(
+        stats.StatsStore(),
+        stats.created_delta(documents),
+        stats.soft_deleted_delta(documents[:1]),
+        stats.restored_delta(documents[:1]),
+        stats.soft_deleted_delta(documents[:1]),
+        stats.transferred_delta(owner, new_owner),
+    )
+    assert (counters["total"], counters["active"], counters["deleted"]) == (2, 1, 1)
+    assert counters["owners"] == {str(new_owner): 1}
+    assert counters["days"] == {"2025-01-31": 2}
+
+
+def test_store_replace_and_summary(documents):
+    """Ensure reconciliation replaces counters and all() only lists totals."""
+    store = stats.StatsStore()
+    apply(store, stats.created_delta(documents))
+    asyncio.run(store.replace("items", stats.empty_counters() | {"total": 7, "active": 7}))
+    summaries = asyncio.run(store.all())
+    assert summaries == {"items": {"total": 7, "active": 7, "deleted": 0, "reconciled_at": None}}
+
+
+def test_record_ignores_store_errors():
+    """Ensure a failing store never breaks the write that triggered it."""
+
+    class Broken:
+        async def apply(self, name, delta):
+            raise RuntimeError("down")
+
+    class Model:
+        __collection__ = "items"
+
+    asyncio.run(stats.record(Broken(), Model, {"total": 1}))
@@ -0,0 +1,70 @@
+# tests/setup/test_database_setup.py
+
+from pymongo import ASCENDING, IndexModel
+
+from app.models.model_data import ModelData
+from app.models.user import User
+from setup.database_setup import declared_indexes, diff_indexes, field_indexes, model_indexes, registered_models
+
+
+# ------------------------------------------------------------
+# Declared indexes
+# ------------------------------------------------------------
+
+def test_field_indexes_follow_model_declarations():
+    """Ensure index=True/unique=True fields get MongoDB's default index names."""
+    indexes = {index.document["name"]: index.document for index in field_indexes(User)}
+    assert indexes["email_1"]["unique"] is True
+    assert "is_verified_1" in indexes
+    assert "hashed_password_1" not in indexes
+
+
+def test_optional_unique_field_index_is_partial():
+    """Ensure users without a username do not collide on the unique index."""
+    index = {index.document["name"]: index.document for index in field_indexes(User)}["username_1"]
+    assert index["partialFilterExpression"] == {"username": {"$type": "string"}}
+
+
+def test_declared_indexes_cover_router_and_support_collections():
+    """Ensure router compound indexes and technical collections are declared."""
+    declared = declared_indexes([User])
+    names = {index.document["name"] for index in declared["user"]}
+    assert {"keyset_active_created_at", "keyset_owner_id_active_created_at", "deleted_updated_at"} <= names
+    assert {"revoked_tokens", "rate_limits", "audit_logs", "import_jobs", "import_errors",
+            "user_archive"} <= set(declared)
+
+
+def test_registered_models_include_subclasses():
+    """Ensure ModelData subclasses are found through ODMantic's pydantic twin classes."""
+    assert User in registered_models()
+
+
+def test_registered_models_skip_unexposed_base():
+    """Ensure no index is maintained on the base model_data collection."""
+    assert ModelData not in registered_models()
+
+
+# ------------------------------------------------------------
+# Diff
+# ------------------------------------------------------------
+
+def test_diff_matches_equivalent_indexes_by_definition():
+    """Ensure an existing index with another name satisfies the declaration."""
+    declared = [IndexModel([("email", ASCENDING)], unique=True)]
+    existing = {"_id_": {"key": [("_id", 1)]}, "by_email": {"key": [("email", 1.0)], "unique": True}}
+    plan = diff_indexes("user", declared, existing)
+    assert plan.missing == [] and plan.conflicting == [] and plan.redundant == {}
+
+
+def test_diff_reports_missing_conflicting_and_redundant():
+    """Ensure the plan separates missing, conflicting and redundant indexes."""
+    existing = {
+        "_id_": {"key": [("_id", 1)]},
+        "email_1": {"key": [("email", 1)]},
+        "roles_1": {"key": [("roles", 1)]},
+        "roles_1_groupes_1": {"key": [("roles", 1), ("groupes", 1)]},
+    }
+    plan = diff_indexes("user", model_indexes(User), existing)
+    assert "public_id_1" in {index.document["name"] for index in plan.missing}
+    assert plan.conflicting == ["email_1"]
+    assert plan.redundant == {"roles_1": "préfixe de roles_1_groupes_1", "roles_1_groupes_1": "non déclaré"}
@@ -0,0 +1,38 @@
+# tests/test_main.py
+
+from app.config.user_roles import UserRole
+from app.main import compile_models, create_app
+from app.models.registry import ModelRoutes
+from app.models.user import User
+from app.schemas.base import CREATE, LIST, RESPONSE, UPDATE, SchemaFactory
+from app.utils.formatters import SerializerFactory
+
+
+# ------------------------------------------------------------
+# Startup
+# ------------------------------------------------------------
+
+def test_create_app_builds_serializers():
+    """Ensure serializers are compiled at startup, not on the first request."""
+    SerializerFactory.clear()
+    create_app()
+    mask = SerializerFactory.effective_mask(User, UserRole.USER, owner=True)
+    assert (User, mask) in SerializerFactory._serializers
+    assert (User, mask) in SerializerFactory._document_serializers
+
+
+def test_create_app_builds_schemas():
+    """Ensure request and response schemas are generated at startup."""
+    SchemaFactory.clear()
+    create_app()
+    kinds = {kind for model, kind, _ in SchemaFactory._schemas if model is User}
+    assert kinds == {CREATE, UPDATE, RESPONSE, LIST}
+
+
+def test_compile_models_builds_every_mounted_model():
+    """Ensure the lifespan hook leaves no model route to build on a live request."""
+    application = create_app()
+    mounted = [route for route in application.routes if isinstance(route, ModelRoutes)]
+    assert mounted and not any(route.compiled for route in mounted)
+    compile_models(application)
+    assert all(route.compiled for route in mounted)
@@ -0,0 +1,99 @@
+# tests/utils/test_formatters.py
+
+import pytest
+from bson import ObjectId
+
+from app.config.permissions_config import PermissionsRegister
+from app.config.user_roles import UserRole
+from app.models.model_data import ModelData
+from app.models.user import User
+from app.services.auth import get_password_hasher
+from app.utils.formatters import SerializerFactory, compile_serializer, dump_value
+
+
+# ------------------------------------------------------------
+# Fixtures
+# ------------------------------------------------------------
+
+@pytest.fixture
+def sample_user():
+    """Fixture returning a User with sensitive fields filled."""
+    user = User(email="jane@example.com", username="jane", owner_id=ObjectId())
+    user.hashed_password = get_password_hasher().hash("secret")
+    return user
+
+
+# ------------------------------------------------------------
+# compile_serializer
+# ------------------------------------------------------------
+
+def test_compile_serializer_reads_only_given_fields(sample_user):
+    """Ensure the compiled function exposes exactly the given fields, in order."""
+    serializer = compile_serializer(("public_id", "email"))
+    assert list(serializer(sample_user)) == ["public_id", "email"]
+    assert serializer(sample_user)["email"] == "jane@example.com"
+
+
+def test_compile_serializer_handles_zero_and_one_field(sample_user):
+    """Ensure edge cases of the field tuple are supported."""
+    assert compile_serializer(())(sample_user) == {}
+    assert compile_serializer(("email",))(sample_user) == {"email": "jane@example.com"}
+
+
+def test_dump_value_copies_containers_and_dumps_models(sample_user):
+    """Ensure nested values are copied like model_dump() does."""
+    nested = {"tags": ["a"], "user": sample_user}
+    dumped = dump_value(nested)
+    assert dumped["tags"] == ["a"] and dumped["tags"] is not nested["tags"]
+    assert dumped["user"] == sample_user.model_dump()
+    assert dump_value("scalar") == "scalar"
+
+
+# ------------------------------------------------------------
+# SerializerFactory
+# ------------------------------------------------------------
+
+def test_serializer_matches_permissions_register(sample_user):
+    """Ensure each role only gets the fields registered for it."""
+    for role in UserRole:
+        result = SerializerFactory.get(User, role)(sample_user)
+        allowed = PermissionsRegister.get_permissions(User, role)
+        assert set(result) == allowed & set(User.model_fields)
+
+
+def test_serializer_never_exposes_password(sample_user):
+    """Ensure hashed_password is hidden from every role."""
+    for role in UserRole:
+        for owner in (False, True):
+            assert "hashed_password" not in SerializerFactory.get(User, role, owner)(sample_user)
+
+
+def test_owner_serializer_adds_user_role_fields(sample_user):
+    """Ensure owners see the UserRole.USER fields on top of their role."""
+    public = SerializerFactory.get(User, UserRole.PUBLIC)(sample_user)
+    owner = SerializerFactory.get(User, UserRole.PUBLIC, owner=True)(sample_user)
+    assert public == {}
+    assert owner["email"] == "jane@example.com"
+
+
+def test_serializer_copies_nested_fields(sample_user):
+    """Ensure mutating a serialized list leaves the instance untouched."""
+    result = SerializerFactory.get(User, UserRole.ADMIN, owner=True)(sample_user)
+    result["roles"].append(UserRole.ADMIN)
+    assert sample_user.roles == [UserRole.USER]
+
+
+def test_serializers_are_cached():
+    """Ensure the same function is returned for the same model and mask."""
+    first = SerializerFactory.get(ModelData, UserRole.ADMIN)
+    assert SerializerFactory.get(ModelData, UserRole.ADMIN) is first
+
+
+def test_build_compiles_every_role_and_owner_flag():
+    """Ensure build() generates a serializer per role and ownership flag."""
+    SerializerFactory.clear()
+    SerializerFactory.build([ModelData])
+    for role in UserRole:
+        for owner in (False, True):
+            mask = SerializerFactory.effective_mask(ModelData, role, owner)
+            assert (ModelData, mask) in SerializerFactory._serializers
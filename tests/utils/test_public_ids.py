@@ -0,0 +1,68 @@
+# tests/utils/test_public_ids.py
+
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+import pytest
+
+from app.models.model_data import ModelData
+from app.utils import public_ids
+from app.utils.public_ids import new_public_id, public_id_generator, uuid7_datetime, uuid7_public_id
+
+
+# ------------------------------------------------------------
+# UUIDv7
+# ------------------------------------------------------------
+
+def test_uuid7_layout():
+    """Ensure generated ids are RFC 9562 version 7 UUIDs."""
+    value = UUID(uuid7_public_id())
+    assert value.version == 7
+    assert value.variant == "specified in RFC 4122"
+
+
+def test_uuid7_is_strictly_increasing():
+    """Ensure ids sort in generation order, even within one millisecond."""
+    ids = [uuid7_public_id() for _ in range(10_000)]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+
+def test_uuid7_survives_clock_going_back(monkeypatch):
+    """Ensure a clock moving backwards does not break the ordering."""
+    first = uuid7_public_id()
+    monkeypatch.setattr(public_ids.time, "time_ns", lambda: 0)
+    assert uuid7_public_id() > first
+
+
+def test_uuid7_datetime():
+    """Ensure the creation time can be read back from the id."""
+    created = uuid7_datetime(uuid7_public_id())
+    assert abs(created - datetime.now(timezone.utc)) < timedelta(seconds=1)
+    with pytest.raises(ValueError):
+        uuid7_datetime(new_public_id("uuid4"))
+
+
+# ------------------------------------------------------------
+# Strategies
+# ------------------------------------------------------------
+
+def test_unknown_strategy():
+    """Ensure an unknown strategy is rejected."""
+    with pytest.raises(ValueError):
+        public_id_generator("sequence")
+
+
+def test_register_strategy(monkeypatch):
+    """Ensure custom strategies can be plugged in."""
+    monkeypatch.setitem(public_ids.PUBLIC_ID_STRATEGIES, "fixed", lambda: "fixed-id")
+    assert new_public_id("fixed") == "fixed-id"
+
+
+def test_model_uses_its_strategy(monkeypatch):
+    """Ensure a model's public_id follows its public_id_strategy unless given."""
+    monkeypatch.setattr(ModelData, "public_id_strategy", "uuid7")
+    assert UUID(ModelData().public_id).version == 7
+    assert ModelData(public_id="given").public_id == "given"
+    monkeypatch.setattr(ModelData, "public_id_strategy", None)
+    assert UUID(ModelData().public_id).version == 4